@@ -8,7 +8,9 @@ from graphene_django import DjangoObjectType
 from amelie.activities.models import Activity, ActivityLabel
 from amelie.calendar.graphql import EventType, EVENT_TYPE_BASE_FIELDS, EVENT_TYPE_BASE_PUBLIC_FIELDS
 from amelie.graphql.decorators import check_authorization
+from amelie.files.models import Attachment
 from amelie.graphql.helpers import is_logged_in
+from amelie.graphql.loaders import load_related
 from amelie.graphql.pagination.connection_field import DjangoPaginationConnectionField
 
 
@@ -92,7 +94,10 @@ class ActivityType(EventType):
 
     def resolve_photos(self: Activity, info):
         # `info.context` is the Django Request object in Graphene
-        return self.photos.filter_public(info.context)
+        return load_related(info, self, 'photos', queryset=Attachment.objects.filter_public(info.context))
+
+    def resolve_activity_label(self: Activity, info):
+        return load_related(info, self, 'activity_label')
 
     def resolve_absolute_url(self: Activity, info):
         return self.get_absolute_url()
@@ -166,7 +171,8 @@ class ActivityLabelType(DjangoObjectType):
 
 
 class ActivitiesQuery(graphene.ObjectType):
-    activities = DjangoPaginationConnectionField(ActivityType, id=graphene.ID(), organizer=graphene.ID())
+    activities = DjangoPaginationConnectionField(ActivityType, id=graphene.ID(), organizer=graphene.ID(),
+                                                keyset_fields=['begin'])
     activity = graphene.Field(ActivityType, id=graphene.ID())
 
     def resolve_activities(self, info, id=None, organizer=None, *args, **kwargs):
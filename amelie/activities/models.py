@@ -1,3 +1,4 @@
+import random
 from datetime import datetime
 
 from django.contrib.contenttypes.models import ContentType
@@ -127,14 +128,19 @@ class Activity(Event):
     def get_calendar_url(self):
         return reverse('activities:ics', args=[self.id])
 
-    def random_photo(self, only_public=True):
-        photos = self.photos.filter_public(only_public)
+    def random_photos(self, amount, only_public=True):
+        """
+        Returns the ids of a random sample of at most amount photos of this activity.
+        """
+        ids = list(self.photos.filter_public(only_public).order_by().values_list('pk', flat=True))
+        return random.sample(ids, min(amount, len(ids)))
 
+    def random_photo(self, only_public=True):
         # Select a random photo
-        photo = photos.order_by('?')[:1]
+        ids = self.random_photos(1, only_public=only_public)
 
         # Done
-        return photo[0] if len(photo) > 0 else None
+        return Attachment.objects.get(pk=ids[0]) if ids else None
 
     def random_public_photo(self):
         return self.random_photo(only_public=True)
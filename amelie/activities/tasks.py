@@ -2,6 +2,8 @@ import logging
 import os
 
 from celery import shared_task, group, chord
+from celery.result import AsyncResult, GroupResult
+from django.conf import settings
 
 from amelie.files.models import Attachment
 
@@ -9,12 +11,50 @@ from amelie.files.models import Attachment
 logger = logging.getLogger(__name__)
 
 
+def photo_upload_progress(upload_id):
+    """
+    Returns the progress of a photo upload, based on the results of its tasks.
+
+    :param upload_id: The task id of the save_photos task of the upload.
+
+    :return: Dictionary with the progress:
+             {
+               'total': The number of photos in the upload, None if the upload has not been started yet,
+               'processed': The number of photos that have been processed, successfully or not,
+               'failed': The number of photos that could not be saved,
+               'done': If all photos have been processed and the activity has been saved,
+               'error': If a chunk of photos could not be processed at all, after which the activity is saved
+                        with the photos of the other chunks,
+             }
+    """
+    progress = {'total': None, 'processed': 0, 'failed': 0, 'done': False, 'error': False}
+
+    upload = AsyncResult(upload_id)
+    if not upload.successful():
+        return progress
+
+    progress['total'] = upload.result['total']
+    chunks = GroupResult.restore(upload.result['group_id']) if upload.result['group_id'] else None
+    for chunk in (chunks.results if chunks else []):
+        if chunk.successful():
+            progress['processed'] += len(chunk.result)
+            progress['failed'] += sum(1 for result in chunk.result if not result['success'])
+
+        elif chunk.failed():
+            progress['error'] = True
+
+    progress['done'] = upload.result['finish_id'] is None or AsyncResult(upload.result['finish_id']).ready()
+    return progress
+
+
 @shared_task(name="default.save_photos")
 def save_photos(folder, photos, activity, photographer, public):
     """
     Upload a batch of photos to the server and add them to an activity.
 
-    This task will create and launch a Celery workflow with a new Task for each photo that needs to be uploaded.
+    This task will create and launch a Celery workflow with a Task for each chunk of PHOTO_UPLOAD_CHUNK_SIZE photos
+    that needs to be uploaded, followed by a single Task that saves the activity. If a chunk fails, that Task does
+    not run, and photo_upload_failed saves the activity instead.
 
     :param folder: The folder that contains the photos to be processed.
     :param photos: List of photo file paths that should be uploaded from the folder.
@@ -22,23 +62,111 @@ def save_photos(folder, photos, activity, photographer, public):
     :param photographer: Who is the photographer of the photos.
     :param public: If the photo is public or not.
 
-    :return: Dictionary with the number of tasks scheduled:
+    :return: Dictionary with the number of tasks scheduled and the ids of the tasks, see photo_upload_progress:
              {
                'scheduled_tasks': The number of save tasks scheduled.
+               'total': The number of photos.
+               'group_id': The id of the group of save tasks.
+               'finish_id': The id of the task that saves the activity.
              }
     """
     logger.info(f"Starting tasks to save {len(photos)} photos for activity {activity.id}")
 
-    # Build a Celery workflow that will save all the photos
     num_photos = len(photos)
-    group(
-        save_single_photo.s(
-            folder=folder, photo=photo, activity=activity, photographer=photographer,
-            public=public, progress=(i+1), total=num_photos
-        ) for i, photo in enumerate(photos)
+    chunk_size = settings.PHOTO_UPLOAD_CHUNK_SIZE
+    chunks = [photos[i:i + chunk_size] for i in range(0, num_photos, chunk_size)]
+    if not chunks:
+        return {'scheduled_tasks': 0, 'total': 0, 'group_id': None, 'finish_id': None}
+
+    # Build a Celery workflow that will save all the photos in chunks and then save the activity once
+    result = chord(
+        # Save each chunk of photos,
+        group(save_photo_chunk.s(
+            folder=folder, photos=chunk, activity=activity, photographer=photographer, public=public
+        ) for chunk in chunks),
+        # followed by saving the activity, also when one of the chunks failed.
+        finish_photo_upload.s(activity=activity).on_error(photo_upload_failed.s(activity=activity))
     ).delay()  # And execute the workflow (the last `.delay()`)
-    logger.info(f'{num_photos} processing tasks scheduled and started.')
-    return {'scheduled_tasks': num_photos}
+
+    # Store the group, so the progress can be followed
+    result.parent.save()
+
+    logger.info(f'{len(chunks)} processing tasks for {num_photos} photos scheduled and started.')
+    return {'scheduled_tasks': len(chunks), 'total': num_photos, 'group_id': result.parent.id,
+            'finish_id': result.id}
+
+
+# acks_late makes it so that the task is retried if the worker crashes before it finishes.
+@shared_task(name="default.save_photo_chunk", acks_late=True)
+def save_photo_chunk(folder, photos, activity, photographer, public):
+    """
+    Upload a chunk of photos to the server and add them to an activity, without saving the activity.
+
+    The attachments are created with a single bulk insert, and are added to the activity with a single insert.
+
+    :param folder: The folder that contains the photos to be processed.
+    :param photos: List of photo file paths that should be uploaded from the folder.
+    :param activity: Which activity to add the photos to.
+    :param photographer: Who is the photographer of the photos.
+    :param public: If the photo is public or not.
+
+    :return: List with the results of the photos, in the same format as the result of save_single_photo.
+    """
+    attachments = []
+    results = []
+
+    for photo in photos:
+        result = {'photo': photo, 'success': True, 'exception': None, 'timings': None}
+        try:
+            attachment = Attachment(file=os.path.join(folder, photo), caption='', owner=photographer, public=public)
+            attachment.prepare(create_thumbnails=True)
+            result['timings'] = attachment.thumbnail_timings
+            attachments.append(attachment)
+        except Exception as e:
+            result.update(success=False, exception=str(e))
+            logger.error(f"Error saving photo {photo}: {e}")
+        results.append(result)
+
+    if attachments:
+        Attachment.objects.bulk_create(attachments)
+        if attachments[0].pk is None:
+            # The database does not return the primary keys of bulk inserted rows, the files are unique however.
+            attachments = list(Attachment.objects.filter(file__in=[a.file.name for a in attachments]))
+
+        activity.photos.add(*attachments)
+
+    failed = sum(1 for result in results if not result['success'])
+    logger.info(f"Saved {len(attachments)} photos for activity {activity}, {failed} failed.")
+    return results
+
+
+@shared_task(name="default.finish_photo_upload")
+def finish_photo_upload(results, activity):
+    """
+    Save the activity once after all photos of an upload have been added.
+
+    :param results: The results of the save_photo_chunk tasks.
+    :param activity: The activity the photos were added to.
+    """
+    activity.save()
+
+    photos = [result for chunk in results for result in chunk]
+    logger.info(f"Photo upload for activity {activity} done, {sum(r['success'] for r in photos)} of "
+                f"{len(photos)} photos saved.")
+
+
+@shared_task(name="default.photo_upload_failed")
+def photo_upload_failed(request, exc, traceback, activity):
+    """
+    Save the activity once after a chunk of an upload failed, so the photos of the other chunks are shown.
+
+    :param request: The request of the failed task.
+    :param exc: The exception of the failed task.
+    :param traceback: The traceback of the failed task.
+    :param activity: The activity the photos were added to.
+    """
+    activity.save()
+    logger.error(f"Photo upload for activity {activity} failed in task {request.id}: {exc}")
 
 
 # acks_late makes it so that the task is retried if the worker crashes before it finishes.
@@ -55,9 +183,15 @@ def save_single_photo(folder, photo, activity, photographer, public, progress=No
     :param progress: Counter to keep track of how many photos have been processed already.
     :param total: The total number of photos to be processed.
 
-    :return: Dictionary with the number of tasks scheduled:
+    :return: Dictionary with the result of saving the photo:
              {
-               'scheduled_tasks': The number of save tasks scheduled.
+               'photo': The path of the photo,
+               'progress': The progress counter,
+               'total_tasks': The total number of photos,
+               'success': If the photo was saved successfully,
+               'exception': The error message if saving failed,
+               'timings': The time in seconds spent on decoding, on each thumbnail and in total, see
+                          Attachment.create_thumbnails,
              }
     """
     if not progress:
@@ -69,10 +203,12 @@ def save_single_photo(folder, photo, activity, photographer, public, progress=No
 
     success = True
     exception = None
+    timings = None
     try:
         file = os.path.join(folder, photo)
         attachment = Attachment(file=file, caption='', owner=photographer, public=public)
         attachment.save(create_thumbnails=True)
+        timings = attachment.thumbnail_timings
         logger.info(f"[{progress}/{total}] Adding photo to activity {activity}...")
         activity.photos.add(attachment)
         activity.save()
@@ -81,11 +217,12 @@ def save_single_photo(folder, photo, activity, photographer, public, progress=No
         exception = str(e)
         logger.error(f"[{progress}/{total}] Error saving photo {photo}: {e}")
     else:
-        logger.info(f"[{progress}/{total}] Photo {photo} saved successfully.")
+        logger.info(f"[{progress}/{total}] Photo {photo} saved successfully, thumbnails took {timings['total']:.2f}s.")
     return {
         'photo': photo,
         'progress': progress,
         'total_tasks': total,
         'success': success,
         'exception': exception,
+        'timings': timings,
     }
@@ -0,0 +1,48 @@
+from django.core.cache import cache
+from django.urls import reverse
+
+from amelie.activities.models import Activity
+from amelie.tools.tests import TestCase, generate_activities
+
+
+class ActivitiesIcsTest(TestCase):
+    def setUp(self):
+        super(ActivitiesIcsTest, self).setUp()
+        cache.clear()
+        self.load_basic_data()
+        generate_activities(5)
+
+    def test_conditional_get(self):
+        url = reverse('activities:activities_ics')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content.count(b'BEGIN:VEVENT'), Activity.objects.filter_public(True).count())
+
+        # An unchanged feed is not sent again
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        # A changed event changes the feed
+        activity = Activity.objects.filter_public(True).first()
+        activity.summary_nl = 'Gewijzigde activiteit'
+        activity.save()
+
+        response_changed = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response_changed.status_code, 200)
+        self.assertIn(b'Gewijzigde activiteit', response_changed.content)
+
+    def test_organizer_renamed(self):
+        url = reverse('activities:activities_ics')
+        committee = self.data['committee1']
+        committee.email = 'com1@inter-actief.utwente.nl'
+        committee.save()
+        response = self.client.get(url)
+        self.assertIn(b'CN="Committee 1"', response.content)
+
+        # Renaming the organizer does not change the update count of its events, but does change the feed
+        committee.name = 'Renamed committee'
+        committee.save()
+
+        response_changed = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response_changed.status_code, 200)
+        self.assertIn(b'CN="Renamed committee"', response_changed.content)
@@ -34,6 +34,7 @@ urlpatterns = [
     path('photos/random/', views.random_photo, name='random_photo'),
     path('photos/upload/', views.photo_upload, name='photo_upload'),
     path('photos/upload/preview/<str:filename>', views.photo_upload_preview, name='photo_upload_preview'),
+    path('photos/upload/progress/<str:upload_id>/', views.photo_upload_progress, name='photo_upload_progress'),
     path('photos/upload/files/', views.UploadPhotoFilesView.as_view(), name='photo_upload_files'),
     path('photos/upload/clear/', views.ClearPhotoUploadDirView.as_view(), name='photo_upload_clear'),
 
@@ -19,7 +19,7 @@ from django.core.exceptions import PermissionDenied, ImproperlyConfigured
 from django.core.paginator import EmptyPage, PageNotAnInteger
 from django.urls import reverse, reverse_lazy
 from django.db import transaction
-from django.db.models import F, Q, Count, Sum
+from django.db.models import Q, Count, Sum
 from django.http import Http404, HttpResponseRedirect, HttpResponse, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, render, redirect
 from django.utils import timezone
@@ -44,7 +44,7 @@ from amelie.activities.models import Activity, DishPrice, Enrollmentoption, Enro
     EnrollmentoptionCheckboxAnswer, EnrollmentoptionFood, EnrollmentoptionFoodAnswer, EnrollmentoptionQuestion, \
     EnrollmentoptionQuestionAnswer, EventDeskRegistrationMessage, Restaurant, EnrollmentoptionNumeric, \
     EnrollmentoptionNumericAnswer, EnrollmentoptionAnswer
-from amelie.activities.tasks import save_photos
+from amelie.activities.tasks import save_photos, photo_upload_progress as get_photo_upload_progress
 from amelie.activities.utils import check_enrollment_allowed, check_unenrollment_allowed, update_waiting_list
 from amelie.claudia.google import GoogleSuiteAPI
 from amelie.files.models import Attachment
@@ -58,7 +58,8 @@ from amelie.tools import amelie_messages, types
 from amelie.tools.const import TaskPriority
 from amelie.tools.decorators import require_actief, require_lid, require_committee, require_board
 from amelie.tools.forms import PeriodForm, ExportForm, PeriodKeywordForm
-from amelie.tools.calendar import ical_calendar
+from amelie.tools.calendar import ical_calendar, ical_feed_response
+from amelie.tools.http import HttpJSONResponse
 from amelie.tools.mixins import RequireActiveMemberMixin, DeleteMessageMixin, PassesTestMixin, RequireBoardMixin, \
     RequireCommitteeMixin
 from amelie.tools.paginator import RangedPaginator
@@ -99,10 +100,8 @@ def activities_ics(request, lang=None):
         .filter(begin__gte=timezone.now() - datetime.timedelta(100)) \
         .order_by('begin')
 
-    ical_contents = ical_calendar(_('Events of Inter-Actief'), act,
-                                  max_duration_before_split=datetime.timedelta(days=5))
-
-    return HttpResponse(ical_contents, content_type='text/calendar; charset=UTF-8')
+    return ical_feed_response(request, _('Events of Inter-Actief'), act,
+                              max_duration_before_split=datetime.timedelta(days=5))
 
 
 def activity_ics(request, pk):
@@ -848,16 +847,28 @@ def photo_upload(request):
                 shutil.move(path, processing_folder)
 
             save_args = [processing_folder, form.cleaned_data["photos"], activity, photographer, public]
-            save_photos.s(*save_args).set(priority=TaskPriority.HIGH).delay()
+            upload = save_photos.s(*save_args).set(priority=TaskPriority.HIGH).delay()
             messages.info(request, _("The photos are now being processed in the background."
                                      "Photos will show up on the activity as they are processed, "
                                      "you can refresh the page to follow the progres."))
+            messages.info(request, _("The progress of the upload can be followed at {url}").format(
+                url=reverse('activities:photo_upload_progress', args=[upload.id])
+            ))
             # Redirect to the result
             return HttpResponseRedirect(activity.get_photo_url())
 
     return render(request, "photo_upload.html", locals())
 
 
+@require_committee('MediaCie')
+@never_cache
+def photo_upload_progress(request, upload_id):
+    """
+    Returns the progress of a photo upload as JSON, see amelie.activities.tasks.photo_upload_progress.
+    """
+    return HttpJSONResponse(get_photo_upload_progress(upload_id))
+
+
 @require_committee('MediaCie')
 @never_cache
 def photo_upload_preview(request, filename):
@@ -1064,22 +1075,11 @@ def photos(request, page=1):
 
 
 def random_photo(request, after=None, type='landscape', format='small', response='json'):
-    filters = Q()
-
-    # Take the format into account
-    if type == 'portrait':
-        filters = filters & Q(**{'thumb_%s_height__gte' % format: F('thumb_%s_width' % format)})
-    elif type == 'landscape':
-        filters = filters & Q(**{'thumb_%s_width__gte' % format: F('thumb_%s_height' % format)})
+    only_public = not hasattr(request, 'user') or not request.user.is_authenticated
 
-    # Only photos after a specific period
-    if after:
-        filters = filters & Q(aangemaakt__gt=after)
+    photo = Attachment.objects.random_photo(orientation=type, format=format, only_public=only_public, after=after)
 
-    # Query
-    try:
-        photo = Attachment.objects.filter_public(request).filter(filters).order_by('?')[0]
-    except:
+    if photo is None:
         raise Http404(_('No photo'))
 
     # Done
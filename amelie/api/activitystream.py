@@ -1,7 +1,6 @@
 from decimal import Decimal
 from itertools import chain
 import logging
-import operator
 from typing import List, Dict
 
 from modernrpc import RpcRequestContext
@@ -18,13 +17,13 @@ from amelie.activities.models import EnrollmentoptionQuestionAnswer, Enrollmento
 from amelie.activities.utils import update_waiting_list
 from amelie.api.api import api_server
 from amelie.api.activitystream_utils import add_detailed_properties, add_images_property, add_thumbnails_property, \
-    get_basic_result
+    get_basic_result, get_indexed_basic_result
 from amelie.api.authentication_types import AnonymousAuthentication
 from amelie.api.decorators import auth_optional, auth_required
 from amelie.api.exceptions import NotLoggedInError, MissingOptionError, SignupError, DoesNotExistError
 from amelie.api.utils import parse_datetime_parameter
 from amelie.companies.models import CompanyEvent
-from amelie.calendar.models import Participation
+from amelie.calendar.models import EventIndex, Participation
 from amelie.education.models import EducationEvent
 from amelie.personal_tab import transactions
 
@@ -91,28 +90,10 @@ def get_activity_stream(begin_date_str: str, end_date_str: str, return_mixed: bo
     begin_date = parse_datetime_parameter(begin_date_str)
     end_date = parse_datetime_parameter(end_date_str)
 
-    # Regular activities
-    regular_activities = Activity.objects.filter_public(not is_authenticated)\
+    entries = EventIndex.objects.stream(only_public=not is_authenticated, mixed=return_mixed)\
         .filter(end__gt=begin_date, begin__lte=end_date)
 
-    # Educational activities
-    education_activities = EducationEvent.objects.filter_public(not is_authenticated) \
-        .filter(end__gt=begin_date, begin__lte=end_date)
-
-    # External activities
-    external_activities = CompanyEvent.objects.filter_public(not is_authenticated) \
-        .filter(end__gt=begin_date, begin__lte=end_date,
-                visible_from__lte=timezone.now(), visible_till__gte=timezone.now())
-
-    activities = chain(regular_activities, education_activities, external_activities)\
-        if return_mixed else regular_activities
-    ordered_activities = sorted(activities, key=operator.attrgetter("begin"))
-
-    result = []
-    for activity in ordered_activities:
-        single = get_basic_result(activity)
-        result.append(single)
-    return result
+    return [get_indexed_basic_result(entry) for entry in entries]
 
 
 @api_server.register_procedure(name='getUpcomingActivities', auth=auth_optional, context_target='ctx')
@@ -167,25 +148,10 @@ def get_upcoming_activities(amount: int, return_mixed: bool = False, ctx: RpcReq
     authentication = ctx.auth_result
     is_authenticated = authentication and not isinstance(authentication, AnonymousAuthentication)
 
-    # Regular activities
-    regular_activities = Activity.objects.filter_public(not is_authenticated).filter(begin__gte=timezone.now())
+    entries = EventIndex.objects.stream(only_public=not is_authenticated, mixed=return_mixed)\
+        .filter(begin__gte=timezone.now())[:amount]
 
-    # Educational activities
-    education_activities = EducationEvent.objects.filter_public(not is_authenticated).filter(begin__gte=timezone.now())
-
-    # External activities
-    external_activities = CompanyEvent.objects.filter_public(not is_authenticated)\
-        .filter(begin__gte=timezone.now(), visible_from__lte=timezone.now(), visible_till__gte=timezone.now())
-
-    activities = chain(regular_activities, education_activities, external_activities)\
-        if return_mixed else regular_activities
-    ordered_activities = sorted(activities, key=operator.attrgetter("begin"))
-
-    result = []
-    for activity in ordered_activities[0:amount]:
-        single = get_basic_result(activity)
-        result.append(single)
-    return result
+    return [get_indexed_basic_result(entry) for entry in entries]
 
 
 @api_server.register_procedure(name='getActivityDetailed', auth=auth_optional, context_target='ctx')
@@ -34,6 +34,21 @@ def get_basic_result(activity):
     return result
 
 
+# Returns basic event properties from an event index entry, equal to get_basic_result of the event
+def get_indexed_basic_result(entry):
+    return {
+        "id": entry.event_id,
+        "beginDate": entry.begin.isoformat(),
+        "endDate": entry.end.isoformat(),
+        "title": entry.summary,
+        "location": entry.location,
+        "category": entry.category,
+        "url": entry.url,
+        "isDutch": entry.dutch_activity,
+        "organizer": entry.organizer,
+    }
+
+
 # Add detailed properties to a result item
 def add_detailed_properties(activity, authentication: Authentication, result):
     authenticated = not isinstance(authentication, AnonymousAuthentication)
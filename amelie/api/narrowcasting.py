@@ -15,6 +15,7 @@ from amelie.api.decorators import auth_optional
 from amelie.api.utils import parse_datetime_parameter
 from amelie.companies.models import TelevisionBanner, CompanyEvent
 from amelie.education.models import EducationEvent
+from amelie.files.models import Attachment
 from amelie.news.models import NewsItem
 from amelie.narrowcasting.models import TelevisionPromotion
 from amelie.room_duty.models import RoomDuty
@@ -219,24 +220,24 @@ def get_activity_photos(days: int, photos_per_activity: int, ctx: RpcRequestCont
     """
     authentication = ctx.auth_result
     is_authenticated = authentication and not isinstance(authentication, AnonymousAuthentication)
-    result = []
 
-    activities = Activity.objects.filter_public(not is_authenticated)\
-        .filter(begin__gte=(timezone.now() - datetime.timedelta(days=days)))
+    activity_ids = list(Activity.objects.filter_public(not is_authenticated)
+                        .filter(begin__gte=(timezone.now() - datetime.timedelta(days=days)))
+                        .values_list('pk', flat=True))
 
-    for activity in activities:
-        candidates = []
+    # Ids of the public photos per activity, from a single query on the photos of all activities
+    candidates = {}
+    for activity_id, photo_id in Attachment.objects.filter(foto_set__in=activity_ids, public=True)\
+            .order_by().values_list('foto_set', 'pk'):
+        candidates.setdefault(activity_id, []).append(photo_id)
 
-        for photo in activity.photos.all():
-            if photo.public:
-                candidates.append(photo.file.url)
+    photo_ids = []
+    for activity_id in activity_ids:
+        ids = candidates.get(activity_id, [])
+        photo_ids += random.sample(ids, min(photos_per_activity, len(ids)))
 
-        if len(candidates) > photos_per_activity:
-            result += random.sample(candidates, photos_per_activity)
-        else:
-            result += candidates
-
-    return result
+    photos = Attachment.objects.in_bulk(photo_ids)
+    return [photos[photo_id].file.url for photo_id in photo_ids]
 
 
 @api_server.register_procedure(name='getHistoricActivitiesWithPictures', auth=auth_optional, context_target='ctx')
@@ -217,6 +217,22 @@ class GetActivityStreamTest(APITestCase):
         expected_result = [_activity_data(a) for a in Activity.objects.filter_public(True)]
         self.send_and_compare_request('getActivityStream', [start, end], 'qNPiKNn3McZIC6fWKE1X', expected_result)
 
+    def test_changed(self):
+        """
+        Test the getActivityStream() call after an event has been changed.
+        """
+        generate_activities(10)
+
+        activity = Activity.objects.filter_public(True)[0]
+        activity.summary_nl = 'Gewijzigd'
+        activity.cancelled = True
+        activity.save()
+
+        start = self.isodate_param(timezone.now())
+        end = self.isodate_param(timezone.now() + datetime.timedelta(days=31))
+        expected_result = [_activity_data(a) for a in Activity.objects.filter_public(True)]
+        self.send_and_compare_request('getActivityStream', [start, end], None, expected_result)
+
 
 class GetUpcomingActivitiesTest(APITestCase):
 
@@ -5,7 +5,9 @@ from amelie.calendar.models import Event
 from django.utils.translation import gettext_lazy as _
 
 from amelie.files.graphql import AttachmentType
+from amelie.files.models import Attachment
 from amelie.graphql.decorators import check_authorization
+from amelie.graphql.loaders import load_related
 
 # Specified separately from EventType.Meta to be able to use it in the Meta class of subclasses.
 EVENT_TYPE_BASE_FIELDS = [
@@ -71,7 +73,10 @@ class EventType(DjangoObjectType):
 
     def resolve_attachments(self: Event, info):
         # `info.context` is the Django Request object in Graphene
-        return self.attachments.filter_public(info.context)
+        return load_related(info, self, 'attachments', queryset=Attachment.objects.filter_public(info.context))
+
+    def resolve_organizer(self: Event, info):
+        return load_related(info, self, 'organizer')
 
     def resolve_summary(self: Event, info):
         return self.summary
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from amelie.calendar.models import Event, EventIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the event index that is used by the activity stream of the API from all events. " \
+           "The index is kept up to date automatically, so this is only needed after bulk changes to events, " \
+           "and after deploying the migration that adds the index."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--if-empty', action='store_true',
+                            help="Only rebuild the index if it is still empty while there are events, "
+                                 "as is the case right after the migration that adds it")
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and (EventIndex.objects.exists() or not Event.objects.exists()):
+            self.stdout.write("Event index is already filled, nothing to do.")
+            return
+
+        EventIndex.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS("Event index rebuilt, {} entries.".format(EventIndex.objects.count())))
@@ -1,7 +1,77 @@
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 
 from amelie.tools.managers import PublicManagerMixin
 
 
 class EventManager(models.Manager, PublicManagerMixin):
     pass
+
+
+class EventIndexManager(models.Manager):
+    def update_event(self, event):
+        """
+        Create or update the index entry of an event.
+
+        :type event: amelie.calendar.models.Event
+        """
+        if not hasattr(event, 'activity_type'):
+            event = event.as_leaf_class()
+            if not hasattr(event, 'activity_type'):
+                # Unknown event type, which is logged by as_leaf_class
+                return
+
+        if event.activity_type == "educational":
+            organizer_nl = organizer_en = event.education_organizer
+        elif event.activity_type == "external":
+            if event.company:
+                organizer_nl, organizer_en = event.company.name_nl, event.company.name_en or event.company.name_nl
+            else:
+                organizer_nl = organizer_en = event.company_text
+        else:
+            organizer_nl = organizer_en = event.organizer.name
+
+        self.update_or_create(event_id=event.pk, defaults={
+            'begin': event.begin,
+            'end': event.end,
+            'category': event.activity_type,
+            'public': event.public,
+            'cancelled': event.cancelled,
+            'dutch_activity': event.dutch_activity,
+            'summary_nl': event.summary_nl,
+            'summary_en': event.summary_en or '',
+            'organizer_nl': organizer_nl,
+            'organizer_en': organizer_en,
+            'location': event.location,
+            'url': event.get_absolute_url(),
+            'visible_from': getattr(event, 'visible_from', None),
+            'visible_till': getattr(event, 'visible_till', None),
+        })
+
+    def rebuild(self):
+        """
+        Rebuild the index entries of all events.
+        """
+        from amelie.calendar.models import Event
+
+        events = Event.objects.select_related('activity__organizer', 'educationevent', 'companyevent__company')
+        for event in events.iterator():
+            self.update_event(event)
+
+    def stream(self, only_public, mixed=True):
+        """
+        Entries of the events that are visible in the activity stream, ordered by begin.
+
+        :param only_public: Only return public events.
+        :param mixed: Also return educational and external events, instead of only regular activities.
+        """
+        now = timezone.now()
+        entries = self.filter(Q(visible_from__isnull=True) | Q(visible_from__lte=now, visible_till__gte=now))
+
+        if only_public:
+            entries = entries.filter(public=True)
+        if not mixed:
+            entries = entries.filter(category="regular")
+
+        return entries.order_by('begin', 'event_id')
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.12 on 2026-10-17 15:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('activities', '0013_activity_enrollment_private'),
+        ('calendar', '0008_alter_event_participants'),
+        ('companies', '0006_vivatbanner'),
+        ('education', '0006_add_default_education_label'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventIndex',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='index_entry', serialize=False, to='calendar.event')),
+                ('begin', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('category', models.CharField(max_length=20)),
+                ('public', models.BooleanField()),
+                ('cancelled', models.BooleanField()),
+                ('dutch_activity', models.BooleanField()),
+                ('summary_nl', models.CharField(max_length=250)),
+                ('summary_en', models.CharField(blank=True, max_length=250)),
+                ('organizer_nl', models.CharField(blank=True, max_length=100)),
+                ('organizer_en', models.CharField(blank=True, max_length=100)),
+                ('location', models.CharField(blank=True, max_length=200)),
+                ('url', models.CharField(max_length=255)),
+                ('visible_from', models.DateTimeField(null=True)),
+                ('visible_till', models.DateTimeField(null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['begin'], name='calendar_eventindex_begin_idx'), models.Index(fields=['category', 'begin'], name='calendar_eventindex_cat_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.12 on 2026-10-17 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calendar', '0009_eventindex'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['begin', 'id'], name='calendar_event_begin_idx'),
+        ),
+    ]
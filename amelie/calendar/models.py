@@ -14,7 +14,7 @@ from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _l
 
 from amelie.files.models import Attachment
-from amelie.calendar.managers import EventManager
+from amelie.calendar.managers import EventManager, EventIndexManager
 from amelie.calendar.tasks import send_participation_callback
 from amelie.members.models import Committee, Person
 from amelie.personal_tab.models import ActivityTransaction
@@ -130,6 +130,9 @@ class Event(models.Model):
 
     class Meta:
         ordering = ['begin']
+        indexes = [
+            models.Index(fields=['begin', 'id'], name='calendar_event_begin_idx'),
+        ]
         verbose_name = _l('Activities')
         verbose_name_plural = _l('Activities')
 
@@ -198,6 +201,7 @@ class Event(models.Model):
     def save(self, *args, **kwargs):
         self.update_count += 1
         super(Event, self).save(*args, **kwargs)
+        EventIndex.objects.update_event(self)
 
     def description_short(self):
         tz = pytz.timezone(settings.TIME_ZONE)
@@ -211,6 +215,65 @@ class Event(models.Model):
             total_string = total_string[:char_limit] + '...'
         return total_string
 
+
+class EventIndex(models.Model):
+    """
+    Denormalized, time-ordered index of all events, used for the activity stream of the API.
+
+    Entries are updated when an event is saved, and contain everything that is needed for the basic result of an
+    event, so the stream does not have to query and merge the separate event types.
+    """
+    event = models.OneToOneField(Event, primary_key=True, related_name='index_entry', on_delete=models.CASCADE)
+    begin = models.DateTimeField()
+    end = models.DateTimeField()
+    category = models.CharField(max_length=20)
+    public = models.BooleanField()
+    cancelled = models.BooleanField()
+    dutch_activity = models.BooleanField()
+
+    summary_nl = models.CharField(max_length=250)
+    summary_en = models.CharField(max_length=250, blank=True)
+    organizer_nl = models.CharField(max_length=100, blank=True)
+    organizer_en = models.CharField(max_length=100, blank=True)
+    location = models.CharField(max_length=200, blank=True)
+    url = models.CharField(max_length=255)
+
+    # Only for external events
+    visible_from = models.DateTimeField(null=True)
+    visible_till = models.DateTimeField(null=True)
+
+    objects = EventIndexManager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['begin'], name='calendar_eventindex_begin_idx'),
+            models.Index(fields=['category', 'begin'], name='calendar_eventindex_cat_idx'),
+        ]
+
+    def __str__(self):
+        return str(self.summary)
+
+    @property
+    def summary(self):
+        summ = self.summary_en if get_language() == "en" and self.summary_en else self.summary_nl
+
+        if self.cancelled:
+            summ = f"[CANCELLED] {summ}"
+        return summ
+
+    @property
+    def organizer(self):
+        return self.organizer_en if get_language() == "en" else self.organizer_nl
+
+
+@receiver(post_save, sender=Committee)
+def update_event_index_organizer(sender, instance, raw=False, **kwargs):
+    if not raw:
+        EventIndex.objects.filter(category="regular", event__organizer=instance).update(
+            organizer_nl=instance.name, organizer_en=instance.name
+        )
+
+
 def _has_next(iterable):
     try:
         first = next(iterable)
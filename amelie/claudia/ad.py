@@ -4,6 +4,7 @@ import logging
 
 import ldap
 import ldap.dn
+from ldap.controls import SimplePagedResultsControl
 
 from amelie.claudia.tools import encode_guid
 
@@ -19,6 +20,54 @@ logger = logging.getLogger(__name__)
 UF_NORMAL_ACCOUNT = 0x200
 UF_ACCOUNTDISABLE = 0x002
 
+# Number of objects per page when taking a snapshot of the directory
+SNAPSHOT_PAGE_SIZE = 500
+
+# A snapshot is taken again if it is older than this, even if it is for the same verification cycle
+SNAPSHOT_MAX_AGE = datetime.timedelta(hours=2)
+
+
+class ADSnapshot(object):
+    """
+    AD objects fetched with paged searches and indexed by DN, GUID, account name and name. It holds all groups, and
+    the users and groups that are being verified.
+
+    Changes that are made through the AD object remove the changed objects from the snapshot, so they are looked up
+    in the live directory again. Changes made by others are not seen until the next snapshot.
+    """
+
+    def __init__(self, key, results):
+        self.key = key
+        self.created = datetime.datetime.now(timezone.utc)
+        self.by_dn = {}
+        self.by_guid = {}
+        self.by_account_name = {}
+        self.by_name = {}
+        self.add(results)
+
+    def add(self, results):
+        """Add the results of a search, a list of tuples (DN, attributes)."""
+        for dn, attrs in results:
+            self.by_dn[dn.lower()] = (dn, attrs)
+            for index, attr in [(self.by_guid, 'objectGUID'), (self.by_account_name, 'sAMAccountName'),
+                                (self.by_name, 'name')]:
+                values = attrs.get(attr)
+                if values:
+                    key = values[0] if attr == 'objectGUID' else values[0].decode().lower()
+                    index.setdefault(key, dn.lower())
+
+    def is_expired(self):
+        return datetime.datetime.now(timezone.utc) - self.created > SNAPSHOT_MAX_AGE
+
+    def get(self, index, key):
+        """Give the (DN, attributes) of the object with the given key in an index, or (None, None)."""
+        dn = index.get(key)
+        return self.by_dn.get(dn, (None, None))
+
+    def forget(self, dn):
+        """Remove an object from the snapshot, because it changed."""
+        self.by_dn.pop(dn.lower(), None)
+
 
 class AD(object):
     def __init__(self, proto, host, username, password, base_dn, port, ca_cert_path):
@@ -33,6 +82,8 @@ class AD(object):
         self.ca_cert_path = ca_cert_path
         # Use any dc components from the base_dn to build the realm
         self.ldap = None
+        self.snapshot = None
+        self.use_snapshot = False
         self.connect()
 
     # =============== Connection functions ===============
@@ -61,6 +112,71 @@ class AD(object):
             logger.error('Could not connect to Active Directory. {}'.format(e))
             raise e
 
+    # =============== Snapshot functions ===============
+
+    def start_snapshot(self, key, guids=()):
+        """
+        Answer lookups from a snapshot of all groups and the objects with the given GUIDs, instead of searching the AD
+        for every object. The groups are kept for the same key, like a verification cycle, until they are too old.
+
+        :param key: Identifier of the verification cycle.
+        :param guids: Binary GUIDs of the objects that are about to be verified.
+        """
+        if self.snapshot is None or self.snapshot.key != key or self.snapshot.is_expired():
+            self.snapshot = None
+            self.snapshot = ADSnapshot(key, self._paged_search(self.baseDN, "(objectClass=group)"))
+            logger.debug('Took snapshot of {} Active Directory groups'.format(len(self.snapshot.by_dn)))
+
+        missing = [guid for guid in guids if self.snapshot.get(self.snapshot.by_guid, guid)[0] is None]
+        if missing:
+            search_filter = "(|%s)" % ''.join("(objectGUID=%s)" % encode_guid(guid) for guid in missing)
+            self.snapshot.add(self._paged_search(self.baseDN, search_filter))
+        self.use_snapshot = True
+
+    def stop_snapshot(self):
+        """
+        Look up objects in the AD again. The snapshot is kept up to date with our own changes, to be used again later.
+        """
+        self.use_snapshot = False
+
+    def _snapshot(self):
+        return self.snapshot if self.use_snapshot else None
+
+    def _forget(self, *dns):
+        """Remove changed objects from the snapshot"""
+        if self.snapshot is not None:
+            for dn in dns:
+                self.snapshot.forget(dn.decode() if isinstance(dn, bytes) else dn)
+
+    def _drop_snapshot(self):
+        """Drop the snapshot, because an object was moved, renamed or deleted and others may still refer to it."""
+        self.snapshot = None
+        self.use_snapshot = False
+
+    def _paged_search(self, base, search_filter):
+        """
+        Search the AD with as many requests as there are pages of results.
+
+        Returns a list of tuples (DN, attributes)
+        """
+        page_control = SimplePagedResultsControl(True, size=SNAPSHOT_PAGE_SIZE, cookie='')
+        results = []
+        try:
+            while True:
+                msgid = self.ldap.search_ext(base, ldap.SCOPE_SUBTREE, search_filter, None, serverctrls=[page_control])
+                rtype, rdata, rmsgid, serverctrls = self.ldap.result3(msgid)
+                # Skip search references, they have no DN
+                results.extend((dn, attrs) for dn, attrs in rdata if dn)
+
+                controls = [control for control in serverctrls
+                            if control.controlType == SimplePagedResultsControl.controlType]
+                if not controls or not controls[0].cookie:
+                    return results
+                page_control.cookie = controls[0].cookie
+        except ldap.SERVER_DOWN:
+            self.connect()
+            return self._paged_search(base, search_filter)
+
     # ================= Search functions =====================
 
     #
@@ -90,6 +206,12 @@ class AD(object):
         Returns a tuple (DN, attributes) or raises ValueError if not found
         """
 
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            dn, attrs = snapshot.get(snapshot.by_guid, guid)
+            if dn is not None and (not ou or dn.lower().endswith(('ou=%s,%s' % (ou, self.baseDN)).lower())):
+                return dn, attrs
+
         search_scope = ldap.SCOPE_SUBTREE
         search_filter = "(objectGUID=%s)" % encode_guid(guid)
         retrieve_attributes = None
@@ -153,6 +275,12 @@ class AD(object):
         Search an account with an accountname. Returns an ADAccount
         """
 
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            dn, attrs = snapshot.get(snapshot.by_account_name, username.lower())
+            if dn is not None and dn.lower().endswith(("ou=Gebruikers,%s" % self.baseDN).lower()):
+                return ADAccount(self, dn, attrs=attrs)
+
         search_scope = ldap.SCOPE_SUBTREE
         search_filter = str("(sAMAccountName=%s)" % username)
         retrieve_attributes = None
@@ -174,6 +302,12 @@ class AD(object):
         Search a group with an accountname. Returns an ADGroup
         """
 
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            dn, attrs = snapshot.get(snapshot.by_name, group.lower())
+            if dn is not None:
+                return ADGroup(self, dn, attrs=attrs)
+
         search_scope = ldap.SCOPE_SUBTREE
         search_filter = "(name=%s)" % group
         retrieve_attributes = None
@@ -280,6 +414,12 @@ class AD(object):
         """
         Get the set of attributes of the DN
         """
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            found_dn, attrs = snapshot.by_dn.get(dn.lower(), (None, None))
+            if found_dn is not None:
+                return attrs
+
         search_scope = ldap.SCOPE_SUBTREE
         search_filter = "(objectClass=*)"
         retrieve_attributes = None
@@ -299,6 +439,7 @@ class AD(object):
         if isinstance(val, str):
             val = val.encode()
 
+        self._forget(dn)
         try:
             self.ldap.modify_s(dn, [(ldap.MOD_REPLACE, attr, val)])
         except ldap.SERVER_DOWN:
@@ -319,6 +460,9 @@ class AD(object):
                 if isinstance(x, str):
                     val[i] = x.encode()
 
+        # Group memberships are also stored in the memberOf attribute of the members
+        members = (val if isinstance(val, list) else [val]) if attr == 'member' else []
+        self._forget(dn, *members)
         try:
             self.ldap.modify_s(dn, [(ldap.MOD_ADD, attr, val)])
         except ldap.SERVER_DOWN:
@@ -339,6 +483,9 @@ class AD(object):
                 if isinstance(x, str):
                     val[i] = x.encode()
 
+        # Group memberships are also stored in the memberOf attribute of the members
+        members = (val if isinstance(val, list) else [val]) if attr == 'member' else []
+        self._forget(dn, *members)
         try:
             self.ldap.modify_s(dn, [(ldap.MOD_DELETE, attr, val)])
         except ldap.SERVER_DOWN:
@@ -369,6 +516,7 @@ class ADObject(object):
         Delete this object. WARNING: After this, the account reference is broken.
         """
 
+        self.ad._drop_snapshot()
         try:
             self.ad.ldap.delete_s(self.dn)
         except ldap.SERVER_DOWN:
@@ -383,6 +531,7 @@ class ADObject(object):
         Move this object to a different OU
         """
         newdn = ("OU=%s," % new_name) + ','.join(ldap.explode_dn(new_adparent.dn)[1:])
+        self.ad._drop_snapshot()
         try:
             self.ad.ldap.rename_s(self.dn, "CN=%s" % (self.name()), newsuperior=newdn)
         except ldap.SERVER_DOWN:
@@ -398,6 +547,7 @@ class ADObject(object):
         Rename this object
         """
         newcn = "CN=%s" % newname
+        self.ad._drop_snapshot()
         try:
             self.ad.ldap.rename_s(self.dn, newcn)
         except ldap.SERVER_DOWN:
@@ -102,6 +102,9 @@ class Claudia:
     notify_mapping_changed = wrap_call_plugins("mapping_changed")
     notify_mapping_deleted = wrap_call_plugins("mapping_deleted")
 
+    notify_snapshot_started = wrap_call_plugins("snapshot_started")
+    notify_snapshot_stopped = wrap_call_plugins("snapshot_stopped")
+
     notify_verify_mapping = wrap_call_plugins("verify_mapping")
     notify_verify_finished = wrap_call_plugins("verify_finished")
 
@@ -128,14 +131,35 @@ class Claudia:
     notify_matrix_created = wrap_call_plugins("matrix_created")
     notify_matrix_changed = wrap_call_plugins("matrix_changed")
 
+    def backend_changed_mappings(self, state):
+        """
+        Ask all plugins which mappings differ from their desired state in the systems that they manage.
+        :param state: The desired state of all mappings.
+        :type state: amelie.claudia.reconcile.DesiredState
+        :return: Set of mapping ids.
+        """
+        changed = set()
+        for plugin in self.plugins:
+            if not hasattr(plugin, 'changed_mappings'):
+                continue
+            try:
+                changed |= set(plugin.changed_mappings(self, state))
+            except Exception as e:
+                logger.exception("Plugin %s hook changed_mappings raised exception: %s" % (plugin.__class__.__name__,
+                                                                                             str(e)))
+                if settings.CLAUDIA_STOP_ON_ERROR:
+                    raise
+        return changed
+
     # ===== Integrity check ======
     @staticmethod
-    def check_integrity():
+    def check_integrity(full=False):
         """
-        Enqueues a complete integrity check of all aliases, mappings and other Mappables.
+        Enqueues an integrity check of all aliases, mappings and other Mappables.
+        :param full: Verify all mappings, instead of only the ones that changed since they were last verified.
         """
         logger.info("Scheduling check_integrity task")
-        check_integrity_task.delay()
+        check_integrity_task.delay(full=full)
         logger.info("All objects are now being scheduled for verification.")
         logger.info("This is all being processed by Celery, so it may take a while to start and process.")
 
@@ -1,4 +1,8 @@
+import datetime
 import logging
+import random
+import threading
+import time
 import uuid
 
 import googleapiclient
@@ -7,9 +11,212 @@ from google.oauth2 import service_account
 
 from amelie.claudia.models import Mapping, DrivePermission
 from django.conf import settings
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of requests in one batch HTTP request (Google allows at most 1000)
+BATCH_SIZE = 100
+
+# Number of times a request that hit a quota is retried, with exponential backoff
+MAX_RETRIES = 6
+
+# Reasons of 403 errors that mean that a quota was hit
+QUOTA_REASONS = [b'rateLimitExceeded', b'userRateLimitExceeded', b'quotaExceeded']
+
+# The group memberships of a verification cycle are read again if they are older than this
+MEMBERSHIPS_MAX_AGE = datetime.timedelta(hours=2)
+
+# API services per thread, building them reads the discovery document and the credentials every time
+_services = threading.local()
+
+
+def is_quota_error(e):
+    """Did a request fail because a quota was hit, so that it should be retried later?"""
+    if not isinstance(e, googleapiclient.errors.HttpError):
+        return False
+    return e.resp.status == 429 or (e.resp.status == 403 and any(reason in (e.content or b'')
+                                                                  for reason in QUOTA_REASONS))
+
+
+def is_invalid_member_key(e):
+    """
+    Did a request fail because a contact could not be found by its GSuite ID? That happens when its e-mail address is
+    also a GSuite group, possibly in another domain, which can only be managed by e-mail address.
+    """
+    return e.resp.status == 400 and "Invalid Input: memberKey".lower() in str(e).lower()
+
+
+def backoff_delay(attempt):
+    """Exponential backoff with random jitter, as recommended by Google"""
+    return min(2 ** attempt + random.random(), 64)
+
+
+class GoogleBatch:
+    """
+    Collects requests to one Google API and sends them in batch HTTP requests of at most BATCH_SIZE requests.
+
+    Requests that fail because a quota was hit are sent again in a new batch with exponential backoff. Callbacks are
+    called with the response and exception of each request when the batch is executed.
+    """
+
+    def __init__(self, service, sleep=time.sleep):
+        self.service = service
+        self.sleep = sleep
+        self.pending = []
+        self.keys = set()
+
+    def add(self, request, callback=None, key=None):
+        """
+        Add a request to the batch.
+        :param request: The HttpRequest to execute.
+        :param callback: Function that is called with the response and the exception (or None) of the request.
+        :param key: Key of the object that the request changes. Google does not execute the requests of a batch in
+                    order, so a request for a key that is already in the batch is sent in the next batch.
+        """
+        if key is not None and key in self.keys:
+            self.execute()
+        self.pending.append((request, callback))
+        if key is not None:
+            self.keys.add(key)
+        if len(self.pending) >= BATCH_SIZE:
+            self.execute()
+
+    def execute(self):
+        """Send all requests in the batch."""
+        pending, self.pending, self.keys = self.pending, [], set()
+        attempt = 0
+        while pending:
+            responses = {}
+
+            def _collect(request_id, response, exception):
+                responses[request_id] = (response, exception)
+
+            batch = self.service.new_batch_http_request(callback=_collect)
+            for i, (request, callback) in enumerate(pending):
+                batch.add(request, request_id=str(i))
+
+            try:
+                batch.execute()
+            except googleapiclient.errors.HttpError as e:
+                if attempt < MAX_RETRIES and (is_quota_error(e) or e.resp.status >= 500):
+                    self.sleep(backoff_delay(attempt))
+                    attempt += 1
+                    continue
+                responses = {str(i): (None, e) for i in range(len(pending))}
+
+            retry = []
+            for i, (request, callback) in enumerate(pending):
+                response, exception = responses.get(str(i), (None, None))
+                if exception is not None and attempt < MAX_RETRIES and is_quota_error(exception):
+                    retry.append((request, callback))
+                elif callback is not None:
+                    callback(response, exception)
+                elif exception is not None:
+                    logger.warning("Batched request {} {} failed - Message: {}".format(request.method, request.uri,
+                                                                                      exception))
+
+            if retry:
+                logger.debug("{} batched requests hit a quota, retrying".format(len(retry)))
+                self.sleep(backoff_delay(attempt))
+            attempt += 1
+            pending = retry
+
+
+class GroupMemberships:
+    """
+    The members of all groups in Google, read with a paged list of the groups and a batch of member lists, and indexed
+    by the ID and e-mail address of the members.
+
+    Changes that are made through the GoogleSuiteAPI object are applied to the index. Changes made by others are not
+    seen until the memberships are read again.
+    """
+
+    def __init__(self, key, groups, members):
+        self.key = key
+        self.created = timezone.now()
+        self.groups = {group['id']: group for group in groups}
+        self.members = members
+        self.by_member = {}
+        for group_id, group_members in members.items():
+            for member in group_members:
+                self._index(member, self.groups[group_id])
+
+    @staticmethod
+    def _keys(member):
+        return [key.lower() for key in [member.get('id'), member.get('email')] if key]
+
+    def _index(self, member, group):
+        for key in self._keys(member):
+            self.by_member.setdefault(key, {})[group['id']] = group
+
+    @classmethod
+    def load(cls, google, key):
+        """
+        Read the members of all groups. Returns None if the members of a group could not be read.
+        """
+        groups = []
+        request = google.api.groups().list(customer='my_customer', maxResults=200)
+        while request is not None:
+            response = request.execute(num_retries=MAX_RETRIES)
+            groups.extend(response.get('groups', []))
+            request = google.api.groups().list_next(previous_request=request, previous_response=response)
+
+        members = {group['id']: [] for group in groups}
+        failed = []
+
+        def _reader(group_id, list_request):
+            def _read(response, exception):
+                if exception is not None:
+                    logger.warning("Could not get group members for group {} - Message: {}".format(group_id, exception))
+                    failed.append(group_id)
+                    return
+                # Read the next pages of large groups one by one
+                while response is not None:
+                    members[group_id].extend(response.get('members', []))
+                    next_request = google.api.members().list_next(previous_request=list_request,
+                                                                  previous_response=response)
+                    response = next_request.execute(num_retries=MAX_RETRIES) if next_request is not None else None
+            return _read
+
+        batch = GoogleBatch(google.api)
+        for group in groups:
+            list_request = google.api.members().list(groupKey=group['id'], maxResults=200)
+            batch.add(list_request, callback=_reader(group['id'], list_request))
+        batch.execute()
+
+        if failed:
+            return None
+        logger.debug("Read the members of {} GSuite groups".format(len(groups)))
+        return cls(key, groups, members)
+
+    def is_expired(self):
+        return timezone.now() - self.created > MEMBERSHIPS_MAX_AGE
+
+    def groups_of(self, key):
+        """Give the groups of the member with the given ID or e-mail address."""
+        return list(self.by_member.get(key.lower(), {}).values())
+
+    def members_of(self, group_id):
+        """Give the members of a group, or None if the group is unknown."""
+        return self.members.get(group_id)
+
+    def added(self, member, group):
+        """Add a new member (as returned by Google) to a group."""
+        self.groups.setdefault(group['id'], group)
+        self.members.setdefault(group['id'], []).append(member)
+        self._index(member, self.groups[group['id']])
+
+    def removed(self, member_key, group_id):
+        """Remove the member with the given ID or e-mail address from a group."""
+        member_key = member_key.lower()
+        group_members = self.members.get(group_id, [])
+        for member in [m for m in group_members if member_key in self._keys(m)]:
+            group_members.remove(member)
+            for key in self._keys(member):
+                self.by_member.get(key, {}).pop(group_id, None)
+        self.by_member.get(member_key, {}).pop(group_id, None)
+
 
 class GoogleSuiteAPI:
     def __init__(self):
@@ -19,15 +226,71 @@ class GoogleSuiteAPI:
             api_version="directory_v1",
             scopes=settings.CLAUDIA_GSUITE['SCOPES']['DOMAIN_API']
         )
+        # Batches per API while batching
+        self.batches = None
+        # Group memberships of all groups, read once per verification cycle
+        self.memberships = None
 
     @staticmethod
     def create_directory_service(user_email, api_name, api_version, scopes):
-        credentials = service_account.Credentials.from_service_account_file(
-            settings.CLAUDIA_GSUITE['SERVICE_ACCOUNT_JSON_FILE'],
-            scopes=scopes
+        key = (user_email, api_name, api_version, tuple(scopes))
+        if not hasattr(_services, 'cache'):
+            _services.cache = {}
+        if key not in _services.cache:
+            credentials = service_account.Credentials.from_service_account_file(
+                settings.CLAUDIA_GSUITE['SERVICE_ACCOUNT_JSON_FILE'],
+                scopes=scopes
+            )
+            delegated_credentials = credentials.with_subject(user_email)
+            _services.cache[key] = build(api_name, api_version, credentials=delegated_credentials)
+        return _services.cache[key]
+
+    def _drive_api(self):
+        return GoogleSuiteAPI.create_directory_service(
+            user_email=settings.CLAUDIA_GSUITE['DOMAIN_ADMIN_ACCOUNT_EMAIL'],
+            api_name="drive",
+            api_version="v3",
+            scopes=settings.CLAUDIA_GSUITE['SCOPES']['DRIVE_API']
         )
-        delegated_credentials = credentials.with_subject(user_email)
-        return build(api_name, api_version, credentials=delegated_credentials)
+
+    # ======= Batching =======
+
+    def start_batching(self, key):
+        """
+        Send group membership, alias and drive permission changes in batches until stop_batching is called, and read
+        the group memberships of all groups at once. The memberships are read again for a new key, like a new
+        verification cycle, or when they are too old.
+        """
+        if self.memberships is None or self.memberships.key != key or self.memberships.is_expired():
+            self.memberships = None
+            self.memberships = GroupMemberships.load(self, key)
+        self.batches = {}
+
+    def stop_batching(self):
+        """Send the remaining batched changes and make changes one by one again."""
+        batches, self.batches = self.batches or {}, None
+        for batch in batches.values():
+            batch.execute()
+
+    def _submit(self, service, request, callback, key=None):
+        """
+        Execute a request, or add it to the batch of its API when batching.
+        :param callback: Function that is called with the response and the exception (or None) of the request.
+        :return: The response if the request was executed right away and succeeded, else None.
+        """
+        if self.batches is not None:
+            if id(service) not in self.batches:
+                self.batches[id(service)] = GoogleBatch(service)
+            self.batches[id(service)].add(request, callback=callback, key=key)
+            return None
+
+        try:
+            response = request.execute(num_retries=MAX_RETRIES)
+        except googleapiclient.errors.HttpError as e:
+            callback(None, e)
+            return None
+        callback(response, None)
+        return response
 
     # noinspection PyMethodMayBeStatic
     def create_password(self):
@@ -130,43 +393,31 @@ class GoogleSuiteAPI:
         except googleapiclient.errors.HttpError as e:
             logger.warning("Could not update name for {} - Message: {}".format(mp, e))
 
-    def update_personal_aliases(self, mp, to_add_aliases, to_remove_aliases):
-        aliases = self.api.users().aliases()
-
+    def _update_aliases(self, aliases, key_name, mp, to_add_aliases, to_remove_aliases, kind):
         for to_remove in to_remove_aliases:
-            try:
-                aliases.delete(userKey=mp.gsuite_id, alias=to_remove).execute()
-            except googleapiclient.errors.HttpError as e:
-                logger.warning("Could not remove personal alias {} for {} - Message: {}".format(to_remove, mp, e))
+            def _removed(response, e, to_remove=to_remove):
+                if e is not None:
+                    logger.warning("Could not remove {} alias {} for {} - Message: {}".format(kind, to_remove, mp, e))
+            self._submit(self.api, aliases.delete(**{key_name: mp.gsuite_id, 'alias': to_remove}), _removed,
+                         key=('alias', to_remove))
         for to_add in to_add_aliases:
-            try:
-                # Template from:
-                # https://developers.google.com/resources/api-libraries/documentation/admin/directory_v1/python/latest/admin_directory_v1.users.aliases.html#insert
-                aliases.insert(userKey=mp.gsuite_id, body={
-                    "alias": to_add,  # A alias email
-                    "kind": "admin#directory#alias",  # Kind of resource this is.
-                }).execute()
-            except googleapiclient.errors.HttpError as e:
-                logger.warning("Could not add personal alias {} for {} - Message: {}".format(to_add, mp, e))
+            def _added(response, e, to_add=to_add):
+                if e is not None:
+                    logger.warning("Could not add {} alias {} for {} - Message: {}".format(kind, to_add, mp, e))
+            # Template from:
+            # https://developers.google.com/resources/api-libraries/documentation/admin/directory_v1/python/latest/admin_directory_v1.users.aliases.html#insert
+            self._submit(self.api, aliases.insert(**{key_name: mp.gsuite_id, 'body': {
+                "alias": to_add,  # A alias email
+                "kind": "admin#directory#alias",  # Kind of resource this is.
+            }}), _added, key=('alias', to_add))
 
-    def update_group_aliases(self, mp, to_add_aliases, to_remove_aliases):
-        aliases = self.api.groups().aliases()
+    def update_personal_aliases(self, mp, to_add_aliases, to_remove_aliases):
+        self._update_aliases(self.api.users().aliases(), 'userKey', mp, to_add_aliases, to_remove_aliases,
+                             kind="personal")
 
-        for to_remove in to_remove_aliases:
-            try:
-                aliases.delete(groupKey=mp.gsuite_id, alias=to_remove).execute()
-            except googleapiclient.errors.HttpError as e:
-                logger.warning("Could not remove group alias {} for {} - Message: {}".format(to_remove, mp, e))
-        for to_add in to_add_aliases:
-            try:
-                # Template from:
-                # https://developers.google.com/resources/api-libraries/documentation/admin/directory_v1/python/latest/admin_directory_v1.users.aliases.html#insert
-                aliases.insert(groupKey=mp.gsuite_id, body={
-                    "alias": to_add,  # A alias email
-                    "kind": "admin#directory#alias",  # Kind of resource this is.
-                }).execute()
-            except googleapiclient.errors.HttpError as e:
-                logger.warning("Could not add group alias {} for {} - Message: {}".format(to_add, mp, e))
+    def update_group_aliases(self, mp, to_add_aliases, to_remove_aliases):
+        self._update_aliases(self.api.groups().aliases(), 'groupKey', mp, to_add_aliases, to_remove_aliases,
+                             kind="group")
 
     def get_group(self, mp: Mapping):
         if mp.gsuite_id:
@@ -231,7 +482,22 @@ class GoogleSuiteAPI:
         else:
             logger.debug("Not updating description for group {} - This mapping type has no description.".format(group))
 
+    def _flush_pending(self, service, prefix):
+        """
+        Send the batch of an API if it contains changes with a key that starts with the given prefix, so that they are
+        seen by the read that follows.
+        """
+        batch = (self.batches or {}).get(id(service))
+        if batch is not None and any(key[:len(prefix)] == prefix for key in batch.keys):
+            batch.execute()
+
     def get_group_members(self, group: Mapping):
+        if self.batches is not None and self.memberships is not None:
+            self._flush_pending(self.api, ('member',))
+            members_list = self.memberships.members_of(group.gsuite_id)
+            if members_list is not None:
+                return list(members_list)
+
         members = self.api.members()
 
         members_list = []
@@ -239,7 +505,7 @@ class GoogleSuiteAPI:
         try:
             # Get the initial members list
             members_request = members.list(groupKey=group.gsuite_id)
-            members_data = members_request.execute()
+            members_data = members_request.execute(num_retries=MAX_RETRIES)
             if 'members' in members_data:
                 members_list.extend(members_data['members'][:])
         except googleapiclient.errors.HttpError as e:
@@ -251,7 +517,7 @@ class GoogleSuiteAPI:
             try:
                 members_request = members.list_next(previous_request=members_request, previous_response=members_data)
                 if members_request:
-                    members_data = members_request.execute()
+                    members_data = members_request.execute(num_retries=MAX_RETRIES)
                 else:
                     members_data = None
             except googleapiclient.errors.HttpError as e:
@@ -262,15 +528,36 @@ class GoogleSuiteAPI:
 
         return members_list
 
+    def _cached_group_memberships(self, member: Mapping):
+        """Same as get_group_memberships, but from the group memberships that were read for this cycle."""
+        self._flush_pending(self.api, ('member', member.id))
+        if member.is_person() and member.gsuite_id:
+            return self.memberships.groups_of(member.gsuite_id)
+        elif member.is_contact() and member.gsuite_id:
+            # Contacts that are also a GSuite group are only known by their e-mail address, see below
+            groups = self.memberships.groups_of(member.gsuite_id)
+            if not groups and member.email:
+                groups = self.memberships.groups_of(member.email)
+            return groups
+        elif member.email:
+            return self.memberships.groups_of(member.email)
+        else:
+            logger.warning("I don't quite know what the group memberships of {} <mid: {}> are.".format(member,
+                                                                                                       member.id))
+            return []
+
     def get_group_memberships(self, member: Mapping):
+        if self.batches is not None and self.memberships is not None:
+            return self._cached_group_memberships(member)
+
         groups = self.api.groups()
         try:
             # People that are active and have their own GSuite account
             if member.is_person() and member.gsuite_id:
-                res = groups.list(userKey=member.gsuite_id).execute()
+                res = groups.list(userKey=member.gsuite_id).execute(num_retries=MAX_RETRIES)
             # People that are not active (and should be added by e-mail address)
             elif member.is_person() and member.email:
-                res = groups.list(userKey=member.email).execute()
+                res = groups.list(userKey=member.email).execute(num_retries=MAX_RETRIES)
             # Contacts that should be identified by their unique id or e-mail address
             elif member.is_contact() and member.gsuite_id:
                 # Contacts are really strange in groups. Because they are basically just an e-mail address which is
@@ -282,17 +569,17 @@ class GoogleSuiteAPI:
                 # the GSuite ID, and if 400's, we assume it's secretly a GSuite group and retrieve it with the e-mail.
                 # - albertskja, 2018-12-18
                 try:
-                    res = groups.list(userKey=member.gsuite_id).execute()
+                    res = groups.list(userKey=member.gsuite_id).execute(num_retries=MAX_RETRIES)
                 except googleapiclient.errors.HttpError as e:
-                    if e.resp.status == 400 and "Invalid Input: memberKey".lower() in str(e).lower():
+                    if is_invalid_member_key(e):
                         # This e-mail address is probably also a GSuite group in a different domain. Lookup by e-mail
-                        res = groups.list(userKey=member.email).execute()
+                        res = groups.list(userKey=member.email).execute(num_retries=MAX_RETRIES)
                     else:
                         raise e
 
             # Other things that only have an e-mail address
             elif member.email:
-                res = groups.list(userKey=member.email).execute()
+                res = groups.list(userKey=member.email).execute(num_retries=MAX_RETRIES)
 
             # Unknown stuff
             else:
@@ -309,80 +596,89 @@ class GoogleSuiteAPI:
                                                                                                    member.email, e))
             return []
 
-    def add_group_member(self, member: Mapping, group: Mapping):
-        members = self.api.members()
+    def add_group_member(self, member: Mapping, group: Mapping, callback=None):
+        """
+        Add a member to a group.
+        :param callback: Function that is called with the details of the new member when it was added.
+        :return: The details of the new member, or None if it failed or the request was batched.
+        """
+        # Template from:
+        # https://developers.google.com/resources/api-libraries/documentation/admin/directory_v1/python/latest/admin_directory_v1.members.html#insert
 
-        try:
-            # Template from:
-            # https://developers.google.com/resources/api-libraries/documentation/admin/directory_v1/python/latest/admin_directory_v1.members.html#insert
-
-            # Active people should be added by their GSuite ID
-            if member.is_person() and member.gsuite_id and member.needs_gsuite_account():
-                member_details = members.insert(groupKey=group.gsuite_id, body={
-                    "id": member.gsuite_id,
-                    "kind": "admin#directory#member",
-                    "role": "MEMBER",
-                }).execute()
-
-            # Inactive people who should be added by their e-mail address
-            elif member.is_person() and member.email and not member.needs_gsuite_account():
-                member_details = members.insert(groupKey=group.gsuite_id, body={
-                    "email": member.email,
-                    "kind": "admin#directory#member",
-                    "role": "MEMBER",
-                }).execute()
-
-            # Other things that are not people
-            elif not member.is_person():
-                member_details = members.insert(groupKey=group.gsuite_id, body={
-                    "email": member.email,
-                    "kind": "admin#directory#member",
-                    "role": "MEMBER",
-                }).execute()
-            else:
-                logger.warning("Could not add person {} to group {} <{}> - Person either needs a GSuite account "
-                               "but does not have one, or does not have an e-mail address.".format(member, group,
-                                                                                                   group.email))
-                return None
+        # Active people should be added by their GSuite ID
+        if member.is_person() and member.gsuite_id and member.needs_gsuite_account():
+            body = {"id": member.gsuite_id}
 
-            return member_details
-        except googleapiclient.errors.HttpError as e:
-            logger.warning("Could not add member {} <{}> to group {} <{}> (#{}) - Message: {}".format(
-                member, member.email, group.name, group.email, group.gsuite_id, e
-            ))
+        # Inactive people who should be added by their e-mail address
+        elif member.is_person() and member.email and not member.needs_gsuite_account():
+            body = {"email": member.email}
 
-    def remove_group_member(self, member: Mapping, group: dict):
-        try:
-            # Active people who have their own gsuite account
-            if member.is_person() and member.gsuite_id:
-                self.api.members().delete(groupKey=group['id'], memberKey=member.gsuite_id).execute()
-            # Inactive people who are in groups with their e-mail address
-            elif member.is_person() and member.email:
-                self.api.members().delete(groupKey=group['id'], memberKey=member.email).execute()
-
-            # Contacts
-            elif member.is_contact():
-                if member.gsuite_id:
-                    try:
-                        self.api.members().delete(groupKey=group['id'], memberKey=member.gsuite_id).execute()
-                    except googleapiclient.errors.HttpError as e:
-                        if e.resp.status == 400 and "Invalid Input: memberKey".lower() in str(e).lower():
-                            # This address is probably also a GSuite group in a different domain. Remove by e-mail
-                            self.api.members().delete(groupKey=group['id'], memberKey=member.email).execute()
-                        else:
-                            raise e
-                else:
-                    logging.warning("Could not delete contact {} from group {} <{}>, "
-                                    "because the contact did not have a GSuite ID. "
-                                    "Please check this manually.".format(member, group['name'], group['email']))
+        # Other things that are not people
+        elif not member.is_person():
+            body = {"email": member.email}
+        else:
+            logger.warning("Could not add person {} to group {} <{}> - Person either needs a GSuite account "
+                           "but does not have one, or does not have an e-mail address.".format(member, group,
+                                                                                               group.email))
+            return None
+
+        body.update({
+            "kind": "admin#directory#member",
+            "role": "MEMBER",
+        })
+
+        def _added(member_details, e):
+            if e is not None:
+                logger.warning("Could not add member {} <{}> to group {} <{}> (#{}) - Message: {}".format(
+                    member, member.email, group.name, group.email, group.gsuite_id, e
+                ))
+                return
+            if self.memberships is not None:
+                self.memberships.added(member_details, {'id': group.gsuite_id, 'name': group.name,
+                                                        'email': group.email})
+            if callback is not None:
+                callback(member_details)
+
+        return self._submit(self.api, self.api.members().insert(groupKey=group.gsuite_id, body=body), _added,
+                            key=('member', member.id, group.gsuite_id))
 
-            # Other stuff
+    def remove_group_member(self, member: Mapping, group: dict):
+        def _removed(member_key, fallback_key=None):
+            def _callback(response, e):
+                if e is not None and fallback_key is not None and is_invalid_member_key(e):
+                    # This address is probably also a GSuite group in a different domain. Remove by e-mail
+                    _delete(fallback_key)
+                elif e is not None:
+                    logger.warning("Could not delete member {} from group {} <{}> (#{}) - Message: {}".format(
+                        member, group['name'], group['email'], group['id'], e
+                    ))
+                elif self.memberships is not None:
+                    self.memberships.removed(member_key, group['id'])
+            return _callback
+
+        def _delete(member_key, fallback_key=None):
+            self._submit(self.api, self.api.members().delete(groupKey=group['id'], memberKey=member_key),
+                         _removed(member_key, fallback_key), key=('member', member.id, group['id']))
+
+        # Active people who have their own gsuite account
+        if member.is_person() and member.gsuite_id:
+            _delete(member.gsuite_id)
+        # Inactive people who are in groups with their e-mail address
+        elif member.is_person() and member.email:
+            _delete(member.email)
+
+        # Contacts
+        elif member.is_contact():
+            if member.gsuite_id:
+                _delete(member.gsuite_id, fallback_key=member.email)
             else:
-                self.api.members().delete(groupKey=group['id'], memberKey=member.email).execute()
-        except googleapiclient.errors.HttpError as e:
-            logger.warning("Could not delete member {} from group {} <{}> (#{}) - Message: {}".format(
-                member, group['name'], group['email'], group['id'], e
-            ))
+                logging.warning("Could not delete contact {} from group {} <{}>, "
+                                "because the contact did not have a GSuite ID. "
+                                "Please check this manually.".format(member, group['name'], group['email']))
+
+        # Other stuff
+        else:
+            _delete(member.email)
 
     def delete_user(self, mp: Mapping):
         try:
@@ -548,12 +844,7 @@ class GoogleSuiteAPI:
             ))
 
     def create_shared_drive(self, mp: Mapping):
-        drive_api = GoogleSuiteAPI.create_directory_service(
-            user_email=settings.CLAUDIA_GSUITE['DOMAIN_ADMIN_ACCOUNT_EMAIL'],
-            api_name="drive",
-            api_version="v3",
-            scopes=settings.CLAUDIA_GSUITE['SCOPES']['DRIVE_API']
-        )
+        drive_api = self._drive_api()
         request_id = str(uuid.uuid4())
         metadata = {"name": mp.get_drivename(),
                     "restrictions": {
@@ -564,47 +855,33 @@ class GoogleSuiteAPI:
                     },
                     "colorRgb": "1d428a"}
         try:
-            drive = drive_api.drives().create(body=metadata, requestId=request_id).execute()
+            drive = drive_api.drives().create(body=metadata, requestId=request_id).execute(num_retries=MAX_RETRIES)
             mp.set_gsuite_id(drive['id'])
             return drive
         except googleapiclient.errors.HttpError as e:
             logger.warning("Could not create shared drive for {} ({}). Message: {}".format(mp.get_drivename(), mp, e))
 
     def update_shared_drive(self, mp: Mapping):
-        drive_api = GoogleSuiteAPI.create_directory_service(
-            user_email=settings.CLAUDIA_GSUITE['DOMAIN_ADMIN_ACCOUNT_EMAIL'],
-            api_name="drive",
-            api_version="v3",
-            scopes=settings.CLAUDIA_GSUITE['SCOPES']['DRIVE_API']
-        )
+        drive_api = self._drive_api()
         metadata = {"name": mp.get_drivename()}
         try:
-            drive = drive_api.drives().update(driveId=mp.get_gsuite_id(), body=metadata).execute()
+            drive = drive_api.drives().update(driveId=mp.get_gsuite_id(),
+                                              body=metadata).execute(num_retries=MAX_RETRIES)
             mp.set_gsuite_id(drive['id'])
         except googleapiclient.errors.HttpError as e:
             logger.warning("Could not update shared drive for {} ({}). Message: {}".format(mp.get_drivename(), mp, e))
 
     def get_shared_drive(self, mp: Mapping):
         if mp.gsuite_id:
-            drive_api = GoogleSuiteAPI.create_directory_service(
-                user_email=settings.CLAUDIA_GSUITE['DOMAIN_ADMIN_ACCOUNT_EMAIL'],
-                api_name="drive",
-                api_version="v3",
-                scopes=settings.CLAUDIA_GSUITE['SCOPES']['DRIVE_API']
-            )
+            drive_api = self._drive_api()
             try:
-                return drive_api.drives().get(driveId=mp.get_gsuite_id()).execute()
+                return drive_api.drives().get(driveId=mp.get_gsuite_id()).execute(num_retries=MAX_RETRIES)
             except googleapiclient.errors.HttpError as e:
                 logger.warning("Could not get shared drive for {} ({}). Message: {}".format(mp.get_drivename(), mp, e))
         return None
 
     def create_drive_permission(self, drive: Mapping, member: Mapping):
-        drive_api = GoogleSuiteAPI.create_directory_service(
-            user_email=settings.CLAUDIA_GSUITE['DOMAIN_ADMIN_ACCOUNT_EMAIL'],
-            api_name="drive",
-            api_version="v3",
-            scopes=settings.CLAUDIA_GSUITE['SCOPES']['DRIVE_API']
-        )
+        drive_api = self._drive_api()
 
         if member.is_person() and member.gsuite_id and member.needs_gsuite_account():
             email = "{}@{}".format(member.adname, settings.CLAUDIA_GSUITE['PRIMARY_DOMAIN'])
@@ -614,73 +891,65 @@ class GoogleSuiteAPI:
                     "role": "fileOrganizer",
                     "type": "group" if member.is_group() else "user",
                     }
-        try:
-            res = drive_api.permissions().create(fileId=drive.get_gsuite_id(), body=metadata,
-                                                   sendNotificationEmail=False, supportsAllDrives=True,
-                                                   useDomainAdminAccess=True).execute()
-            DrivePermission.objects.create(drive=drive.get_mapped_object(), mapping=member, permission_id=res['id'])
-        except googleapiclient.errors.HttpError as e:
-            logger.warning("Could not create permission for {} for user {}. Message: {}".format(drive, member, e))
+
+        def _created(res, e):
+            if e is not None:
+                logger.warning("Could not create permission for {} for user {}. Message: {}".format(drive, member, e))
+            else:
+                DrivePermission.objects.create(drive=drive.get_mapped_object(), mapping=member,
+                                               permission_id=res['id'])
+
+        self._submit(drive_api, drive_api.permissions().create(fileId=drive.get_gsuite_id(), body=metadata,
+                                                               sendNotificationEmail=False, supportsAllDrives=True,
+                                                               useDomainAdminAccess=True),
+                     _created, key=('permission', drive.id, member.id))
 
     def delete_drive_permission(self, drive: Mapping, member: Mapping):
-        drive_api = GoogleSuiteAPI.create_directory_service(
-            user_email=settings.CLAUDIA_GSUITE['DOMAIN_ADMIN_ACCOUNT_EMAIL'],
-            api_name="drive",
-            api_version="v3",
-            scopes=settings.CLAUDIA_GSUITE['SCOPES']['DRIVE_API']
-        )
+        drive_api = self._drive_api()
         permission_id = DrivePermission.objects.get(drive=drive.get_mapped_object(), mapping=member)
 
-        try:
-            drive_api.permissions().delete(fileId=drive.get_gsuite_id(), permissionId=permission_id.permission_id,
-                                           supportsAllDrives=True, useDomainAdminAccess=True).execute()
-            permission_id.delete()
-        except googleapiclient.errors.HttpError as e:
-            logger.warning("Could not delete permission for {} for user {}. Message: {}".format(drive, member, e))
+        def _deleted(res, e):
+            if e is not None:
+                logger.warning("Could not delete permission for {} for user {}. Message: {}".format(drive, member, e))
+            else:
+                permission_id.delete()
+
+        self._submit(drive_api, drive_api.permissions().delete(fileId=drive.get_gsuite_id(),
+                                                               permissionId=permission_id.permission_id,
+                                                               supportsAllDrives=True, useDomainAdminAccess=True),
+                     _deleted, key=('permission', drive.id, member.id))
 
     def delete_drive_permission_by_id(self, drive: Mapping, id: str):
-        drive_api = GoogleSuiteAPI.create_directory_service(
-            user_email=settings.CLAUDIA_GSUITE['DOMAIN_ADMIN_ACCOUNT_EMAIL'],
-            api_name="drive",
-            api_version="v3",
-            scopes=settings.CLAUDIA_GSUITE['SCOPES']['DRIVE_API']
-        )
+        drive_api = self._drive_api()
         try:
             permission_id = DrivePermission.objects.get(drive=drive.get_mapped_object(), permission_id=id)
         except DrivePermission.DoesNotExist:
             permission_id = None
 
-        try:
-            drive_api.permissions().delete(fileId=drive.get_gsuite_id(), permissionId=id,
-                                           supportsAllDrives=True, useDomainAdminAccess=True).execute()
-            if permission_id is not None:
+        def _deleted(res, e):
+            if e is not None:
+                logger.warning("Could not delete permission for {} by ID for ID {}. Message: {}".format(drive, id, e))
+            elif permission_id is not None:
                 permission_id.delete()
-        except googleapiclient.errors.HttpError as e:
-            logger.warning("Could not delete permission for {} by ID for ID {}. Message: {}".format(drive, id, e))
+
+        self._submit(drive_api, drive_api.permissions().delete(fileId=drive.get_gsuite_id(), permissionId=id,
+                                                               supportsAllDrives=True, useDomainAdminAccess=True),
+                     _deleted, key=('permission', drive.id, id))
 
     def get_drive_permission(self, drive: Mapping, id: str):
-        drive_api = GoogleSuiteAPI.create_directory_service(
-            user_email=settings.CLAUDIA_GSUITE['DOMAIN_ADMIN_ACCOUNT_EMAIL'],
-            api_name="drive",
-            api_version="v3",
-            scopes=settings.CLAUDIA_GSUITE['SCOPES']['DRIVE_API']
-        )
+        drive_api = self._drive_api()
         try:
             return drive_api.permissions().get(fileId=drive.get_gsuite_id(), permissionId=id,
-                                               fields="emailAddress",
-                                               supportsAllDrives=True, useDomainAdminAccess=True).execute()
+                                               fields="emailAddress", supportsAllDrives=True,
+                                               useDomainAdminAccess=True).execute(num_retries=MAX_RETRIES)
         except googleapiclient.errors.HttpError as e:
             logger.warning("Could not retrieve permission ID {} for drive {}. Message: {}".format(id, drive, e))
 
     def get_drive_permissions(self, drive: Mapping):
-        drive_api = GoogleSuiteAPI.create_directory_service(
-            user_email=settings.CLAUDIA_GSUITE['DOMAIN_ADMIN_ACCOUNT_EMAIL'],
-            api_name="drive",
-            api_version="v3",
-            scopes=settings.CLAUDIA_GSUITE['SCOPES']['DRIVE_API']
-        )
+        drive_api = self._drive_api()
+        self._flush_pending(drive_api, ('permission', drive.id))
         try:
-            return drive_api.permissions().list(fileId=drive.get_gsuite_id(), pageSize=100,
-                                                supportsAllDrives=True, useDomainAdminAccess=True).execute()
+            return drive_api.permissions().list(fileId=drive.get_gsuite_id(), pageSize=100, supportsAllDrives=True,
+                                                useDomainAdminAccess=True).execute(num_retries=MAX_RETRIES)
         except googleapiclient.errors.HttpError as e:
             logger.warning("Could not retrieve permissions for {}. Message: {}".format(drive, e))
@@ -1,3 +1,4 @@
+import datetime
 import json
 import logging
 from functools import cached_property
@@ -5,6 +6,7 @@ from typing import Dict, Any, Union, List, Optional
 
 import requests
 from django.urls import reverse
+from django.utils import timezone
 from requests import RequestException
 
 from amelie.claudia.models import Mapping
@@ -12,11 +14,53 @@ from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+# A snapshot is taken again if it is older than this, even if it is for the same verification cycle
+SNAPSHOT_MAX_AGE = datetime.timedelta(hours=2)
+
+
+class KanidmSnapshot:
+    """
+    Kanidm objects indexed by UUID, name and SPN. It holds all groups, fetched with the list endpoint, and the persons
+    that were looked up since the snapshot was taken.
+
+    Changes that are made through the KanidmAPI object remove the changed objects from the snapshot, so they are
+    looked up in Kanidm again. Changes made by others are not seen until the next snapshot.
+    """
+
+    def __init__(self, key, groups: List[Dict[str, Any]]):
+        self.key = key
+        self.created = timezone.now()
+        self.objects: Dict[str, Dict[str, Dict[str, Any]]] = {"person": {}, "group": {}}
+        for entry in groups:
+            self.add("group", entry)
+
+    def add(self, kind: str, entry: Dict[str, Any]):
+        attrs = entry.get("attrs", {})
+        for attr in ["uuid", "name", "spn"]:
+            for value in attrs.get(attr, []):
+                self.objects[kind][value.lower()] = entry
+
+    def is_expired(self) -> bool:
+        return timezone.now() - self.created > SNAPSHOT_MAX_AGE
+
+    def get(self, kind: str, uuid_or_name: str) -> Optional[Dict[str, Any]]:
+        return self.objects[kind].get(uuid_or_name.lower())
+
+    def forget(self, uuid_or_name: str):
+        """Remove an object from the snapshot, because it changed."""
+        for objects in self.objects.values():
+            entry = objects.get(uuid_or_name.lower())
+            if entry is not None:
+                for key in [key for key, value in objects.items() if value is entry]:
+                    del objects[key]
+
 
 class KanidmAPI:
     def __init__(self):
         self.config = settings.CLAUDIA_KANIDM
         self._connection_obj = None
+        self.snapshot: Optional[KanidmSnapshot] = None
+        self.use_snapshot = False
         if 'API_BASE' not in self.config or not self.config['API_BASE']:
             logger.error("Missing Kanidm 'API_BASE' value in CLAUDIA_KANIDM config variable")
             raise AttributeError("Missing Kanidm 'API_BASE' config")
@@ -37,25 +81,75 @@ class KanidmAPI:
         return resp.json()
 
     def _post(self, path, data=None) -> Optional[Union[List[Any], Dict[str, Any]]]:
+        self._forget(path, data)
         resp = self._connection.post(f'https://{self.config["API_BASE"]}/{path}', json=data)
         resp.raise_for_status()
         return resp.json()
 
     def _put(self, path, data=None) -> Optional[Union[List[Any], Dict[str, Any]]]:
+        self._forget(path, data)
         resp = self._connection.put(f'https://{self.config["API_BASE"]}/{path}', json=data)
         resp.raise_for_status()
         return resp.json()
 
     def _patch(self, path, data=None) -> Optional[Union[List[Any], Dict[str, Any]]]:
+        self._forget(path, data)
         resp = self._connection.patch(f'https://{self.config["API_BASE"]}/{path}', json=data)
         resp.raise_for_status()
         return resp.json()
 
     def _delete(self, path, data=None) -> Optional[Union[List[Any], Dict[str, Any]]]:
+        self._forget(path, data, deleted=True)
         resp = self._connection.delete(f'https://{self.config["API_BASE"]}/{path}', json=data)
         resp.raise_for_status()
         return resp.json()
 
+    # ====== Snapshot ==========
+    def start_snapshot(self, key):
+        """
+        Answer lookups of groups from a snapshot of all groups, and lookups of persons from a snapshot of the persons
+        that were requested before, instead of requesting every object from Kanidm. The snapshot is reused for the
+        same key, like a verification cycle, until it is too old.
+        """
+        if self.snapshot is None or self.snapshot.key != key or self.snapshot.is_expired():
+            self.snapshot = None
+            self.snapshot = KanidmSnapshot(key, groups=self.list_unwrapped_groups())
+        self.use_snapshot = True
+
+    def stop_snapshot(self):
+        """
+        Request objects from Kanidm again. The snapshot is kept up to date with our own changes, to be used again later.
+        """
+        self.use_snapshot = False
+
+    def _from_snapshot(self, kind: str, uuid_or_name: str) -> Optional[Dict[str, Any]]:
+        if self.use_snapshot and self.snapshot is not None:
+            return self.snapshot.get(kind, uuid_or_name)
+        return None
+
+    def _add_to_snapshot(self, kind: str, entry: Optional[Dict[str, Any]]):
+        if self.use_snapshot and self.snapshot is not None and entry:
+            self.snapshot.add(kind, entry)
+
+    def _forget(self, path: str, data, deleted: bool = False):
+        """Remove the objects that a request to the given path changes from the snapshot."""
+        if self.snapshot is None:
+            return
+        parts = path.split("/")
+        if len(parts) < 3 or parts[0] != "v1" or parts[1] not in ["person", "group"]:
+            return
+        renamed = isinstance(data, dict) and "name" in data.get("attrs", {})
+        if renamed or (deleted and len(parts) == 3):
+            # Other objects may still refer to the old name of the object
+            self.snapshot = None
+            self.use_snapshot = False
+            return
+        self.snapshot.forget(parts[2])
+        # Group memberships are also stored in the directmemberof attribute of the members
+        if parts[3:] == ["_attr", "member"]:
+            for member in data or []:
+                self.snapshot.forget(member)
+
     def get_object_from_spn(self, spn: str) -> 'KanidmObject':
         person = self.get_person(spn)
         if person:
@@ -76,7 +170,12 @@ class KanidmAPI:
         return [KanidmPerson.from_json(kanidm=self, json_data=g) for g in self.list_unwrapped_persons()]
 
     def get_unwrapped_person(self, uuid_or_username: str) -> Dict[str, Any]:
-        return self._get(f"v1/person/{uuid_or_username}")
+        snapshot_person = self._from_snapshot("person", uuid_or_username)
+        if snapshot_person is not None:
+            return snapshot_person
+        person = self._get(f"v1/person/{uuid_or_username}")
+        self._add_to_snapshot("person", person)
+        return person
 
     def get_person(self, uuid_or_username: str) -> 'KanidmPerson':
         return KanidmPerson.from_json(kanidm=self, json_data=self.get_unwrapped_person(uuid_or_username))
@@ -127,6 +226,9 @@ class KanidmAPI:
         return [KanidmGroup.from_json(kanidm=self, json_data=g) for g in self.list_unwrapped_groups()]
 
     def get_unwrapped_group(self, uuid_or_groupname: str) -> Dict[str, Any]:
+        snapshot_group = self._from_snapshot("group", uuid_or_groupname)
+        if snapshot_group is not None:
+            return snapshot_group
         return self._get(f"v1/group/{uuid_or_groupname}")
 
     def get_group(self, uuid_or_groupname: str) -> 'KanidmGroup':
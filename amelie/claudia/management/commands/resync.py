@@ -6,5 +6,9 @@ from amelie.claudia.clau import Claudia
 class Command(BaseCommand):
     help = 'Resync all Claudia data'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help="Verify all mappings, instead of only the ones that changed since their last verification")
+
     def handle(self, *args, **options):
-        Claudia.get_instance().check_integrity()
+        Claudia.get_instance().check_integrity(full=options['full'])
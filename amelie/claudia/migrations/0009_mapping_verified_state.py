@@ -0,0 +1,18 @@
+# Generated by Django 5.2.12 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claudia', '0008_extragroup_matrix'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mapping',
+            name='verified_state',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.12 on 2026-10-17 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claudia', '0009_mapping_verified_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mapping',
+            name='verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
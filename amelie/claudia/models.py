@@ -289,6 +289,10 @@ class Mapping(models.Model):
     gsuite_id = models.CharField(max_length=100, blank=True, null=True)
     gsuite_forwarding_enabled = models.BooleanField(default=False)
     matrix_space_id = models.CharField(max_length=100, blank=True, null=True)
+    # Hash of the desired state that this mapping was last verified with by the integrity check
+    verified_state = models.CharField(max_length=64, blank=True)
+    # When this mapping was last verified by the integrity check
+    verified_at = models.DateTimeField(blank=True, null=True)
 
     @staticmethod
     def get_type(obj):
@@ -119,6 +119,13 @@ class AccountsPlugin(ClaudiaPlugin):
         """
         return Event.objects.filter(type=DELETE_USER, mapping=mp).exists()
 
+    # ====== Snapshots ====
+    def snapshot_started(self, claudia, key, mappings):
+        self.ad.start_snapshot(key, [mp.get_guid() for mp in mappings if mp.get_guid()])
+
+    def snapshot_stopped(self, claudia):
+        self.ad.stop_snapshot()
+
     # ====== Verify! ====
 
     def verify_mapping(self, claudia: Claudia, mp, fix=False):
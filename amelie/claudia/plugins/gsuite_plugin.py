@@ -50,6 +50,14 @@ class GoogleSuitePlugin(ClaudiaPlugin):
         """
         return Event.objects.filter(type=DELETE_GSUITE_USER, mapping=mp).exists()
 
+    # ======= Snapshots =======
+
+    def snapshot_started(self, claudia, key, mappings):
+        self.google.start_batching(key)
+
+    def snapshot_stopped(self, claudia):
+        self.google.stop_batching()
+
     # ======= Claudia functions =======
 
     def verify_mapping(self, claudia: Claudia, mp: Mapping, fix: bool = False) -> None:
@@ -217,6 +225,16 @@ class GoogleSuitePlugin(ClaudiaPlugin):
                     logger.debug("Should be removed from GSuite groups: {}".format([x['email'] for x in to_remove_groups]))
                     changes.append(('gsuite_groups', ["-{}".format(x['email']) for x in to_remove_groups]))
 
+                def _save_member_id(details):
+                    # Contacts (and inactive people) are added by e-mail in a group, but cannot be deleted by e-mail.
+                    # They can only be deleted by using the unique ID that they get when adding them, so we save that
+                    # as the gsuite ID and use it when deleting it.
+                    # The batch may be sent after the integrity check saved the verified state of the mapping, so only
+                    # the gsuite ID is saved.
+                    if mp.is_contact() or (mp.is_person() and not mp.gsuite_id):
+                        mp.gsuite_id = details['id']
+                        Mapping.objects.filter(pk=mp.pk).update(gsuite_id=mp.gsuite_id)
+
                 if to_add_groups or to_remove_groups:
                     if fix:
                         for group in to_add_groups:
@@ -229,14 +247,7 @@ class GoogleSuitePlugin(ClaudiaPlugin):
                                 gs_group = self.google.get_group(group)
 
                             if gs_group:
-                                details = self.google.add_group_member(mp, group)
-                                # Contacts (and inactive people) are added by e-mail in a group,
-                                # but cannot be deleted by e-mail.
-                                # They can only be deleted by using the unique ID that they get when adding them, so
-                                # we save that as the gsuite ID and use it when deleting it.
-                                if details is not None and (mp.is_contact() or (mp.is_person() and not mp.gsuite_id)):
-                                    mp.gsuite_id = details['id']
-                                    mp.save()
+                                self.google.add_group_member(mp, group, callback=_save_member_id)
                         for group in to_remove_groups:
                             self.google.remove_group_member(mp, group)
 
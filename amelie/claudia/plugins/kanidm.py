@@ -56,6 +56,13 @@ class KanidmPlugin(ClaudiaPlugin):
 
         return account
 
+    # ====== Snapshots ====
+    def snapshot_started(self, claudia, key, mappings):
+        self.kanidm.start_snapshot(key)
+
+    def snapshot_stopped(self, claudia):
+        self.kanidm.stop_snapshot()
+
     # ====== Verify! ====
 
     def verify_mapping(self, claudia, mp, fix=False):
@@ -6,6 +6,38 @@ class ClaudiaPlugin(object):
     Plugin to log notices from Claudia to plugins to the Claudia log.
     """
 
+    def changed_mappings(self, claudia, state):
+        """
+        Give the mappings that differ from their desired state in the system of this plugin, so that the integrity
+        check verifies them even if their desired state did not change. Mappings that no plugin reports are still
+        verified again after CLAUDIA_VERIFY_MAX_AGE_DAYS.
+
+        :param Claudia claudia: The Claudia object.
+        :param DesiredState state: The desired state of all mappings.
+        :return: Set of mapping ids.
+        """
+        return set()
+
+    def snapshot_started(self, claudia, key, mappings):
+        """
+        Signal that many mappings are about to be verified, so the plugin can look up the objects in its system in a
+        snapshot, instead of one by one. Changes must still be made in the system itself, but may be sent in batches
+        until the snapshot is stopped.
+
+        :param Claudia claudia: The Claudia object.
+        :param key: Identifier of the verification cycle, the same snapshot may be used again for the same key.
+        :param list[Mapping] mappings: The mappings that are about to be verified.
+        """
+        pass
+
+    def snapshot_stopped(self, claudia):
+        """
+        Signal that the mappings of a snapshot have been verified, the plugin should look up objects one by one again.
+
+        :param Claudia claudia: The Claudia object.
+        """
+        pass
+
     def mapping_created(self, claudia, mp):
         """
         Signal that a mapping has been activated.
@@ -0,0 +1,307 @@
+"""
+Builds the desired state of all Claudia mappings in a few queries, so that the integrity check only has to verify the
+mappings that changed since they were last verified.
+"""
+import hashlib
+import json
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+
+from amelie.claudia.models import Mapping, Membership, ExtraPersonalAlias
+from amelie.claudia.tools import strip_domains, unify_mail
+from amelie.members.models import Person, Committee, DogroupGeneration, Function, Student, StudyPeriod, Employee
+from amelie.personal_tab.models import Authorization, RFIDCard
+from amelie.tools.encodings import normalize_to_ascii
+
+logger = logging.getLogger(__name__)
+
+SELECTS = ['all', 'mail', 'ad', 'shared_drive']
+
+
+class DesiredState(object):
+    """
+    The desired state of all Mappable objects and their mappings, the same as the Mapping methods give it, but loaded
+    in bulk. Objects are identified by a node: a tuple of their mapping type and id.
+    """
+
+    def __init__(self):
+        self.mappings = {}  # node -> Mapping
+        self.mappings_by_id = {}  # mapping id -> Mapping
+        self.objects = {}  # node -> Mappable object
+        self.active = set()  # nodes that are active according to Mappable.is_active
+        self.object_groups = defaultdict(set)  # node -> group nodes according to Mappable.groups
+        self.object_members = defaultdict(set)  # group node -> member nodes according to Mappable.members
+        self.extra_groups = defaultdict(dict)  # member mapping id -> {group mapping id: Membership}
+        self.extra_members = defaultdict(set)  # group mapping id -> member mapping ids
+        self.extra_aliases = defaultdict(list)  # mapping id -> extra personal aliases
+        self.member_ids = set()  # ids of persons that are a member of the association
+        self.mail_dogroup = set()  # ids of persons with the mail_dogroup preference
+        self.students = set()  # ids of persons that are a student
+        self.person_data = {}  # person id -> extra data of the person
+        self.consumption_candidates = set()  # person ids that might need a mapping for Alexia
+        self._states = {}
+
+    @classmethod
+    def build(cls):
+        """
+        Load the desired state of everything that Claudia manages.
+        """
+        state = cls()
+        state._load_mappings()
+        state._load_objects()
+        state._load_persons()
+        state._load_committees()
+        state._load_dogroups()
+        logger.debug(f"Loaded desired state of {len(state.objects)} objects and {len(state.mappings)} mappings")
+        return state
+
+    # ===== Loading =====
+
+    def _load_mappings(self):
+        for mp in Mapping.objects.all():
+            self.mappings[(mp.type, mp.ident)] = mp
+            self.mappings_by_id[mp.id] = mp
+
+        for membership in Membership.objects.all():
+            self.extra_groups[membership.member_id][membership.group_id] = membership
+            self.extra_members[membership.group_id].add(membership.member_id)
+
+        for mapping_id, email in ExtraPersonalAlias.objects.values_list('mapping_id', 'email'):
+            self.extra_aliases[mapping_id].append(email)
+
+    def _load_objects(self):
+        querysets = {
+            'AmeliePerson': Person.objects.only('first_name', 'initials', 'last_name_prefix', 'last_name',
+                                                'account_name', 'email_address', 'webmaster', 'preferred_language',
+                                                'shell'),
+            'AmelieDoGroup': DogroupGeneration.objects.select_related('dogroup'),
+        }
+        for mapping_type, cls in Mapping.RELATED_CLASSES.items():
+            for obj in querysets.get(mapping_type, cls.get_all()):
+                self.objects[(mapping_type, obj.id)] = obj
+
+        # The other Mappables are active according to their own fields
+        for node, obj in self.objects.items():
+            if node[0] not in ['AmeliePerson', 'AmelieGroup', 'AmelieDoGroup'] and obj.is_active():
+                self.active.add(node)
+
+    def _load_persons(self):
+        self.member_ids = set(Person.objects.members().values_list('id', flat=True))
+        self.mail_dogroup = set(Person.objects.filter(preferences__name='mail_dogroup').values_list('id', flat=True))
+
+        for person_id, committee_id in Function.objects.filter(
+                end__isnull=True, committee__abolished__isnull=True).values_list('person_id', 'committee_id'):
+            self.active.add(('AmeliePerson', person_id))
+            self._add_edge(('AmeliePerson', person_id), ('AmelieGroup', committee_id))
+
+        students = {person_id: number for person_id, number in Student.objects.values_list('person_id', 'number')}
+        employees = {person_id: number for person_id, number in Employee.objects.values_list('person_id', 'number')}
+
+        rfids = defaultdict(list)
+        for person_id, code, active in RFIDCard.objects.values_list('person_id', 'code', 'active'):
+            self.consumption_candidates.add(person_id)
+            if active:
+                rfids[person_id].append(code)
+
+        mandates = set(Authorization.objects.filter(
+            is_signed=True, end_date__isnull=True, authorization_type__consumptions=True
+        ).values_list('person_id', flat=True))
+        self.consumption_candidates &= self.member_ids & mandates
+
+        self.students = set(students)
+        for node, obj in self.objects.items():
+            if node[0] != 'AmeliePerson':
+                continue
+            # Same as Person.get_extra_data
+            self.person_data[obj.id] = {
+                'employee_number': 'm%07d' % employees[obj.id] if employees.get(obj.id) is not None else None,
+                'student_number': 's%07d' % students[obj.id] if students.get(obj.id) is not None else None,
+                'rfids': sorted(rfids[obj.id]),
+                'consumption_mandate': obj.id in self.member_ids and obj.id in mandates,
+                'preferred_language': obj.preferred_language,
+                'shell': obj.shell if obj.shell != 'default' else settings.CLAUDIA_SHELL_DEFAULT,
+            }
+
+    def _load_committees(self):
+        current = {node[1] for node, obj in self.objects.items() if node[0] == 'AmelieGroup' and not obj.abolished}
+        self.active |= {('AmelieGroup', committee_id) for committee_id in current}
+
+        # Committees are only in non-abolished parent committees if they are not abolished themselves
+        for child_id, parent_id in Committee.parent_committees.through.objects.values_list('from_committee_id',
+                                                                                            'to_committee_id'):
+            if child_id in current and parent_id in current:
+                self._add_edge(('AmelieGroup', child_id), ('AmelieGroup', parent_id))
+
+    def _load_dogroups(self):
+        children = StudyPeriod.objects.filter(dogroup__isnull=False).values_list('student__person_id', 'dogroup_id')
+        parents = DogroupGeneration.parents.through.objects.values_list('person_id', 'dogroupgeneration_id')
+
+        for person_id, dogroup_id in list(children) + list(parents):
+            if person_id not in self.mail_dogroup or person_id not in self.member_ids:
+                continue
+            person, dogroup = ('AmeliePerson', person_id), ('AmelieDoGroup', dogroup_id)
+            # DogroupGeneration.members also gives parents without a student, Person.groups does not
+            if person_id in self.students:
+                self.object_groups[person].add(dogroup)
+            self.object_members[dogroup].add(person)
+            self.active.add(dogroup)
+
+    def _add_edge(self, member, group):
+        self.object_groups[member].add(group)
+        self.object_members[group].add(member)
+
+    # ===== Queries, the same as the Mapping methods =====
+
+    def _node(self, mapping_id):
+        mp = self.mappings_by_id[mapping_id]
+        return mp.type, mp.ident
+
+    def _key(self, node):
+        """Identify a node by its mapping id, or by its type and id if it has no mapping yet."""
+        mp = self.mappings.get(node)
+        return mp.id if mp else '%s:%s' % node
+
+    def needs_account(self, node):
+        """Same as Mapping.needs_account"""
+        mp = self.mappings.get(node)
+        if node in self.active:
+            return True
+        if mp is None:
+            return False
+        for group_id, membership in self.extra_groups[mp.id].items():
+            group = self.objects.get(self._node(group_id))
+            if membership.ad and group is not None and not group.is_dogroup():
+                return True
+        return False
+
+    def is_needed(self, node):
+        """Same as Mapping.is_needed, or Mappable.is_needed for objects without a mapping"""
+        if node[0] == 'SharedDrive':
+            return node in self.objects
+        mp = self.mappings.get(node)
+        return (node in self.active or bool(self.object_groups[node]) or bool(self.object_members[node])
+                or (node[0] == 'AmeliePerson' and node[1] in self.consumption_candidates)
+                or (mp is not None and bool(self.extra_groups[mp.id] or self.extra_members[mp.id])))
+
+    def groups(self, node, select):
+        """Same as Mapping.groups, but gives nodes"""
+        groups = set(self.object_groups[node])
+
+        mp = self.mappings.get(node)
+        if mp is not None:
+            groups |= {self._node(group_id) for group_id, membership in self.extra_groups[mp.id].items()
+                       if select == 'all' or getattr(membership, select)}
+
+        if node[0] == 'AmeliePerson' and select in ['ad', 'all'] and self.needs_account(node):
+            special = [settings.CLAUDIA_MAPPING_ACTIVE_MEMBERS]
+            if self.objects[node].is_webmaster():
+                special.append(settings.CLAUDIA_MAPPING_WEBMASTERS)
+            groups |= {self._node(group_id) for group_id in special if group_id in self.mappings_by_id}
+
+        return groups
+
+    def all_groups(self, node, select):
+        """Same as Mapping.all_groups, but gives nodes"""
+        result = set()
+        to_visit = self.groups(node, select)
+        while to_visit:
+            group = to_visit.pop()
+            result.add(group)
+            to_visit |= self.groups(group, select) - result
+        return result
+
+    def members(self, node):
+        """Same as Mapping.members, but gives nodes"""
+        members = set(self.object_members[node])
+        mp = self.mappings.get(node)
+        if mp is not None:
+            members |= {self._node(member_id) for member_id in self.extra_members[mp.id]}
+        return members
+
+    def aliases(self, node):
+        """Same as Mapping.aliases"""
+        aliases = []
+        for group in self.groups(node, 'mail'):
+            group_obj = self.objects.get(group)
+            email = group_obj.get_email() if group_obj is not None else self.mappings[group].email
+            if email:
+                aliases.append(email)
+
+        obj = self.objects[node]
+        if node[0] == 'AmeliePerson' and node in self.active:
+            aliases.append(obj.personal_alias())
+            if obj.get_adname():
+                aliases.append(normalize_to_ascii(obj.get_adname()))
+
+        aliases = [strip_domains(alias) for alias in aliases]
+        return sorted(alias for alias in aliases if '@' not in alias)
+
+    def state(self, node):
+        """
+        The desired state of a node, as a dictionary of everything the plugins synchronize, with groups and members
+        identified by their mapping id. Returns None if the mapped object does not exist anymore.
+        """
+        if node not in self._states:
+            obj = self.objects.get(node)
+            if obj is None:
+                self._states[node] = None
+            else:
+                mp = self.mappings.get(node)
+
+                def _keys(nodes):
+                    return sorted((self._key(n) for n in nodes), key=str)
+
+                self._states[node] = {
+                    'name': normalize_to_ascii(obj.get_name()),
+                    'email': unify_mail(obj.get_email()) or '',
+                    'adname': normalize_to_ascii(obj.get_adname()) or '',
+                    'active': node in self.active,
+                    'needed': self.is_needed(node),
+                    'needs_account': self.needs_account(node),
+                    'groups': {select: _keys(self.groups(node, select)) for select in SELECTS},
+                    'all_groups': {select: _keys(self.all_groups(node, select)) for select in SELECTS},
+                    'members': _keys(self.members(node)),
+                    'aliases': self.aliases(node),
+                    'extra_aliases': sorted(self.extra_aliases[mp.id]) if mp else [],
+                    'extra_data': self.person_data[node[1]] if node[0] == 'AmeliePerson' else obj.get_extra_data(),
+                }
+        return self._states[node]
+
+    def digest(self, node):
+        """A hash of the desired state of a node, to compare with Mapping.verified_state."""
+        return hashlib.sha256(json.dumps(self.state(node), sort_keys=True, default=str).encode()).hexdigest()
+
+    def mapping_digest(self, mapping_id):
+        """The hash of the desired state of a mapping, or None if the mapped object does not exist anymore."""
+        node = self._node(mapping_id)
+        return self.digest(node) if self.state(node) is not None else None
+
+    # ===== Differences =====
+
+    def changed_mappings(self, verified_before=None):
+        """
+        Give the ids of the mappings whose desired state differs from the state they were last verified with, or that
+        need to be activated or deactivated.
+
+        :param verified_before: Also give the mappings that were not verified since this time, so that changes that
+                                were made directly in the systems of the plugins are repaired as well.
+        :type verified_before: datetime.datetime | None
+        """
+        changed = set()
+        for node, mp in self.mappings.items():
+            if self.state(node) is None or mp.verified_state != self.digest(node) or \
+                    mp.active != self.is_needed(node):
+                changed.add(mp.id)
+            elif verified_before is not None and (mp.verified_at is None or mp.verified_at < verified_before):
+                changed.add(mp.id)
+        return changed
+
+    def unmapped_objects(self):
+        """Give the nodes of objects that might need a mapping, but do not have one yet."""
+        return [node for node in self.objects if node not in self.mappings and self.is_needed(node)]
+
+    def deactivation_candidates(self):
+        """Give the ids of active mappings that are not needed anymore."""
+        return {mp.id for node, mp in self.mappings.items() if mp.active and not self.is_needed(node)}
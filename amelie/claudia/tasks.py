@@ -1,11 +1,13 @@
 import uuid
 import ldap
 import logging
+from datetime import timedelta
 
 from celery import shared_task
 from django.conf import settings
 from django.core.cache import cache
-from typing import Optional
+from django.utils import timezone
+from typing import List, Optional, Tuple
 
 
 logger = logging.getLogger(__name__)
@@ -13,64 +15,160 @@ logger = logging.getLogger(__name__)
 
 CHECKED_MAPPINGS_CACHE_KEY_TEMPLATE = "verification_cycle_{cycle_id}_mappings"
 PENDING_COUNT_CACHE_KEY_TEMPLATE = "verification_cycle_{cycle_id}_pending"
+DEACTIVATION_CACHE_KEY_TEMPLATE = "verification_cycle_{cycle_id}_deactivation"
 
 
 # ===== Integrity check ======
 @shared_task(name="claudia.check_integrity", acks_late=True)
-def check_integrity():
+def check_integrity(full: bool = False):
     """
-    Enqueues a complete integrity check of all aliases, mappings and other Mappables.
-    In more detail, this will run:
-    - Verify on all objects in the linked database
-    - Verify on all other cid's in the database
-    These both need to be queued, because a Mapping might not exist for a new object, or a Mapping might still exist for a deleted object.
+    Enqueues an integrity check of all aliases, mappings and other Mappables.
+    In more detail, this will:
+    - Build the desired state of all objects and mappings in bulk
+    - Queue verification of objects that need a Mapping but do not have one yet
+    - Queue verification, in chunks, of the mappings whose desired state changed since they were last verified, that
+      differ from it in a backend according to the plugins, that need to be (de)activated, or that were not verified
+      for CLAUDIA_VERIFY_MAX_AGE_DAYS
+
+    :param full: Verify all mappings, instead of only the changed ones.
+    :type full: bool
     """
     logger.info("Start of check_integrity")
-    from amelie.claudia.models import Mapping
+    from amelie.claudia.clau import Claudia
+    from amelie.claudia.reconcile import DesiredState
+
+    state = DesiredState.build()
+
+    # Objects without a mapping are verified one by one, verify_object creates their mapping if they need one.
+    unmapped = state.unmapped_objects()
+    for object_type, object_id in unmapped:
+        verify_object.delay(object_id=object_id, object_type=object_type)
+
+    if full:
+        changed = set(state.mappings_by_id)
+    else:
+        verified_before = timezone.now() - timedelta(days=settings.CLAUDIA_VERIFY_MAX_AGE_DAYS)
+        changed = state.changed_mappings(verified_before) | Claudia.get_instance().backend_changed_mappings(state)
+    changed = sorted(changed)
+
+    logger.info(f"Verifying {len(unmapped)} new objects and {len(changed)} of {len(state.mappings)} mappings.")
+    if not changed:
+        return
 
-    # Generate a cycle ID for the Celery tasks so that they use the same cache key
-    # to determine whether a Mapping was already verified before or not.
-    # If we did not pass this, each queued object would get a different cycle ID,
-    # resulting in its own separated tree of verified objects, and we would be doing a lot of extra work.
-    import uuid
     cycle_id = str(uuid.uuid4())
+    chunks = [changed[i:i + settings.CLAUDIA_VERIFY_CHUNK_SIZE]
+              for i in range(0, len(changed), settings.CLAUDIA_VERIFY_CHUNK_SIZE)]
 
-    # Set initial values for the cache keys. Because there is only one claudia queue worker, and both this task and
-    # the verification tasks run in that worker, their cache is guaranteed to be shared. We need to initialize these
-    # caches properly because we are generating a cycle ID for the verification, which means the initialization of the
-    # cache will not happen on the first verification, so we need to initialize them here.
-    checked_mappings_cache_key = CHECKED_MAPPINGS_CACHE_KEY_TEMPLATE.format(cycle_id=cycle_id)
-    pending_count_cache_key = PENDING_COUNT_CACHE_KEY_TEMPLATE.format(cycle_id=cycle_id)
-    # We set the checked objects to an empty set because no objects have been checked yet.
-    cache.set(checked_mappings_cache_key, set(), timeout=7200)
-    # We set the pending counter to 0 because no tasks have been enqueued yet. Later when enqueueing objects, this counter will be increased.
-    cache.set(pending_count_cache_key, 0, timeout=7200)
-
-    # Keep track of Cid's
-    cids = []
-    for rc in Mapping.RELATED_CLASSES:
-        rc_objects = Mapping.RELATED_CLASSES[rc].get_all()
-        logger.debug(f"Queueing verification for {rc_objects.count()} '{rc}' objects.")
-        for obj in rc_objects:
-            mp = Mapping.find(obj)
-            # Increment pending counter
-            current_pending = cache.get(pending_count_cache_key, 0)
-            cache.set(pending_count_cache_key, current_pending + 1, timeout=7200)
-            # Schedule task
-            verify_object.delay(object_id=obj.id, object_type=rc, cycle_id=cycle_id)
-            if mp:
-                cids.append(mp.id)
-
-    # Other left-over mappings (should not happen).
-    for mp in Mapping.objects.all():
-        if mp.id not in cids:
-            # Increment pending counter
-            current_pending = cache.get(pending_count_cache_key, 0)
-            cache.set(pending_count_cache_key, current_pending + 1, timeout=7200)
-            # Schedule task
-            verify_object.delay(object_id=mp.id, object_type=None, cycle_id=cycle_id)
-
-    logger.info("Scheduled all objects for verification. They are now being processed by Celery, this may take a while.")
+    # The mappings that might have to be deactivated are checked by the last chunk to finish. The pending counter
+    # is only changed with incr and decr, which are atomic, so exactly one chunk sees it reach zero.
+    cache.set(DEACTIVATION_CACHE_KEY_TEMPLATE.format(cycle_id=cycle_id), state.deactivation_candidates(), timeout=7200)
+    cache.set(PENDING_COUNT_CACHE_KEY_TEMPLATE.format(cycle_id=cycle_id), len(chunks), timeout=7200)
+
+    for chunk in chunks:
+        verify_mappings.delay(
+            mappings=[(mapping_id, state.mapping_digest(mapping_id)) for mapping_id in chunk],
+            cycle_id=cycle_id
+        )
+
+    logger.info(f"Scheduled {len(chunks)} chunks of mappings for verification in cycle {cycle_id}. "
+                f"They are now being processed by Celery, this may take a while.")
+
+
+@shared_task(
+    name="claudia.verify_mappings", acks_late=True, bind=True,
+    # Auto-retry when LDAP is down, first time after 1 minute, exponential after that (2m, 4m, 8m, 10m, 10m)
+    autoretry_for=(ldap.SERVER_DOWN,), retry_backoff=60, retry_backoff_max=600, retry_jitter=True,
+)
+def verify_mappings(self, mappings: List[Tuple[int, Optional[str]]], cycle_id: str, fix: bool = True):
+    """
+    Let Claudia verify a chunk of mappings of an integrity check. Unlike verify_object, the members of groups are
+    not enqueued, because the integrity check already enqueued every mapping that changed.
+
+    :param mappings: List of tuples of the PK of a Mapping and the hash of its desired state, which is saved as its
+                     verified state after it is verified, or None if the mapped object does not exist anymore.
+    :param cycle_id: The integrity check that the chunk belongs to.
+    :param fix: Whether to fix any issues that Claudia finds. Defaults to True.
+    """
+    from amelie.claudia.clau import Claudia
+    from amelie.claudia.models import Mapping
+
+    claudia = Claudia.get_instance()
+    mps = Mapping.objects.in_bulk([mapping_id for mapping_id, digest in mappings])
+
+    # The chunk is done when it was verified or failed, unless it is retried because LDAP is down.
+    finished = True
+    try:
+        # The plugins look up the objects in their systems in a snapshot that is shared by all chunks of the cycle
+        claudia.notify_snapshot_started(cycle_id, list(mps.values()))
+        try:
+            _verify_chunk(claudia, mappings, mps, fix)
+        finally:
+            claudia.notify_snapshot_stopped()
+    except ldap.SERVER_DOWN:
+        finished = self.request.retries >= self.max_retries
+        raise
+    finally:
+        if finished:
+            _finish_chunk(claudia, cycle_id)
+
+
+def _finish_chunk(claudia, cycle_id: str):
+    """Count a chunk of an integrity check as done, and finish the integrity check if it was the last chunk."""
+    try:
+        pending = cache.decr(PENDING_COUNT_CACHE_KEY_TEMPLATE.format(cycle_id=cycle_id))
+    except ValueError:
+        logger.warning(f"Verification cycle {cycle_id} expired before all chunks were verified.")
+        return
+
+    if pending <= 0:
+        _finish_integrity_check(claudia, cycle_id)
+
+
+def _verify_chunk(claudia, mappings, mps, fix: bool):
+    """Verify the mappings of a chunk and save the state they were verified with."""
+    from amelie.claudia.models import Mapping
+
+    for mapping_id, digest in mappings:
+        mp = mps.get(mapping_id)
+        if mp is None:
+            continue
+        try:
+            if not mp.active and mp.is_needed():
+                logger.debug(f"Activating mapping '{mp.name}' (cid {mp.id})")
+                mp.active = True
+                mp.save()
+                claudia.notify_mapping_created(mp)
+
+            claudia.verify_mapping(mp=mp, fix=fix)
+
+            Mapping.objects.filter(id=mp.id).update(verified_state=digest or '', verified_at=timezone.now())
+        except ldap.SERVER_DOWN:
+            # Retry the whole chunk later, the mappings that were already verified have no changes left.
+            raise
+        except Exception as e:
+            logger.exception(f"Exception raised when verifying Mapping '{mp.name}' (cid {mp.id}): {e}")
+            if settings.CLAUDIA_STOP_ON_ERROR:
+                raise
+
+
+def _finish_integrity_check(claudia, cycle_id: str):
+    """Deactivate the mappings that are not needed anymore, after all mappings of an integrity check were verified."""
+    from amelie.claudia.models import Mapping
+
+    deactivation_cache_key = DEACTIVATION_CACHE_KEY_TEMPLATE.format(cycle_id=cycle_id)
+    candidates = cache.get(deactivation_cache_key, set())
+    cache.delete(deactivation_cache_key)
+    cache.delete(PENDING_COUNT_CACHE_KEY_TEMPLATE.format(cycle_id=cycle_id))
+
+    logger.debug(f"Checking if any mappings need to be deactivated...")
+    for mp in Mapping.objects.filter(id__in=candidates, active=True):
+        if not mp.is_needed():
+            logger.debug(f"Deactivating mapping '{mp.name}' (cid {mp.id})")
+            mp.active = False
+            mp.save()
+            claudia.notify_mapping_deleted(mp)
+
+    logger.info(f"Finished integrity check cycle {cycle_id}")
 
 
 @shared_task(
@@ -194,8 +292,7 @@ def verify_object(object_id: int, object_type: Optional[str] = None, fix: bool =
                 if member_mp.id not in current_queued:
                     logger.debug(f"Enqueueing Mapping '{member_mp.name}' (cid {member_mp.id}) for later verification in cycle {cycle_id}")
                     # Increment pending counter
-                    current_pending = cache.get(pending_count_cache_key, 0)
-                    cache.set(pending_count_cache_key, current_pending + 1, timeout=7200)
+                    cache.incr(pending_count_cache_key)
                     # Schedule task
                     verify_object.delay(object_id=member_mp.id, object_type=None, fix=fix, cycle_id=cycle_id)
                 else:
@@ -220,13 +317,15 @@ def verify_object(object_id: int, object_type: Optional[str] = None, fix: bool =
         # So, this will run whenever we are about to exit the verification function as a sort of 'cleanup' handler.
         # We use it to decrement the pending objects counter and to perform Mapping cleanup at the very end of the cycle.
 
-        # Decrement pending counter
-        cycle_pending = cache.get(pending_count_cache_key, 1)
-        cache.set(pending_count_cache_key, cycle_pending - 1, timeout=7200)
+        # Decrement pending counter. incr and decr are atomic, so exactly one task sees the counter reach zero.
+        try:
+            final_pending = cache.decr(pending_count_cache_key)
+        except ValueError:
+            # The cycle expired
+            final_pending = None
 
         # Last task in cycle, cleanup
-        final_pending = cache.get(pending_count_cache_key, 0)
-        if final_pending <= 0:
+        if final_pending is not None and final_pending <= 0:
             final_checked_objects = cache.get(checked_mappings_cache_key, set())
             cache.delete(checked_mappings_cache_key)
             cache.delete(pending_count_cache_key)
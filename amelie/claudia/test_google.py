@@ -0,0 +1,132 @@
+import httplib2
+from googleapiclient.errors import HttpError
+
+from amelie.claudia.google import BATCH_SIZE, GoogleBatch, GroupMemberships
+from amelie.tools.tests import TestCase
+
+
+def _error(status, content=b''):
+    return HttpError(httplib2.Response({'status': status}), content)
+
+
+class FakeRequest:
+    """A request that gives the next of its results every time it is executed."""
+
+    def __init__(self, uri, *results):
+        self.method = 'POST'
+        self.uri = uri
+        self.results = list(results) or [{'uri': uri}]
+
+    def next_result(self):
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+
+class FakeBatchRequest:
+    def __init__(self, transport, callback):
+        self.transport = transport
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.transport.batches.append([request.uri for request_id, request in self.requests])
+        for request_id, request in self.requests:
+            result = request.next_result()
+            if isinstance(result, Exception):
+                self.callback(request_id, None, result)
+            else:
+                self.callback(request_id, result, None)
+
+
+class FakeTransport:
+    """Stands in for a Google API service, and records the batches that were sent to it."""
+
+    def __init__(self):
+        self.batches = []
+
+    def new_batch_http_request(self, callback):
+        return FakeBatchRequest(self, callback)
+
+
+class GoogleBatchTest(TestCase):
+    def setUp(self):
+        super(GoogleBatchTest, self).setUp()
+        self.transport = FakeTransport()
+        self.sleeps = []
+        self.batch = GoogleBatch(self.transport, sleep=self.sleeps.append)
+        self.results = []
+
+    def _callback(self, uri):
+        return lambda response, exception: self.results.append((uri, response, exception))
+
+    def test_batches(self):
+        for i in range(BATCH_SIZE + 1):
+            self.batch.add(FakeRequest(str(i)), callback=self._callback(str(i)))
+        self.assertEqual(len(self.transport.batches), 1)
+        self.batch.execute()
+
+        self.assertEqual([len(batch) for batch in self.transport.batches], [BATCH_SIZE, 1])
+        self.assertEqual([(uri, response) for uri, response, exception in self.results],
+                         [(str(i), {'uri': str(i)}) for i in range(BATCH_SIZE + 1)])
+        self.assertEqual(self.sleeps, [])
+
+    def test_quota_retry(self):
+        self.batch.add(FakeRequest('a', _error(429), {'uri': 'a'}), callback=self._callback('a'))
+        self.batch.add(FakeRequest('b'), callback=self._callback('b'))
+        self.batch.add(FakeRequest('c', _error(404)), callback=self._callback('c'))
+        self.batch.execute()
+
+        # Only the request that hit the quota is sent again, after a backoff
+        self.assertEqual(self.transport.batches, [['a', 'b', 'c'], ['a']])
+        self.assertEqual(len(self.sleeps), 1)
+        results = {uri: (response, exception) for uri, response, exception in self.results}
+        self.assertEqual(results['a'], ({'uri': 'a'}, None))
+        self.assertEqual(results['b'], ({'uri': 'b'}, None))
+        self.assertEqual(results['c'][1].resp.status, 404)
+
+    def test_rate_limit_forbidden(self):
+        self.batch.add(FakeRequest('a', _error(403, b'{"reason": "userRateLimitExceeded"}'), {'uri': 'a'}),
+                       callback=self._callback('a'))
+        self.batch.add(FakeRequest('b', _error(403, b'{"reason": "forbidden"}')), callback=self._callback('b'))
+        self.batch.execute()
+
+        self.assertEqual(self.transport.batches, [['a', 'b'], ['a']])
+
+    def test_same_key(self):
+        # Changes to the same object are sent in order, in separate batches
+        self.batch.add(FakeRequest('add'), key=('member', 1, 'group'))
+        self.batch.add(FakeRequest('other'), key=('member', 2, 'group'))
+        self.batch.add(FakeRequest('remove'), key=('member', 1, 'group'))
+        self.batch.execute()
+
+        self.assertEqual(self.transport.batches, [['add', 'other'], ['remove']])
+
+
+class GroupMembershipsTest(TestCase):
+    def setUp(self):
+        super(GroupMembershipsTest, self).setUp()
+        self.board = {'id': 'g1', 'email': 'board@example.com', 'name': 'Board'}
+        self.party = {'id': 'g2', 'email': 'party@example.com', 'name': 'Party'}
+        self.memberships = GroupMemberships('cycle', [self.board, self.party], {
+            'g1': [{'id': 'u1', 'email': 'Person@example.com'}],
+            'g2': [{'id': 'u1', 'email': 'person@example.com'}, {'id': 'c1', 'email': 'contact@example.org'}],
+        })
+
+    def test_lookup(self):
+        self.assertEqual(self.memberships.groups_of('u1'), [self.board, self.party])
+        self.assertEqual(self.memberships.groups_of('person@EXAMPLE.com'), [self.board, self.party])
+        self.assertEqual(self.memberships.groups_of('contact@example.org'), [self.party])
+        self.assertEqual(self.memberships.groups_of('unknown@example.org'), [])
+        self.assertEqual(len(self.memberships.members_of('g2')), 2)
+        self.assertIsNone(self.memberships.members_of('g3'))
+
+    def test_changes(self):
+        self.memberships.added({'id': 'c1', 'email': 'contact@example.org'}, self.board)
+        self.assertEqual(self.memberships.groups_of('c1'), [self.party, self.board])
+
+        self.memberships.removed('u1', 'g1')
+        self.assertEqual(self.memberships.groups_of('u1'), [self.party])
+        self.assertEqual(self.memberships.groups_of('person@example.com'), [self.party])
+        self.assertEqual(self.memberships.members_of('g1'), [{'id': 'c1', 'email': 'contact@example.org'}])
@@ -0,0 +1,97 @@
+import datetime
+
+from django.test import override_settings
+from django.utils import timezone
+
+from amelie.claudia.models import ExtraGroup, ExtraPersonalAlias, Mapping, Membership
+from amelie.claudia.reconcile import SELECTS, DesiredState
+from amelie.members.models import Committee, Function, Person
+from amelie.tools.tests import TestCase
+
+
+class DesiredStateTest(TestCase):
+    """The desired state that is loaded in bulk must be the same as the one that the Mapping methods give."""
+
+    def setUp(self):
+        super(DesiredStateTest, self).setUp()
+        self.load_basic_data()
+        today = datetime.date.today()
+
+        parent = self.data['committee1']
+        parent.email = 'com1@inter-actief.utwente.nl'
+        parent.save()
+        child = Committee.objects.create(name='Committee 2', abbreviation='Com2', email='com2@inter-actief.utwente.nl')
+        child.parent_committees.add(parent)
+        abolished = Committee.objects.create(name='Committee 3', abbreviation='Com3', abolished=today)
+        abolished.parent_committees.add(parent)
+
+        person1, person2 = self.data['person1'], self.data['person2']
+        person1.webmaster = True
+        person1.save()
+        third = Person.objects.create(first_name='Test3', last_name='Client', gender=Person.GenderTypes.WOMAN,
+                                      account_name='testuser3')
+        Function.objects.create(person=person1, committee=child, function='Member', begin=today)
+        Function.objects.create(person=person2, committee=parent, function='Member', begin=today, end=today)
+        Function.objects.create(person=third, committee=abolished, function='Member', begin=today)
+
+        extra = ExtraGroup.objects.create(name='Extra group', active=True, email='extra@inter-actief.utwente.nl',
+                                          adname='extra')
+        active_members = ExtraGroup.objects.create(name='Active members', active=True, adname='active')
+        webmasters = ExtraGroup.objects.create(name='Webmasters', active=True, adname='webmasters')
+
+        for obj in [parent, child, abolished, person1, person2, third, extra, active_members, webmasters]:
+            Mapping.wrap(obj).check_mapping(fix=True)
+
+        Membership.objects.create(group=Mapping.find(extra), member=Mapping.find(person2), ad=True, mail=True)
+        Membership.objects.create(group=Mapping.find(extra), member=Mapping.find(child), mail=True)
+        Membership.objects.create(group=Mapping.find(child), member=Mapping.find(third), shared_drive=True)
+        ExtraPersonalAlias.objects.create(mapping=Mapping.find(person1), email='test.alias@inter-actief.net')
+
+        settings_override = override_settings(CLAUDIA_MAPPING_ACTIVE_MEMBERS=Mapping.find(active_members).id,
+                                              CLAUDIA_MAPPING_WEBMASTERS=Mapping.find(webmasters).id)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def _nodes(self, mappings):
+        return {(mp.type, mp.ident) for mp in mappings}
+
+    def test_same_as_mappings(self):
+        state = DesiredState.build()
+
+        for mp in Mapping.objects.all():
+            node = (mp.type, mp.ident)
+            with self.subTest(mapping=mp.name):
+                self.assertEqual(state.is_needed(node), mp.is_needed())
+                self.assertEqual(state.needs_account(node), mp.needs_account())
+                for select in SELECTS:
+                    self.assertEqual(state.groups(node, select), self._nodes(mp.groups(select)))
+                    self.assertEqual(state.all_groups(node, select), self._nodes(mp.all_groups(select)))
+                self.assertEqual(state.members(node), self._nodes(mp.members()))
+                self.assertEqual(state.aliases(node), sorted(mp.aliases()))
+                self.assertEqual(state.state(node)['extra_data'], mp.extra_data())
+
+    def test_unmapped_objects(self):
+        person = Person.objects.create(first_name='Test4', last_name='Client', gender=Person.GenderTypes.MAN)
+        Function.objects.create(person=person, committee=self.data['committee1'], function='Member',
+                                begin=datetime.date.today())
+
+        self.assertEqual(DesiredState.build().unmapped_objects(), [('AmeliePerson', person.id)])
+
+    def test_changed_mappings(self):
+        state = DesiredState.build()
+        for mp in Mapping.objects.all():
+            node = (mp.type, mp.ident)
+            Mapping.objects.filter(id=mp.id).update(active=state.is_needed(node), verified_state=state.digest(node),
+                                                    verified_at=timezone.now())
+
+        state = DesiredState.build()
+        self.assertEqual(state.changed_mappings(), set())
+
+        # Mappings that were not verified for a while are verified again
+        self.assertEqual(state.changed_mappings(timezone.now() + datetime.timedelta(minutes=1)),
+                         set(Mapping.objects.values_list('id', flat=True)))
+
+        # A change in the desired state of a mapping changes its digest
+        self.data['person1'].first_name = 'Renamed'
+        self.data['person1'].save()
+        self.assertEqual(DesiredState.build().changed_mappings(), {Mapping.find(self.data['person1']).id})
@@ -0,0 +1,234 @@
+import ldap
+from django.test import override_settings
+from ldap.controls import SimplePagedResultsControl
+
+from amelie.claudia.ad import AD, SNAPSHOT_PAGE_SIZE
+from amelie.claudia.kanidm import KanidmAPI
+from amelie.claudia.tools import encode_guid
+from amelie.tools.tests import SimpleTestCase
+
+BASE_DN = 'dc=ia,dc=utwente,dc=nl'
+
+
+def _group(name):
+    return 'cn=%s,ou=Groepen,%s' % (name, BASE_DN), {
+        'objectClass': [b'top', b'group'], 'objectGUID': [('g-%s' % name).encode()], 'name': [name.encode()],
+        'sAMAccountName': [name.encode()],
+    }
+
+
+def _user(name):
+    return 'cn=%s,ou=Gebruikers,%s' % (name, BASE_DN), {
+        'objectClass': [b'top', b'person', b'organizationalPerson', b'user'], 'objectGUID': [('u-%s' % name).encode()],
+        'name': [name.encode()], 'sAMAccountName': [name.encode()],
+    }
+
+
+class FakeLDAP:
+    """Stands in for an LDAP connection, and answers searches by their filter."""
+
+    def __init__(self, results):
+        self.results = results
+        self.paged_searches = []
+        self.searches = []
+        self.modifications = []
+        self.pages = {}
+
+    def search_ext(self, base, scope, search_filter, attributes, serverctrls):
+        page_control = serverctrls[0]
+        start = int(page_control.cookie or 0)
+        end = start + page_control.size
+        self.paged_searches.append(search_filter)
+        msgid = len(self.paged_searches)
+        self.pages[msgid] = (self.results.get(search_filter, [])[start:end],
+                             str(end) if end < len(self.results.get(search_filter, [])) else '')
+        return msgid
+
+    def result3(self, msgid):
+        rdata, cookie = self.pages.pop(msgid)
+        control = SimplePagedResultsControl(True, size=SNAPSHOT_PAGE_SIZE, cookie=cookie)
+        return ldap.RES_SEARCH_RESULT, rdata + [(None, ['ldap://referral'])], msgid, [control]
+
+    def search_s(self, base, scope, search_filter, attributes):
+        self.searches.append(search_filter)
+        return [(dn, attrs) for dn, attrs in self.results.get(search_filter, [])
+                if dn.lower().endswith(base.lower())]
+
+    def modify_s(self, dn, modlist):
+        self.modifications.append(dn)
+
+
+class StubAD(AD):
+    def __init__(self, results):
+        self.fake = FakeLDAP(results)
+        super(StubAD, self).__init__('ldaps', 'localhost', 'claudia', 'secret', BASE_DN, 636, '')
+
+    def connect(self):
+        self.ldap = self.fake
+
+
+class ADSnapshotTest(SimpleTestCase):
+    def setUp(self):
+        super(ADSnapshotTest, self).setUp()
+        self.groups = [_group('group%d' % i) for i in range(3)]
+        self.user = _user('user1')
+        self.other = _user('user2')
+        self.ad = StubAD({
+            '(objectClass=group)': self.groups,
+            '(|(objectGUID=%s))' % encode_guid(b'u-user1'): [self.user],
+            '(objectGUID=%s)' % encode_guid(b'u-user2'): [self.other],
+            '(objectClass=*)': [self.user] + self.groups,
+        })
+
+    def test_paged_search(self):
+        groups = [_group('group%d' % i) for i in range(SNAPSHOT_PAGE_SIZE * 2 + 1)]
+        self.ad.fake.results['(objectClass=group)'] = groups
+
+        self.assertEqual(self.ad._paged_search(BASE_DN, '(objectClass=group)'), groups)
+        self.assertEqual(self.ad.fake.paged_searches, ['(objectClass=group)'] * 3)
+
+    def test_snapshot_lookup(self):
+        self.ad.start_snapshot('cycle', [b'u-user1'])
+        self.assertEqual(self.ad.fake.paged_searches,
+                         ['(objectClass=group)', '(|(objectGUID=%s))' % encode_guid(b'u-user1')])
+
+        # The objects that are being verified and all groups are looked up in the snapshot
+        self.assertEqual(self.ad.get_person_guid(b'u-user1').dn, self.user[0])
+        self.assertEqual(self.ad.find_person('USER1').dn, self.user[0])
+        self.assertEqual(self.ad.find_group('group1').dn, self.groups[1][0])
+        self.assertEqual(self.ad.get_attributes(self.groups[2][0].upper()), self.groups[2][1])
+        self.assertEqual(self.ad.fake.searches, [])
+
+        # Other objects are still looked up in the directory
+        self.assertEqual(self.ad.get_person_guid(b'u-user2').dn, self.other[0])
+        self.assertEqual(self.ad.fake.searches, ['(objectGUID=%s)' % encode_guid(b'u-user2')])
+
+        # The groups are kept for the next chunk of the cycle, the objects of that chunk are added
+        self.ad.stop_snapshot()
+        self.ad.fake.results['(|(objectGUID=%s))' % encode_guid(b'u-user2')] = [self.other]
+        self.ad.start_snapshot('cycle', [b'u-user1', b'u-user2'])
+        self.assertEqual(self.ad.fake.paged_searches[2:], ['(|(objectGUID=%s))' % encode_guid(b'u-user2')])
+
+        # A new cycle takes a new snapshot
+        self.ad.start_snapshot('other', [])
+        self.assertEqual(self.ad.fake.paged_searches[3:], ['(objectClass=group)'])
+
+    def test_lookup_without_snapshot(self):
+        self.ad.start_snapshot('cycle', [b'u-user1'])
+        self.ad.stop_snapshot()
+
+        self.ad.get_attributes(self.groups[0][0])
+        self.assertEqual(self.ad.fake.searches, ['(objectClass=*)'])
+
+    def test_forget_after_write(self):
+        self.ad.start_snapshot('cycle', [b'u-user1'])
+
+        self.ad.set_single_attribute(self.groups[0][0], 'description', 'Changed')
+        self.ad.add_multiple_attributes(self.groups[1][0], 'member', [self.user[0]])
+        self.assertEqual(self.ad.fake.modifications, [self.groups[0][0], self.groups[1][0]])
+
+        # The changed group and its new member are looked up in the directory again, the other group is not
+        self.ad.get_attributes(self.groups[0][0])
+        self.ad.get_attributes(self.groups[1][0])
+        self.ad.get_attributes(self.user[0])
+        self.ad.get_attributes(self.groups[2][0])
+        self.assertEqual(self.ad.fake.searches, ['(objectClass=*)'] * 3)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Stands in for the HTTP session of the Kanidm API, and records the requests that were made."""
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.requests = []
+
+    def _request(self, method, url, data=None):
+        path = url.split('/', 3)[3]
+        self.requests.append((method, path))
+        return FakeResponse(self.objects.get(path) if method == 'GET' else {})
+
+    def get(self, url, params=None):
+        return self._request('GET', url)
+
+    def post(self, url, json=None):
+        return self._request('POST', url, json)
+
+    def patch(self, url, json=None):
+        return self._request('PATCH', url, json)
+
+    def delete(self, url, json=None):
+        return self._request('DELETE', url, json)
+
+
+def _kanidm_entry(uuid, name, spn):
+    return {'attrs': {'uuid': [uuid], 'name': [name], 'spn': [spn]}}
+
+
+@override_settings(CLAUDIA_KANIDM={'API_BASE': 'idm.example.com', 'API_KEY': 'secret'})
+class KanidmSnapshotTest(SimpleTestCase):
+    def setUp(self):
+        super(KanidmSnapshotTest, self).setUp()
+        self.group = _kanidm_entry('1234', 'group1', 'group1@idm.example.com')
+        self.person = _kanidm_entry('5678', 'user1', 'user1@idm.example.com')
+        self.session = FakeSession({
+            'v1/group': [self.group, _kanidm_entry('9012', 'group2', 'group2@idm.example.com')],
+            'v1/group/group1': self.group,
+            'v1/person/user1': self.person,
+            'v1/person/5678': self.person,
+        })
+        self.kanidm = KanidmAPI()
+        self.kanidm._connection_obj = self.session
+
+    def _gets(self):
+        return [path for method, path in self.session.requests if method == 'GET']
+
+    def test_snapshot_lookup(self):
+        self.kanidm.start_snapshot('cycle')
+        self.assertEqual(self._gets(), ['v1/group'])
+
+        # All groups are in the snapshot, by UUID, name and SPN
+        for key in ['1234', 'GROUP1', 'group1@idm.example.com']:
+            self.assertEqual(self.kanidm.get_unwrapped_group(key), self.group)
+        self.assertEqual(self._gets(), ['v1/group'])
+
+        # Persons are added to the snapshot after they are requested
+        self.assertEqual(self.kanidm.get_unwrapped_person('user1'), self.person)
+        self.assertEqual(self.kanidm.get_unwrapped_person('5678'), self.person)
+        self.assertEqual(self._gets(), ['v1/group', 'v1/person/user1'])
+
+        # The snapshot is reused for the same cycle
+        self.kanidm.stop_snapshot()
+        self.kanidm.start_snapshot('cycle')
+        self.assertEqual(self._gets(), ['v1/group', 'v1/person/user1'])
+
+    def test_lookup_without_snapshot(self):
+        self.kanidm.get_unwrapped_person('user1')
+        self.kanidm.get_unwrapped_person('user1')
+        self.assertEqual(self._gets(), ['v1/person/user1', 'v1/person/user1'])
+
+    def test_forget_after_write(self):
+        self.kanidm.start_snapshot('cycle')
+        self.kanidm.get_unwrapped_person('user1')
+
+        # Adding a member changes the group and the member
+        self.kanidm.add_member_to_group('group1', 'user1')
+        self.kanidm.get_unwrapped_group('group1')
+        self.kanidm.get_unwrapped_person('user1')
+        self.assertEqual(self._gets(), ['v1/group', 'v1/person/user1', 'v1/group/group1', 'v1/person/user1'])
+
+        # Renaming drops the whole snapshot, other objects may still refer to the old name
+        self.kanidm.set_person_name('user1', 'user2')
+        self.assertIsNone(self.kanidm.snapshot)
+        self.kanidm.get_unwrapped_group('group2')
+        self.assertEqual(self._gets()[-1], 'v1/group/group2')
@@ -1,14 +1,14 @@
 from django.core.exceptions import ValidationError
 from django.urls import reverse
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.template.defaultfilters import slugify
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _l, get_language
 
 from amelie.companies.managers import CompanyManager
 from amelie.calendar.managers import EventManager
-from amelie.calendar.models import Event
+from amelie.calendar.models import Event, EventIndex
 from amelie.activities.models import ActivityLabel
 from amelie.tools.discord import send_discord
 
@@ -107,6 +107,9 @@ class Company(models.Model):
     def save(self, *args, **kwargs):
         self.slug = slugify(self.name_nl)
         super(Company, self).save(*args, **kwargs)
+        EventIndex.objects.filter(event__companyevent__company=self).update(
+            organizer_nl=self.name_nl, organizer_en=self.name_en or self.name_nl
+        )
 
     def get_absolute_url(self):
         return reverse('companies:company_details', args=(), kwargs={'slug': self.slug})
@@ -219,3 +222,27 @@ class CompanyEvent(Event):
         return self.visible_from <= timezone.now() <= self.visible_till
 
 post_save.connect(send_discord, sender=CompanyEvent)
+
+
+def _remember_company_events(sender, instance, **kwargs):
+    """
+    Remember the events of a company before it is deleted. Deleting a company sets the company of its events to NULL
+    without saving them, so their entries in the event index still show the name of the company.
+
+    Call from pre_delete signal.
+    """
+    instance._index_event_ids = list(CompanyEvent.objects.filter(company=instance).values_list('pk', flat=True))
+
+
+def _company_deleted(sender, instance, **kwargs):
+    """
+    Update the event index entries of the events of a deleted company.
+
+    Call from post_delete signal.
+    """
+    for event in CompanyEvent.objects.filter(pk__in=getattr(instance, '_index_event_ids', [])):
+        EventIndex.objects.update_event(event)
+
+
+pre_delete.connect(_remember_company_events, sender=Company)
+post_delete.connect(_company_deleted, sender=Company)
@@ -18,7 +18,7 @@ from amelie.members.models import Committee
 from amelie.statistics.decorators import track_hits
 from amelie.tools.decorators import require_board, require_committee
 from amelie.tools.forms import PeriodForm
-from amelie.tools.calendar import ical_calendar
+from amelie.tools.calendar import ical_calendar, ical_feed_response
 from amelie.tools.http import HttpJSONResponse
 from amelie.tools.mixins import RequireBoardMixin, RequireCommitteeMixin
 
@@ -335,11 +335,8 @@ def event_old(request):
 
 def company_events_ics(request):
     """ Will return an ics file containing all the CompanyEvents. """
-    resp = HttpResponse(content_type='text/calendar; charset=UTF-8')
-    resp.write(ical_calendar(_l('Inter-Actief external activities'), CompanyEvent.objects.filter(
-        begin__gte=timezone.now() - datetime.timedelta(100)).order_by('begin')))
-
-    return resp
+    return ical_feed_response(request, _l('Inter-Actief external activities'), CompanyEvent.objects.filter(
+        begin__gte=timezone.now() - datetime.timedelta(100)).order_by('begin'))
 
 
 def company_event_ics(request, id):
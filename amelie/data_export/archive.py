@@ -0,0 +1,119 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP_STORED
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Files with these extensions are compressed already, so they are stored in the archive as they are
+COMPRESSED_EXTENSIONS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.heic', '.mp3', '.mp4', '.m4a', '.mov', '.avi', '.mkv', '.webm',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.pdf', '.docx', '.xlsx', '.pptx', '.odt', '.ods', '.odp',
+}
+
+# Number of records that is read from the database at once
+CHUNK_SIZE = 500
+
+# Size of the blocks in which streams are copied into the archive
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+class ExportArchive:
+    """
+    The zip file of a data export, which all exporters of the export write into, possibly at the same time.
+
+    A zip file can only write one entry at a time, so every entry is written while holding a lock. Records and
+    downloads are spooled to a temporary file first, so the archive is only locked while they are copied into it.
+    Records, files and downloads are streamed, so the memory that is used does not depend on the size of the export.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.zipfile = ZipFile(path, 'w', compression=ZIP_DEFLATED, allowZip64=True)
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.zipfile.close()
+
+    @staticmethod
+    def compress_type(arcname):
+        """Already compressed media is stored, everything else is deflated."""
+        return ZIP_STORED if os.path.splitext(arcname)[1].lower() in COMPRESSED_EXTENSIONS else ZIP_DEFLATED
+
+    @contextlib.contextmanager
+    def open(self, arcname):
+        """
+        Open a new entry in the archive to write bytes to. The archive is locked until the entry is closed, so the
+        data should be available right away, like a spooled temporary file.
+        """
+        info = ZipInfo(arcname, date_time=time.localtime()[:6])
+        info.compress_type = self.compress_type(arcname)
+        with self.lock, self.zipfile.open(info, 'w', force_zip64=True) as entry:
+            yield entry
+
+    @contextlib.contextmanager
+    def open_text(self, arcname, tempdir=None):
+        """
+        Open a new entry in the archive to write UTF-8 text to. The text is spooled to a temporary file, so the
+        archive is not locked while the text is produced, like while records are read from the database.
+        """
+        with tempfile.TemporaryFile(dir=tempdir) as spool:
+            text = io.TextIOWrapper(spool, encoding='utf-8', newline='')
+            yield text
+            text.flush()
+            text.detach()
+            self._write_spool(arcname, spool)
+
+    def _write_spool(self, arcname, spool):
+        spool.seek(0)
+        with self.open(arcname) as entry:
+            shutil.copyfileobj(spool, entry, COPY_BUFFER_SIZE)
+
+    def write_bytes(self, arcname, data):
+        with self.lock:
+            self.zipfile.writestr(arcname, data, compress_type=self.compress_type(arcname))
+
+    def write_json(self, arcname, data):
+        """Write a JSON document, which should be small, like the details of a single object."""
+        self.write_bytes(arcname, json.dumps(data, indent=2, sort_keys=True, cls=DjangoJSONEncoder))
+
+    def write_jsonl(self, arcname, records, tempdir=None):
+        """Write an iterable of records (dictionaries) as JSON Lines, one record per line."""
+        with self.open_text(arcname, tempdir) as text:
+            for record in records:
+                text.write(json.dumps(record, sort_keys=True, cls=DjangoJSONEncoder))
+                text.write('\n')
+
+    def write_csv(self, arcname, fieldnames, rows, tempdir=None):
+        """Write an iterable of rows (dictionaries with the given field names) as CSV, with a header."""
+        with self.open_text(arcname, tempdir) as text:
+            writer = csv.DictWriter(text, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def write_file(self, arcname, path):
+        """Copy a file from disk into the archive."""
+        with self.lock:
+            self.zipfile.write(path, arcname, compress_type=self.compress_type(arcname))
+
+    def write_stream(self, arcname, chunks, tempdir=None):
+        """
+        Write an iterable of byte strings, like a download, into the archive. The chunks are spooled to a temporary
+        file first, so that a slow download does not keep the other exporters from writing to the archive.
+        """
+        with tempfile.TemporaryFile(dir=tempdir) as spool:
+            for chunk in chunks:
+                spool.write(chunk)
+            self._write_spool(arcname, spool)
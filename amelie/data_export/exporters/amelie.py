@@ -1,94 +1,44 @@
 import os
 
-import json
 from django.utils.translation import gettext_lazy as _l
 from oauth2_provider.models import Application, AccessToken, Grant
-from zipfile import ZipFile
 
 from amelie.claudia.models import Mapping, Timeline, Event as ClaudiaEvent
+from amelie.data_export.archive import CHUNK_SIZE
 from amelie.data_export.exporters.exporter import DataExporter
 from amelie.personal_tab.models import ReversalTransaction, DebtCollectionTransaction, CustomTransaction, \
-    CookieCornerTransaction, ContributionTransaction, AlexiaTransaction, ActivityTransaction
+    CookieCornerTransaction, ContributionTransaction, AlexiaTransaction, ActivityTransaction, \
+    DebtCollectionInstruction
+
+# Fields of every transaction in the personal tab export
+TRANSACTION_FIELDS = ['date', 'price', 'description', 'discount', 'debt_collection', 'added_on']
 
 
 class AmelieDataExporter(DataExporter):
-    def export_data(self):
-        self.log.debug("Exporting amelie data for {} to {}".format(self.data_export.person, self.filename))
-
-        with ZipFile(self.filename, 'w') as export_file:
-            export_claudia, files_claudia = self.export_claudia()
-            export_file.writestr(
-                'account.json',
-                json.dumps(export_claudia, indent=2, sort_keys=True)
-            )
-            for file in files_claudia:
-                filename = os.path.basename(file)
-                export_file.write(file, arcname=os.path.join("account_files", filename))
-
-            export_calendar, files_calendar = self.export_calendar()
-            export_file.writestr(
-                'enrollments.json',
-                json.dumps(export_calendar, indent=2, sort_keys=True)
-            )
-            for file in files_calendar:
-                filename = os.path.basename(file)
-                export_file.write(file, arcname=os.path.join("enrollments_files", filename))
-
-            export_room_duty, files_room_duty = self.export_roomduty()
-            export_file.writestr(
-                'room_duty.json',
-                json.dumps(export_room_duty, indent=2, sort_keys=True)
-            )
-            for file in files_room_duty:
-                filename = os.path.basename(file)
-                export_file.write(file, arcname=os.path.join("room_duty_files", filename))
-
-            export_member, files_member = self.export_member()
-            export_file.writestr(
-                'member.json',
-                json.dumps(export_member, indent=2, sort_keys=True)
-            )
-            for file in files_member:
-                filename = os.path.basename(file)
-                export_file.write(file, arcname=os.path.join("member_files", filename))
-
-            export_news, files_news = self.export_news()
-            export_file.writestr(
-                'news.json',
-                json.dumps(export_news, indent=2, sort_keys=True)
-            )
-            for file in files_news:
-                filename = os.path.basename(file)
-                export_file.write(file, arcname=os.path.join("news_files", filename))
-
-            export_oauth, files_oauth = self.export_oauth()
-            export_file.writestr(
-                'oauth.json',
-                json.dumps(export_oauth, indent=2, sort_keys=True)
-            )
-            for file in files_oauth:
-                filename = os.path.basename(file)
-                export_file.write(file, arcname=os.path.join("oauth_files", filename))
-
-            export_education, files_education = self.export_education()
-            export_file.writestr(
-                'education.json',
-                json.dumps(export_education, indent=2, sort_keys=True)
-            )
-            for file in files_education:
+    def export_data(self, archive):
+        self.log.debug("Exporting amelie data for {} to {}".format(self.data_export.person, archive.path))
+
+        # Small parts of the export are written as a JSON document, together with the files they refer to
+        for name, export in [('account', self.export_claudia), ('room_duty', self.export_roomduty),
+                             ('member', self.export_member), ('oauth', self.export_oauth),
+                             ('education', self.export_education), ('personal_tab', self.export_personal_tab)]:
+            data, files = export()
+            archive.write_json(self.arcname('{}.json'.format(name)), data)
+            for file in files:
                 filename = os.path.basename(file)
-                export_file.write(file, arcname=os.path.join("education_files", filename))
-
-            export_personal_tab, files_personal_tab = self.export_personal_tab()
-            export_file.writestr(
-                'personal_tab.json',
-                json.dumps(export_personal_tab, indent=2, sort_keys=True)
-            )
-            for file in files_personal_tab:
-                filename = os.path.basename(file)
-                export_file.write(file, arcname=os.path.join("personal_tab_files", filename))
+                archive.write_file(self.arcname("{}_files".format(name), filename), file)
+
+        # Parts that grow with the history of the person are streamed as JSON Lines or CSV, one record per line
+        self.export_timeline(archive)
+        self.export_calendar(archive)
+        self.export_news(archive)
+        self.export_transactions(archive)
+        self.export_debt_collection_instructions(archive)
 
-        return self.filename
+        return True
+
+    def _records(self, queryset):
+        return queryset.iterator(chunk_size=CHUNK_SIZE)
 
     def export_claudia(self):
         claudia_data = {}
@@ -100,15 +50,6 @@ class AmelieDataExporter(DataExporter):
             claudia_data['groups'] = [str(x) for x in claudia_mapping.groups('all')]
             claudia_data['aliases'] = [str(x) for x in claudia_mapping.aliases()]
 
-            # - Timeline entries that belong to these Mappings
-            person_timeline_entries = Timeline.objects.filter(mapping=claudia_mapping)
-            claudia_data['timeline'] = [{
-                'datetime': str(timeline.datetime),
-                'name': str(timeline.name),
-                'type': str(timeline.type),
-                'description': str(timeline.description)
-            } for timeline in person_timeline_entries]
-
             # - Events that are scheduled for these Mappings
             person_events = ClaudiaEvent.objects.filter(mapping=claudia_mapping)
             claudia_data['scheduled_events'] = [{
@@ -118,12 +59,24 @@ class AmelieDataExporter(DataExporter):
 
         return claudia_data, []
 
-    def export_calendar(self):
-        calendar_data = {'enrollments': []}
+    def export_timeline(self, archive):
+        # - Timeline entries that belong to the Mapping of the person
+        claudia_mapping = Mapping.find(self.data_export.person)
+        if claudia_mapping:
+            archive.write_jsonl(self.arcname('account_timeline.jsonl'), ({
+                'datetime': str(timeline.datetime),
+                'name': str(timeline.name),
+                'type': str(timeline.type),
+                'description': str(timeline.description)
+            } for timeline in self._records(Timeline.objects.filter(mapping=claudia_mapping))))
 
+    def export_calendar(self, archive):
         # - Events for which the person enrolled and the options they gave for it.
-        person_enrollments = self.data_export.person.participation_set.all()
-        for enrollment in person_enrollments:
+        person_enrollments = self.data_export.person.participation_set.select_related('event').prefetch_related(
+            'enrollmentoptionanswer_set__enrollmentoption'
+        )
+
+        def _enrollment(enrollment):
             enrollment_data = {
                 'remark': str(enrollment.remark),
                 'payment_method': str(enrollment.get_payment_method_display()),
@@ -134,7 +87,7 @@ class AmelieDataExporter(DataExporter):
                 enrollment_data['event'] = "{} ({} - {})".format(enrollment.event.summary, enrollment.event.begin,
                                                                  enrollment.event.end)
             else:
-                enrollment_data['event'] = _l('deleted activity')
+                enrollment_data['event'] = str(_l('deleted activity'))
 
             for enrollment_option_answer in enrollment.enrollmentoptionanswer_set.all():
                 enrollment_data['enrollment_options'].append({
@@ -142,10 +95,10 @@ class AmelieDataExporter(DataExporter):
                     'answer': str(enrollment_option_answer.display_answer),
                     'price': str(enrollment_option_answer.get_price_extra()),
                 })
+            return enrollment_data
 
-            calendar_data['enrollments'].append(enrollment_data)
-
-        return calendar_data, []
+        archive.write_jsonl(self.arcname('enrollments.jsonl'),
+                            (_enrollment(enrollment) for enrollment in self._records(person_enrollments)))
 
     def export_roomduty(self):
         person_room_duty_pools = self.data_export.person.room_duty_pools.all()
@@ -280,19 +233,17 @@ class AmelieDataExporter(DataExporter):
 
         return member_data, member_files
 
-    def export_news(self):
-        return {
-            'news_posts': [{
-                'publication_date': str(post.publication_date),
-                'title_nl': str(post.title_nl),
-                'title_en': str(post.title_en),
-                'slug': str(post.slug),
-                'introduction_nl': str(post.introduction_nl),
-                'introduction_en': str(post.introduction_en),
-                'content_nl': str(post.content_nl),
-                'content_en': str(post.content_en),
-            } for post in self.data_export.person.newsitem_set.all()]
-        }, []
+    def export_news(self, archive):
+        archive.write_jsonl(self.arcname('news.jsonl'), ({
+            'publication_date': str(post.publication_date),
+            'title_nl': str(post.title_nl),
+            'title_en': str(post.title_en),
+            'slug': str(post.slug),
+            'introduction_nl': str(post.introduction_nl),
+            'introduction_en': str(post.introduction_en),
+            'content_nl': str(post.content_nl),
+            'content_en': str(post.content_en),
+        } for post in self._records(self.data_export.person.newsitem_set.all())))
 
     def export_oauth(self):
         person = self.data_export.person
@@ -369,73 +320,8 @@ class AmelieDataExporter(DataExporter):
                 'description': str(credit.description),
                 'discount': str(credit.discount) if credit.discount else None,
                 'added_on': str(credit.added_on),
-            } for credit in person.discountcredit_set.all()],
-            'transactions': {
-                'activty_transactions': [{
-                    'date': str(transaction.date),
-                    'price': str(transaction.price),
-                    'description': str(transaction.description),
-                    'discount': str(transaction.discount) if transaction.discount else None,
-                    'debt_collection': str(transaction.debt_collection) if transaction.debt_collection else None,
-                    'added_on': str(transaction.added_on),
-                    'event': str(transaction.event),
-                    'participation': str(transaction.participation),
-                    'has_enrollment_options': transaction.with_enrollment_options,
-                } for transaction in ActivityTransaction.objects.filter(person=person)],
-                'alexia_transactions': [{
-                    'date': str(transaction.date),
-                    'price': str(transaction.price),
-                    'description': str(transaction.description),
-                    'discount': str(transaction.discount) if transaction.discount else None,
-                    'debt_collection': str(transaction.debt_collection) if transaction.debt_collection else None,
-                    'added_on': str(transaction.added_on),
-                    'alexia_id': transaction.transaction_id,
-                } for transaction in AlexiaTransaction.objects.filter(person=person)],
-                'contribution_transactions': [{
-                    'date': str(transaction.date),
-                    'price': str(transaction.price),
-                    'description': str(transaction.description),
-                    'discount': str(transaction.discount) if transaction.discount else None,
-                    'debt_collection': str(transaction.debt_collection) if transaction.debt_collection else None,
-                    'added_on': str(transaction.added_on),
-                    'membership': str(transaction.membership)
-                } for transaction in ContributionTransaction.objects.filter(person=person)],
-                'cookie_corner_transactions': [{
-                    'date': str(transaction.date),
-                    'price': str(transaction.price),
-                    'description': str(transaction.description),
-                    'discount': str(transaction.discount) if transaction.discount else None,
-                    'debt_collection': str(transaction.debt_collection) if transaction.debt_collection else None,
-                    'added_on': str(transaction.added_on),
-                    'article': str(transaction.article),
-                    'amount': str(transaction.amount),
-                } for transaction in CookieCornerTransaction.objects.filter(person=person)],
-                'custom_transactions': [{
-                    'date': str(transaction.date),
-                    'price': str(transaction.price),
-                    'description': str(transaction.description),
-                    'discount': str(transaction.discount) if transaction.discount else None,
-                    'debt_collection': str(transaction.debt_collection) if transaction.debt_collection else None,
-                    'added_on': str(transaction.added_on),
-                } for transaction in CustomTransaction.objects.filter(person=person)],
-                'debt_collection_transactions': [{
-                    'date': str(transaction.date),
-                    'price': str(transaction.price),
-                    'description': str(transaction.description),
-                    'discount': str(transaction.discount) if transaction.discount else None,
-                    'debt_collection': str(transaction.debt_collection) if transaction.debt_collection else None,
-                    'added_on': str(transaction.added_on),
-                } for transaction in DebtCollectionTransaction.objects.filter(person=person)],
-                'reversal_transactions': [{
-                    'date': str(transaction.date),
-                    'price': str(transaction.price),
-                    'description': str(transaction.description),
-                    'discount': str(transaction.discount) if transaction.discount else None,
-                    'debt_collection': str(transaction.debt_collection) if transaction.debt_collection else None,
-                    'added_on': str(transaction.added_on),
-                    'reversal': str(transaction.reversal),
-                } for transaction in ReversalTransaction.objects.filter(person=person)],
-            },
+            } for credit in person.discountcredit_set.select_related('discount_period',
+                                                                     'discount__discount_period')],
             'rfid_cards': [{
                 'code': str(card),
                 'active': card.active,
@@ -458,26 +344,78 @@ class AmelieDataExporter(DataExporter):
                     'other_bank': amendment.other_bank,
                     'reason': str(amendment.reason),
                 } for amendment in authorization.amendments.all()],
-                'debt_collection_instructions': [{
-                    'reference': str(instruction.debt_collection_reference()),
-                    'batch': str(instruction.batch),
-                    'end_to_end_id': str(instruction.end_to_end_id),
-                    'description': str(instruction.description),
-                    'amount': str(instruction.amount),
-                    'amendment': {
-                        'date': str(instruction.amendment.date),
-                        'previous_iban': str(instruction.amendment.previous_iban),
-                        'previous_bic': str(instruction.amendment.previous_bic),
-                        'other_bank': instruction.amendment.other_bank,
-                        'reason': str(instruction.amendment.reason),
-                    } if instruction.amendment else None,
-                    'reversal': {
-                        'date': str(instruction.reversal.date),
-                        'pre_settlement': instruction.reversal.pre_settlement,
-                        'reason': str(instruction.reversal.get_reason_display()),
-                    } if hasattr(instruction, 'reversal') else None,
-                } for instruction in authorization.instructions.all()],
-            } for authorization in person.authorization_set.all()],
+            } for authorization in person.authorization_set.select_related('authorization_type').prefetch_related(
+                'amendments')],
         }
 
         return personal_tab_data, []
+
+    def export_transactions(self, archive):
+        person = self.data_export.person
+
+        # Per type of transaction: the file name, the queryset and the fields besides TRANSACTION_FIELDS
+        transaction_types = [
+            ('activity_transactions',
+             ActivityTransaction.objects.select_related('event', 'participation__person', 'participation__event'), {
+                 'event': lambda transaction: str(transaction.event),
+                 'participation': lambda transaction: str(transaction.participation),
+                 'has_enrollment_options': lambda transaction: transaction.with_enrollment_options,
+             }),
+            ('alexia_transactions', AlexiaTransaction.objects.all(), {
+                'alexia_id': lambda transaction: transaction.transaction_id,
+            }),
+            ('contribution_transactions',
+             ContributionTransaction.objects.select_related('membership__member', 'membership__type'), {
+                 'membership': lambda transaction: str(transaction.membership),
+             }),
+            ('cookie_corner_transactions', CookieCornerTransaction.objects.select_related('article'), {
+                'article': lambda transaction: str(transaction.article),
+                'amount': lambda transaction: str(transaction.amount),
+            }),
+            ('custom_transactions', CustomTransaction.objects.all(), {}),
+            ('debt_collection_transactions', DebtCollectionTransaction.objects.all(), {}),
+            ('reversal_transactions', ReversalTransaction.objects.select_related('reversal'), {
+                'reversal': lambda transaction: str(transaction.reversal),
+            }),
+        ]
+
+        for name, queryset, fields in transaction_types:
+            transactions = queryset.filter(person=person).select_related('discount__discount_period',
+                                                                         'debt_collection')
+            rows = ({
+                'date': str(transaction.date),
+                'price': str(transaction.price),
+                'description': str(transaction.description),
+                'discount': str(transaction.discount) if transaction.discount else None,
+                'debt_collection': str(transaction.debt_collection) if transaction.debt_collection else None,
+                'added_on': str(transaction.added_on),
+                **{field: value(transaction) for field, value in fields.items()},
+            } for transaction in self._records(transactions))
+            archive.write_csv(self.arcname('personal_tab', '{}.csv'.format(name)), TRANSACTION_FIELDS + list(fields),
+                              rows)
+
+    def export_debt_collection_instructions(self, archive):
+        instructions = DebtCollectionInstruction.objects.filter(
+            authorization__person=self.data_export.person
+        ).select_related('authorization', 'batch', 'amendment', 'reversal')
+
+        archive.write_jsonl(self.arcname('personal_tab', 'debt_collection_instructions.jsonl'), ({
+            'authorization': str(instruction.authorization.authorization_reference()),
+            'reference': str(instruction.debt_collection_reference()),
+            'batch': str(instruction.batch),
+            'end_to_end_id': str(instruction.end_to_end_id),
+            'description': str(instruction.description),
+            'amount': str(instruction.amount),
+            'amendment': {
+                'date': str(instruction.amendment.date),
+                'previous_iban': str(instruction.amendment.previous_iban),
+                'previous_bic': str(instruction.amendment.previous_bic),
+                'other_bank': instruction.amendment.other_bank,
+                'reason': str(instruction.amendment.reason),
+            } if instruction.amendment else None,
+            'reversal': {
+                'date': str(instruction.reversal.date),
+                'pre_settlement': instruction.reversal.pre_settlement,
+                'reason': str(instruction.reversal.get_reason_display()),
+            } if hasattr(instruction, 'reversal') else None,
+        } for instruction in self._records(instructions)))
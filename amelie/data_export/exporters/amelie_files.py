@@ -1,8 +1,7 @@
-import json
 import os
-from zipfile import ZipFile
 
 from amelie.files.models import Attachment
+from amelie.data_export.archive import CHUNK_SIZE
 from amelie.data_export.exporters.exporter import DataExporter
 from amelie.members.models import Photographer
 
@@ -10,29 +9,22 @@ from amelie.members.models import Photographer
 class AmelieFilesDataExporter(DataExporter):
     default_enabled = False
 
-    def export_data(self):
-        self.log.debug("Exporting amelie files for {} to {}".format(self.data_export.person, self.filename))
+    def export_data(self, archive):
+        self.log.debug("Exporting amelie files for {} to {}".format(self.data_export.person, archive.path))
 
-        with ZipFile(self.filename, 'w') as export_file:
+        attachments = Attachment.objects.filter(owner__person=self.data_export.person)
 
-            attachments = Attachment.objects.filter(owner__person=self.data_export.person)
+        # Photos and other media are stored as they are, recompressing them only takes time
+        for attachment in attachments.iterator(chunk_size=CHUNK_SIZE):
+            archive.write_file(self.arcname("files", os.path.basename(attachment.file.path)), attachment.file.path)
 
-            attachment_data = {'files': []}
-            for attachment in attachments:
-                filename = os.path.basename(attachment.file.path)
-                export_file.write(attachment.file.path, arcname=os.path.join("files", filename))
-                attachment_data['files'].append({
-                    'filename': filename,
-                    'caption': str(attachment.caption),
-                    'mimetype': str(attachment.mimetype),
-                    'created_on': str(attachment.created),
-                    'last_modified': str(attachment.modified),
-                    'public': attachment.public,
-                })
+        archive.write_jsonl(self.arcname('files.jsonl'), ({
+            'filename': os.path.basename(attachment.file.path),
+            'caption': str(attachment.caption),
+            'mimetype': str(attachment.mimetype),
+            'created_on': str(attachment.created),
+            'last_modified': str(attachment.modified),
+            'public': attachment.public,
+        } for attachment in attachments.iterator(chunk_size=CHUNK_SIZE)))
 
-            export_file.writestr(
-                'files.json',
-                json.dumps(attachment_data, indent=2, sort_keys=True)
-            )
-
-        return self.filename
+        return True
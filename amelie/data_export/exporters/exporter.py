@@ -1,7 +1,7 @@
 import logging
 import os
+import posixpath
 import shutil
-from typing import Optional
 
 from django.conf import settings
 
@@ -16,22 +16,29 @@ class DataExporter:
         :type data_export: amelie.data_export.models.DataExport
         """
         self.data_export = data_export
-        self.filename = os.path.join(settings.DATA_EXPORT_ROOT,
-                                     "{}-{}.zip".format(data_export.download_code, self.__class__.__name__))
-        self.tempdir = os.path.join(settings.DATA_EXPORT_ROOT, str(data_export.download_code))
+        self.tempdir = os.path.join(settings.DATA_EXPORT_ROOT, str(data_export.download_code),
+                                    self.__class__.__name__)
         self.log = logging.getLogger(__name__)
 
         # Create temporary directory
         os.makedirs(self.tempdir)
 
-    def export_data(self) -> Optional[str]:
+    def arcname(self, *parts):
         """
-        Export data from this application to a .zip file specified by self.filename.
-        Returns the file name if it has exported a file to that location.
+        Gives the name of a file of this exporter in the archive of the data export.
+        """
+        return posixpath.join(self.__class__.__name__, *parts)
+
+    def export_data(self, archive) -> bool:
+        """
+        Export data from this application into the archive of the data export, in the files given by self.arcname.
+        Other exporters may write to the same archive at the same time.
 
-        :return The file name if it has exported a file to that location or None if no file was exported.
+        :param archive: The archive of the data export.
+        :type archive: amelie.data_export.archive.ExportArchive
+        :return True if data was exported, False if this application has no data on the person.
         """
-        pass
+        return False
 
     def post_export_cleanup(self):
         """
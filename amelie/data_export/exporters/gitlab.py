@@ -1,21 +1,18 @@
-import json
-import os
-from zipfile import ZipFile
-
 import gitlab
 from django.conf import settings
 
+from amelie.data_export.archive import COPY_BUFFER_SIZE
 from amelie.data_export.exporters.exporter import DataExporter
 
 
 class GitLabDataExporter(DataExporter):
-    def export_data(self):
-        self.log.debug("Exporting gitlab data for {} to {}".format(self.data_export.person, self.filename))
+    def export_data(self, archive):
+        self.log.debug("Exporting gitlab data for {} to {}".format(self.data_export.person, archive.path))
 
         ad_name = self.data_export.person.get_adname()
 
         if not ad_name:
-            return None
+            return False
 
         server = settings.CLAUDIA_GITLAB['SERVER']
         token = settings.CLAUDIA_GITLAB['TOKEN']
@@ -25,66 +22,60 @@ class GitLabDataExporter(DataExporter):
 
         git_user_list = git.users.list(username=ad_name)
         if not git_user_list:
-            return None
+            return False
 
         git_user = git_user_list[0]
 
         user_data = self.download_user_data(git_user)
 
-        with ZipFile(self.filename, mode='w') as zip_file:
-            zip_file.writestr('metadata.json', json.dumps(user_data, indent=2, sort_keys=True))
-
-            for project_id, project_info in user_data['projects'].items():
-                name = project_info['path']
-                path = '/projects/{}/snapshot'.format(project_id)
-                project = git.projects.get(project_id)
-
-                zip_file.writestr(
-                    os.path.join(name, 'snapshot.tar'),
-                    git.http_get(path, wiki=True).content
-                )
-                zip_file.writestr(
-                    os.path.join(name, 'files.tar.gz'),
-                    project.repository_archive()
-                )
-                zip_file.writestr(
-                    os.path.join(name, 'project.json'),
-                    json.dumps({
-                        'id': project_id,
-                        'commits': self.list_sub_objects(project.commits, [
-                            'short_id', 'title', 'created_at', 'parent_ids', 'message', 'author_name', 'author_email',
-                            'authored_date', 'committer_name', 'committer_email', 'committed_date'
-                        ]),
-                        'branches': self.list_sub_objects(project.branches, [
-                            'name', 'commit', 'merged', 'protected', 'developers_can_push', 'developers_can_merge'
-                        ]),
-                        'members': self.list_sub_objects(project.members, ['access_level', 'state']),
-                        # 'customattributes': self.list_sub_objects(project.customattributes),
-                        # 'deployments': self.list_sub_objects(project.deployments),
-                        # 'environments': self.list_sub_objects(project.environments),
-                        # 'events': self.list_sub_objects(project.events),
-                        # 'hooks': self.list_sub_objects(project.hooks),
-                        # 'issues': self.list_sub_objects(project.issues),
-                        # 'jobs': self.list_sub_objects(project.jobs),
-                        'keys': self.list_sub_objects(project.keys, ['title', 'key', 'created_at']),
-                        # 'labels': self.list_sub_objects(project.labels),
-                        # 'mergerequests': self.list_sub_objects(project.mergerequests),
-                        # 'milestones': self.list_sub_objects(project.milestones),
-                        # 'pipelines': self.list_sub_objects(project.pipelines),
-                        # 'pipelineschedules': self.list_sub_objects(project.pipelineschedules),
-                        'protectedbranches': self.list_sub_objects(project.protectedbranches, [
-                            "merge_access_levels", "push_access_levels"]),
-                        'runners': self.list_sub_objects(project.runners, [
-                            "active", "description", "is_shared", "name", "online",
-                            "status"]),
-                        # 'snippets': self.list_sub_objects(project.snippets),
-                        # 'tags': self.list_sub_objects(project.tags),
-                        # 'variables': self.list_sub_objects(project.variables),
-                        # 'wikis': self.list_sub_objects(project.wikis),
-                    }, indent=2, sort_keys=True)
-                )
-
-        return self.filename
+        archive.write_json(self.arcname('metadata.json'), user_data)
+
+        for project_id, project_info in user_data['projects'].items():
+            name = project_info['path']
+            path = '/projects/{}/snapshot'.format(project_id)
+            project = git.projects.get(project_id)
+
+            # Repositories can be large, so they are downloaded in chunks instead of in memory
+            snapshot = git.http_get(path, wiki=True, streamed=True)
+            archive.write_stream(self.arcname(name, 'snapshot.tar'), snapshot.iter_content(COPY_BUFFER_SIZE),
+                                 tempdir=self.tempdir)
+            archive.write_stream(self.arcname(name, 'files.tar.gz'),
+                                 project.repository_archive(streamed=True, iterator=True), tempdir=self.tempdir)
+            archive.write_json(self.arcname(name, 'project.json'), {
+                'id': project_id,
+                'commits': self.list_sub_objects(project.commits, [
+                    'short_id', 'title', 'created_at', 'parent_ids', 'message', 'author_name', 'author_email',
+                    'authored_date', 'committer_name', 'committer_email', 'committed_date'
+                ]),
+                'branches': self.list_sub_objects(project.branches, [
+                    'name', 'commit', 'merged', 'protected', 'developers_can_push', 'developers_can_merge'
+                ]),
+                'members': self.list_sub_objects(project.members, ['access_level', 'state']),
+                # 'customattributes': self.list_sub_objects(project.customattributes),
+                # 'deployments': self.list_sub_objects(project.deployments),
+                # 'environments': self.list_sub_objects(project.environments),
+                # 'events': self.list_sub_objects(project.events),
+                # 'hooks': self.list_sub_objects(project.hooks),
+                # 'issues': self.list_sub_objects(project.issues),
+                # 'jobs': self.list_sub_objects(project.jobs),
+                'keys': self.list_sub_objects(project.keys, ['title', 'key', 'created_at']),
+                # 'labels': self.list_sub_objects(project.labels),
+                # 'mergerequests': self.list_sub_objects(project.mergerequests),
+                # 'milestones': self.list_sub_objects(project.milestones),
+                # 'pipelines': self.list_sub_objects(project.pipelines),
+                # 'pipelineschedules': self.list_sub_objects(project.pipelineschedules),
+                'protectedbranches': self.list_sub_objects(project.protectedbranches, [
+                    "merge_access_levels", "push_access_levels"]),
+                'runners': self.list_sub_objects(project.runners, [
+                    "active", "description", "is_shared", "name", "online",
+                    "status"]),
+                # 'snippets': self.list_sub_objects(project.snippets),
+                # 'tags': self.list_sub_objects(project.tags),
+                # 'variables': self.list_sub_objects(project.variables),
+                # 'wikis': self.list_sub_objects(project.wikis),
+            })
+
+        return True
 
     @staticmethod
     def download_user_data(git_user):
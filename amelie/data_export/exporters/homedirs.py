@@ -2,7 +2,6 @@ import os
 import time
 
 import requests
-import shutil
 
 from django.conf import settings
 
@@ -16,13 +15,13 @@ class DataHoarderError(Exception):
 class HomedirDataExporter(DataExporter):
     default_enabled = False
 
-    def export_data(self):
-        self.log.debug("Exporting home directory for {} to {}".format(self.data_export.person, self.filename))
+    def export_data(self, archive):
+        self.log.debug("Exporting home directory for {} to {}".format(self.data_export.person, archive.path))
 
         # Check if user is active. If not, this exporter cannot return anything.
         ad_name = self.data_export.person.get_adname()
         if not ad_name:
-            return None
+            return False
 
         data_hoarder_url = settings.DATA_HOARDER_CONFIG['url']
         data_hoarder_key = settings.DATA_HOARDER_CONFIG['key']
@@ -53,8 +52,9 @@ class HomedirDataExporter(DataExporter):
             elif data['status'] == 3:
                 raise DataHoarderError(data['error_msg'])
 
-        # Copy the file from the data hoarder dir to the filename required by the script and remove the source file.
-        shutil.copy(os.path.join(data_hoarder_basedir, data['filename']), self.filename)
+        # Add the file from the data hoarder dir to the archive and remove the source file.
+        archive.write_file(self.arcname(os.path.basename(data['filename'])),
+                           os.path.join(data_hoarder_basedir, data['filename']))
         os.remove(os.path.join(data_hoarder_basedir, data['filename']))
 
-        return self.filename
+        return True
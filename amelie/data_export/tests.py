@@ -1,3 +1,81 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from zipfile import ZipFile, ZIP_DEFLATED, ZIP_STORED
 
-# Create your tests here.
+from amelie.data_export.archive import ExportArchive
+from amelie.tools.tests import TestCase
+
+
+class ExportArchiveTest(TestCase):
+    def setUp(self):
+        super(ExportArchiveTest, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'export.zip')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+        super(ExportArchiveTest, self).tearDown()
+
+    def test_records(self):
+        with ExportArchive(self.path) as archive:
+            archive.write_json('data/member.json', {'name': 'Test'})
+            archive.write_jsonl('data/news.jsonl', ({'id': i} for i in range(3)))
+            archive.write_csv('data/transactions.csv', ['date', 'price'],
+                              ({'date': '2026-01-0{}'.format(i), 'price': '1.50'} for i in range(1, 3)))
+
+        with ZipFile(self.path) as zipfile:
+            self.assertEqual(json.loads(zipfile.read('data/member.json')), {'name': 'Test'})
+            self.assertEqual([json.loads(line) for line in zipfile.read('data/news.jsonl').splitlines()],
+                             [{'id': 0}, {'id': 1}, {'id': 2}])
+            rows = list(csv.DictReader(io.StringIO(zipfile.read('data/transactions.csv').decode())))
+            self.assertEqual(rows, [{'date': '2026-01-01', 'price': '1.50'}, {'date': '2026-01-02', 'price': '1.50'}])
+
+    def test_records_outside_lock(self):
+        with ExportArchive(self.path) as archive:
+            def _records():
+                for i in range(3):
+                    # Other exporters can write to the archive while the records are read
+                    self.assertFalse(archive.lock.locked())
+                    yield {'id': i}
+
+            archive.write_jsonl('data/news.jsonl', _records(), tempdir=self.tempdir)
+            archive.write_csv('data/news.csv', ['id'], _records(), tempdir=self.tempdir)
+
+        with ZipFile(self.path) as zipfile:
+            self.assertEqual(len(zipfile.read('data/news.jsonl').splitlines()), 3)
+            self.assertEqual(len(zipfile.read('data/news.csv').splitlines()), 4)
+
+    def test_compression(self):
+        photo = os.path.join(self.tempdir, 'photo.JPG')
+        with open(photo, 'wb') as photo_file:
+            photo_file.write(os.urandom(1024))
+
+        with ExportArchive(self.path) as archive:
+            archive.write_file('files/photo.JPG', photo)
+            archive.write_stream('files/notes.txt', [b'note ' * 100, b'end'], tempdir=self.tempdir)
+
+        # Media that is compressed already is stored as it is
+        with ZipFile(self.path) as zipfile:
+            self.assertEqual(zipfile.getinfo('files/photo.JPG').compress_type, ZIP_STORED)
+            self.assertEqual(zipfile.getinfo('files/notes.txt').compress_type, ZIP_DEFLATED)
+            self.assertEqual(zipfile.read('files/notes.txt'), b'note ' * 100 + b'end')
+
+    def test_concurrent_writers(self):
+        with ExportArchive(self.path) as archive:
+            threads = [threading.Thread(target=archive.write_jsonl,
+                                        args=('exporter{}/records.jsonl'.format(i), ({'n': n} for n in range(1000))))
+                       for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        with ZipFile(self.path) as zipfile:
+            self.assertIsNone(zipfile.testzip())
+            for i in range(4):
+                self.assertEqual(len(zipfile.read('exporter{}/records.jsonl'.format(i)).splitlines()), 1000)
@@ -1,7 +1,7 @@
 import os
 import uuid
 from django.db import transaction
-from django.http import HttpResponseRedirect, Http404, HttpResponse
+from django.http import HttpResponseRedirect, Http404, FileResponse
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.views import View
@@ -131,11 +131,11 @@ class DataExportDownloadView(View):
         if not data_export.filename or not os.path.exists(data_export.filename):
             raise Http404(_("Could not find a data export download with this code."))
 
-        with open(data_export.filename, 'rb') as export_file:
-            response = HttpResponse(export_file.read(), content_type="application/zip")
-            response['Content-Disposition'] = 'inline; filename=data_export_{}_{}.zip'.format(
-                data_export.person.slug, str(data_export.complete_timestamp).replace(" ", "-")
-            )
+        # Exports can be large, so the file is streamed instead of read into memory
+        response = FileResponse(open(data_export.filename, 'rb'), content_type="application/zip")
+        response['Content-Disposition'] = 'inline; filename=data_export_{}_{}.zip'.format(
+            data_export.person.slug, str(data_export.complete_timestamp).replace(" ", "-")
+        )
 
         data_export.download_count += 1
         data_export.save()
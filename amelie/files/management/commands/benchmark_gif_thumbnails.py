@@ -0,0 +1,59 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+from PIL import Image
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from amelie.files import images2gif
+from amelie.files.models import _create_gif_thumbnail
+
+
+def _images2gif_thumbnail(source, size_pixels, target):
+    """The thumbnail path for GIF images that was used before _create_gif_thumbnail."""
+    frames = images2gif.readGif(source, False)
+    for frame in frames:
+        frame.thumbnail(size_pixels, Image.LANCZOS)
+    images2gif.writeGif(target, frames)
+
+
+def _pillow_thumbnail(source, size_pixels, target):
+    with Image.open(source) as image:
+        _create_gif_thumbnail(image, size_pixels, target)
+
+
+class Command(BaseCommand):
+    help = "Compares the time and peak memory usage of making a thumbnail of a GIF image with Pillow and with " \
+           "the old images2gif implementation."
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="The GIF image to make thumbnails of")
+        parser.add_argument('--size', default='medium', choices=settings.THUMBNAIL_SIZES.keys(),
+                            help="The thumbnail size to make, defaults to medium")
+        parser.add_argument('--runs', default=3, type=int, help="The number of runs per implementation")
+
+    def handle(self, *args, **options):
+        size_pixels = settings.THUMBNAIL_SIZES[options['size']]
+
+        for name, create_thumbnail in (('images2gif', _images2gif_thumbnail), ('pillow', _pillow_thumbnail)):
+            durations = []
+            peak_memory = 0
+
+            with tempfile.TemporaryDirectory() as directory:
+                target = os.path.join(directory, 'thumbnail.gif')
+
+                for run in range(options['runs']):
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    create_thumbnail(options['source'], size_pixels, target)
+                    durations.append(time.perf_counter() - start)
+                    peak_memory = max(peak_memory, tracemalloc.get_traced_memory()[1])
+                    tracemalloc.stop()
+
+                size = os.path.getsize(target)
+
+            self.stdout.write("{}: {:.3f}s (min {:.3f}s), peak memory {:.1f} MiB, thumbnail {:.1f} KiB".format(
+                name, sum(durations) / len(durations), min(durations), peak_memory / 2 ** 20, size / 2 ** 10
+            ))
@@ -1,7 +1,41 @@
+import random
+
 from django.db import models
+from django.db.models import F, Max, Min, Q
 
 from amelie.tools.managers import PublicManagerMixin
 
 
 class AttachmentManager(models.Manager, PublicManagerMixin):
-    pass
+    @staticmethod
+    def random_photo_filter(orientation, format):
+        """
+        Returns a filter on the orientation ('portrait' or 'landscape') of the thumbnail of the given format.
+        """
+        if orientation == 'portrait':
+            return Q(**{'thumb_%s_height__gte' % format: F('thumb_%s_width' % format)})
+        elif orientation == 'landscape':
+            return Q(**{'thumb_%s_width__gte' % format: F('thumb_%s_height' % format)})
+        else:
+            return Q()
+
+    def random_photo(self, orientation=None, format='small', only_public=True, after=None):
+        """
+        Returns a random attachment with the given orientation of the thumbnail of the given format, or None.
+
+        A random id between the lowest and the highest id is picked, and the first matching attachment from that id
+        on is returned. This only walks the primary key index, so the attachment table does not have to be sorted
+        randomly. Attachments after a gap in the ids are picked a bit more often, which does not matter here.
+
+        :param after: Only pick attachments that were created after this date and time.
+        """
+        bounds = self.aggregate(Min('pk'), Max('pk'))
+        if bounds['pk__min'] is None:
+            return None
+
+        photos = self.filter_public(only_public).filter(self.random_photo_filter(orientation, format))
+        if after:
+            photos = photos.filter(created__gt=after)
+
+        pk = random.randint(bounds['pk__min'], bounds['pk__max'])
+        return photos.filter(pk__gte=pk).order_by('pk').first() or photos.filter(pk__lt=pk).order_by('-pk').first()
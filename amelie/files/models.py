@@ -1,4 +1,6 @@
 import errno
+import logging
+import time
 import uuid
 from typing import Optional
 
@@ -6,7 +8,7 @@ import os
 import mimetypes
 import shutil
 
-from PIL import Image
+from PIL import Image, ImageSequence
 from django.conf import settings
 from django.core.validators import FileExtensionValidator
 from django.db import models
@@ -20,6 +22,9 @@ from amelie.members.models import Photographer, Person
 from amelie.tools.http import HttpJSONResponse
 
 
+logger = logging.getLogger(__name__)
+
+
 def _get_map(file, name):
     """
     Retrieves the location map for saving a specific attachment on disk.
@@ -47,44 +52,143 @@ def _get_map(file, name):
     return location_map
 
 
+def _thumbnail_target(target):
+    """
+    Returns the filename of a thumbnail, thumbnails are always JPEG or GIF files.
+    """
+    if target[-4:].lower() != '.jpg' and target[-4:].lower() != '.gif':
+        target += '.jpg'
+    return target
+
+
+def _save_thumbnail(image, target):
+    """
+    Save a thumbnail as JPEG, and in the extra formats from THUMBNAIL_EXTRA_FORMATS next to it.
+    """
+    image.save(target, 'JPEG', quality=settings.THUMBNAIL_QUALITY, progressive=settings.THUMBNAIL_PROGRESSIVE,
+               optimize=settings.THUMBNAIL_OPTIMIZE)
+
+    for extra_format in settings.THUMBNAIL_EXTRA_FORMATS:
+        try:
+            image.save(f"{target}.{extra_format}", extra_format.upper(), quality=settings.THUMBNAIL_QUALITY)
+        except (KeyError, OSError) as e:
+            # The Pillow build does not support this format
+            logger.warning(f"Could not save {extra_format} variant of thumbnail {target}: {e}")
+
+
 def _create_thumbnail(file, size, source, target):
     """
     Make thumbnails for types.
     Returns the filename where it has been saved if that was successful, otherwise it returns False.
+
+    Only used for GIF images, other images are handled by _create_thumbnails.
     """
 
     if file.get_type() == 'image':
         # open source and retrieve size
         image = Image.open(source)
         # check the extension and existence of the thumbnail
-        if target[-4:].lower() != '.jpg' and target[-4:].lower() != '.gif':
-            target += '.jpg'
+        target = _thumbnail_target(target)
         if os.path.exists(target):
             return False
 
         size_pixels = settings.THUMBNAIL_SIZES[size]
         # check whether the dimensions of the source are large enough such that a thumbnail is useful.
         if any(map(lambda b, d: b > d, image.size, size_pixels)):
-            if target[-4:].lower() == '.jpg':
-                # JPEG does not understand palleted images that are possible if you have a png
-                thumb = open(target, 'w')
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
-                image.thumbnail(size_pixels, Image.LANCZOS)
-                image.save(thumb, 'JPEG')
-                thumb.close()
-                return target
             if target[-4:].lower() == '.gif':
-                from amelie.files import images2gif
-                frames = images2gif.readGif(source, False)
-                for frame in frames:
-                    frame.thumbnail(size_pixels, Image.LANCZOS)
-                images2gif.writeGif(target, frames)
+                _create_gif_thumbnail(image, size_pixels, target)
                 return target
     # Save was not successful
     return False
 
 
+def _create_gif_thumbnail(image, size_pixels, target):
+    """
+    Make a thumbnail of an (animated) GIF image.
+
+    The frames are decoded one at a time, and only the first THUMBNAIL_GIF_MAX_FRAMES frames and at most
+    THUMBNAIL_GIF_MAX_DURATION milliseconds of the animation are kept. The duration and disposal of each frame are
+    preserved.
+    """
+    frames = []
+    durations = []
+    disposals = []
+
+    for frame in ImageSequence.Iterator(image):
+        if len(frames) >= settings.THUMBNAIL_GIF_MAX_FRAMES or sum(durations) >= settings.THUMBNAIL_GIF_MAX_DURATION:
+            break
+
+        durations.append(frame.info.get('duration', 100))
+        disposals.append(getattr(frame, 'disposal_method', 0))
+
+        thumb = frame.convert('RGBA')
+        thumb.thumbnail(size_pixels, Image.LANCZOS)
+        frames.append(thumb)
+
+    options = {'loop': image.info['loop']} if 'loop' in image.info else {}
+    frames[0].save(target, 'GIF', save_all=True, append_images=frames[1:], duration=durations, disposal=disposals,
+                   **options)
+
+
+def _create_thumbnails(file, source, locations_map):
+    """
+    Make all thumbnails of an image, decoding the source only once.
+
+    The source is decoded at a reduced scale if possible (JPEG draft mode), after which the thumbnails are made from
+    large to small, each one resized from the previous one.
+
+    Returns a tuple of a dictionary with the filenames of the saved thumbnails per size, and a dictionary with the
+    time in seconds that was spent decoding and on each thumbnail.
+    """
+    targets = {}
+    timings = {}
+
+    if file.get_type() != 'image':
+        return targets, timings
+
+    if _thumbnail_target(locations_map['small'])[-4:].lower() == '.gif':
+        for size in ('small', 'medium', 'large'):
+            start = time.perf_counter()
+            target = _create_thumbnail(file, size, source, locations_map[size])
+            timings[size] = time.perf_counter() - start
+            if target:
+                targets[size] = target
+        return targets, timings
+
+    start = time.perf_counter()
+    image = Image.open(source)
+    original_size = image.size
+
+    # Sizes from large to small, only those for which the source is large enough such that a thumbnail is useful.
+    sizes = sorted(
+        (size for size, size_pixels in settings.THUMBNAIL_SIZES.items()
+         if any(map(lambda b, d: b > d, original_size, size_pixels))),
+        key=lambda size: settings.THUMBNAIL_SIZES[size][0] * settings.THUMBNAIL_SIZES[size][1], reverse=True
+    )
+    if not sizes:
+        return targets, timings
+
+    # Let the JPEG decoder downscale to (at least) the largest thumbnail size
+    image.draft('RGB', settings.THUMBNAIL_SIZES[sizes[0]])
+    if image.mode != 'RGB':
+        # JPEG does not understand palleted images that are possible if you have a png
+        image = image.convert('RGB')
+    else:
+        image.load()
+    timings['decode'] = time.perf_counter() - start
+
+    for size in sizes:
+        start = time.perf_counter()
+        target = _thumbnail_target(locations_map[size])
+        if not os.path.exists(target):
+            image.thumbnail(settings.THUMBNAIL_SIZES[size], Image.LANCZOS)
+            _save_thumbnail(image, target)
+            targets[size] = target
+        timings[size] = time.perf_counter() - start
+
+    return targets, timings
+
+
 def get_thumb(preferred: str = None):
     """
     Generate a function to return the best (exact or closest) thumbnail or the original image if there are no thumbnails.
@@ -156,6 +260,17 @@ class Attachment(models.Model):
             return '%s' % os.path.basename(self.file.name)
 
     def save(self, create_thumbnails=False, *args, **kwargs):
+        self.prepare(create_thumbnails=create_thumbnails)
+
+        # Save
+        super(Attachment, self).save(*args, **kwargs)
+
+    def prepare(self, create_thumbnails=False):
+        """
+        Determine the mimetype and optionally create the thumbnails, which is done on save.
+
+        Use this before creating attachments with bulk_create, which does not call save.
+        """
         self.mimetype = mimetypes.guess_type(self.file.path)[0]
         if not self.mimetype:
             self.mimetype = "application/octet-stream"
@@ -164,22 +279,28 @@ class Attachment(models.Model):
         if create_thumbnails:
             self.create_thumbnails()
 
-        # Save
-        super(Attachment, self).save(*args, **kwargs)
-
     def create_thumbnails(self):
+        """
+        Move the file to its final location and create the thumbnails.
+
+        Returns a dictionary with the time in seconds that was spent on decoding the image, on each thumbnail and in
+        total, which is also kept in the thumbnail_timings attribute.
+        """
         filename = os.path.basename(self.file.path)
         locations_map = _get_map(self, filename)
         location = locations_map['original']
         shutil.move(self.file.path, location)
         self.file = location[len(settings.MEDIA_ROOT) + 1:]
 
-        for size in ('small', 'medium', 'large'):
-            thumb = locations_map[size]
-            target = _create_thumbnail(self, size, location, thumb)
+        start = time.perf_counter()
+        targets, timings = _create_thumbnails(self, location, locations_map)
 
-            if target:
-                setattr(self, f"thumb_{size}", target[len(settings.MEDIA_ROOT) + 1:])
+        for size, target in targets.items():
+            setattr(self, f"thumb_{size}", target[len(settings.MEDIA_ROOT) + 1:])
+
+        timings['total'] = time.perf_counter() - start
+        self.thumbnail_timings = timings
+        return timings
 
     def get_type(self):
         return settings.MIMETYPES.get(self.mimetype, "other")
@@ -223,12 +344,11 @@ class Attachment(models.Model):
             # Only remove the file if it exists and if it is in the MEDIA_ROOT directory.
             if os.path.isfile(path) and os.path.commonpath([path, settings.MEDIA_ROOT]) == settings.MEDIA_ROOT:
                 os.remove(path)
-        if self.thumb_large and self.thumb_large.path:
-            safe_remove(self.thumb_large.path)
-        if self.thumb_medium and self.thumb_medium.path:
-            safe_remove(self.thumb_medium.path)
-        if self.thumb_small and self.thumb_small.path:
-            safe_remove(self.thumb_small.path)
+        for thumb in (self.thumb_large, self.thumb_medium, self.thumb_small):
+            if thumb and thumb.path:
+                safe_remove(thumb.path)
+                for extra_format in settings.THUMBNAIL_EXTRA_FORMATS:
+                    safe_remove(f"{thumb.path}.{extra_format}")
         if self.file and self.file.path:
             safe_remove(self.file.path)
         super().delete()
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GraphqlConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'amelie.graphql'
+
+    def ready(self):
+        # Invalidate cached GraphQL responses when models change
+        import amelie.graphql.response_cache  # noqa: F401
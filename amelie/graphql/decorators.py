@@ -2,7 +2,7 @@ from graphql import GraphQLError
 
 from graphql_jwt.decorators import user_passes_test, login_required
 
-from amelie.graphql.helpers import is_board
+from amelie.graphql.helpers import is_board, is_in_committee
 
 
 def _get_attribute(obj, dotted_path):
@@ -20,10 +20,7 @@ def _get_attribute(obj, dotted_path):
 def allow_only_self_or_board(identity):
     def wrapper_allow_only_self_or_board(func):
         def wrapper_args_allow_only_self_or_board(self, info, *args, **kwargs):
-            user = info.context.user
-            is_board = hasattr(user, 'person') and hasattr(user.person, 'is_board') and user.person.is_board
-            is_superuser = hasattr(user, 'is_superuser') and user.is_superuser
-            if not is_board and not is_superuser and _get_attribute(info, identity) != self.id:
+            if not is_board(info) and _get_attribute(info, identity) != self.id:
                 raise GraphQLError("Access denied.")
             return func(self, info, *args, **kwargs)
         return wrapper_args_allow_only_self_or_board
@@ -35,7 +32,7 @@ AUTHORIZATION_FIELD_TYPES = ["public_fields", "login_fields", "committee_fields"
 
 
 def committee_required(committees: list):
-    return user_passes_test(lambda u: is_board(u) or (hasattr(u, 'person') and hasattr(u.person, 'is_in_committee') and any(u.person.is_in_committee(committee) for committee in committees)))
+    return user_passes_test(lambda u: is_board(u) or any(is_in_committee(u, committee) for committee in committees))
 
 def board_required():
     return user_passes_test(lambda u: is_board(u))
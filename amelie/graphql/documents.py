@@ -0,0 +1,95 @@
+import functools
+import hashlib
+import json
+
+from django.conf import settings
+from graphql import GraphQLError, TypeInfo, TypeInfoVisitor, Visitor, get_named_type, parse, validate, visit
+
+
+class QueryDocument:
+    """
+    A parsed and validated GraphQL query, with the Django models of the types that it selects.
+
+    errors:  The syntax or validation errors of the query, the query cannot be executed if there are any.
+    models:  The models of the DjangoObjectTypes that the query selects, to invalidate cached responses with.
+    """
+
+    def __init__(self, document=None, errors=None, models=frozenset()):
+        self.document = document
+        self.errors = errors or []
+        self.models = models
+
+
+class _ModelCollector(Visitor):
+    def __init__(self, type_info):
+        super().__init__()
+        self.type_info = type_info
+        self.models = set()
+
+    def enter_field(self, node, *args):
+        graphene_type = getattr(get_named_type(self.type_info.get_type()), 'graphene_type', None)
+        model = getattr(getattr(graphene_type, '_meta', None), 'model', None)
+        if model is not None:
+            self.models.add(model)
+
+
+def query_hash(query):
+    return hashlib.sha256(query.encode()).hexdigest()
+
+
+@functools.lru_cache(maxsize=settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+def get_document(schema, query):
+    """
+    Parse and validate a query against the schema. The result is kept per query, so the queries that the frontend sends
+    over and over again are only parsed and validated once per process.
+
+    :type schema: graphql.GraphQLSchema
+    :rtype: QueryDocument
+    """
+    try:
+        document = parse(query)
+    except GraphQLError as e:
+        return QueryDocument(errors=[e])
+
+    errors = validate(schema, document)
+    if errors:
+        return QueryDocument(document, errors)
+
+    type_info = TypeInfo(schema)
+    collector = _ModelCollector(type_info)
+    visit(document, TypeInfoVisitor(type_info, collector))
+    return QueryDocument(document, models=frozenset(collector.models))
+
+
+@functools.lru_cache(maxsize=None)
+def get_persisted_queries():
+    """
+    Returns the persisted queries from settings.GRAPHQL_PERSISTED_QUERIES_FILE, by their id and by their SHA-256 hash.
+
+    The file is a JSON object with the query documents by their id, like the query manifests that frontend builds make.
+    """
+    if not settings.GRAPHQL_PERSISTED_QUERIES_FILE:
+        return {}
+
+    with open(settings.GRAPHQL_PERSISTED_QUERIES_FILE) as manifest:
+        queries = json.load(manifest)
+    return {**{query_hash(query): query for query in queries.values()}, **queries}
+
+
+def get_persisted_query_id(data):
+    """
+    Returns the persisted query id of a request, from the id parameter or an Apollo persistedQuery extension.
+
+    :param data: The parameters of the GraphQL request.
+    """
+    if data.get('id'):
+        return str(data['id'])
+
+    extensions = data.get('extensions') or {}
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    persisted_query = extensions.get('persistedQuery') if isinstance(extensions, dict) else None
+    return persisted_query.get('sha256Hash') if isinstance(persisted_query, dict) else None
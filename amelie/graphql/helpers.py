@@ -4,15 +4,70 @@ from django.contrib.auth.models import User, AnonymousUser
 from graphql import GraphQLResolveInfo
 
 
-def is_logged_in(user_or_info: Union[User, AnonymousUser, GraphQLResolveInfo]):
+class AuthorizationFacts:
+    """
+    The facts about a user that the authorization checks of the GraphQL API depend on. They are loaded with one query
+    the first time they are needed, and kept on the user object, which lives as long as the request.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._committees = None
+        self._board = None
+
+    @property
+    def person(self):
+        return getattr(self.user, 'person', None)
+
+    def _load(self):
+        if self._committees is None:
+            self._committees = set()
+            self._board = False
+            if self.person is not None:
+                for abbreviation, superuser, abolished in self.person.function_set.filter(end__isnull=True).values_list(
+                        'committee__abbreviation', 'committee__superuser', 'committee__abolished'):
+                    self._committees.add(abbreviation)
+                    self._board = self._board or (superuser and abolished is None)
+
+    @property
+    def is_board(self):
+        """Same as Person.is_board, or a superuser."""
+        if getattr(self.user, 'is_superuser', False):
+            return True
+        self._load()
+        return self._board
+
+    def is_in_committee(self, abbreviation):
+        """Same as Person.is_in_committee."""
+        self._load()
+        return abbreviation in self._committees
+
+
+def _get_user(user_or_info: Union[User, AnonymousUser, GraphQLResolveInfo]):
     if isinstance(user_or_info, GraphQLResolveInfo):
         user_or_info = user_or_info.context.user if hasattr(user_or_info.context, 'user') else None
-    return user_or_info.is_authenticated
+    return user_or_info
+
+
+def authorization_facts(user_or_info: Union[User, AnonymousUser, GraphQLResolveInfo]):
+    user = _get_user(user_or_info)
+    if user is None:
+        return AuthorizationFacts(None)
+
+    facts = getattr(user, '_graphql_authorization_facts', None)
+    if facts is None:
+        facts = AuthorizationFacts(user)
+        user._graphql_authorization_facts = facts
+    return facts
+
+
+def is_logged_in(user_or_info: Union[User, AnonymousUser, GraphQLResolveInfo]):
+    return _get_user(user_or_info).is_authenticated
 
 
 def is_board(user_or_info: Union[User, AnonymousUser, GraphQLResolveInfo]):
-    if isinstance(user_or_info, GraphQLResolveInfo):
-        user_or_info = user_or_info.context.user if hasattr(user_or_info.context, 'user') else None
-    board = hasattr(user_or_info, 'person') and hasattr(user_or_info.person, 'is_board') and user_or_info.person.is_board
-    superuser = hasattr(user_or_info, 'is_superuser') and user_or_info.is_superuser
-    return board or superuser
+    return authorization_facts(user_or_info).is_board
+
+
+def is_in_committee(user_or_info: Union[User, AnonymousUser, GraphQLResolveInfo], abbreviation):
+    return authorization_facts(user_or_info).is_in_committee(abbreviation)
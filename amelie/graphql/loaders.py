@@ -0,0 +1,93 @@
+from django.db.models import Model, Prefetch, prefetch_related_objects
+from django.db.models.fields.related_descriptors import ReverseManyToOneDescriptor
+from graphql import GraphQLResolveInfo
+
+
+class RelationLoader:
+    """
+    Loads related objects for all objects of a GraphQL result list at once, instead of once per object.
+
+    Lists of objects that are resolved are registered with the loader. The first time a resolver needs a relation of
+    one of those objects, the relation is prefetched for the whole list with one IN query, and the other objects of the
+    list find it in their prefetch cache. The related objects are registered as one list as well, so relations of
+    those are loaded at once too, across all of their parents.
+
+    There is one loader per request, see get_loader.
+    """
+
+    def __init__(self):
+        # Object id -> the list of objects it was resolved in
+        self.groups = {}
+
+    def register(self, objects):
+        """Register a list of objects that were resolved together. Returns the objects as a list."""
+        objects = list(objects)
+        for obj in objects:
+            if isinstance(obj, Model):
+                self.groups[id(obj)] = objects
+        return objects
+
+    def load(self, obj, relation, queryset=None, key=None):
+        """
+        Returns the related object(s) of obj, prefetching the relation for all objects that were resolved with it.
+
+        :param relation: Name of a (reverse) foreign key, one-to-one or many-to-many field.
+        :param queryset: Optional queryset to filter the related objects of a to-many relation with.
+        :param key: Name of the queryset, when different querysets are used for the same relation in a request.
+        :return: The related object, or a list of related objects for to-many relations.
+        """
+        group = self.groups.get(id(obj), [obj])
+        if queryset is None:
+            lookup, attribute = relation, relation
+        else:
+            attribute = '_graphql_{}_{}'.format(relation, key) if key else '_graphql_{}'.format(relation)
+            lookup = Prefetch(relation, queryset=queryset, to_attr=attribute)
+
+        if not all(self._is_loaded(item, relation, attribute, queryset) for item in group):
+            prefetch_related_objects(group, lookup)
+            related = []
+            for item in group:
+                value = self._value(item, relation, attribute, queryset)
+                related.extend(value if isinstance(value, list) else [value] if value is not None else [])
+            self.register(related)
+
+        return self._value(obj, relation, attribute, queryset)
+
+    @staticmethod
+    def _is_many(obj, relation):
+        # Also true for many-to-many relations, ManyToManyDescriptor is a subclass
+        return isinstance(getattr(type(obj), relation), ReverseManyToOneDescriptor)
+
+    def _is_loaded(self, obj, relation, attribute, queryset):
+        if queryset is not None:
+            return hasattr(obj, attribute)
+        if self._is_many(obj, relation):
+            return relation in getattr(obj, '_prefetched_objects_cache', {})
+        return getattr(type(obj), relation).is_cached(obj)
+
+    def _value(self, obj, relation, attribute, queryset):
+        if queryset is not None:
+            return getattr(obj, attribute)
+        if self._is_many(obj, relation):
+            return list(getattr(obj, relation).all())
+        return getattr(obj, relation)
+
+
+def get_loader(info_or_request):
+    """Returns the relation loader of the request of a GraphQL query."""
+    request = info_or_request.context if isinstance(info_or_request, GraphQLResolveInfo) else info_or_request
+    loader = getattr(request, '_graphql_relation_loader', None)
+    if loader is None:
+        loader = RelationLoader()
+        request._graphql_relation_loader = loader
+    return loader
+
+
+def load_related(info, obj, relation, queryset=None, key=None):
+    """Shortcut for get_loader(info).load(obj, relation, queryset, key), see RelationLoader.load."""
+    return get_loader(info).load(obj, relation, queryset, key)
+
+
+def register_list(info, objects):
+    """Shortcut for get_loader(info).register(objects), see RelationLoader.register."""
+    return get_loader(info).register(objects)
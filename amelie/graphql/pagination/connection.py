@@ -5,6 +5,7 @@ from collections import OrderedDict
 from graphene import Connection, List, NonNull, Field
 from graphene.relay.connection import ConnectionOptions
 
+from amelie.graphql.loaders import register_list
 from amelie.graphql.pagination.objects_type import PageInfoExtra
 
 
@@ -47,3 +48,7 @@ class PaginationConnection(Connection):
         return super(Connection, cls).__init_subclass_with_meta__(
             _meta=_meta, **options
         )
+
+    def resolve_results(root, info):
+        # The results are loaded together, so their relations can be loaded together as well
+        return register_list(info, root.results)
@@ -1,15 +1,17 @@
+import base64
+import json
 import re
 import math
 
-from django.core.paginator import Paginator
 from django.conf import settings
+from django.db.models import Q, QuerySet
 
 from graphene import Int, String
 from graphene_django.filter import DjangoFilterConnectionField
 from graphene_django.utils import maybe_queryset
+from graphql import GraphQLError
 
 from amelie.graphql.pagination.connection import PaginationConnection
-from amelie.graphql.pagination.objects_type import PageInfoExtra
 
 
 # Based on: https://github.com/instruct-br/graphene-django-pagination
@@ -21,15 +23,22 @@ class DjangoPaginationConnectionField(DjangoFilterConnectionField):
         order_by=None,
         extra_filter_meta=None,
         filterset_class=None,
+        keyset_fields=None,
         *args,
         **kwargs
     ):
+        """
+        :param keyset_fields: Fields of the model that the results may be paginated on with cursors (the after
+                              argument) when they are ordered by them. Deep pages then cost the same as the first page,
+                              if there is an index on the field. The fields should be unique enough and not nullable.
+        """
         self._type = type
         self._fields = fields
         self._provided_filterset_class = filterset_class
         self._filterset_class = None
         self._extra_filter_meta = extra_filter_meta
         self._base_args = None
+        self._keyset_fields = tuple(keyset_fields or ())
 
         kwargs.setdefault("limit", Int(settings.GRAPHENE_DEFAULT_LIMIT, description="Query limit"))
         kwargs.setdefault("offset", Int(description="Query offset"))
@@ -47,12 +56,14 @@ class DjangoPaginationConnectionField(DjangoFilterConnectionField):
         class NodeConnection(PaginationConnection):
             total_count = Int()
 
+            keyset_fields = self._keyset_fields
+
             class Meta:
                 node = self._type
                 name = '{}NodeConnection'.format(self._type._meta.name)
 
             def resolve_total_count(self, info, **kwargs):
-                return self.iterable.count()
+                return self.count()
 
         return NodeConnection
 
@@ -60,71 +71,141 @@ class DjangoPaginationConnectionField(DjangoFilterConnectionField):
     def resolve_connection(cls, connection, arguments, iterable, max_limit=None):
         iterable = maybe_queryset(iterable)
 
-        _len = len(iterable)
-
         ordering = arguments.get("ordering")
 
         if ordering:
             iterable = connection_from_list_ordering(iterable, ordering)
 
-        connection = connection_from_list_slice(
-            iterable,
-            arguments,
-            connection_type=connection,
-            pageinfo_type=PageInfoExtra,
-        )
+        keyset_ordering = None
+        if isinstance(iterable, QuerySet) and connection.keyset_fields and arguments.get("limit") is not None:
+            keyset_ordering = get_keyset_ordering(iterable, connection.keyset_fields)
+
+        if keyset_ordering:
+            connection = connection_from_keyset(
+                iterable,
+                keyset_ordering,
+                arguments,
+                connection_type=connection,
+            )
+        elif arguments.get("after"):
+            raise GraphQLError("Cursors are not supported for this ordering.")
+        else:
+            connection = connection_from_list_slice(
+                iterable,
+                arguments,
+                connection_type=connection,
+            )
         connection.iterable = iterable
-        connection.length = _len
 
         return connection
 
 
-def connection_from_list_slice(
-    list_slice, args=None, connection_type=None, pageinfo_type=None
-):
+class LazyCount:
+    """The number of results of a queryset, which is only counted the first time it is needed."""
+
+    def __init__(self, iterable, value=None):
+        self.iterable = iterable
+        self.value = value
+
+    def __call__(self):
+        if self.value is None:
+            self.value = self.iterable.count() if isinstance(self.iterable, QuerySet) else len(self.iterable)
+        return self.value
+
+
+class PageInfo:
+    """
+    Pagination data of a connection (see PageInfoExtra). The fields that need the total number of results only count
+    them when they are queried.
+    """
+
+    def __init__(self, count, limit, offset, has_next_page, page=None, has_previous_page=None, end_cursor=None):
+        self.count = count
+        self.limit = limit
+        self.offset = offset
+        self.has_next_page = has_next_page
+        self.end_cursor = end_cursor
+        self._page = page
+        self._has_previous_page = has_previous_page
+
+    @property
+    def num_pages(self):
+        if self.limit is None:
+            return 1
+        return max(math.ceil(self.count() / self.limit), 1)
+
+    @property
+    def page(self):
+        return self._page() if callable(self._page) else self._page
+
+    @property
+    def has_previous_page(self):
+        if self._has_previous_page is not None:
+            return self._has_previous_page
+        return self.page > 1
+
+
+def _offset_page(offset, limit, results, has_next_page, count):
+    """
+    Returns the page number of the results at an offset, or a function that gives it if the results need to be counted
+    for it. Fills in the count if it is known already from the results of the last page.
+    """
+    if not has_next_page and (results or not offset):
+        count.value = offset + len(results)
+
+    page = math.ceil(offset / limit) + 1
+    if not results and page > 1:
+        # Past the last page, which is given as the current page instead
+        def last_page():
+            return min(page, max(math.ceil(count() / limit), 1))
+        return last_page
+    return page
+
+
+def connection_from_list_slice(list_slice, args=None, connection_type=None):
     args = args or {}
     limit = args.get("limit", None)
-    offset = args.get("offset", 0)
+    offset = args.get("offset", 0) or 0
 
     if limit is None:
-        return connection_type(
-            results=list_slice,
-            page_info=pageinfo_type(
-                has_previous_page=False,
+        count = LazyCount(list_slice)
+        connection = connection_type(
+            results=list_slice[offset:] if offset else list_slice,
+            page_info=PageInfo(
+                count=count,
+                limit=limit,
+                offset=offset,
                 has_next_page=False,
                 page=1,
-                num_pages=1,
-                limit=limit,
-                offset=offset
+                has_previous_page=False,
             )
         )
     else:
         assert isinstance(limit, int), "Limit must be of type int"
         assert limit > 0, "Limit must be positive integer greater than 0"
 
-        paginator = Paginator(list_slice, limit)
-        _slice = list_slice[offset:(offset+limit)]
+        # One extra result tells if there is a next page, without counting all results
+        results = list(list_slice[offset:(offset + limit + 1)])
+        has_next_page = len(results) > limit
+        results = results[:limit]
 
-        page_num = math.ceil(offset/limit) + 1
-        page_num = (
-            paginator.num_pages
-            if page_num > paginator.num_pages
-            else page_num
-        )
-        page = paginator.page(page_num)
-
-        return connection_type(
-            results=_slice,
-            page_info=pageinfo_type(
-                has_previous_page=page.has_previous(),
-                has_next_page=page.has_next(),
-                page=page_num,
-                num_pages=paginator.num_pages,
+        count = LazyCount(list_slice)
+        page = _offset_page(offset, limit, results, has_next_page, count)
+
+        connection = connection_type(
+            results=results,
+            page_info=PageInfo(
+                count=count,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                has_next_page=has_next_page,
+                page=page,
             )
         )
 
+    connection.count = count
+    return connection
+
 
 def connection_from_list_ordering(items_list, ordering):
     field, order = ordering.split(',')
@@ -133,3 +214,86 @@ def connection_from_list_ordering(items_list, ordering):
     field = re.sub(r'(?<!^)(?=[A-Z])', '_', field).lower()
 
     return items_list.order_by(f'{order}{field}')
+
+
+def get_keyset_ordering(queryset, keyset_fields):
+    """
+    Returns the field and direction (field, descending) that the queryset is ordered by first, if it is one of the
+    given keyset fields. Returns None otherwise.
+    """
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    if not ordering or not isinstance(ordering[0], str):
+        return None
+
+    field = ordering[0].lstrip('-')
+    if field not in keyset_fields:
+        return None
+    return field, ordering[0].startswith('-')
+
+
+def encode_cursor(field, obj):
+    # Dates are written with str instead of DjangoJSONEncoder, which leaves out the microseconds
+    data = json.dumps([getattr(obj, field), obj.pk], default=str)
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError):
+        raise GraphQLError("Invalid cursor.")
+    return value, pk
+
+
+def connection_from_keyset(queryset, keyset_ordering, args, connection_type=None):
+    """
+    Paginate on the value of the ordering field and the primary key of the last result of the previous page, instead
+    of on an offset, so the database can find the page through the index on the field. Without a cursor, the offset is
+    used for the first page.
+    """
+    field, descending = keyset_ordering
+    limit = args["limit"]
+    after = args.get("after")
+    offset = args.get("offset", 0) or 0
+
+    assert isinstance(limit, int), "Limit must be of type int"
+    assert limit > 0, "Limit must be positive integer greater than 0"
+
+    direction = '-' if descending else ''
+    comparison = 'lt' if descending else 'gt'
+    queryset = queryset.order_by(f'{direction}{field}', f'{direction}pk')
+
+    page_queryset = queryset
+    before = None
+    if after:
+        value, pk = decode_cursor(after)
+        before = Q(**{f'{field}__{comparison}': value}) | Q(**{field: value, f'pk__{comparison}': pk})
+        page_queryset = queryset.filter(before)
+        offset = 0
+
+    results = list(page_queryset[offset:(offset + limit + 1)])
+    has_next_page = len(results) > limit
+    results = results[:limit]
+
+    count = LazyCount(queryset)
+    if before is not None:
+        # The page number is only known by counting the results before the cursor
+        def page():
+            return queryset.exclude(before).count() // limit + 1
+    else:
+        page = _offset_page(offset, limit, results, has_next_page, count)
+
+    connection = connection_type(
+        results=results,
+        page_info=PageInfo(
+            count=count,
+            limit=limit,
+            offset=offset,
+            has_next_page=has_next_page,
+            page=page,
+            has_previous_page=True if before is not None else None,
+            end_cursor=encode_cursor(field, results[-1]) if results else None,
+        )
+    )
+    connection.count = count
+    return connection
@@ -1,4 +1,4 @@
-from graphene import ObjectType, Boolean, Int
+from graphene import ObjectType, Boolean, Int, String
 
 
 # Based on: https://github.com/instruct-br/graphene-django-pagination
@@ -33,3 +33,9 @@ class PageInfoExtra(ObjectType):
         name="offset",
         description="Offset as given to query"
     )
+    end_cursor = String(
+        required=False,
+        name="endCursor",
+        description="Cursor of the last result, to continue after with the after argument (only on connections "
+                    "that support cursors)"
+    )
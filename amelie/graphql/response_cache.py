@@ -0,0 +1,123 @@
+import functools
+import hashlib
+import json
+import re
+import uuid
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils.translation import get_language
+
+MODEL_VERSION_KEY = 'graphql_response_version_{}'
+RESPONSE_KEY = 'graphql_response_{}'
+
+# Quoted names in SQL, the tables that a database query reads are among them
+QUOTED_NAME = re.compile(r'[`"]([^`"]+)[`"]')
+
+
+def _cache():
+    """The cache of the responses and model versions, or None if the response cache is disabled."""
+    if not settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+        return None
+    return caches[settings.GRAPHQL_RESPONSE_CACHE]
+
+
+@functools.lru_cache(maxsize=None)
+def _models_by_table():
+    return {model._meta.db_table: model._meta.label_lower for model in apps.get_models(include_auto_created=True)}
+
+
+def _versions(cache, labels):
+    """Returns the current versions of the models with the given labels, by label."""
+    keys = {label: MODEL_VERSION_KEY.format(label) for label in labels}
+    versions = cache.get_many(keys.values())
+    missing = {key: uuid.uuid4().hex for key in keys.values() if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return {label: versions[key] for label, key in keys.items()}
+
+
+class CachedResponse:
+    """
+    The cached response to a query of an anonymous user. A response is used until one of the models that it was made
+    from changes. These are the models of the types that the query selects, and every other model that the resolvers
+    read from the database.
+    """
+
+    def __init__(self, cache, query, variables, operation_name, models):
+        data = json.dumps([query, variables, operation_name, get_language()], sort_keys=True, default=str)
+        self.cache = cache
+        self.key = RESPONSE_KEY.format(hashlib.sha256(data.encode()).hexdigest())
+        self.entry = cache.get(self.key)
+        self.models = {model._meta.label_lower for model in models} | set(self.entry['models'] if self.entry else [])
+        # The versions are read before the query is executed, so a change while it is executed makes the response stale
+        self.versions = _versions(cache, self.models)
+        self.read = set()
+
+    @classmethod
+    def for_query(cls, query, variables, operation_name, models):
+        """Returns the cached response to a query, or None if the response cache is disabled."""
+        cache = _cache()
+        return cls(cache, query, variables, operation_name, models) if cache is not None else None
+
+    def get(self):
+        """Returns the data of the cached response, or None if there is none or one of its models changed."""
+        if self.entry is None or self.entry['versions'] is None:
+            return None
+        if any(self.versions[label] != version for label, version in self.entry['versions'].items()):
+            return None
+        return self.entry['data']
+
+    @contextmanager
+    def track(self):
+        """Record the models that are read from the database while the query is executed."""
+        def _record(execute, sql, params, many, context):
+            tables = _models_by_table()
+            self.read.update(tables[name] for name in QUOTED_NAME.findall(sql) if name in tables)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(_record):
+            yield
+
+    def set(self, data):
+        """
+        Cache the data of the response. If the resolvers read models of which the versions were not known before the
+        query was executed, only the models are remembered, so that the next response to the query can be cached.
+        """
+        if self.read <= self.models:
+            entry = {'models': sorted(self.models), 'versions': self.versions, 'data': data}
+        else:
+            entry = {'models': sorted(self.models | self.read), 'versions': None, 'data': None}
+        self.cache.set(self.key, entry, settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT)
+
+
+def invalidate_model(model):
+    """
+    Make the cached responses that were made from objects of the model stale.
+
+    Only the processes that share the cache see the new version. With a cache per process, like the default
+    LocMemCache, the other processes keep serving their responses until GRAPHQL_RESPONSE_CACHE_TIMEOUT has passed.
+    """
+    cache = _cache()
+    if cache is not None:
+        cache.set(MODEL_VERSION_KEY.format(model._meta.label_lower), uuid.uuid4().hex, None)
+
+
+@receiver(post_save, dispatch_uid='graphql_response_cache_save')
+@receiver(post_delete, dispatch_uid='graphql_response_cache_delete')
+def _invalidate_saved_model(sender, **kwargs):
+    invalidate_model(sender)
+
+
+@receiver(m2m_changed, dispatch_uid='graphql_response_cache_m2m')
+def _invalidate_m2m_models(sender, instance, action, model, **kwargs):
+    if action.startswith('post_'):
+        invalidate_model(sender)
+        invalidate_model(instance.__class__)
+        invalidate_model(model)
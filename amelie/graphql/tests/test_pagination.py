@@ -0,0 +1,60 @@
+from graphene_django.utils.testing import GraphQLTestMixin
+
+from amelie.activities.models import Activity
+from amelie.graphql.tests import GraphQLClient
+from amelie.tools.tests import TestCase, generate_activities
+
+
+class PaginationConnectionFieldTests(GraphQLTestMixin, TestCase):
+    QUERY = '''
+        query ($limit: Int, $offset: Int, $after: String) {
+            activities(limit: $limit, offset: $offset, after: $after) {
+                totalCount
+                pageInfo { hasNextPage hasPreviousPage page numPages endCursor }
+                results { id }
+            }
+        }
+    '''
+
+    def setUp(self):
+        super(PaginationConnectionFieldTests, self).setUp()
+        self.client = GraphQLClient()
+        self.load_basic_data()
+
+        # Five of these activities are public
+        generate_activities(10)
+        self.activity_ids = [str(pk) for pk in Activity.objects.filter(public=True).order_by('begin', 'pk')
+                                                                .values_list('pk', flat=True)]
+
+    def _activities(self, **variables):
+        response = self.query(self.QUERY, variables=variables)
+        self.assertResponseNoErrors(response)
+        return response.json()['data']['activities']
+
+    def test_offset(self):
+        data = self._activities(limit=2, offset=2)
+        self.assertEqual([result['id'] for result in data['results']], self.activity_ids[2:4])
+        self.assertEqual(data['totalCount'], 5)
+        self.assertEqual(data['pageInfo'], {'hasNextPage': True, 'hasPreviousPage': True, 'page': 2, 'numPages': 3,
+                                            'endCursor': data['pageInfo']['endCursor']})
+
+        # Past the last page, the last page is given
+        data = self._activities(limit=2, offset=10)
+        self.assertEqual(data['results'], [])
+        self.assertEqual(data['pageInfo']['page'], 3)
+
+    def test_cursor(self):
+        ids = []
+        after = None
+        for page in range(1, 4):
+            data = self._activities(limit=2, after=after)
+            ids += [result['id'] for result in data['results']]
+            self.assertEqual(data['pageInfo']['page'], page)
+            after = data['pageInfo']['endCursor']
+
+        self.assertFalse(data['pageInfo']['hasNextPage'])
+        self.assertEqual(ids, self.activity_ids)
+
+    def test_invalid_cursor(self):
+        response = self.query(self.QUERY, variables={'limit': 2, 'after': 'invalid'})
+        self.assertResponseHasErrors(response)
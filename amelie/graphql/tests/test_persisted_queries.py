@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+
+from django.core.cache import cache
+from django.test import override_settings
+from graphene_django.utils.testing import GraphQLTestMixin
+
+from amelie.graphql.documents import get_persisted_queries, query_hash
+from amelie.graphql.tests import GraphQLClient
+from amelie.tools.tests import TestCase
+
+
+class PersistedQueryTests(GraphQLTestMixin, TestCase):
+    QUERY = 'query { committees(limit: 20, includeAbolished: false) { results { name } } }'
+
+    def setUp(self):
+        super(PersistedQueryTests, self).setUp()
+        self.client = GraphQLClient()
+        self.load_basic_data()
+
+        manifest = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+        json.dump({'committees': self.QUERY}, manifest)
+        manifest.close()
+        self.addCleanup(os.remove, manifest.name)
+
+        settings_override = override_settings(GRAPHQL_PERSISTED_QUERIES_FILE=manifest.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        get_persisted_queries.cache_clear()
+        self.addCleanup(get_persisted_queries.cache_clear)
+
+    def _post(self, data):
+        return self.client.post(self.GRAPHQL_URL, json.dumps(data), content_type='application/json')
+
+    def _committee_names(self, response):
+        self.assertResponseNoErrors(response)
+        return [committee['name'] for committee in response.json()['data']['committees']['results']]
+
+    def test_persisted_query_id(self):
+        expected = self._committee_names(self.query(self.QUERY))
+        self.assertEqual(self._committee_names(self._post({'id': 'committees'})), expected)
+
+    def test_persisted_query_hash(self):
+        expected = self._committee_names(self.query(self.QUERY))
+        response = self._post({'extensions': {'persistedQuery': {'version': 1, 'sha256Hash': query_hash(self.QUERY)}}})
+        self.assertEqual(self._committee_names(response), expected)
+
+    def test_unknown_persisted_query(self):
+        response = self._post({'id': 'unknown'})
+        self.assertEqual(response.json()['errors'][0]['message'], 'PersistedQueryNotFound')
+
+    @override_settings(GRAPHQL_PERSISTED_QUERIES_ONLY=True)
+    def test_persisted_queries_only(self):
+        self._committee_names(self._post({'id': 'committees'}))
+        response = self.query('query { committees(limit: 10, includeAbolished: false) { results { name } } }')
+        self.assertEqual(response.json()['errors'][0]['message'], 'PersistedQueryNotSupported')
+
+    @override_settings(GRAPHQL_RESPONSE_CACHE_TIMEOUT=300)
+    def test_response_cache(self):
+        cache.clear()
+        names = self._committee_names(self._post({'id': 'committees'}))
+        self.assertIn(self.data['committee1'].name, names)
+
+        # The cached response is used, without touching the database
+        with self.assertNumQueries(0):
+            self.assertEqual(self._committee_names(self._post({'id': 'committees'})), names)
+
+        # Changing a committee makes the cached response stale
+        self.data['committee1'].name = 'Renamed committee'
+        self.data['committee1'].save()
+        self.assertIn('Renamed committee', self._committee_names(self._post({'id': 'committees'})))
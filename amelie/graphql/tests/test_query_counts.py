@@ -0,0 +1,113 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from graphene_django.utils.testing import GraphQLTestMixin
+
+from amelie.graphql.helpers import authorization_facts
+from amelie.graphql.tests import GraphQLClient
+from amelie.members.models import Committee, CommitteeCategory, Function, Person
+from amelie.news.models import NewsItem
+from amelie.tools.tests import TestCase, generate_activities
+
+
+class QueryCountTests(GraphQLTestMixin, TestCase):
+    """
+    The number of database queries of representative GraphQL queries should not depend on the number of results, the
+    relations of the results are loaded together.
+    """
+
+    def setUp(self):
+        super(QueryCountTests, self).setUp()
+        self.client = GraphQLClient()
+        self.load_basic_data()
+        self.category = CommitteeCategory.objects.create(name='Test')
+
+        # News items need the education committee to exist, they are published by it here
+        self.education_committee, _ = Committee.objects.get_or_create(
+            name='EduCom', abbreviation=settings.EDUCATION_COMMITTEE_ABBR)
+
+    def _add_committee(self, i):
+        committee = Committee.objects.create(name='Committee {}'.format(i), abbreviation='C{}'.format(i),
+                                             category=self.category)
+        for j in range(3):
+            person = Person.objects.create(first_name='Member {}'.format(j), last_name='Committee {}'.format(i),
+                                           gender=Person.GenderTypes.UNKNOWN)
+            Function.objects.create(person=person, committee=committee, function='Member',
+                                    begin=datetime.date(2020, 1, 1))
+
+    def _add_news_item(self, i):
+        NewsItem.objects.create(title_nl='Nieuws {}'.format(i), introduction_nl='Nieuws', content_nl='Nieuws',
+                                publisher=self.education_committee, author=self.data['person1'],
+                                publication_date=timezone.now())
+
+    def _count_queries(self, query):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.query(query)
+        self.assertResponseNoErrors(response)
+        return len(queries)
+
+    def assertConstantQueries(self, query, add):
+        """Assert that the query takes as many database queries after more results are added with add(i)."""
+        for i in range(2):
+            add(i)
+        before = self._count_queries(query)
+        for i in range(2, 6):
+            add(i)
+        self.assertEqual(self._count_queries(query), before)
+
+    def test_committees(self):
+        self.assertConstantQueries('''
+            query {
+                committees(limit: 20, includeAbolished: false) {
+                    results { name category { name } functionSet { person isCurrentMember } }
+                }
+            }
+        ''', self._add_committee)
+
+    def test_committee_categories(self):
+        self.assertConstantQueries('''
+            query {
+                committeeCategories(limit: 20) {
+                    results { name committeeSet { name functionSet { person } } }
+                }
+            }
+        ''', self._add_committee)
+
+    def test_activities(self):
+        self.assertConstantQueries('''
+            query {
+                activities(limit: 20) {
+                    results { summary organizer { name } activityLabel { name } attachments { public } }
+                }
+            }
+        ''', lambda i: generate_activities(2))
+
+    def test_news(self):
+        self.assertConstantQueries('''
+            query {
+                newsItems(limit: 20) {
+                    results { title author publisher attachments { public } activities { id } }
+                }
+            }
+        ''', self._add_news_item)
+
+    def test_authorization_facts(self):
+        board = Committee.objects.create(name='Board', abbreviation='Board', superuser=True)
+        Function.objects.create(person=self.data['person2'], committee=board, function='Chair',
+                                begin=datetime.date(2020, 1, 1))
+        Function.objects.create(person=self.data['person2'], committee=self.data['committee1'], function='Member',
+                                begin=datetime.date(2020, 1, 1))
+
+        user = User.objects.select_related('person').get(pk=self.data['user2'].pk)
+
+        # The board membership and committees are loaded once, and kept for the user of the request
+        with self.assertNumQueries(1):
+            facts = authorization_facts(user)
+            self.assertTrue(facts.is_board)
+            self.assertTrue(facts.is_in_committee('Com1'))
+            self.assertFalse(facts.is_in_committee('Other'))
+            self.assertIs(authorization_facts(user), facts)
@@ -0,0 +1,98 @@
+import datetime
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from graphene_django.utils.testing import GraphQLTestMixin
+
+from amelie.graphql.response_cache import CachedResponse
+from amelie.graphql.tests import GraphQLClient
+from amelie.members.models import Committee, Function
+from amelie.tools.tests import TestCase
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_TIMEOUT=300)
+class ResponseCacheTests(GraphQLTestMixin, TestCase):
+    MEMBERS_QUERY = 'query ($id: ID) { committee(id: $id) { name functionSet { person } } }'
+    PARENTS_QUERY = 'query ($id: ID) { committee(id: $id) { parentCommittees { name } } }'
+    COMMITTEES_QUERY = 'query { committees(limit: 20, includeAbolished: false) { results { name } } }'
+
+    def setUp(self):
+        super(ResponseCacheTests, self).setUp()
+        self.client = GraphQLClient()
+        self.load_basic_data()
+        caches[settings.GRAPHQL_RESPONSE_CACHE].clear()
+
+        self.committee = self.data['committee1']
+        Function.objects.create(person=self.data['person1'], committee=self.committee, function='Member',
+                                begin=datetime.date(2020, 1, 1))
+
+    def _data(self, query, **variables):
+        response = self.query(query, variables=variables)
+        self.assertResponseNoErrors(response)
+        return response.json()['data']
+
+    def _members(self):
+        return [function['person'] for function in
+                self._data(self.MEMBERS_QUERY, id=self.committee.id)['committee']['functionSet']]
+
+    def test_cached(self):
+        names = self._data(self.COMMITTEES_QUERY)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._data(self.COMMITTEES_QUERY), names)
+
+    def test_disabled(self):
+        with override_settings(GRAPHQL_RESPONSE_CACHE_TIMEOUT=0):
+            self.assertIsNone(CachedResponse.for_query(self.COMMITTEES_QUERY, {}, None, []))
+            self._data(self.COMMITTEES_QUERY)
+            with CaptureQueriesContext(connection) as queries:
+                self._data(self.COMMITTEES_QUERY)
+            self.assertGreater(len(queries), 0)
+
+    def test_model_read_by_resolver(self):
+        # The name of a member is read from Person, which the query does not select as a type. The first response
+        # finds that out, the second one is cached.
+        self._members()
+        members = self._members()
+        with self.assertNumQueries(0):
+            self.assertEqual(self._members(), members)
+
+        person = self.data['person1']
+        person.first_name = 'Renamed'
+        person.save()
+        self.assertEqual(self._members(), ['Renamed Client'])
+
+    def test_related_object_added(self):
+        self._members()
+        self._members()
+
+        Function.objects.create(person=self.data['person2'], committee=self.committee, function='Member',
+                                begin=datetime.date(2020, 1, 1))
+        self.assertEqual(sorted(self._members()), ['Test Client', 'Test2 Client'])
+
+    def test_many_to_many(self):
+        parent = Committee.objects.create(name='Parent committee', abbreviation='Parent')
+        self._data(self.PARENTS_QUERY, id=self.committee.id)
+        self.assertEqual(self._data(self.PARENTS_QUERY, id=self.committee.id)['committee']['parentCommittees'], [])
+
+        self.committee.parent_committees.add(parent)
+        self.assertEqual(self._data(self.PARENTS_QUERY, id=self.committee.id)['committee']['parentCommittees'],
+                         [{'name': 'Parent committee'}])
+
+    def test_deleted(self):
+        committee = Committee.objects.create(name='Deleted committee', abbreviation='Deleted')
+        self.assertIn({'name': 'Deleted committee'}, self._data(self.COMMITTEES_QUERY)['committees']['results'])
+
+        committee.delete()
+        self.assertNotIn({'name': 'Deleted committee'}, self._data(self.COMMITTEES_QUERY)['committees']['results'])
+
+    def test_authenticated_not_cached(self):
+        self._data(self.COMMITTEES_QUERY)
+        self.client.force_login(self.data['user1'])
+
+        with CaptureQueriesContext(connection) as queries:
+            self._data(self.COMMITTEES_QUERY)
+        self.assertGreater(len(queries), 0)
@@ -1,8 +1,76 @@
+from contextlib import nullcontext
+
+from django.conf import settings
 from graphene_django.views import GraphQLView
+from graphql import ExecutionResult, GraphQLError, OperationType, execute, get_operation_ast
+from graphql_jwt.utils import get_http_authorization
+
+from amelie.graphql.documents import get_document, get_persisted_queries, get_persisted_query_id
+from amelie.graphql import response_cache
 
 
 class IAGraphQLView(GraphQLView):
+    """
+    GraphQL view that caches the parsed and validated query documents, and the responses to queries of anonymous
+    users. Clients can send the id or SHA-256 hash of a persisted query instead of the query itself.
+    """
+
+    @staticmethod
+    def is_anonymous(request):
+        # The JSONWebTokenMiddleware only authenticates the user while resolving, so check for a token as well
+        return not request.user.is_authenticated and get_http_authorization(request) is None
+
     def execute_graphql_request(
         self, request, data, query, variables, operation_name, show_graphiql=False
     ):
-        return super().execute_graphql_request(request, data, query, variables, operation_name, show_graphiql=show_graphiql)
+        anonymous = self.is_anonymous(request)
+
+        persisted_query_id = get_persisted_query_id(data)
+        if persisted_query_id is not None:
+            query = get_persisted_queries().get(persisted_query_id)
+            if query is None:
+                return ExecutionResult(data=None, errors=[GraphQLError("PersistedQueryNotFound")])
+        elif query and anonymous and settings.GRAPHQL_PERSISTED_QUERIES_ONLY \
+                and query not in get_persisted_queries().values():
+            return ExecutionResult(data=None, errors=[GraphQLError("PersistedQueryNotSupported")])
+
+        if not query:
+            return super().execute_graphql_request(request, data, query, variables, operation_name,
+                                                   show_graphiql=show_graphiql)
+
+        schema = self.schema.graphql_schema
+        document = get_document(schema, query)
+        if document.errors:
+            return ExecutionResult(data=None, errors=document.errors)
+
+        # Mutations (and the checks on queries sent with GET) are left to graphene-django
+        operation_ast = get_operation_ast(document.document, operation_name)
+        if operation_ast is None or operation_ast.operation != OperationType.QUERY:
+            return super().execute_graphql_request(request, data, query, variables, operation_name,
+                                                   show_graphiql=show_graphiql)
+
+        cached = None
+        if anonymous:
+            cached = response_cache.CachedResponse.for_query(query, variables, operation_name, document.models)
+            data = cached.get() if cached is not None else None
+            if data is not None:
+                return ExecutionResult(data=data)
+
+        try:
+            with cached.track() if cached is not None else nullcontext():
+                result = execute(
+                    schema,
+                    document.document,
+                    root_value=self.get_root_value(request),
+                    context_value=self.get_context(request),
+                    variable_values=variables,
+                    operation_name=operation_name,
+                    middleware=self.get_middleware(request),
+                    execution_context_class=self.execution_context_class,
+                )
+        except Exception as e:
+            return ExecutionResult(data=None, errors=[e])
+
+        if cached is not None and not result.errors:
+            cached.set(result.data)
+        return result
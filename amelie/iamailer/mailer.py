@@ -1,3 +1,5 @@
+import copy
+import functools
 import logging
 import os
 from email.mime.image import MIMEImage
@@ -27,6 +29,17 @@ def render_mail(template, context=None, html=False, preview=False):
     :param preview: Render preview for view in browser.
     :return: Tuple containing the rendered content, the subject for the mail and a list of attachments.
     """
+    content, subject, attach_static = _render_mail_template(template, context, html=html, preview=preview)
+    attachments = _process_attach_static(attach_static)
+
+    return content, subject, attachments
+
+
+def _render_mail_template(template, context=None, html=False, preview=False):
+    """
+    Render an email template, like render_mail, but without processing the static attachments.
+    :return: Tuple containing the rendered content, the subject for the mail and a dict of static attachments.
+    """
     if not context:
         context = {}
 
@@ -53,9 +66,8 @@ def render_mail(template, context=None, html=False, preview=False):
 
     subject = new_context.get('subject', None)
     attach_static = new_context.get('attach_static', {})
-    attachments = _process_attach_static(attach_static)
 
-    return content, subject, attachments
+    return content, subject, attach_static
 
 
 def _process_attach_static(attach_static):
@@ -68,27 +80,40 @@ def _process_attach_static(attach_static):
     attachments = []
 
     for cid, staticfilename in attach_static.items():
-        fullpath = finders.find(staticfilename)
-        basename = os.path.basename(staticfilename)
+        # Every message gets its own copy of the cached part, because it becomes a part of that message
+        attachments.append(copy.deepcopy(_static_mime_part(cid, staticfilename)))
 
-        if not fullpath:
-            raise ValueError("Static file {} could not be found.".format(staticfilename))
+    return attachments
 
-        if cid != md5(staticfilename.encode()).hexdigest():
-            raise ValueError("CID {} invalid for static file {}.".format(cid, staticfilename))
 
-        with open(fullpath, 'rb') as imagefile:
-            imagedata = imagefile.read()
-        attachment = MIMEImage(imagedata, name=basename)
-        attachment.add_header('Content-ID', '<{}>'.format(cid))
-        attachment.add_header('Content-Disposition', 'inline', filename=basename)
-        attachments.append(attachment)
+@functools.lru_cache(maxsize=64)
+def _static_mime_part(cid, staticfilename):
+    """
+    Build the inline MIME part of a static file, cached so that mass mailings read and encode every image only once.
 
-    return attachments
+    :param cid: Content ID of the part, which should be the md5 hash of the static file name.
+    :param staticfilename: Name of the static file.
+    :return: MIMEImage object
+    """
+    fullpath = finders.find(staticfilename)
+    basename = os.path.basename(staticfilename)
+
+    if not fullpath:
+        raise ValueError("Static file {} could not be found.".format(staticfilename))
+
+    if cid != md5(staticfilename.encode()).hexdigest():
+        raise ValueError("CID {} invalid for static file {}.".format(cid, staticfilename))
+
+    with open(fullpath, 'rb') as imagefile:
+        imagedata = imagefile.read()
+    attachment = MIMEImage(imagedata, name=basename)
+    attachment.add_header('Content-ID', '<{}>'.format(cid))
+    attachment.add_header('Content-Disposition', 'inline', filename=basename)
+    return attachment
 
 
 def send_single_mail_from_template(template, mail_from=None, to=None, cc=None, bcc=None, headers=None, context=None,
-                                   language=None, attachments=None, connection=None):
+                                   language=None, attachments=None, connection=None, prerendered=None):
     """
     Send HTML mail to specified recipients by rendering template.
     :param template: Template to render.
@@ -101,6 +126,8 @@ def send_single_mail_from_template(template, mail_from=None, to=None, cc=None, b
     :param language: Language code for translation.
     :param attachments: Attachments. List of tuples for parameters for EmailMultiAlternativesRelated.attach
     :param connection: Email backend connection.
+    :param prerendered: List of PrerenderedMail objects of the template in this language. The first one that
+                        applies to the context is used instead of rendering the template.
     """
     # Remember the old translation setting
     old_language = translation.get_language()
@@ -109,8 +136,18 @@ def send_single_mail_from_template(template, mail_from=None, to=None, cc=None, b
 
     # Render the template
     try:
-        plain_content, plain_subject, plain_attachments = render_mail(template, context)
-        html_content, html_subject, html_attachments = render_mail(template, context, html=True)
+        rendered = None
+        for variant in prerendered or []:
+            rendered = variant.render(context or {})
+            if rendered is not None:
+                break
+
+        if rendered is not None:
+            plain_content, plain_subject, html_content, html_subject, attach_static = rendered
+            html_attachments = _process_attach_static(attach_static)
+        else:
+            plain_content, plain_subject, plain_attachments = render_mail(template, context)
+            html_content, html_subject, html_attachments = render_mail(template, context, html=True)
     finally:
         # Reactivate the old language
         translation.activate(old_language)
@@ -5,7 +5,8 @@ from amelie.iamailer.tasks import send_mails
 
 class MailTask:
     def __init__(self, from_: str = None, template_name: str = None, template_string: str = None,
-                 report_to: str = None, report_language: str = None, report_always: bool = True, priority: int = 5):
+                 report_to: str = None, report_language: str = None, report_always: bool = True, priority: int = 5,
+                 prerender: bool = False):
         """
         Create a task to send e-mails.
         :param from_: Sender of the message "Name <email@domain.local>"
@@ -16,6 +17,8 @@ class MailTask:
         :param report_always: True if you always want a delivery report, False if you only want one if some mails fail to send.
         :param priority: Priority with which the mails are sent. Can be a number from 1 (lowest) to 10 (highest).
                          5 is the default. Priority is only used if the mails are sent in the background.
+        :param prerender: True to render the template once per language and only fill in the personal values, like
+                          the name of the recipient, for each mail. Useful for mailings to many recipients.
         """
         self.from_: str = from_
         self.template_name: str = template_name
@@ -24,6 +27,7 @@ class MailTask:
         self.report_language: str = report_language
         self.report_always: bool = report_always
         self.priority: int = priority
+        self.prerender: bool = prerender
 
         self.recipients: List['Recipient'] = []
 
@@ -48,7 +52,8 @@ class MailTask:
             "template_string": self.template_string,
             "report_to": self.report_to,
             "report_language": self.report_language,
-            "report_always": self.report_always
+            "report_always": self.report_always,
+            "prerender": self.prerender,
         }
 
         if delay:
@@ -0,0 +1,78 @@
+import itertools
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import get_template
+from django.utils import translation
+
+from amelie.iamailer.mailer import render_mail
+from amelie.iamailer.prerender import prerender_mails
+from amelie.members.models import Person
+from amelie.tools.mail import PersonRecipient
+from amelie.weekmail.models import WeekMail
+
+
+def _render_all(template, mails):
+    """Render every mail completely, like send_single_mail_from_template does without prerendering."""
+    old_language = translation.get_language()
+    for maildata in mails:
+        translation.activate(maildata['language'])
+        try:
+            render_mail(template, maildata['context'])
+            render_mail(template, maildata['context'], html=True)
+        finally:
+            translation.activate(old_language)
+
+
+def _render_prerendered(template, mails):
+    """Render the template once per language and fill in the personal values of every mail."""
+    prerendered = prerender_mails(template, mails)
+    old_language = translation.get_language()
+    fallbacks = 0
+    for maildata in mails:
+        translation.activate(maildata['language'])
+        try:
+            variants = prerendered.get(maildata['language'], [])
+            if all(variant.render(maildata['context']) is None for variant in variants):
+                fallbacks += 1
+                render_mail(template, maildata['context'])
+                render_mail(template, maildata['context'], html=True)
+        finally:
+            translation.activate(old_language)
+    return fallbacks
+
+
+class Command(BaseCommand):
+    help = "Compares the time it takes to render a weekmail for every recipient completely and with prerendering."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--weekmail', type=int, help="The weekmail to render, defaults to the latest one")
+        parser.add_argument('--recipients', default=1000, type=int, help="The number of recipients to render for")
+
+    def handle(self, *args, **options):
+        weekmail = WeekMail.objects.filter(pk=options['weekmail']).first() if options['weekmail'] \
+            else WeekMail.objects.order_by('-creation_date').first()
+        if weekmail is None:
+            raise CommandError("No weekmail found.")
+
+        persons = list(Person.objects.members()[:options['recipients']])
+        if not persons:
+            raise CommandError("No members found.")
+
+        template = get_template('weekmail/weekmail_mail.mail')
+        mails = [PersonRecipient(person, context={'weekmail': weekmail}).get_maildata()
+                 for person in itertools.islice(itertools.cycle(persons), options['recipients'])]
+
+        start = time.perf_counter()
+        _render_all(template, mails)
+        full = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fallbacks = _render_prerendered(template, mails)
+        prerendered = time.perf_counter() - start
+
+        per_thousand = 1000 / len(mails)
+        self.stdout.write("Full rendering: {:.2f}s per 1000 recipients".format(full * per_thousand))
+        self.stdout.write("Prerendering: {:.2f}s per 1000 recipients ({} of {} mails rendered completely)".format(
+            prerendered * per_thousand, fallbacks, len(mails)
+        ))
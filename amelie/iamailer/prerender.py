@@ -0,0 +1,233 @@
+import datetime
+import logging
+import re
+from decimal import Decimal
+
+from django.template.base import Node, TextNode, VariableNode, render_value_in_context
+from django.template.context import Context
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.utils import translation
+
+from amelie.iamailer.mailer import _render_mail_template
+
+logger = logging.getLogger(__name__)
+
+# Types of personal context values that can be filled in after rendering
+PERSONAL_VALUE_TYPES = (str, int, float, Decimal, datetime.date, type(None))
+
+MARKER_RE = re.compile('\x1e(\\d+)\x1f')
+
+# Maximum number of prerendered versions per language, for different structures of the personal values
+MAX_VARIANTS = 4
+
+# Value that is used to check that the template outputs a personal value with the usual escaping
+PROBE_VALUE = '<&"\'probe>'
+
+
+def _marker(index):
+    return '\x1e{}\x1f'.format(index)
+
+
+def _leaves(value, path=()):
+    """
+    Returns the leaf values of a (nested) dictionary, by the path of keys to them.
+    """
+    if isinstance(value, dict):
+        leaves = {}
+        for key, item in value.items():
+            leaves.update(_leaves(item, path + (key,)))
+        return leaves
+    return {path: value}
+
+
+def _replace_leaves(value, replacements, path=()):
+    """
+    Returns a copy of a (nested) dictionary with the leaf values at the given paths replaced.
+    """
+    if isinstance(value, dict):
+        return {key: _replace_leaves(item, replacements, path + (key,)) for key, item in value.items()}
+    return replacements.get(path, value)
+
+
+class PrerenderedMail(object):
+    """
+    The plain and HTML versions of a mail template rendered once for many recipients in a single language.
+
+    The parts of the context that are the same for all recipients are rendered into the mail, the personal values
+    (like the name of the recipient) are left as markers that render() fills in for each recipient.
+    """
+
+    def __init__(self, shared_keys, personal_paths, parts):
+        self.shared_keys = shared_keys
+        self.personal_paths = personal_paths
+        self.parts = parts
+
+    def applies_to(self, context):
+        """
+        Check if the personal values of the context can be filled in. Contexts that have other keys or values of
+        other types are rendered completely.
+        """
+        personal = {key: value for key, value in context.items() if key not in self.shared_keys}
+        if set(context) - set(personal) != self.shared_keys:
+            return False
+        leaves = _leaves(personal)
+        return list(leaves) == self.personal_paths and \
+            all(isinstance(value, PERSONAL_VALUE_TYPES) for value in leaves.values())
+
+    def render(self, context):
+        """
+        Fill in the personal values of the context. Should be called with the language of the mail activated.
+
+        :return: Tuple of the plain content, plain subject, HTML content, HTML subject and static attachments, or
+                 None if this prerendered mail does not apply to the context.
+        """
+        if not self.applies_to(context):
+            return None
+
+        leaves = _leaves({key: value for key, value in context.items() if key not in self.shared_keys})
+        values = [render_value_in_context(leaves[path], Context()) for path in self.personal_paths]
+
+        def _substitute(text):
+            return MARKER_RE.sub(lambda m: values[int(m.group(1))], text) if text else text
+
+        plain_content, plain_subject, plain_attach_static = self.parts['plain']
+        html_content, html_subject, html_attach_static = self.parts['html']
+        return (_substitute(plain_content), _substitute(plain_subject), _substitute(html_content),
+                _substitute(html_subject), html_attach_static)
+
+
+def _personal(context, shared_keys):
+    return {key: value for key, value in context.items() if key not in shared_keys}
+
+
+def _fixed_template_name(filter_expression):
+    """
+    Returns the template name of an extends or include tag if it is a fixed string, or None.
+    """
+    if isinstance(filter_expression.var, str) and not filter_expression.filters:
+        return filter_expression.var
+    return None
+
+
+def _only_outputs(template, names, checked=None):
+    """
+    Check in the compiled template that the variables with the given names are only output as they are, like
+    {{ recipient.first_name }}. They may not be filtered or used in any tag, like in the condition of an if tag, because
+    then their value can change more of the mail than just their own output. Extended and included templates are
+    checked as well, which is only possible if their names are fixed.
+    """
+    template = getattr(template, 'template', template)
+    checked = checked if checked is not None else set()
+    if template.origin.name in checked:
+        return True
+    checked.add(template.origin.name)
+
+    uses = re.compile(r'(?<![\w.])(?:{})(?!\w)'.format('|'.join(re.escape(name) for name in names)))
+    output = re.compile(r'^\s*(?:{})(?:\.\w+)*\s*$'.format('|'.join(re.escape(name) for name in names)))
+
+    for node in template.nodelist.get_nodes_by_type(Node):
+        if isinstance(node, TextNode):
+            continue
+        contents = node.token.contents if getattr(node, 'token', None) else ''
+        if isinstance(node, VariableNode):
+            if uses.search(contents) and not output.match(contents):
+                return False
+            continue
+        if uses.search(contents):
+            return False
+
+        if isinstance(node, ExtendsNode) or isinstance(node, IncludeNode):
+            name = _fixed_template_name(node.parent_name if isinstance(node, ExtendsNode) else node.template)
+            if name is None or not _only_outputs(template.engine.get_template(name), names, checked):
+                return False
+
+    return True
+
+
+def _prerender(template, first, shared_keys):
+    """
+    Prerender a template for recipients with the same language, of which first is the context of one, or return None if
+    that is not possible for this template.
+    """
+    personal = _personal(first, shared_keys)
+    personal_paths = list(_leaves(personal))
+
+    prerendered = PrerenderedMail(shared_keys, personal_paths, {})
+    if not prerendered.applies_to(first):
+        return None
+
+    # The template must only output the personal values, which is checked in the compiled template
+    if personal and not _only_outputs(template, set(personal)):
+        return None
+
+    def _context(values):
+        shared = {key: first[key] for key in shared_keys}
+        shared.update(_replace_leaves(personal, dict(zip(personal_paths, values))))
+        return shared
+
+    markers = [_marker(i) for i in range(len(personal_paths))]
+    for name, html in [('plain', False), ('html', True)]:
+        prerendered.parts[name] = _render_mail_template(template, _context(markers), html=html)
+
+    # As a last check, rendering it with other values has to give the same result as filling those values in. The real
+    # values of the first recipient catch differences for their type.
+    first_values = [_leaves(personal)[path] for path in personal_paths]
+    for values in [first_values, [PROBE_VALUE] * len(personal_paths), [''] * len(personal_paths)]:
+        plain_content, plain_subject, html_content, html_subject, attach_static = prerendered.render(_context(values))
+        for html, content, subject in [(False, plain_content, plain_subject), (True, html_content, html_subject)]:
+            if _render_mail_template(template, _context(values), html=html)[:2] != (content, subject):
+                return None
+
+    return prerendered
+
+
+def prerender_mails(template, mails):
+    """
+    Render a mail template once per language for all recipients of a mailing.
+
+    Context keys with the same value for all recipients of a language are rendered into the mail. The other keys must
+    contain (dictionaries of) simple values that the template only outputs, like the name of the recipient. Templates
+    that use them in another way, for example in a filter or an if tag, are detected in the compiled template and not
+    prerendered. Recipients whose personal values have a different structure (like a student number
+    that is missing) get their own prerendered version, up to MAX_VARIANTS per language.
+
+    :param template: Template object.
+    :param mails: List of mail data dictionaries, as returned by IAMailer's `Recipient.get_maildata()`.
+    :return: Dictionary from language to a list of PrerenderedMail objects, to be passed to
+             `send_single_mail_from_template`. Mails that none of them apply to are rendered completely.
+    """
+    languages = {}
+    for maildata in mails:
+        languages.setdefault(maildata.get('language', None), []).append(maildata.get('context', {}) or {})
+
+    old_language = translation.get_language()
+    prerendered = {}
+    for language, contexts in languages.items():
+        first = contexts[0]
+        shared_keys = {key for key, value in first.items()
+                       if all(key in context and context[key] == value for context in contexts[1:])}
+
+        # One context for every structure of the personal values
+        variants = {}
+        for context in contexts:
+            variants.setdefault(tuple(_leaves(_personal(context, shared_keys))), context)
+
+        prerendered[language] = []
+        if language:
+            translation.activate(language)
+        # noinspection PyBroadException
+        try:
+            for context in list(variants.values())[:MAX_VARIANTS]:
+                variant = _prerender(template, context, shared_keys)
+                if variant is not None:
+                    prerendered[language].append(variant)
+        except Exception:
+            logger.exception(f'Prerendering mail template for language {language} failed')
+            prerendered[language] = []
+        finally:
+            translation.activate(old_language)
+
+        if not prerendered[language]:
+            logger.info(f'Mail template can not be prerendered for language {language}, rendering every mail')
+
+    return prerendered
@@ -1,28 +1,112 @@
+import functools
 import logging
 import time
 
 from celery import shared_task, group, chord
+from celery.exceptions import SoftTimeLimitExceeded
 from django.conf import settings
 from django.core.mail import get_connection
 from django.template import Template
 from django.template.loader import get_template
 
 from amelie.iamailer.mailer import send_single_mail_from_template
+from amelie.iamailer.prerender import prerender_mails
 
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=16)
+def _compile_template_string(template_string):
+    return Template(template_string)
+
+
+def _load_template(template_name=None, template_string=None):
+    """
+    Load a mail template by name or from a string.
+
+    Template files are cached by the template loaders, template strings are compiled once per worker process.
+    """
+    if template_name:
+        return get_template(template_name)
+    else:
+        return _compile_template_string(template_string)
+
+
+class _TokenBucket(object):
+    """
+    Token bucket rate limiter.
+
+    :param rate: Number of tokens that are added per second, or None for no limit.
+    :param capacity: Maximum number of tokens in the bucket, which is the number of tokens that can be taken at once.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self):
+        """
+        Take a token from the bucket, waiting until one is available.
+        """
+        if not self.rate:
+            return
+
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        if self.tokens < 1:
+            wait = (1 - self.tokens) / self.rate
+            logger.debug(f'Waiting {wait:.1f} seconds for the e-mail rate limit...')
+            time.sleep(wait)
+            self.tokens = 1
+            self.updated = time.monotonic()
+
+        self.tokens -= 1
+
+
+_mail_bucket = None
+
+
+def _get_mail_bucket():
+    """
+    Returns the rate limiter of the batches of this worker process.
+
+    The limiter is shared by all batches, so the burst is only allowed once after the worker has been idle, and not
+    again for every batch. The mail queue is handled by a single worker process, see scripts/start_celery.sh.
+    """
+    global _mail_bucket
+    if _mail_bucket is None:
+        _mail_bucket = _TokenBucket(rate=1 / settings.EMAIL_DELAY if settings.EMAIL_DELAY else None,
+                                    capacity=settings.EMAIL_BURST)
+    return _mail_bucket
+
+
+def _batch_size():
+    """
+    Returns the number of mails in a batch: EMAIL_BATCH_SIZE, but no more than the number of mails that can wait for
+    the rate limit in half of EMAIL_BATCH_TIME_LIMIT, which leaves the other half for sending them.
+    """
+    batch_size = settings.EMAIL_BATCH_SIZE
+    if batch_size and settings.EMAIL_DELAY:
+        batch_size = min(batch_size, max(1, int(settings.EMAIL_BATCH_TIME_LIMIT / 2 / settings.EMAIL_DELAY)))
+    return batch_size
+
+
 @shared_task(name="iamailer.send_mails")
 def send_mails(mails, mail_from=None, template_name=None, template_string=None, report_to=None, report_language=None,
-               report_always=True):
+               report_always=True, prerender=False):
     """
     Send HTML mails to specified recipients by rendering a template.
 
     Exactly one of the parameters template_name or template_string must be provided.
 
-    This task will create and launch a Celery workflow with a new Task for each mail that needs to be sent,
-    followed by a single task to send the delivery report mail.
+    This task will create and launch a Celery workflow with a new Task for each batch of mails that needs to be sent
+    (see `_batch_size`, or for each mail if EMAIL_BATCH_SIZE is not set), followed by a single task to send the
+    delivery report mail.
 
     :param mails: Dict containing email information:
         {
@@ -41,10 +125,12 @@ def send_mails(mails, mail_from=None, template_name=None, template_string=None,
                       Example: 'Sender <sender@example.com>'
     :param report_language: Language code for translations.
     :param report_always: Always send a delivery report. If False, only delivery reports are sent if an error occurs.
+    :param prerender: Render the template once per language and only fill in the personal values for each mail.
+                      See `amelie.iamailer.prerender.prerender_mails`.
 
-    :return: Dictionary with the number of tasks scheduled:
+    :return: Dictionary with the number of mails scheduled:
              {
-               'scheduled_tasks': The number of mail tasks scheduled.
+               'scheduled_tasks': The number of mails scheduled.
              }
     """
     num_mails = len(mails)
@@ -57,18 +143,33 @@ def send_mails(mails, mail_from=None, template_name=None, template_string=None,
 
     # Verify that the template exists/works by trying to load it.
     logger.debug('Loading template...')
+    template = _load_template(template_name, template_string)
     if template_name:
-        _ = get_template(template_name)
         logger.debug("Using template from file '{}'".format(template_name))
     else:
-        _ = Template(template_string)
         logger.debug('Using template from string')
 
+    prerendered = {}
+    if prerender:
+        logger.debug('Prerendering template...')
+        prerendered = prerender_mails(template, mails)
+
     # Build a Celery workflow that will send all the mails and then send a delivery report
     logger.info('Sending mails to {} recipients'.format(num_mails))
-    chord(
+    batch_size = _batch_size()
+    if batch_size:
+        # Send the mails in batches, each over a single connection,
+        mail_tasks = group(
+            send_mail_batch.s(mail_from=mail_from, mails=mails[i:i + batch_size], template_name=template_name,
+                              template_string=template_string, prerendered=prerendered)
+            for i in range(0, num_mails, batch_size)
+        )
+    else:
         # Send each mail,
-        group(send_single_mail.s(mail_from=mail_from, maildata=maildata, template_name=template_name, template_string=template_string) for maildata in mails),
+        mail_tasks = group(send_single_mail.s(mail_from=mail_from, maildata=maildata, template_name=template_name, template_string=template_string,
+                                              prerendered=prerendered.get(maildata.get('language', None))) for maildata in mails)
+    chord(
+        mail_tasks,
         # followed by the delivery report,
         send_delivery_report.s(
             mail_from=mail_from, total_mail_count=num_mails, report_to=report_to,
@@ -81,7 +182,7 @@ def send_mails(mails, mail_from=None, template_name=None, template_string=None,
 
 # acks_late makes it so that the task is retried if the worker crashes before it finishes.
 @shared_task(name="iamailer.send_single_mail", acks_late=True)
-def send_single_mail(mail_from, maildata, template_name=None, template_string=None):
+def send_single_mail(mail_from, maildata, template_name=None, template_string=None, prerendered=None):
     """
     Send a single e-mail.
 
@@ -89,6 +190,7 @@ def send_single_mail(mail_from, maildata, template_name=None, template_string=No
     :param maildata: Dictionary of Mail data, as returned by IAMailer's `Recipient.get_maildata()`.
     :param template_name: The name of the template file to use (only if template_string is not provided).
     :param template_string: The template string to use (only if template_name is not provided).
+    :param prerendered: List of PrerenderedMail objects of the template in the language of the mail, or None.
     :return: Dictionary with data about the sending:
              {
                'to': maildata.to (Name/email where the mail was sent to),
@@ -114,10 +216,7 @@ def send_single_mail(mail_from, maildata, template_name=None, template_string=No
         if template_string and template_name:
             raise ValueError('Both template and template_name are provided')
 
-        if template_name:
-            template = get_template(template_name)
-        else:
-            template = Template(template_string)
+        template = _load_template(template_name, template_string)
 
         logger.debug(f'Sending mail to {to_string}')
 
@@ -125,7 +224,7 @@ def send_single_mail(mail_from, maildata, template_name=None, template_string=No
         send_single_mail_from_template(
             template=template, mail_from=mail_from, to=to, cc=cc, bcc=bcc, headers=headers,
             context=context, language=language, attachments=attachments,
-            connection=get_connection(timeout=settings.EMAIL_TIMEOUT))
+            connection=get_connection(timeout=settings.EMAIL_TIMEOUT), prerendered=prerendered)
     except Exception as e:
         success = False
         exception = str(e)
@@ -144,13 +243,102 @@ def send_single_mail(mail_from, maildata, template_name=None, template_string=No
     }
 
 
+# Not acks_late, a batch that is delivered again would send its mails again.
+@shared_task(name="iamailer.send_mail_batch", soft_time_limit=settings.EMAIL_BATCH_TIME_LIMIT)
+def send_mail_batch(mail_from, mails, template_name=None, template_string=None, prerendered=None):
+    """
+    Send a batch of e-mails over a single connection to the mail server.
+
+    The sending rate is limited with a token bucket that allows EMAIL_BURST mails at once and one mail every
+    EMAIL_DELAY seconds after that, instead of waiting EMAIL_DELAY seconds after every mail.
+
+    If the batch takes longer than EMAIL_BATCH_TIME_LIMIT, the mails that have not been sent yet are reported as
+    failed, so the results of the sent mails still reach the delivery report.
+
+    :param mail_from: Sender information for mail From header.
+    :param mails: List of dictionaries of Mail data, as returned by IAMailer's `Recipient.get_maildata()`.
+    :param template_name: The name of the template file to use (only if template_string is not provided).
+    :param template_string: The template string to use (only if template_name is not provided).
+    :param prerendered: Dictionary from language to PrerenderedMail objects, as returned by `prerender_mails`.
+    :return: List of dictionaries with data about the sending of each mail, like the result of `send_single_mail`.
+    """
+    results = []
+    template = None
+    template_exception = None
+    # noinspection PyBroadException
+    try:
+        if not template_string and not template_name:
+            raise ValueError('None of template and template_name are provided')
+        if template_string and template_name:
+            raise ValueError('Both template and template_name are provided')
+
+        template = _load_template(template_name, template_string)
+    except Exception as e:
+        template_exception = str(e)
+        logger.exception('Loading the mail template failed')
+
+    bucket = _get_mail_bucket()
+    connection = get_connection(timeout=settings.EMAIL_TIMEOUT)
+
+    try:
+        for maildata in mails:
+            to = maildata['to']
+            to_string = ';'.join(to)
+
+            success = True
+            exception = template_exception
+            if exception:
+                success = False
+            else:
+                bucket.take()
+                # noinspection PyBroadException
+                try:
+                    logger.debug(f'Sending mail to {to_string}')
+
+                    # Send mail, the connection is opened when the first mail is sent and stays open after that
+                    send_single_mail_from_template(
+                        template=template, mail_from=mail_from, to=to, cc=maildata.get('cc', []),
+                        bcc=maildata.get('bcc', []), headers=maildata.get('headers', {}),
+                        context=maildata.get('context', {}), language=maildata.get('language', None),
+                        attachments=maildata.get('attachments', None), connection=connection,
+                        prerendered=(prerendered or {}).get(maildata.get('language', None)))
+                except SoftTimeLimitExceeded:
+                    raise
+                except Exception as e:
+                    success = False
+                    exception = str(e)
+                    logger.exception(f'Sending mail to {to_string} failed')
+
+                    # Start with a fresh connection, the mail server might have dropped this one
+                    connection.close()
+                else:
+                    logger.info(f'Sending mail to {to_string} succeeded')
+
+            results.append({
+                'to': to,
+                'success': success,
+                'exception': exception
+            })
+    except SoftTimeLimitExceeded:
+        logger.error(f'Sending a batch of mails took too long, {len(mails) - len(results)} mails were not sent')
+        results += [{
+            'to': maildata['to'],
+            'success': False,
+            'exception': 'Not sent, sending the batch took too long'
+        } for maildata in mails[len(results):]]
+    finally:
+        connection.close()
+
+    return results
+
+
 # acks_late makes it so that the task is retried if the worker crashes before it finishes.
 @shared_task(name="iamailer.send_delivery_report", acks_late=True)
 def send_delivery_report(results, mail_from, total_mail_count, report_to, report_language, report_always):
     """
     Send a delivery report based on the number of successfully and unsuccessfully sent emails.
 
-    :param results: List of Celery Task results from the `send_single_mail` tasks.
+    :param results: List of Celery Task results from the `send_single_mail` or `send_mail_batch` tasks.
     :param mail_from: From address. Example: 'Sender <sender@example.com>'
     :param total_mail_count: Total number of e-mails that were attempted.
     :param report_to: Address to send the delivery report to. None if no delivery report must be sent.
@@ -171,6 +359,8 @@ def send_delivery_report(results, mail_from, total_mail_count, report_to, report
     # it will be al list. Convert the dict into a 1-long list if it is a dict to avoid problems.
     if type(results) == dict:
         results = [results]
+    # Batches return a list of results, one for each mail.
+    results = [r for result in results for r in (result if type(result) == list else [result])]
 
     # Collect the errors and count the errors and successes
     failed_mails = [r for r in results if not r['success']]
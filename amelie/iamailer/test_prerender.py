@@ -0,0 +1,86 @@
+from django.core import mail
+from django.template import Template
+from django.test import override_settings
+
+from amelie.iamailer.mailer import _render_mail_template, send_single_mail_from_template
+from amelie.iamailer.prerender import MAX_VARIANTS, prerender_mails
+from amelie.tools.tests import SimpleTestCase
+
+TEMPLATE = '{% load subject %}{% subject %}News for {{ name }}{% endsubject %}' \
+           '<p>{{ greeting }} {{ name }},</p><p>Your number is {{ person.number }}.</p>'
+
+
+def _contexts():
+    return [
+        {'greeting': 'Hello', 'name': 'Alice & <Bob>', 'person': {'number': 1}},
+        {'greeting': 'Hello', 'name': '"Carol"', 'person': {'number': 2}},
+        {'greeting': 'Hello', 'name': '', 'person': {'number': None}},
+    ]
+
+
+class PrerenderMailsTest(SimpleTestCase):
+    def _full_render(self, template, context):
+        plain_content, plain_subject, _ = _render_mail_template(template, context)
+        html_content, html_subject, _ = _render_mail_template(template, context, html=True)
+        return plain_content, plain_subject, html_content, html_subject
+
+    def _prerendered_render(self, variants, context):
+        for variant in variants:
+            rendered = variant.render(context)
+            if rendered is not None:
+                return rendered[:4]
+        return None
+
+    def test_same_as_full_render(self):
+        template = Template(TEMPLATE)
+        contexts = _contexts()
+
+        prerendered = prerender_mails(template, [{'to': ['r@example.com'], 'context': c} for c in contexts])
+
+        self.assertEqual(len(prerendered[None]), 1)
+        for context in contexts:
+            self.assertEqual(self._prerendered_render(prerendered[None], context), self._full_render(template, context))
+        # The personal values are escaped like in a full render
+        self.assertIn('Alice &amp; &lt;Bob&gt;', self._prerendered_render(prerendered[None], contexts[0])[2])
+
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+    def test_same_mail(self):
+        template = Template(TEMPLATE)
+        mails = [{'to': ['r@example.com'], 'context': c} for c in _contexts()]
+        prerendered = prerender_mails(template, mails)
+
+        for maildata in mails:
+            send_single_mail_from_template(template, to=maildata['to'], context=maildata['context'])
+            send_single_mail_from_template(template, to=maildata['to'], context=maildata['context'],
+                                           prerendered=prerendered[None])
+        for full, fast in zip(mail.outbox[::2], mail.outbox[1::2]):
+            self.assertEqual(fast.subject, full.subject)
+            self.assertEqual(fast.body, full.body)
+            self.assertEqual(fast.alternatives, full.alternatives)
+
+    def test_not_only_output(self):
+        for template_string in [
+            '{% load subject %}{% subject %}News{% endsubject %}{% if name %}Dear {{ name }}{% endif %}',
+            '{% load subject %}{% subject %}News{% endsubject %}Dear {{ name|upper }}',
+            '{% load subject %}{% subject %}News{% endsubject %}{% with n=name %}Dear {{ n }}{% endwith %}',
+        ]:
+            template = Template(template_string)
+            contexts = [{'name': 'Alice'}, {'name': 'Bob'}]
+
+            prerendered = prerender_mails(template, [{'to': ['r@example.com'], 'context': c} for c in contexts])
+
+            self.assertEqual(prerendered[None], [], template_string)
+
+    def test_max_variants(self):
+        template = Template(TEMPLATE)
+        # Each recipient has another personal key, so every context has a different structure
+        contexts = [{'greeting': 'Hello', 'name': 'Recipient %i' % i, 'key%i' % i: 'Value'}
+                    for i in range(MAX_VARIANTS + 1)]
+
+        prerendered = prerender_mails(template, [{'to': ['r@example.com'], 'context': c} for c in contexts])
+
+        self.assertEqual(len(prerendered[None]), MAX_VARIANTS)
+        for context in contexts[:MAX_VARIANTS]:
+            self.assertEqual(self._prerendered_render(prerendered[None], context), self._full_render(template, context))
+        # The last recipient is rendered completely
+        self.assertIsNone(self._prerendered_render(prerendered[None], contexts[MAX_VARIANTS]))
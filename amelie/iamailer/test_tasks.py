@@ -0,0 +1,126 @@
+from celery.exceptions import SoftTimeLimitExceeded
+from django.core import mail
+from django.test import override_settings
+
+from amelie.iamailer import tasks
+from amelie.iamailer.tasks import _TokenBucket, _batch_size, send_delivery_report, send_mail_batch
+from amelie.tools.tests import SimpleTestCase
+
+TEMPLATE = '{% load subject %}{% subject %}Test for {{ name }}{% endsubject %}Dear {{ name }},'
+
+
+class FakeTime:
+    """Stands in for the time module, with a clock that only advances while sleeping."""
+
+    def __init__(self, time_limit=None):
+        self.now = 0
+        self.sleeps = []
+        self.time_limit = time_limit
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        # Celery interrupts the task with an exception once the soft time limit has passed
+        if self.time_limit is not None and self.now > self.time_limit:
+            raise SoftTimeLimitExceeded()
+
+
+def _mails(count):
+    return [{'to': ['Recipient {0} <recipient{0}@example.com>'.format(i)], 'context': {'name': 'Recipient %i' % i}}
+            for i in range(count)]
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class SendMailBatchTest(SimpleTestCase):
+    def setUp(self):
+        self.time = FakeTime()
+        self._use_time(self.time)
+
+    def _use_time(self, fake_time):
+        old_time, old_bucket = tasks.time, tasks._mail_bucket
+        self.addCleanup(setattr, tasks, 'time', old_time)
+        self.addCleanup(setattr, tasks, '_mail_bucket', old_bucket)
+        tasks.time = fake_time
+        tasks._mail_bucket = None
+
+    @override_settings(EMAIL_BATCH_SIZE=50, EMAIL_DELAY=5, EMAIL_BATCH_TIME_LIMIT=240)
+    def test_batch_size_time_limit(self):
+        # Half of the time limit is enough to wait for 24 mails
+        self.assertEqual(_batch_size(), 24)
+
+    @override_settings(EMAIL_BATCH_SIZE=50, EMAIL_DELAY=0, EMAIL_BATCH_TIME_LIMIT=240)
+    def test_batch_size_without_delay(self):
+        self.assertEqual(_batch_size(), 50)
+
+    @override_settings(EMAIL_BATCH_SIZE=None, EMAIL_DELAY=5, EMAIL_BATCH_TIME_LIMIT=240)
+    def test_batch_size_disabled(self):
+        self.assertIsNone(_batch_size())
+
+    def test_token_bucket(self):
+        bucket = _TokenBucket(rate=1 / 5, capacity=2)
+        for _ in range(4):
+            bucket.take()
+        # The burst is taken at once, after that one token every 5 seconds
+        self.assertEqual(self.time.sleeps, [5, 5])
+
+        # After being idle the bucket is full again, but not more than full
+        self.time.now += 60
+        for _ in range(3):
+            bucket.take()
+        self.assertEqual(self.time.sleeps, [5, 5, 5])
+
+    def test_token_bucket_without_rate(self):
+        bucket = _TokenBucket(rate=None)
+        for _ in range(10):
+            bucket.take()
+        self.assertEqual(self.time.sleeps, [])
+
+    @override_settings(EMAIL_DELAY=5, EMAIL_BURST=2)
+    def test_delay(self):
+        results = send_mail_batch(mail_from='Sender <sender@example.com>', mails=_mails(4), template_string=TEMPLATE)
+
+        self.assertEqual(self.time.sleeps, [5, 5])
+        self.assertEqual([r['success'] for r in results], [True] * 4)
+        self.assertEqual([m.subject for m in mail.outbox], ['Test for Recipient %i' % i for i in range(4)])
+
+    @override_settings(EMAIL_DELAY=5, EMAIL_BURST=1, EMAIL_BATCH_TIME_LIMIT=12)
+    def test_time_limit(self):
+        self._use_time(FakeTime(time_limit=12))
+
+        results = send_mail_batch(mail_from='Sender <sender@example.com>', mails=_mails(4), template_string=TEMPLATE)
+
+        # The fourth mail would be sent after 15 seconds, so it is reported as not sent, and not lost
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual([r['to'] for r in results], [m['to'] for m in _mails(4)])
+        self.assertEqual([r['success'] for r in results], [True, True, True, False])
+        self.assertEqual(results[3]['exception'], 'Not sent, sending the batch took too long')
+
+    @override_settings(EMAIL_DELAY=0)
+    def test_template_error(self):
+        results = send_mail_batch(mail_from='Sender <sender@example.com>', mails=_mails(2))
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual([r['success'] for r in results], [False, False])
+
+
+class SendDeliveryReportTest(SimpleTestCase):
+    def test_flatten_results(self):
+        batch = [{'to': ['a@example.com'], 'success': True, 'exception': None},
+                 {'to': ['b@example.com'], 'success': False, 'exception': 'Error'}]
+        single = {'to': ['c@example.com'], 'success': True, 'exception': None}
+
+        report = send_delivery_report([batch, single, [batch[0]]], mail_from='Sender <sender@example.com>',
+                                      total_mail_count=4, report_to=None, report_language=None, report_always=True)
+
+        self.assertEqual(report, {'num_total': 4, 'num_success': 3, 'num_failed': 1})
+
+    def test_single_result(self):
+        single = {'to': ['c@example.com'], 'success': False, 'exception': 'Error'}
+
+        report = send_delivery_report(single, mail_from='Sender <sender@example.com>', total_mail_count=1,
+                                      report_to=None, report_language=None, report_always=True)
+
+        self.assertEqual(report, {'num_total': 1, 'num_success': 0, 'num_failed': 1})
@@ -8,6 +8,7 @@ from django.utils.translation import gettext_lazy as _
 
 from amelie.graphql.decorators import check_authorization
 from amelie.graphql.helpers import is_board, is_logged_in
+from amelie.graphql.loaders import load_related
 from amelie.graphql.pagination.connection_field import DjangoPaginationConnectionField
 from amelie.members.models import Committee, Function, CommitteeCategory, Photographer
 
@@ -26,10 +27,10 @@ class FunctionType(DjangoObjectType):
     is_current_member = graphene.Boolean(description=_("This person is currently a member of this committee"))
 
     def resolve_person(obj: Function, info):
-        return obj.person.incomplete_name()
+        return load_related(info, obj, 'person').incomplete_name()
 
     def resolve_is_current_member(obj: Function, info):
-        return obj.end is None and obj.committee.abolished is None
+        return obj.end is None and load_related(info, obj, 'committee').abolished is None
 
 @check_authorization
 class PhotographerType(DjangoObjectType):
@@ -147,9 +148,12 @@ class CommitteeType(DjangoObjectType):
         """
         # If past members are requested, only include them if the user is a board member
         if include_past_members and is_board(info):
-            return obj.function_set.all()
+            return load_related(info, obj, 'function_set')
         # Else only return current members
-        return obj.function_set.filter(end__isnull=True)
+        return load_related(info, obj, 'function_set', queryset=Function.objects.filter(end__isnull=True), key='current')
+
+    def resolve_category(obj: Committee, info):
+        return load_related(info, obj, 'category')
 
     def resolve_information(obj: Committee, info):
         return obj.information
@@ -187,7 +191,8 @@ class CommitteeCategoryType(DjangoObjectType):
                     Q(abolished__isnull=True) | Q(function__person=info.context.person)
                 ).distinct()
         # Else only return active committees
-        return obj.committee_set.filter(abolished__isnull=True)
+        return load_related(info, obj, 'committee_set', queryset=Committee.objects.filter(abolished__isnull=True),
+                            key='active')
 
 
 class MembersQuery(graphene.ObjectType):
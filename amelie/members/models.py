@@ -694,10 +694,16 @@ class Person(models.Model, Mappable):
         if not self.is_active():
             return []
 
+        return [self.personal_alias()]
+
+    def personal_alias(self):
+        """
+        Gives the e-mail alias of this person, regardless of whether this person is active.
+        """
         # Strip spaces and apostrophes
         last_name = normalize_to_ascii(self.get_surname()).replace(' ', '').replace("'", '')
         name = normalize_to_ascii(self.get_givenname()).replace(' ', '').replace("'", '')
-        return [('%s.%s' % (name, last_name)).lower()]
+        return ('%s.%s' % (name, last_name)).lower()
 
     def groups(self):
         """Get all groups of this person"""
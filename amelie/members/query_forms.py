@@ -475,7 +475,8 @@ class MailingForm(forms.Form):
         ccs = [self.cleaned_data['cc_email']] if self.cleaned_data['cc_email'] else None
         bccs = [self.cleaned_data['bcc_email']] if self.cleaned_data['bcc_email'] else None
 
-        task = MailTask(sender, template_string=template_string, report_to=sender, priority=TaskPriority.MEDIUM)
+        task = MailTask(sender, template_string=template_string, report_to=sender, priority=TaskPriority.MEDIUM,
+                        prerender=True)
 
         for recipient in recipients:
             if isinstance(recipient, tuple):
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import time
+
+import requests
+from aiohttp import web
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.http import JsonResponse
+from django.test import override_settings
+from django.test.client import AsyncRequestFactory, RequestFactory
+
+from amelie.narrowcasting import views
+from amelie.narrowcasting.models import RoomState, SpotifyAssociation
+from amelie.tools.asyncio import get_http_session
+
+PLAYER = {
+    'is_playing': True,
+    'progress_ms': 1000,
+    'device': {'name': 'Benchmark'},
+    'item': {'name': 'Benchmark', 'duration_ms': 180000, 'artists': [{'name': 'Benchmark'}],
+             'album': {'images': [{'url': 'https://example.com/album.jpg'}]}},
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class StubSpotify(threading.Thread):
+    """A Spotify player API on localhost that answers after a fixed latency, in a thread of its own."""
+
+    def __init__(self, latency):
+        super().__init__(daemon=True)
+        self.latency = latency
+        self.url = None
+        self.ready = threading.Event()
+
+    async def player(self, request):
+        await asyncio.sleep(self.latency)
+        return web.json_response(PLAYER)
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        app.router.add_get('/v1/me/player', self.player)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, '127.0.0.1', 0).start())
+        self.url = 'http://127.0.0.1:{}/v1'.format(runner.addresses[0][1])
+        self.ready.set()
+        loop.run_forever()
+
+
+def _sync_now_playing(request):
+    """room_spotify_now_playing as it was before it was an async view."""
+    assoc = SpotifyAssociation.objects.get(name=request.GET['id'])
+    res = requests.get("{}/me/player".format(settings.SPOTIFY_API_URL), params={"market": "from_token"},
+                       headers={"Authorization": "Bearer {}".format(assoc.access_token)})
+    data = res.json()
+    data['error'] = False
+    return JsonResponse(data)
+
+
+class Command(BaseCommand):
+    help = "Compares the throughput of one ASGI worker for the room screen's Spotify endpoint as a sync view and as " \
+           "an async view, against a stubbed Spotify API. The test data is rolled back afterwards."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', default=200, type=int, help="The number of requests, defaults to 200")
+        parser.add_argument('--concurrency', default=50, type=int,
+                            help="The number of requests at the same time, defaults to 50")
+        parser.add_argument('--latency', default=100, type=int,
+                            help="The latency of the stubbed Spotify API in milliseconds, defaults to 100")
+
+    def handle(self, *args, **options):
+        stub = StubSpotify(options['latency'] / 1000)
+        stub.start()
+        stub.ready.wait()
+
+        # Skip the page cache, every request should go upstream
+        async_view = views.room_spotify_now_playing.__wrapped__
+
+        try:
+            with transaction.atomic(), override_settings(SPOTIFY_API_URL=stub.url, SPOTIFY_CLIENT_SECRET='benchmark'):
+                # Skip the state of the poller as well
+                RoomState.objects.filter(part='spotify').delete()
+                SpotifyAssociation.objects.create(name='benchmark', access_token='benchmark',
+                                                  refresh_token='benchmark')
+
+                # Django runs sync views of an ASGI app in one thread per worker, see sync_to_async
+                sync_rate = self._benchmark("Sync view", lambda: sync_to_async(_sync_now_playing)(
+                    RequestFactory().get('/narrowcasting/room/spotify/', {'id': 'benchmark'})), options)
+                async_rate = self._benchmark("Async view", lambda: async_view(
+                    AsyncRequestFactory().get('/narrowcasting/room/spotify/', {'id': 'benchmark'})), options)
+                self.stdout.write(self.style.SUCCESS("Speedup: {:.1f}x".format(async_rate / sync_rate)))
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def _benchmark(self, name, request, options):
+        async def run():
+            semaphore = asyncio.Semaphore(options['concurrency'])
+
+            async def one():
+                async with semaphore:
+                    response = await request()
+                if response.status_code != 200:
+                    raise CommandError("{}: {}".format(response.status_code, response.content.decode()))
+
+            await asyncio.gather(*[one() for _ in range(options['requests'])])
+            await get_http_session().close()
+
+        start = time.perf_counter()
+        async_to_sync(run)()
+        duration = time.perf_counter() - start
+        rate = options['requests'] / duration
+        self.stdout.write("{}: {} requests in {:.2f}s, {:.1f} requests/s".format(name, options['requests'], duration,
+                                                                                  rate))
+        return rate
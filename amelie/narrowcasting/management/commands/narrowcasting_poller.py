@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from amelie.narrowcasting.room_state import RoomStatePoller
+
+
+class Command(BaseCommand):
+    help = "Keeps the Spotify players, chat messages, room duty and pictures of the room narrowcasting screen up to " \
+           "date in the database, from where they are pushed to the screens."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Refresh everything once instead of running forever")
+
+    def handle(self, *args, **options):
+        poller = RoomStatePoller()
+        if not poller.next_refresh:
+            self.stdout.write(self.style.WARNING("No parts of the room state to refresh, see NARROWCASTING_ROOM_REFRESH"))
+            return
+
+        self.stdout.write(self.style.SUCCESS("Refreshing the room state: {}".format(', '.join(
+            "{} every {}s".format(part, poller.intervals[part]) for part in poller.next_refresh))))
+        try:
+            poller.run(once=options['once'])
+        except KeyboardInterrupt:
+            pass
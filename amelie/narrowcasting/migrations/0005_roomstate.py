@@ -0,0 +1,24 @@
+# Generated by Django 5.2.12 on 2026-10-17 23:50
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('narrowcasting', '0004_auto_20240724_1740'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('part', models.CharField(max_length=20, unique=True)),
+                ('version', models.CharField(max_length=16)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('expires', models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
 from amelie.activities.models import Activity
@@ -18,3 +19,23 @@ class SpotifyAssociation(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class RoomState(models.Model):
+    """
+    A part of the state of the room screen, as refreshed by the narrowcasting_poller command. It is stored in the
+    database so that all web workers see it.
+
+    part:    The part of the state, see amelie.narrowcasting.room_state.ROOM_STATE_PARTS.
+    version: Hash of the data, which only changes when the data changes.
+    data:    The data of the part, as sent to the screens.
+    expires: The moment after which the part is not used anymore, because the poller stopped refreshing it.
+    """
+
+    part = models.CharField(max_length=20, unique=True)
+    version = models.CharField(max_length=16)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    expires = models.DateTimeField()
+
+    def __str__(self):
+        return self.part
@@ -0,0 +1,332 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.html import escape
+from django.utils.translation import gettext as _
+from mautrix.client import ClientAPI
+from mautrix.types import PaginationDirection, RoomEventFilter, TextMessageEventContent, MessageEvent, UserID
+from mautrix.types.event.type import EventType
+
+from amelie.activities.models import Activity
+from amelie.api.activitystream_utils import add_images_property, add_thumbnails_property, get_basic_result
+from amelie.api.authentication_types import AnonymousAuthentication
+from amelie.api.narrowcasting import get_room_duty_today
+from amelie.narrowcasting.models import RoomState, SpotifyAssociation
+from amelie.tools.asyncio import get_event_loop, get_http_session
+
+logger = logging.getLogger(__name__)
+
+# The parts of the state of the room screen, in the order in which they are refreshed
+ROOM_STATE_PARTS = ('spotify', 'chat', 'room_duty', 'pictures')
+
+# Number of activities with pictures that the room screen rotates through
+ROOM_PICTURE_ACTIVITIES = 20
+
+
+async def spotify_refresh_token(association, session: Optional[aiohttp.ClientSession] = None):
+    session = session or get_http_session()
+    try:
+        async with session.post(f"{settings.SPOTIFY_ACCOUNTS_URL}/api/token", data={
+            "grant_type": "refresh_token",
+            "refresh_token": association.refresh_token,
+            "client_id": settings.SPOTIFY_CLIENT_ID,
+            "client_secret": settings.SPOTIFY_CLIENT_SECRET
+        }) as res:
+            status = res.status
+            data = await res.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as e:
+        raise ValueError(_("ConnectionError while refreshing access token:") + f" {e}")
+
+    if 'error' in data:
+        raise ValueError(data['error_description'])
+    elif status != 200:
+        raise ValueError(f"Status code: {status}")
+
+    try:
+        association.access_token = data['access_token']
+        await association.asave()
+    except KeyError as e:
+        if 'error' in data:
+            raise ValueError(data['error_description'])
+        else:
+            raise e
+    return association
+
+
+async def spotify_request(association, method, path, session: Optional[aiohttp.ClientSession] = None, **kwargs):
+    """
+    Make a request to the Spotify player API for an association, and return the response as shown on the room screen.
+    An expired access token is refreshed, after which the request is retried.
+
+    :param association: The SpotifyAssociation of the player.
+    :param method: The HTTP method, e.g. "GET".
+    :param path: The path of the API endpoint, e.g. "/me/player".
+    :param session: The HTTP session to use, defaults to the session of the running event loop.
+    """
+    session = session or get_http_session()
+    try:
+        async with session.request(method, f"{settings.SPOTIFY_API_URL}{path}",
+                                   headers={"Authorization": "Bearer {}".format(association.access_token)},
+                                   **kwargs) as res:
+            status = res.status
+            content = await res.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError, ConnectionError) as e:
+        logger.warning(f"ConnectionError during Spotify request {method} {path}: {e}")
+        # Return empty response
+        return {}
+
+    if status == 200:
+        data = json.loads(content)
+        data['error'] = False
+    elif status == 204:
+        data = {'error': False, 'is_playing': False}
+    elif status == 401:
+        # Access code expired, request a new one and retry the request.
+        try:
+            await spotify_refresh_token(association, session)
+            return await spotify_request(association, method, path, session, **kwargs)
+        except ValueError as e:
+            data = {'error': True, 'code': 500, 'msg': str(e)}
+    elif status == 429:
+        # Since we often exceed the rate limit, do not report as error
+        data = {'error': False, 'is_playing': False}
+    else:
+        data = {'error': True, 'code': status, 'msg': content.decode()}
+
+    return data
+
+
+async def spotify_player_state(association, session: Optional[aiohttp.ClientSession] = None):
+    """Retrieve the state of the Spotify player of an association, as shown on the room screen."""
+    return await spotify_request(association, "GET", "/me/player", session, params={"market": "from_token"})
+
+
+async def spotify_player_states(associations, session: Optional[aiohttp.ClientSession] = None):
+    """Retrieve the states of the Spotify players of several associations at once, by association name."""
+    states = await asyncio.gather(*[spotify_player_state(association, session) for association in associations])
+    return {association.name: state for association, state in zip(associations, states)}
+
+
+def matrix_client() -> ClientAPI:
+    matrix_hostname = settings.MATRIX_SETTINGS['SERVER']
+    access_token = settings.MATRIX_SETTINGS['TOKEN']
+    user_id = settings.MATRIX_SETTINGS['USER']
+
+    if matrix_hostname == "" or access_token == "" or settings.MATRIX_SETTINGS['ROOM_ID'] == "":
+        raise ValueError("Chat settings not configured.")
+
+    return ClientAPI(user_id, base_url=matrix_hostname, token=access_token)
+
+
+async def close_matrix_client(client: ClientAPI):
+    if client and client.api and client.api.session:
+        await client.api.session.close()
+
+
+async def get_ia_chat_messages(client: Optional[ClientAPI] = None) -> List[Dict[str, Any]]:
+    """
+    Retrieve the last messages of the chat room that is shown on the room screen.
+
+    :param client: Matrix client to use, a new one is made (and closed afterwards) if not given.
+    """
+    chat_room_id = settings.MATRIX_SETTINGS['ROOM_ID']
+    max_msg_to_show = settings.MATRIX_SETTINGS['MAX_MSG_TO_SHOW']
+    max_msg_length = settings.MATRIX_SETTINGS['MAX_MSG_LENGTH']
+
+    own_client = client is None
+    if own_client:
+        client = matrix_client()
+
+    try:
+        filter_messages = RoomEventFilter(types=[EventType.ROOM_MESSAGE])
+        events = await client.get_messages(chat_room_id, direction=PaginationDirection.BACKWARD,
+                                           limit=max_msg_to_show, filter_json=filter_messages)
+
+        # Retrieve the display names of all senders at once
+        senders = list({ev.sender for ev in events.events})
+        display_names = dict(zip(senders, await asyncio.gather(
+            *[_get_user_display_name(client, sender) for sender in senders], return_exceptions=True)))
+
+        messages = []
+        for ev in events.events:
+            ev: MessageEvent
+            try:
+                username = display_names[ev.sender]
+                if isinstance(username, Exception):
+                    raise username
+                if username is None:
+                    username, _ = ClientAPI.parse_user_id(ev.sender)
+            except ValueError:
+                username = ev.sender
+            try:
+                timestamp = datetime.datetime.fromtimestamp(ev.timestamp / 1000)
+                if timestamp.date() != datetime.date.today():
+                    timestamp = timestamp.strftime("%m-%d %H:%M:%S")
+                else:
+                    timestamp = timestamp.strftime('%H:%M:%S')
+            except ValueError:
+                timestamp = datetime.datetime.now().strftime('%H:%M:%S')
+
+            if isinstance(ev.content, TextMessageEventContent):
+                msg_body = str(ev.content.body)
+                if len(msg_body) > max_msg_length:
+                    msg_body = msg_body[:max_msg_length].strip() + "…"
+            else:
+                msg_body = f"<unsupported message '{ev.content.__class__.__name__}'>"
+
+            # Escape the values because they will be rendered in the frontend without escaping
+            username = escape(username)
+            msg_body = escape(msg_body)
+
+            messages.append({"from": username, "time": timestamp, "message": msg_body})
+    finally:
+        if own_client:
+            await close_matrix_client(client)
+
+    return messages[::-1]
+
+
+async def _get_user_display_name(client: ClientAPI, matrix_id: UserID) -> str:
+    return await client.get_displayname(matrix_id)
+
+
+def get_latest_pictures(amount=ROOM_PICTURE_ACTIVITIES) -> List[Dict]:
+    """The public activities with pictures that the room screen shows, same as getLatestActivitiesWithPictures."""
+    authentication = AnonymousAuthentication(None)
+    activities = Activity.objects.filter_public(True).filter(photos__gt=0, photos__public=True).distinct()\
+        .order_by("-begin")
+
+    result = []
+    for activity in activities[0:amount]:
+        single = get_basic_result(activity)
+        add_thumbnails_property(activity, authentication, single)
+        add_images_property(activity, authentication, single)
+        result.append(single)
+    return result
+
+
+def set_room_state(part, data, timeout):
+    """
+    Store a part of the room state, which expires after timeout seconds. The version of the part only changes when its
+    data changes, so the screens are only sent the parts that changed.
+    """
+    serialized = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+    version = hashlib.sha256(serialized.encode()).hexdigest()[:16]
+    RoomState.objects.update_or_create(part=part, defaults={
+        'version': version, 'data': data, 'expires': timezone.now() + datetime.timedelta(seconds=timeout),
+    })
+
+
+def _current_room_state():
+    return RoomState.objects.filter(expires__gt=timezone.now())
+
+
+def _room_state(states):
+    return {state.part: {'version': state.version, 'data': state.data} for state in states}
+
+
+def get_room_state():
+    """Returns the parts of the room state that are kept up to date by the poller, as {part: {version, data}}."""
+    return _room_state(_current_room_state())
+
+
+async def aget_room_state():
+    return _room_state([state async for state in _current_room_state()])
+
+
+def get_room_state_data(part):
+    """Returns the data of a part of the room state, or None if the poller does not keep it up to date."""
+    state = _current_room_state().filter(part=part).only('data').first()
+    return state.data if state is not None else None
+
+
+async def aget_room_state_data(part):
+    state = await _current_room_state().filter(part=part).only('data').afirst()
+    return state.data if state is not None else None
+
+
+class RoomStatePoller(object):
+    """
+    Refreshes the state of the room screen on its own schedule, see settings.NARROWCASTING_ROOM_REFRESH.
+
+    The upstream services are called once per interval, however many screens there are. A part of the state expires
+    when it has not been refreshed for a few intervals, after which the views fall back to calling the upstream
+    services themselves.
+    """
+
+    # Number of intervals after which a part of the state expires
+    EXPIRE_INTERVALS = 3
+
+    def __init__(self, intervals=None):
+        self.intervals = intervals or settings.NARROWCASTING_ROOM_REFRESH
+        self.next_refresh = {part: 0.0 for part in ROOM_STATE_PARTS if self.intervals.get(part)}
+        self.loop = get_event_loop()
+        self.matrix = None
+
+    def refresh_spotify(self):
+        if settings.SPOTIFY_CLIENT_SECRET == "":
+            return None
+        associations = list(SpotifyAssociation.objects.exclude(refresh_token__isnull=True).exclude(refresh_token=''))
+        return self.loop.run_until_complete(spotify_player_states(associations))
+
+    def refresh_chat(self):
+        if self.matrix is None:
+            self.matrix = matrix_client()
+        try:
+            return {'error': False, 'messages': self.loop.run_until_complete(get_ia_chat_messages(self.matrix))}
+        except Exception as e:
+            # Start with a new client next time
+            self.loop.run_until_complete(close_matrix_client(self.matrix))
+            self.matrix = None
+            return {'error': True, 'messages': [], 'error_msg': str(e)}
+
+    def refresh_room_duty(self):
+        return get_room_duty_today()
+
+    def refresh_pictures(self):
+        return get_latest_pictures()
+
+    def refresh(self, part):
+        try:
+            data = getattr(self, 'refresh_{}'.format(part))()
+        except Exception:
+            logger.exception("Could not refresh the %s of the room screen", part)
+            return
+        if data is not None:
+            set_room_state(part, data, self.intervals[part] * self.EXPIRE_INTERVALS)
+
+    def refresh_due(self):
+        """Refresh the parts of the state that are due, and return the number of seconds until the next one is."""
+        for part, due in self.next_refresh.items():
+            if due <= time.monotonic():
+                self.refresh(part)
+                self.next_refresh[part] = time.monotonic() + self.intervals[part]
+        close_old_connections()
+        return max(0.0, min(self.next_refresh.values()) - time.monotonic())
+
+    def run(self, once=False):
+        try:
+            if once:
+                for part in self.next_refresh:
+                    self.refresh(part)
+                return
+            while True:
+                time.sleep(self.refresh_due())
+        finally:
+            if self.matrix is not None:
+                self.loop.run_until_complete(close_matrix_client(self.matrix))
+            self.loop.run_until_complete(self._close_http_session())
+
+    @staticmethod
+    async def _close_http_session():
+        await get_http_session().close()
@@ -25,8 +25,51 @@ $(document).ready(function(){
     updateAndInterval(updateRoomDuty, 60 * MINUTE);
     updateAndInterval(updateNowPlaying, 2 * SECOND);
     updateAndInterval(updateChatMessages, 15 * SECOND);
+    listenForRoomState();
 });
 
+// Parts of the room state that the server pushes, these do not have to be polled
+var pushedParts = {};
+
+function listenForRoomState() {
+    if (!window.EventSource) {
+        return;
+    }
+
+    var source = new EventSource("./state/");
+    source.addEventListener("spotify", function (event) {
+        pushedParts.spotify = true;
+        var players = JSON.parse(event.data);
+        $(".nowplaying_location").each(function () {
+            var identifier = $(this).data('user');
+            if (identifier in players) {
+                renderNowPlaying($(this), identifier, players[identifier]);
+            } else {
+                renderNowPlayingError($(this), identifier, 404);
+            }
+        });
+    });
+    source.addEventListener("chat", function (event) {
+        pushedParts.chat = true;
+        renderChatMessages(JSON.parse(event.data));
+    });
+    source.addEventListener("room_duty", function (event) {
+        pushedParts.room_duty = true;
+        renderRoomDuty(JSON.parse(event.data));
+    });
+    source.addEventListener("pictures", function (event) {
+        pushedParts.pictures = true;
+        setPictures(JSON.parse(event.data));
+    });
+    source.addEventListener("expired", function (event) {
+        delete pushedParts[JSON.parse(event.data)];
+    });
+    source.onerror = function () {
+        // Poll everything until the browser has reconnected
+        pushedParts = {};
+    };
+}
+
 function getString(string_id){
     return $("#translation_strings #"+string_id).text();
 }
@@ -72,12 +115,19 @@ function updateEvent() {
 
 var pictures = null;
 
+function setPictures(result) {
+    pictures = result;
+    numActivities = result.length;
+}
+
 function updatePictures() {
+    if (pushedParts.pictures) {
+        return;
+    }
     $.jsonRPC.request('getLatestActivitiesWithPictures', {
         params: [numActivitiesInitial],
         success: function(result) {
-            pictures = result.result;
-            numActivities = result.result.length;
+            setPictures(result.result);
         },
         error: function(result) {
             console.error("Could not load pictures");
@@ -85,42 +135,48 @@ function updatePictures() {
     });
 }
 
+function renderRoomDuty(roomDuties) {
+    $("#room_duty_entries .room_duty_entry").remove();
+    if (roomDuties.length > 0){
+        for (var i = 0; i < roomDuties.length; i++) {
+            var roomDuty = roomDuties[i];
+            var startTime = moment(roomDuty.beginDate);
+            var endTime = moment(roomDuty.endDate);
+            var participants = "";
+            for (var j = 0; j < roomDuty.participants.length; j++) {
+                if (participants === "") {
+                    participants += roomDuty.participants[j].firstName;
+                } else {
+                    participants += ", " + roomDuty.participants[j].firstName;
+                }
+            }
+            if (participants === "") {
+                participants = "<i>" + getString('no_room_duty_scheduled') + "</i>";
+            }
+
+            var elem = $("<div class='room_duty_entry'>" +
+                "<span class='time'>" + startTime.format("HH:mm") + " / " + endTime.format("HH:mm") + "</span>" +
+                "<span class='names'>" + participants + "</span>" +
+                "</div>");
+            $("#room_duty_entries").append(elem);
+        }
+    } else {
+        var e = $("<div class='room_duty_entry'>" +
+            "<span class='time'><i>" + getString('no_room_duty_today') + "</i></span>" +
+            "<span class='names'></span>" +
+            "</div>");
+        $("#room_duty_entries").append(e);
+    }
+}
+
 function updateRoomDuty() {
+    if (pushedParts.room_duty) {
+        return;
+    }
     $.jsonRPC.request('getRoomDutyToday', {
         params: [],
         success: function(result) {
-            var roomDuties = result.result;
-            $("#room_duty_entries .room_duty_entry").remove();
-            if (roomDuties.length > 0){
-                for (var i = 0; i < roomDuties.length; i++) {
-                    var roomDuty = roomDuties[i];
-                    var startTime = moment(roomDuty.beginDate);
-                    var endTime = moment(roomDuty.endDate);
-                    var participants = "";
-                    for (var j = 0; j < roomDuty.participants.length; j++) {
-                        if (participants === "") {
-                            participants += roomDuty.participants[j].firstName;
-                        } else {
-                            participants += ", " + roomDuty.participants[j].firstName;
-                        }
-                    }
-                    if (participants === "") {
-                        participants = "<i>" + getString('no_room_duty_scheduled') + "</i>";
-                    }
-
-                    var elem = $("<div class='room_duty_entry'>" +
-                        "<span class='time'>" + startTime.format("HH:mm") + " / " + endTime.format("HH:mm") + "</span>" +
-                        "<span class='names'>" + participants + "</span>" +
-                        "</div>");
-                    $("#room_duty_entries").append(elem);
-                }
-            } else {
-                var e = $("<div class='room_duty_entry'>" +
-                    "<span class='time'><i>" + getString('no_room_duty_today') + "</i></span>" +
-                    "<span class='names'></span>" +
-                    "</div>");
-                $("#room_duty_entries").append(e);
-            }
+            renderRoomDuty(result.result);
         },
         error: function(result) {
             console.error("Could not load room duty");
@@ -254,7 +310,103 @@ function setNextPicture() {
 
 var nowPlayingExclude = [];
 
+function renderNowPlayingError(dom_object, identifier, status) {
+    if (status === 404) {
+        nowPlayingExclude.push(identifier);
+        dom_object.find(".nowplaying_title").html("<a href='?setup_spotify=" + identifier + "'>" + getString('not_associated') + "</a>");
+    } else {
+        // Update playing device
+        if (identifier === "inter-actief") {
+            spotify_room_device = null;
+        }
+        dom_object.find(".albumimage").attr("style", "display: none;");
+        dom_object.find(".albumimage").attr("src", "");
+        dom_object.find(".nowplaying_title").html(getString("spotify_error"));
+        dom_object.find(".nowplaying_artist").html("");
+        dom_object.find(".nowplaying_device").html("");
+        dom_object.find(".nowplaying_track").addClass("nowplaying_nothing");
+        dom_object.find(".nowplaying_album").addClass("not_playing");
+    }
+}
+
+function renderNowPlaying(dom_object, identifier, data) {
+    if (data['error'] === false && data['is_playing'] === true) {
+        // Update playing device
+        if (identifier === "inter-actief") {
+            spotify_room_device = data["device"]["name"];
+        }
+
+        var artists = [];
+        for (var key in data.item.artists) {
+            artist = data.item.artists[key];
+            artists.push(artist.name);
+        }
+        if (artists.length === 0) {
+            artists = [getString("unknown_artist")];
+        }
+
+        var progress = (data.progress_ms / data.item.duration_ms) * 100;
+
+        // Preload the image before showing it.
+        var img_tag = $('<img alt="" src="' + data.item.album.images[0].url + '" />');
+        img_tag.bind('load', function () {
+            dom_object.find(".albumimage").attr("style", "");
+            dom_object.find(".nowplaying_album").removeClass("not_playing");
+            dom_object.find(".nowplaying_track").removeClass("nowplaying_nothing");
+            dom_object.find(".albumimage").attr('src', data.item.album.images[0].url);
+            dom_object.find(".nowplaying_title").html(data.item.name);
+            dom_object.find(".nowplaying_artist").html(artists.join(", "));
+            dom_object.find(".nowplaying_device").html(data.device.name);
+            var progressDiv = dom_object.find(".nowplaying_progress");
+            var progress_per_five_sec = (5000 / data.item.duration_ms) * 100;
+            var curProgress = parseFloat(progressDiv[0].style.width.replace("%", "")) - progress_per_five_sec - 0.1;
+            var transitionProgress = 0;
+            if (!isNaN(curProgress)) {
+                if (progress < curProgress) {
+                    progressDiv.removeClass("transition");
+                } else if (!progressDiv.hasClass('transition')) {
+                    progressDiv.addClass('transition');
+                    transitionProgress = Math.min(progress + progress_per_five_sec, 100);
+                } else {
+                    transitionProgress = Math.min(progress + progress_per_five_sec, 100);
+                }
+            }
+            progressDiv.attr('style', "width: "+transitionProgress+'%;');
+        });
+        if (img_tag[0].width) {
+            img_tag.trigger('load')
+        }
+    } else if (data['error'] === false) {
+        // Update playing device
+        if (identifier === "inter-actief") {
+            spotify_room_device = null;
+        }
+        dom_object.find(".albumimage").attr("style", "display: none;");
+        dom_object.find(".albumimage").attr("src", "");
+        dom_object.find(".nowplaying_title").html(getString("not_playing"));
+        dom_object.find(".nowplaying_artist").html("");
+        dom_object.find(".nowplaying_device").html("");
+        dom_object.find(".nowplaying_track").addClass("nowplaying_nothing");
+        dom_object.find(".nowplaying_album").addClass("not_playing");
+    } else {
+        // Update playing device
+        if (identifier === "inter-actief") {
+            spotify_room_device = null;
+        }
+        dom_object.find(".albumimage").attr("style", "display: none;");
+        dom_object.find(".albumimage").attr("src", "");
+        dom_object.find(".nowplaying_title").html(getString("spotify_error"));
+        dom_object.find(".nowplaying_artist").html("");
+        dom_object.find(".nowplaying_device").html("");
+        dom_object.find(".nowplaying_track").addClass("nowplaying_nothing");
+        dom_object.find(".nowplaying_album").addClass("not_playing");
+    }
+}
+
 function updateNowPlaying() {
+    if (pushedParts.spotify) {
+        return;
+    }
     $(".nowplaying_location").each(function(){
         var dom_object = $(this);
         var identifier = $(this).data('user');
@@ -264,101 +416,37 @@ function updateNowPlaying() {
                 url: "./spotify/?id=" + identifier,
                 error: function (result) {
                     console.log(result);
-                    if (result.status === 404) {
-                        nowPlayingExclude.push(identifier);
-                        dom_object.find(".nowplaying_title").html("<a href='?setup_spotify=" + identifier + "'>" + getString('not_associated') + "</a>");
-                    } else {
-                        // Update playing device
-                        if (identifier === "inter-actief") {
-                            spotify_room_device = null;
-                        }
-                        dom_object.find(".albumimage").attr("style", "display: none;");
-                        dom_object.find(".albumimage").attr("src", "");
-                        dom_object.find(".nowplaying_title").html(getString("spotify_error"));
-                        dom_object.find(".nowplaying_artist").html("");
-                        dom_object.find(".nowplaying_device").html("");
-                        dom_object.find(".nowplaying_track").addClass("nowplaying_nothing");
-                        dom_object.find(".nowplaying_album").addClass("not_playing");
-                    }
+                    renderNowPlayingError(dom_object, identifier, result.status);
                 }
             }).done(function (data) {
-                if (data['error'] === false && data['is_playing'] === true) {
-                    // Update playing device
-                    if (identifier === "inter-actief") {
-                        spotify_room_device = data["device"]["name"];
-                    }
-
-                    var artists = [];
-                    for (var key in data.item.artists) {
-                        artist = data.item.artists[key];
-                        artists.push(artist.name);
-                    }
-                    if (artists.length === 0) {
-                        artists = [getString("unknown_artist")];
-                    }
-
-                    var progress = (data.progress_ms / data.item.duration_ms) * 100;
-
-                    // Preload the image before showing it.
-                    var img_tag = $('<img alt="" src="' + data.item.album.images[0].url + '" />');
-                    img_tag.bind('load', function () {
-                        dom_object.find(".albumimage").attr("style", "");
-                        dom_object.find(".nowplaying_album").removeClass("not_playing");
-                        dom_object.find(".nowplaying_track").removeClass("nowplaying_nothing");
-                        dom_object.find(".albumimage").attr('src', data.item.album.images[0].url);
-                        dom_object.find(".nowplaying_title").html(data.item.name);
-                        dom_object.find(".nowplaying_artist").html(artists.join(", "));
-                        dom_object.find(".nowplaying_device").html(data.device.name);
-                        var progressDiv = dom_object.find(".nowplaying_progress");
-                        var progress_per_five_sec = (5000 / data.item.duration_ms) * 100;
-                        var curProgress = parseFloat(progressDiv[0].style.width.replace("%", "")) - progress_per_five_sec - 0.1;
-                        var transitionProgress = 0;
-                        if (!isNaN(curProgress)) {
-                            if (progress < curProgress) {
-                                progressDiv.removeClass("transition");
-                            } else if (!progressDiv.hasClass('transition')) {
-                                progressDiv.addClass('transition');
-                                transitionProgress = Math.min(progress + progress_per_five_sec, 100);
-                            } else {
-                                transitionProgress = Math.min(progress + progress_per_five_sec, 100);
-                            }
-                        }
-                        progressDiv.attr('style', "width: "+transitionProgress+'%;');
-                    });
-                    if (img_tag[0].width) {
-                        img_tag.trigger('load')
-                    }
-                } else if (data['error'] === false) {
-                    // Update playing device
-                    if (identifier === "inter-actief") {
-                        spotify_room_device = null;
-                    }
-                    dom_object.find(".albumimage").attr("style", "display: none;");
-                    dom_object.find(".albumimage").attr("src", "");
-                    dom_object.find(".nowplaying_title").html(getString("not_playing"));
-                    dom_object.find(".nowplaying_artist").html("");
-                    dom_object.find(".nowplaying_device").html("");
-                    dom_object.find(".nowplaying_track").addClass("nowplaying_nothing");
-                    dom_object.find(".nowplaying_album").addClass("not_playing");
-                } else {
-                    // Update playing device
-                    if (identifier === "inter-actief") {
-                        spotify_room_device = null;
-                    }
-                    dom_object.find(".albumimage").attr("style", "display: none;");
-                    dom_object.find(".albumimage").attr("src", "");
-                    dom_object.find(".nowplaying_title").html(getString("spotify_error"));
-                    dom_object.find(".nowplaying_artist").html("");
-                    dom_object.find(".nowplaying_device").html("");
-                    dom_object.find(".nowplaying_track").addClass("nowplaying_nothing");
-                    dom_object.find(".nowplaying_album").addClass("not_playing");
-                }
+                renderNowPlaying(dom_object, identifier, data);
             });
         }
     });
 }
 
+function renderChatMessages(data) {
+    var dom_object = $("#ia_chat_messages");
+    if (data['error'] === false && data['messages']) {
+        // Update chat box
+        dom_object.html('');
+        for (var msg of data.messages) {
+            dom_object.append(`<div class="ia_chat_message"><span class="ia_chat_message_time">[${msg.time}]</span><span class="ia_chat_message_from">${msg.from}</span>: ${msg.message}</div>`)
+        }
+    } else if (data['error'] === false) {
+        // Empty chat box
+        dom_object.html("");
+    } else {
+        // Show an error message in the chat window
+        console.log(data);
+        dom_object.html(`<span id="ia_chat_loading">${getString("chat_error")}</span>`);
+    }
+}
+
 function updateChatMessages() {
+    if (pushedParts.chat) {
+        return;
+    }
     var dom_object = $("#ia_chat_messages");
     $.ajax({
         url: "./chat_messages/",
@@ -368,20 +456,6 @@ function updateChatMessages() {
             dom_object.html(`<span id="ia_chat_loading">${getString("chat_error")}</span>`);
         }
     }).done(function (data) {
-        if (data['error'] === false && data['messages']) {
-            // Update chat box
-            dom_object.html('');
-            for (var msg of data.messages) {
-                dom_object.append(`<div class="ia_chat_message"><span class="ia_chat_message_time">[${msg.time}]</span><span class="ia_chat_message_from">${msg.from}</span>: ${msg.message}</div>`)
-            }
-        } else if (data['error'] === false) {
-            // Empty chat box
-            dom_object.html("");
-        } else {
-            // Show an error message in the chat window
-            console.log(data);
-            dom_object.html(`<span id="ia_chat_loading">${getString("chat_error")}</span>`);
-        }
+        renderChatMessages(data);
     });
-
 }
@@ -0,0 +1,69 @@
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from amelie.narrowcasting.models import RoomState
+from amelie.narrowcasting.room_state import RoomStatePoller, get_room_state, get_room_state_data, set_room_state
+from amelie.tools.tests import TestCase
+
+
+class RoomStateTests(TestCase):
+    def test_version_changes_with_data(self):
+        set_room_state('chat', {'error': False, 'messages': []}, 60)
+        version = get_room_state()['chat']['version']
+
+        # Refreshing without changes keeps the version, so the screens are not sent the same data again
+        set_room_state('chat', {'error': False, 'messages': []}, 60)
+        self.assertEqual(get_room_state()['chat']['version'], version)
+
+        set_room_state('chat', {'error': False, 'messages': [{'from': 'Someone', 'time': '16:00', 'message': 'Hi'}]},
+                       60)
+        self.assertNotEqual(get_room_state()['chat']['version'], version)
+
+    def test_expired(self):
+        set_room_state('chat', {'error': False, 'messages': []}, 60)
+        RoomState.objects.filter(part='chat').update(expires=timezone.now())
+
+        # The poller stopped refreshing the chat, so it is not used anymore
+        self.assertEqual(get_room_state(), {})
+        self.assertIsNone(get_room_state_data('chat'))
+
+    def test_poller(self):
+        RoomStatePoller(intervals={'room_duty': 60, 'pictures': 60}).run(once=True)
+
+        state = get_room_state()
+        self.assertEqual(set(state.keys()), {'room_duty', 'pictures'})
+        self.assertEqual(state['room_duty']['data'], [])
+        self.assertEqual(state['pictures']['data'], [])
+
+    def test_chat_view_uses_state(self):
+        chat = {'error': False, 'messages': [{'from': 'Someone', 'time': '16:00', 'message': 'Hi'}]}
+        set_room_state('chat', chat, 60)
+
+        response = self.client.get(reverse('narrowcasting:room_matrix_messages'))
+        self.assertEqual(response.json(), chat)
+
+    def test_spotify_view_uses_state(self):
+        player = {'error': False, 'is_playing': False}
+        set_room_state('spotify', {'inter-actief': player}, 60)
+
+        response = self.client.get('/narrowcasting/room/spotify/', {'id': 'inter-actief'})
+        self.assertEqual(response.json(), player)
+
+    @override_settings(SPOTIFY_CLIENT_SECRET='secret')
+    def test_spotify_view_unknown_association(self):
+        response = self.client.get('/narrowcasting/room/spotify/', {'id': 'unknown'})
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(NARROWCASTING_STREAM_LIFETIME=0.2, NARROWCASTING_STREAM_INTERVAL=0.05)
+    def test_stream_ends(self):
+        chat = {'error': False, 'messages': []}
+        set_room_state('chat', chat, 60)
+
+        response = self.client.get(reverse('narrowcasting:room_state_stream'))
+
+        # The stream ends after its lifetime, the state is sent once
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(content, 'event: chat\ndata: {}\n\n'.format(json.dumps(chat)))
@@ -13,4 +13,5 @@ urlpatterns = [
     path('room/pause_spotify/', views.room_spotify_pause, name='room_spotify_now_playing'),
     path('room/play_spotify/', views.room_spotify_play, name='room_spotify_now_playing'),
     path('room/chat_messages/', views.room_ia_chat, name='room_matrix_messages'),
+    path('room/state/', views.room_state_stream, name='room_state_stream'),
 ]
@@ -1,23 +1,21 @@
-import datetime
-import logging
-from typing import Any, List, Dict
+import asyncio
+import json
+import time
 
 import markdown
 import requests
 from django.conf import settings
-from django.http import JsonResponse, Http404
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, Http404, StreamingHttpResponse
 from django.shortcuts import render, redirect
 from django.urls import reverse
-from django.utils.html import escape
 from django.utils.translation import gettext as _
 from django.views.decorators.cache import cache_page
-from mautrix.client import ClientAPI
-from mautrix.types import PaginationDirection, RoomEventFilter, PaginatedMessages, TextMessageEventContent, \
-    MessageEvent, Format, RoomID, UserID
-from mautrix.types.event.type import EventType
 
 from amelie.narrowcasting.models import SpotifyAssociation
-from amelie.tools.asyncio import get_event_loop
+from amelie.narrowcasting.room_state import aget_room_state, aget_room_state_data, get_ia_chat_messages, \
+    get_room_state, spotify_player_state, spotify_request
 
 
 def index(request):
@@ -86,36 +84,7 @@ def room_spotify_callback(request):
     return redirect("narrowcasting:room")
 
 
-def _spotify_refresh_token(association):
-    try:
-        res = requests.post("https://accounts.spotify.com/api/token", data={
-            "grant_type": "refresh_token",
-            "refresh_token": association.refresh_token,
-            "client_id": settings.SPOTIFY_CLIENT_ID,
-            "client_secret": settings.SPOTIFY_CLIENT_SECRET
-        })
-    except (requests.exceptions.ConnectionError, ConnectionError) as e:
-        raise ValueError(_("ConnectionError while refreshing access token:") + f" {e}")
-
-    data = res.json()
-
-    if 'error' in data:
-        raise ValueError(data['error_description'])
-    elif res.status_code != 200:
-        raise ValueError(f"Status code: {res.status_code}")
-
-    try:
-        association.access_token = data['access_token']
-        association.save()
-    except KeyError as e:
-        if 'error' in data:
-            raise ValueError(data['error_description'])
-        else:
-            raise e
-    return association
-
-@cache_page(15)
-def room_spotify_now_playing(request):
+async def _spotify_association(request):
     identifier = request.GET.get('id', None)
     if settings.SPOTIFY_CLIENT_SECRET == "":
         raise ValueError(_("Spotify settings not configured."))
@@ -124,196 +93,108 @@ def room_spotify_now_playing(request):
         raise ValueError(_("Missing identifier"))
 
     try:
-        assoc = SpotifyAssociation.objects.get(name=identifier)
+        return await SpotifyAssociation.objects.aget(name=identifier)
     except SpotifyAssociation.DoesNotExist:
         raise Http404(_("No association for this identifier"))
 
-    try:
-        res = requests.get("https://api.spotify.com/v1/me/player",
-                            params={"market": "from_token"},
-                            headers={"Authorization": "Bearer {}".format(assoc.access_token)}
-                            )
-    except (requests.exceptions.ConnectionError, ConnectionError) as e:
-        log = logging.getLogger("amelie.narrowcasting.views.room_spotify_now_playing")
-        log.warning(f"ConnectionError while retrieving player info: {e}")
-        # Return empty response
-        return JsonResponse({})
-
-    if res.status_code == 200:
-        data = res.json()
-        data['error'] = False
-    elif res.status_code == 204:
-        data = {'error': False, 'is_playing': False}
-    elif res.status_code == 401:
-        # Access code expired, request a new one and retry the request.
-        try:
-            _spotify_refresh_token(assoc)
-            return room_spotify_now_playing(request)
-        except ValueError as e:
-            data = {'error': True, 'code': 500, 'msg': str(e)}
-    elif res.status_code == 429:
-        # Since we often exceed the rate limit, do not report as error
-        data = {'error': False, 'is_playing': False}
-    else:
-        data = {'error': True, 'code': res.status_code, 'msg': res.content.decode()}
-
-    return JsonResponse(data)
-
 
 @cache_page(15)
-def room_spotify_pause(request):
-    identifier = request.GET.get('id', None)
-    if settings.SPOTIFY_CLIENT_SECRET == "":
-        raise ValueError(_("Spotify settings not configured."))
+async def room_spotify_now_playing(request):
+    # Use the player state of the poller if it is running
+    players = await aget_room_state_data('spotify')
+    if players is not None and request.GET.get('id', None) in players:
+        return JsonResponse(players[request.GET['id']])
 
-    if identifier is None:
-        raise ValueError(_("Missing identifier"))
-
-    try:
-        assoc = SpotifyAssociation.objects.get(name=identifier)
-    except SpotifyAssociation.DoesNotExist:
-        raise Http404(_("No association for this identifier"))
-
-    try:
-        res = requests.put("https://api.spotify.com/v1/me/player/pause",
-                            headers={"Authorization": "Bearer {}".format(assoc.access_token)}
-                            )
-    except (requests.exceptions.ConnectionError, ConnectionError) as e:
-        log = logging.getLogger("amelie.narrowcasting.views.room_spotify_now_playing")
-        log.warning(f"ConnectionError while pausing Spotify player: {e}")
-        # Return empty response
-        return JsonResponse({})
-
-    if res.status_code == 200:
-        data = res.json()
-        data['error'] = False
-    elif res.status_code == 204:
-        data = {'error': False, 'is_playing': False}
-    elif res.status_code == 401:
-        # Access code expired, request a new one and retry the request.
-        try:
-            _spotify_refresh_token(assoc)
-            return room_spotify_pause(request)
-        except ValueError as e:
-            data = {'error': True, 'code': 500, 'msg': str(e)}
-    elif res.status_code == 429:
-        # Since we often exceed the rate limit, do not report as error
-        data = {'error': False, 'is_playing': False}
-    else:
-        data = {'error': True, 'code': res.status_code, 'msg': res.content.decode()}
-
-    return JsonResponse(data)
+    assoc = await _spotify_association(request)
+    return JsonResponse(await spotify_player_state(assoc))
 
 
 @cache_page(15)
-def room_spotify_play(request):
-    identifier = request.GET.get('id', None)
-    if settings.SPOTIFY_CLIENT_SECRET == "":
-        raise ValueError(_("Spotify settings not configured."))
-
-    if identifier is None:
-        raise ValueError(_("Missing identifier"))
+async def room_spotify_pause(request):
+    assoc = await _spotify_association(request)
+    return JsonResponse(await spotify_request(assoc, "PUT", "/me/player/pause"))
 
-    try:
-        assoc = SpotifyAssociation.objects.get(name=identifier)
-    except SpotifyAssociation.DoesNotExist:
-        raise Http404(_("No association for this identifier"))
-
-    try:
-        res = requests.put("https://api.spotify.com/v1/me/player/play",
-                            headers={"Authorization": "Bearer {}".format(assoc.access_token)}
-                            )
-    except (requests.exceptions.ConnectionError, ConnectionError) as e:
-        log = logging.getLogger("amelie.narrowcasting.views.room_spotify_now_playing")
-        log.warning(f"ConnectionError while unpausing Spotify player: {e}")
-        # Return empty response
-        return JsonResponse({})
-
-    if res.status_code == 200:
-        data = res.json()
-        data['error'] = False
-    elif res.status_code == 204:
-        data = {'error': False, 'is_playing': False}
-    elif res.status_code == 401:
-        # Access code expired, request a new one and retry the request.
-        try:
-            _spotify_refresh_token(assoc)
-            return room_spotify_play(request)
-        except ValueError as e:
-            data = {'error': True, 'code': 500, 'msg': str(e)}
-    elif res.status_code == 429:
-        # Since we often exceed the rate limit, do not report as error
-        data = {'error': False, 'is_playing': False}
-    else:
-        data = {'error': True, 'code': res.status_code, 'msg': res.content.decode()}
 
-
-    return JsonResponse(data)
+@cache_page(15)
+async def room_spotify_play(request):
+    assoc = await _spotify_association(request)
+    return JsonResponse(await spotify_request(assoc, "PUT", "/me/player/play"))
 
 
 @cache_page(15)
-def room_ia_chat(request):
+async def room_ia_chat(request):
+    # Use the chat messages of the poller if it is running
+    chat = await aget_room_state_data('chat')
+    if chat is not None:
+        return JsonResponse(chat)
+
     try:
-        messages = get_event_loop().run_until_complete(_get_ia_chat_messages())
+        messages = await get_ia_chat_messages()
         return JsonResponse({'error': False, 'messages': messages})
     except Exception as e:
         return JsonResponse({'error': True, 'messages': [], 'error_msg': str(e)})
 
 
-async def _get_ia_chat_messages() -> List[Dict[str, Any]]:
-    matrix_hostname = settings.MATRIX_SETTINGS['SERVER']
-    access_token = settings.MATRIX_SETTINGS['TOKEN']
-    user_id = settings.MATRIX_SETTINGS['USER']
-    chat_room_id = settings.MATRIX_SETTINGS['ROOM_ID']
-    max_msg_to_show = settings.MATRIX_SETTINGS['MAX_MSG_TO_SHOW']
-    max_msg_length = settings.MATRIX_SETTINGS['MAX_MSG_LENGTH']
-
-    if matrix_hostname == "" or access_token == "" or chat_room_id == "":
-        raise ValueError("Chat settings not configured.")
-
-    client: ClientAPI = ClientAPI(user_id, base_url=matrix_hostname, token=access_token)
-
-    try:
-        filter_messages = RoomEventFilter(types=[EventType.ROOM_MESSAGE])
-        events = await client.get_messages(chat_room_id, direction=PaginationDirection.BACKWARD,
-                                           limit=max_msg_to_show, filter_json=filter_messages)
-
-        messages = []
-        for ev in events.events:
-            ev: MessageEvent
-            try:
-                username = await _get_user_display_name(client, ev.sender)
-                if username is None:
-                    username, _ = ClientAPI.parse_user_id(ev.sender)
-            except ValueError:
-                username = ev.sender
-            try:
-                timestamp = datetime.datetime.fromtimestamp(ev.timestamp / 1000)
-                if timestamp.date() != datetime.date.today():
-                    timestamp = timestamp.strftime("%m-%d %H:%M:%S")
-                else:
-                    timestamp = timestamp.strftime('%H:%M:%S')
-            except ValueError:
-                timestamp = datetime.datetime.now().strftime('%H:%M:%S')
-
-            if isinstance(ev.content, TextMessageEventContent):
-                msg_body = str(ev.content.body)
-                if len(msg_body) > max_msg_length:
-                    msg_body = msg_body[:max_msg_length].strip() + "…"
-            else:
-                msg_body = f"<unsupported message '{ev.content.__class__.__name__}'>"
-
-            # Escape the values because they will be rendered in the frontend without escaping
-            username = escape(username)
-            msg_body = escape(msg_body)
-
-            messages.append({"from": username, "time": timestamp, "message": msg_body})
-    finally:
-        if client and client.api and client.api.session:
-            await client.api.session.close()
-
-    return messages[::-1]
-
-
-async def _get_user_display_name(client: ClientAPI, matrix_id: UserID) -> str:
-    return await client.get_displayname(matrix_id)
+class _RoomStateEvents(object):
+    """
+    The server-sent events for the parts of the room state that changed since they were last sent to a screen. The
+    stream ends after NARROWCASTING_STREAM_LIFETIME, the browser then connects again and gets the whole state.
+    """
+
+    def __init__(self):
+        self.versions = {}
+        self.last_event = time.monotonic()
+        self.end = self.last_event + settings.NARROWCASTING_STREAM_LIFETIME
+
+    def is_open(self):
+        return time.monotonic() < self.end
+
+    def changes(self, state):
+        events = []
+        for part, entry in state.items():
+            if self.versions.get(part) != entry['version']:
+                self.versions[part] = entry['version']
+                events.append("event: {}\ndata: {}\n\n".format(part, json.dumps(entry['data'], cls=DjangoJSONEncoder)))
+
+        # The poller stopped refreshing these parts, the screen should get them itself again
+        for part in [part for part in self.versions if part not in state]:
+            del self.versions[part]
+            events.append("event: expired\ndata: {}\n\n".format(json.dumps(part)))
+
+        # Comment lines keep the connection open through proxies
+        if not events and time.monotonic() - self.last_event >= settings.NARROWCASTING_STREAM_KEEPALIVE:
+            events.append(": keepalive\n\n")
+        if events:
+            self.last_event = time.monotonic()
+        return events
+
+
+def _room_state_events():
+    events = _RoomStateEvents()
+    while events.is_open():
+        yield from events.changes(get_room_state())
+        time.sleep(settings.NARROWCASTING_STREAM_INTERVAL)
+
+
+async def _aroom_state_events():
+    events = _RoomStateEvents()
+    while events.is_open():
+        for event in events.changes(await aget_room_state()):
+            yield event
+        await asyncio.sleep(settings.NARROWCASTING_STREAM_INTERVAL)
+
+
+async def room_state_stream(request):
+    """
+    Server-sent events with the parts of the room state that changed, as refreshed by the narrowcasting_poller
+    command. Each open screen only reads the state from the database, so the upstream services are not called more often
+    when there are more screens.
+
+    Under ASGI the events are written by an async generator. A WSGI server can only stream a normal generator, which
+    holds a worker thread for each open screen until the stream ends.
+    """
+    events = _aroom_state_events() if isinstance(request, ASGIRequest) else _room_state_events()
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -3,7 +3,10 @@ import graphene
 from graphene_django import DjangoObjectType
 from django.utils.translation import gettext_lazy as _
 
+from amelie.activities.models import Activity
+from amelie.files.models import Attachment
 from amelie.graphql.decorators import check_authorization
+from amelie.graphql.loaders import load_related
 from amelie.graphql.pagination.connection_field import DjangoPaginationConnectionField
 from amelie.news.models import NewsItem
 
@@ -66,17 +69,17 @@ class NewsItemType(DjangoObjectType):
 
     def resolve_attachments(self: NewsItem, info):
         # `info.context` is the Django Request object in Graphene
-        return self.attachments.filter_public(info.context).all()
+        return load_related(info, self, 'attachments', queryset=Attachment.objects.filter_public(info.context))
 
     def resolve_activities(self: NewsItem, info):
         # `info.context` is the Django Request object in Graphene
-        return self.activities.filter_public(info.context).all()
+        return load_related(info, self, 'activities', queryset=Activity.objects.filter_public(info.context))
 
     def resolve_author(obj: NewsItem, info):
-        return obj.author.incomplete_name()
+        return load_related(info, obj, 'author').incomplete_name()
 
     def resolve_publisher(obj: NewsItem, info):
-        return obj.publisher.name
+        return load_related(info, obj, 'publisher').name
 
     def resolve_title(obj: NewsItem, info):
         return obj.title
@@ -90,7 +93,7 @@ class NewsItemType(DjangoObjectType):
 
 class NewsQuery(graphene.ObjectType):
     news_item = graphene.Field(NewsItemType, id=graphene.ID())
-    news_items = DjangoPaginationConnectionField(NewsItemType, id=graphene.ID(), pinned_on_top=graphene.Boolean(required=False, default_value=False))
+    news_items = DjangoPaginationConnectionField(NewsItemType, id=graphene.ID(), pinned_on_top=graphene.Boolean(required=False, default_value=False), keyset_fields=['publication_date'])
 
     def resolve_news_item(root, info, id):
         return NewsItem.objects.get(pk=id)
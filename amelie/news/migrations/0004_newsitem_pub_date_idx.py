@@ -0,0 +1,17 @@
+# Generated by Django 5.2.12 on 2026-10-17 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_alter_newsitem_slug'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsitem',
+            index=models.Index(fields=['publication_date', 'id'], name='news_newsitem_pub_date_idx'),
+        ),
+    ]
@@ -36,6 +36,9 @@ class NewsItem(models.Model):
 
     class Meta:
         ordering = ['-publication_date']
+        indexes = [
+            models.Index(fields=['publication_date', 'id'], name='news_newsitem_pub_date_idx'),
+        ]
         verbose_name = _l('News message')
         verbose_name_plural = _l('News messages')
 
@@ -1,16 +1,23 @@
 import datetime
-from datetime import timezone as tz
 
-from django.db.models import Sum, Q
+from django.db.models import Case, Sum, Value, When
 from django.template.defaultfilters import date as _date
 from django.utils import timezone, translation
 from django.utils.translation import gettext as _
 
 from amelie.members.models import Person, Membership, PaymentType, Payment
+from amelie.personal_tab.managers import SEPA_DEBT_COLLECTION_START
 from amelie.personal_tab.models import Transaction, DebtCollectionInstruction, DebtCollectionBatch, \
-    DebtCollectionTransaction, ContributionTransaction, ReversalTransaction, Reversal, Amendment
+    DebtCollectionTransaction, ContributionTransaction, ReversalTransaction, Reversal, Amendment, Authorization, \
+    deferred_transaction_updates
 from amelie.tools.encodings import normalize_to_ascii
 
+# Number of instructions that are linked to their transactions in one UPDATE query
+INSTRUCTION_UPDATE_BATCH_SIZE = 500
+
+
+class InstructionsChangedError(Exception):
+    pass
 
 
 def authorization_contribution(person):
@@ -68,6 +75,33 @@ def authorization_cookie_corner(person):
     return authorization
 
 
+def authorizations_cookie_corner(people):
+    """
+    Returns the most appropriate cookie corner authorization for many persons at once, in the same order as
+    authorization_cookie_corner does, as a dictionary from person id to authorization. Persons without a corresponding
+    authorization are not included.
+
+    :type people: list of Person
+    """
+    result = {}
+    for authorization in Authorization.objects.filter(
+            person__in=people, is_signed=True, authorization_type__consumptions=True
+    ).order_by('authorization_type__id', 'pk'):
+        current = result.get(authorization.person_id)
+        # Active authorizations go before terminated ones
+        if current is None or (current.end_date and not authorization.end_date):
+            result[authorization.person_id] = authorization
+    return result
+
+
+def _uncollected_transactions(end_date):
+    return Transaction.objects.filter(debt_collection=None, date__gte=SEPA_DEBT_COLLECTION_START, date__lt=end_date)
+
+
+def _sums_per_person(transactions):
+    return {row['person']: row['price__sum'] for row in transactions.order_by().values('person').annotate(Sum('price'))}
+
+
 def generate_contribution_instructions(years):
     """
     Generate DebtCollectionInstruction objects to collect the contribution of a given association year.
@@ -179,15 +213,18 @@ def save_contribution_instructions(rows, batch):
 
 
 def generate_cookie_corner_instructions(end_date):
-    all_transactions = Transaction.objects.filter(debt_collection=None)
+    all_transactions = _uncollected_transactions(end_date)
 
-    # Date the SEPA debt collection went into effect: 2013-10-31 00:00 CET
-    begin_date = datetime.datetime(2013, 10, 30, 23, 00, 00, tzinfo=tz.utc)
+    # Uncollected sums per person, from the same transactions that are linked to the instructions when they are saved
+    uncollected = _sums_per_person(all_transactions)
+    people = list(Person.objects.filter(pk__in=[pk for pk, price in uncollected.items() if price]).order_by('pk'))
 
-    all_transactions = all_transactions.filter(date__gte=begin_date, date__lt=end_date)
+    # The authorizations and their next amendment and sequence type are loaded for everyone at once
+    authorizations = authorizations_cookie_corner(people)
+    next_instructions = Authorization.objects.next_instructions(
+        [authorization for person_id, authorization in authorizations.items() if uncollected[person_id] > 0]
+    )
 
-    # Order only by person, so distinct works as intended. See Django manual.
-    people = all_transactions.filter(person__isnull=False).order_by('person').distinct().values('person')
     results = {
         'negative': [],
         'no_authorization': [],
@@ -200,21 +237,20 @@ def generate_cookie_corner_instructions(end_date):
 
     end_date_timezone_amsterdam = end_date.astimezone(timezone.get_default_timezone())
 
-    for p in people:
-        person = Person.objects.get(id=p['person'])
+    for person in people:
         transactions = all_transactions.filter(person=person)
-        price = transactions.aggregate(Sum('price'))['price__sum']
+        price = uncollected[person.pk]
         sumf = ("%.2f" % price).replace('.', ',')
 
         if price == 0:
             continue
 
-        authorization = authorization_cookie_corner(person)
+        authorization = authorizations.get(person.pk)
         instruction = None
         sequence_type = None
 
         if authorization and price > 0:
-            sequence_type = authorization.next_sequence_type()
+            amendment, sequence_type = next_instructions[authorization.id]
 
             name = person.incomplete_name()
 
@@ -226,8 +262,7 @@ def generate_cookie_corner_instructions(end_date):
 
             if sequence_type:
                 instruction = DebtCollectionInstruction(amount=price, authorization=authorization,
-                                                        description=description,
-                                                        amendment=authorization.next_amendment())
+                                                        description=description, amendment=amendment)
 
         row = {
             'person': person,
@@ -235,7 +270,8 @@ def generate_cookie_corner_instructions(end_date):
             'sum': price,
             'sumf': sumf,
             'instruction': instruction,
-            'transactions': transactions
+            'transactions': transactions,
+            'end_date': end_date,
         }
 
         if price < 0:
@@ -269,6 +305,12 @@ def filter_cookie_corner_instructions(rows, post):
 
 def save_cookie_corner_instructions(rows, batch):
     """
+    Save the instructions of the given rows in a batch, and link the uncollected transactions of each person to their
+    instruction. The transactions are linked with one UPDATE query per INSTRUCTION_UPDATE_BATCH_SIZE instructions.
+
+    Raises InstructionsChangedError if the uncollected transactions of a person no longer sum up to the amount of
+    their instruction.
+
     :type rows: list
     :type batch: DebtCollectionBatch
     """
@@ -277,28 +319,49 @@ def save_cookie_corner_instructions(rows, batch):
 
     debt_collection_datetime = datetime.datetime.combine(execution_date, datetime.time(0, 0)).replace(tzinfo=timezone_amsterdam)
 
-    for row in rows:
-        person = row['person']
-        price = row['sum']
-        instruction = row['instruction']
-        transactions = row['transactions']
+    with deferred_transaction_updates():
+        for row in rows:
+            person = row['person']
+            price = row['sum']
+            instruction = row['instruction']
 
-        with translation.override(person.preferred_language):
-            description = _('Direct withdrawal personal tab {date}').format(date=_date(execution_date, "j F Y"))
+            with translation.override(person.preferred_language):
+                description = _('Direct withdrawal personal tab {date}').format(date=_date(execution_date, "j F Y"))
 
-        instruction.batch = batch
-        instruction.save()
+            instruction.batch = batch
+            instruction.save()
+            instruction.end_to_end_id = instruction.debt_collection_reference()
 
-        instruction.end_to_end_id = instruction.debt_collection_reference()
-        instruction.save()
+            dct = DebtCollectionTransaction(date=debt_collection_datetime, price=-price, person=person,
+                                            description=description, debt_collection=instruction)
+            dct.save()
 
-        for transaction in transactions:
-            transaction.debt_collection = instruction
-            transaction.save()
+        for i in range(0, len(rows), INSTRUCTION_UPDATE_BATCH_SIZE):
+            chunk = rows[i:i + INSTRUCTION_UPDATE_BATCH_SIZE]
 
-        dct = DebtCollectionTransaction(date=debt_collection_datetime, price=-price, person=person,
-                                        description=description, debt_collection=instruction)
-        dct.save()
+            # The end-to-end-id contains the id of the instruction, so it can only be set after saving it
+            DebtCollectionInstruction.objects.filter(pk__in=[row['instruction'].pk for row in chunk]).update(
+                end_to_end_id=Case(*[When(pk=row['instruction'].pk, then=Value(row['instruction'].end_to_end_id))
+                                     for row in chunk])
+            )
+
+            # Rows of the same generation have the same end date, but be safe and link them per end date
+            for end_date in {row['end_date'] for row in chunk}:
+                same_end = [row for row in chunk if row['end_date'] == end_date]
+                transactions = _uncollected_transactions(end_date).filter(person__in=[row['person'] for row in same_end])
+
+                # Never link other transactions than the ones that make up the amount of the instruction
+                sums = _sums_per_person(transactions)
+                for row in same_end:
+                    if sums.get(row['person'].pk) != row['sum']:
+                        raise InstructionsChangedError(
+                            "The uncollected transactions of {} sum up to {} instead of {}".format(
+                                row['person'], sums.get(row['person'].pk), row['sum']))
+
+                # Updates do not send signals, but neither the daily transaction rollup nor the balance checkpoints
+                # depend on the debt collection instruction of a transaction
+                transactions.update(debt_collection=Case(*[When(person=row['person'], then=Value(row['instruction'].pk))
+                                                           for row in same_end]))
 
 
 def process_reversal(reversal, actor):
@@ -0,0 +1,85 @@
+import datetime
+import tempfile
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+
+from amelie.personal_tab.models import Authorization, AuthorizationType, DebtCollectionAssignment, \
+    DebtCollectionBatch, DebtCollectionInstruction
+from amelie.personal_tab.sepa import Pain008ValidationError, validate_pain008, write_pain008
+
+
+class Rollback(Exception):
+    pass
+
+
+def _create_assignment(instructions):
+    """Create a debt collection assignment with a FRST and a RCUR batch with the given number of instructions."""
+    authorization_type = AuthorizationType.objects.create(name_nl='Benchmark', text_nl='Benchmark', consumptions=True)
+    authorizations = [
+        Authorization.objects.create(authorization_type=authorization_type, iban='NL91ABNA0417164300', bic='ABNANL2A',
+                                     account_holder_name='Benchmark {}'.format(i), start_date=datetime.date(2020, 1, 1),
+                                     is_signed=True)
+        for i in range(10)
+    ]
+
+    assignment = DebtCollectionAssignment.objects.create(description='Benchmark')
+    batches = [
+        DebtCollectionBatch.objects.create(assignment=assignment, execution_date=datetime.date.today(),
+                                           sequence_type=sequence_type, status=DebtCollectionBatch.StatusChoices.NEW)
+        for sequence_type in (DebtCollectionBatch.SequenceTypes.FRST, DebtCollectionBatch.SequenceTypes.RCUR)
+    ]
+    DebtCollectionInstruction.objects.bulk_create([
+        DebtCollectionInstruction(batch=batches[i % 2], authorization=authorizations[i % 10],
+                                  end_to_end_id='IA-BENCH-{:08d}'.format(i), description='Benchmark instruction',
+                                  amount=Decimal('12.34'))
+        for i in range(instructions)
+    ], batch_size=1000)
+    return assignment
+
+
+class Command(BaseCommand):
+    help = "Compares the time and number of queries of exporting a debt collection assignment to a SEPA file with " \
+           "the old template and with the streaming pain.008 writer. The test data is rolled back afterwards."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--instructions', default=5000, type=int,
+                            help="The number of instructions in the assignment, defaults to 5000")
+        parser.add_argument('--schema', help="Path to pain.008.001.02.xsd, to also validate the output (needs lxml)")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._benchmark(_create_assignment(options['instructions']), options['schema'])
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def _benchmark(self, assignment, schema):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            render_to_string('exports/sepadd.xml', {'assignment': assignment})
+            duration = time.perf_counter() - start
+        self.stdout.write("Template: {:.2f}s, {} queries".format(duration, len(queries)))
+
+        with tempfile.TemporaryFile() as output:
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                for chunk in write_pain008(assignment):
+                    output.write(chunk)
+                duration = time.perf_counter() - start
+            self.stdout.write("Writer: {:.2f}s, {} queries, {} bytes".format(duration, len(queries), output.tell()))
+
+            if schema:
+                output.seek(0)
+                try:
+                    validate_pain008(output, schema)
+                except ImportError:
+                    raise CommandError("Validating the output needs lxml.")
+                except Pain008ValidationError as e:
+                    raise CommandError("The output is not valid:\n{}".format(e))
+                self.stdout.write("The output is valid.")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from amelie.personal_tab.tasks import create_balance_checkpoint
+
+
+class Command(BaseCommand):
+    help = "Queues the creation of a balance checkpoint at the start of today, which speeds up balance overviews " \
+           "and debt collection runs. Supposed to be ran as a daily cronjob."
+
+    def handle(self, *args, **options):
+        create_balance_checkpoint.delay()
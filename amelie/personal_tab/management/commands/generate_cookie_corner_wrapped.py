@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from amelie.personal_tab.tasks import generate_cookie_corner_wrapped
+
+
+class Command(BaseCommand):
+    help = "Queues the generation of the Cookie Corner Wrapped profiles of all persons for a year. Should be ran " \
+           "after the wrapped year has ended."
+
+    def add_arguments(self, parser):
+        parser.add_argument('year', nargs='?', type=int, default=settings.COOKIE_CORNER_WRAPPED_YEAR,
+                            help="The year to generate the profiles for, defaults to COOKIE_CORNER_WRAPPED_YEAR")
+
+    def handle(self, *args, **options):
+        generate_cookie_corner_wrapped.delay(options['year'])
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from amelie.personal_tab.models import DailyTransactionTotal, Transaction
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the daily transaction rollup that is used by the treasurer reports from all transactions. " \
+           "The rollup is kept up to date automatically, so this is only needed after bulk changes to transactions, " \
+           "and after deploying the migration that adds the rollup."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--if-empty', action='store_true',
+                            help="Only rebuild the rollup if it is still empty while there are transactions, "
+                                 "as is the case right after the migration that adds it")
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and (DailyTransactionTotal.objects.exists() or not Transaction.objects.exists()):
+            self.stdout.write("Daily transaction rollup is already filled, nothing to do.")
+            return
+
+        DailyTransactionTotal.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS("Daily transaction rollup rebuilt, {} rows.".format(
+            DailyTransactionTotal.objects.count())))
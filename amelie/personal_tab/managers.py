@@ -1,14 +1,20 @@
 import datetime
 
-from django.db import models
-from django.db.models import Q
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Q, Value, When
 from django.db.models.aggregates import Sum
+from django.db.models.functions import TruncDate
 from django.utils import timezone
 from datetime import timezone as tz
 
 from amelie.members.models import Person
 
 
+# Date the SEPA debt collection went into effect: 2013-10-31 00:00 CET
+SEPA_DEBT_COLLECTION_START = datetime.datetime(2013, 10, 30, 23, 00, 00, tzinfo=tz.utc)
+
+
 def _contribution_authorization_types():
     """
     Returns AuthorizationTypes solely for contributions.
@@ -21,11 +27,8 @@ def _people_with_outstanding_balance():
     """
     Returns a QuerySet with all Persons having a non-zero cookie corner balance.
     """
-    # Date the SEPA debt collection went into effect: 2013-10-31 00:00 CET
-    begin = datetime.datetime(2013, 10, 30, 23, 00, 00, tzinfo=tz.utc)
-
-    return Person.objects.filter(transaction__date__gte=begin).annotate(balance=Sum('transaction__price')).filter(
-        balance__gt=0)
+    return Person.objects.filter(transaction__date__gte=SEPA_DEBT_COLLECTION_START).annotate(
+        balance=Sum('transaction__price')).filter(balance__gt=0)
 
 
 def _people_with_recent_or_future_transactions(days):
@@ -125,6 +128,44 @@ class AuthorizationManager(models.Manager):
         """
         return self.filter(Q(pk__in=self.contribution_to_terminate()) | Q(pk__in=self.non_contribution_to_terminate()))
 
+    def next_instructions(self, authorizations):
+        """
+        Return the amendment and sequence type for the next debt collection instruction of many authorizations at
+        once, the same as Authorization.next_amendment and Authorization.next_sequence_type, in three queries.
+
+        Returns a dictionary from authorization id to a tuple of the amendment (or None) and the sequence type (or None
+        if there is an ongoing FRST batch).
+        """
+        from amelie.personal_tab.models import Amendment, DebtCollectionBatch, DebtCollectionInstruction
+
+        ids = [authorization.id for authorization in authorizations]
+
+        amendments = {amendment.authorization_id: amendment
+                      for amendment in Amendment.objects.filter(authorization__in=ids, instruction__isnull=True)}
+        ongoing_frst = set(DebtCollectionInstruction.objects.filter(
+            authorization__in=ids, batch__status=DebtCollectionBatch.StatusChoices.NEW,
+            batch__sequence_type=DebtCollectionBatch.SequenceTypes.FRST
+        ).values_list('authorization', flat=True))
+        processed = set(DebtCollectionInstruction.objects.filter(
+            Q(reversal__isnull=True) | Q(reversal__pre_settlement=False), authorization__in=ids,
+            batch__status=DebtCollectionBatch.StatusChoices.PROCESSED
+        ).values_list('authorization', flat=True))
+
+        result = {}
+        for authorization_id in ids:
+            amendment = amendments.get(authorization_id)
+            if amendment and amendment.other_bank:
+                # If moved to other bank the next instruction has to be sequence type FRST again.
+                sequence_type = DebtCollectionBatch.SequenceTypes.FRST
+            elif authorization_id in ongoing_frst:
+                sequence_type = None
+            elif authorization_id in processed:
+                sequence_type = DebtCollectionBatch.SequenceTypes.RCUR
+            else:
+                sequence_type = DebtCollectionBatch.SequenceTypes.FRST
+            result[authorization_id] = (amendment, sequence_type)
+        return result
+
     def contribution_to_anonymize(self):
         """
         Return inactive contribution authorizations which can be anonymized.
@@ -194,3 +235,245 @@ class DebtCollectionInstructionManager(models.Manager):
         """
         dt = timezone.now() - datetime.timedelta(days=days)
         return self.filter(batch__execution_date__gte=dt)
+
+
+# Reverse relation names of all Transaction subclasses, used as the transaction type in the daily rollup
+TRANSACTION_TYPES = ['cookiecornertransaction', 'activitytransaction', 'alexiatransaction', 'contributiontransaction',
+                     'customtransaction', 'debtcollectiontransaction', 'reversaltransaction']
+
+
+def _day_bounds(day):
+    """
+    Returns the start and end datetime of a day in the current timezone.
+    """
+    start = timezone.make_aware(datetime.datetime.combine(day, datetime.time()))
+    end = timezone.make_aware(datetime.datetime.combine(day + datetime.timedelta(days=1), datetime.time()))
+    return start, end
+
+
+def _closed_days(start, end):
+    """
+    Returns the first and the last (exclusive) day that lie completely within [start, end) and have been closed,
+    that is, lie before today. Returns None if there are no such days.
+    """
+    today = timezone.localdate()
+    first = timezone.localdate(start) if start else None
+    if first and _day_bounds(first)[0] < start:
+        first += datetime.timedelta(days=1)
+    last = min(timezone.localdate(end), today) if end else today
+
+    if first and first >= last:
+        return None
+    return first, last
+
+
+class DailyTransactionTotalManager(models.Manager):
+    # Grouping fields of the daily rollup, and the expressions that calculate them from the transaction table.
+    GROUPING_EXPRESSIONS = {
+        'day': lambda: TruncDate('date'),
+        'person': lambda: F('person'),
+        'transaction_type': lambda: Case(*[When(**{'{}__isnull'.format(t): False}, then=Value(t))
+                                           for t in TRANSACTION_TYPES], default=Value('transaction')),
+        'article': lambda: F('cookiecornertransaction__article'),
+        'discount_period': lambda: F('discount__discount_period'),
+    }
+
+    def _transactions(self, transaction_type=None, person=None):
+        from amelie.personal_tab.models import Transaction
+
+        transactions = Transaction.objects.order_by()
+        if transaction_type:
+            transactions = transactions.filter(**{'{}__isnull'.format(transaction_type): False})
+        if person is not None:
+            transactions = transactions.filter(person=person)
+        return transactions
+
+    def _aggregate_transactions(self, transactions, group_by):
+        """
+        Groups raw transactions by the given rollup fields and sums them like the rollup does.
+        """
+        annotations = {'group_{}'.format(field): self.GROUPING_EXPRESSIONS[field]() for field in group_by}
+        aggregates = {
+            'transaction_count': Count('id'), 'amount_sum': Sum('cookiecornertransaction__amount'),
+            'price_sum': Sum('price'), 'discount_sum': Sum('discount__amount'),
+        }
+        if not annotations:
+            return [transactions.aggregate(**aggregates)]
+        return transactions.annotate(**annotations).values(*annotations).annotate(**aggregates)
+
+    def _create_from_transactions(self, transactions, batch_size=1000):
+        fields = list(self.GROUPING_EXPRESSIONS)
+        rows = self._aggregate_transactions(transactions, fields)
+        batch = []
+        for row in rows.iterator():
+            batch.append(self.model(
+                day=row['group_day'], person_id=row['group_person'], transaction_type=row['group_transaction_type'],
+                article_id=row['group_article'], discount_period_id=row['group_discount_period'],
+                count=row['transaction_count'], amount=row['amount_sum'] or 0, price=row['price_sum'] or 0,
+                discount=row['discount_sum'],
+            ))
+            if len(batch) >= batch_size:
+                self.bulk_create(batch)
+                batch = []
+        self.bulk_create(batch)
+
+    def refresh(self, person_id, day):
+        """
+        Recompute the rollup of a single person on a single day from the transaction table.
+        """
+        start, end = _day_bounds(day)
+        with transaction.atomic():
+            self.filter(person_id=person_id, day=day).delete()
+            self._create_from_transactions(self._transactions(person=person_id).filter(date__gte=start, date__lt=end))
+
+    def rebuild(self):
+        """
+        Recompute the complete rollup from the transaction table.
+        """
+        with transaction.atomic():
+            self.all().delete()
+            self._create_from_transactions(self._transactions())
+
+    def totals(self, start, end, group_by=(), transaction_type=None, person=None):
+        """
+        Sum the transactions in the period [start, end), grouped by any of the rollup fields ('day', 'person',
+        'transaction_type', 'article' and 'discount_period').
+
+        Days that are completely within the period and have been closed are read from the rollup, the remainder of
+        the period is read from the transaction table. Returns a dictionary from the tuple of grouping values to a
+        dictionary with the number of transactions ('count'), the number of articles ('amount'), the total price
+        ('price') and the total discount ('discount', None if no discount was given).
+
+        :param start: Start of the period, or None to start at the first transaction.
+        :param end: End of the period (exclusive), or None to end at the last transaction.
+        :param group_by: Tuple of rollup fields to group by.
+        :param transaction_type: Only include transactions of this type, see TRANSACTION_TYPES.
+        :param person: Only include transactions of this person.
+        """
+        group_by = tuple(group_by)
+        totals = {}
+
+        def _add(key, count, amount, price, discount):
+            if key not in totals:
+                totals[key] = {'count': 0, 'amount': 0, 'price': 0, 'discount': None}
+            row = totals[key]
+            row['count'] += count or 0
+            row['amount'] += amount or 0
+            row['price'] += price or 0
+            if discount is not None:
+                row['discount'] = (row['discount'] or 0) + discount
+
+        raw_filter = Q()
+        if start:
+            raw_filter &= Q(date__gte=start)
+        if end:
+            raw_filter &= Q(date__lt=end)
+
+        closed_days = _closed_days(start, end)
+        if closed_days:
+            first, last = closed_days
+
+            rollup = self.filter(day__lt=last)
+            if first:
+                rollup = rollup.filter(day__gte=first)
+            if transaction_type:
+                rollup = rollup.filter(transaction_type=transaction_type)
+            if person is not None:
+                rollup = rollup.filter(person=person)
+
+            aggregates = {'count_sum': Sum('count'), 'amount_sum': Sum('amount'), 'price_sum': Sum('price'),
+                          'discount_sum': Sum('discount')}
+            if group_by:
+                rows = rollup.order_by().values(*group_by).annotate(**aggregates)
+            else:
+                rows = [rollup.aggregate(**aggregates)]
+
+            for row in rows:
+                _add(tuple(row[field] for field in group_by),
+                     row['count_sum'], row['amount_sum'], row['price_sum'], row['discount_sum'])
+
+            # Only read the days outside of the closed days from the transaction table
+            closed_filter = Q(date__lt=_day_bounds(last)[0])
+            if first:
+                closed_filter &= Q(date__gte=_day_bounds(first)[0])
+            raw_filter &= ~closed_filter
+
+        transactions = self._transactions(transaction_type, person).filter(raw_filter)
+        for row in self._aggregate_transactions(transactions, group_by):
+            _add(tuple(row['group_{}'.format(field)] for field in group_by),
+                 row['transaction_count'], row['amount_sum'], row['price_sum'], row['discount_sum'])
+
+        return totals
+
+
+class BalanceCheckpointManager(models.Manager):
+    def _latest(self, dt, field):
+        """
+        Returns the date of the latest checkpoint at or before dt (or None) and its value of field per person.
+        """
+        checkpoint = self.filter(date__lte=dt).order_by('-date').first()
+        if checkpoint is None:
+            return None, {}
+        return checkpoint.date, dict(checkpoint.entries.values_list('person', field))
+
+    @staticmethod
+    def _add(values, rows):
+        for person, price in rows:
+            values[person] = values.get(person, 0) + (price or 0)
+        return values
+
+    def balances(self, dt):
+        """
+        Returns the personal tab balance per person at dt, that is, the sum of all transactions since the start of
+        SEPA debt collection up to (but not including) dt. Persons without transactions are not included.
+        """
+        from amelie.personal_tab.models import DailyTransactionTotal
+
+        start, values = self._latest(dt, 'balance')
+        totals = DailyTransactionTotal.objects.totals(start or SEPA_DEBT_COLLECTION_START, dt, group_by=('person',))
+        return self._add(values, [(key[0], value['price']) for key, value in totals.items()])
+
+    def exam_cookie_credits(self, dt):
+        """
+        Returns the exam cookie credit per person at dt.
+        """
+        from amelie.personal_tab.models import DiscountCredit
+
+        start, values = self._latest(dt, 'exam_cookie_credit')
+        credits = DiscountCredit.objects.filter(discount_period_id=settings.COOKIE_CORNER_EXAM_COOKIE_DISCOUNT_PERIOD_ID,
+                                                date__lt=dt)
+        if start:
+            credits = credits.filter(date__gte=start)
+        rows = credits.order_by().values('person').annotate(Sum('price'))
+        return self._add(values, [(row['person'], row['price__sum']) for row in rows])
+
+    def create_checkpoint(self, date):
+        """
+        Create a checkpoint with the balances of all persons at the given date, computed from the previous checkpoint.
+        Returns None if a checkpoint at that date already exists.
+        """
+        from amelie.personal_tab.models import BalanceCheckpointEntry
+
+        with transaction.atomic():
+            if self.filter(date=date).exists():
+                return None
+
+            balances = self.balances(date)
+            exam_cookie_credits = self.exam_cookie_credits(date)
+
+            checkpoint = self.create(date=date)
+            entries = [BalanceCheckpointEntry(checkpoint=checkpoint, person_id=person,
+                                              balance=balances.get(person, 0),
+                                              exam_cookie_credit=exam_cookie_credits.get(person, 0))
+                       for person in set(balances) | set(exam_cookie_credits)]
+            # Persons without any balance do not need an entry
+            BalanceCheckpointEntry.objects.bulk_create(
+                [e for e in entries if e.balance or e.exam_cookie_credit], batch_size=1000
+            )
+        return checkpoint
+
+    def invalidate(self, date):
+        """
+        Remove all checkpoints that would include a transaction or credit at the given date.
+        """
+        self.filter(date__gt=date).delete()
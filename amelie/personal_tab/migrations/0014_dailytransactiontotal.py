@@ -0,0 +1,36 @@
+# Generated by Django 5.2.12 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0022_person_minecraft_username_person_minecraft_uuid'),
+        ('personal_tab', '0013_authorization_documenso_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTransactionTotal',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='day')),
+                ('transaction_type', models.CharField(max_length=30, verbose_name='transaction type')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='number of transactions')),
+                ('amount', models.PositiveIntegerField(default=0, verbose_name='Amount')),
+                ('price', models.DecimalField(decimal_places=2, default=0.0, max_digits=10, verbose_name='Price')),
+                ('discount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='discount')),
+                ('article', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='personal_tab.article', verbose_name='Article')),
+                ('discount_period', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='personal_tab.discountperiod', verbose_name='discount offer')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='members.person', verbose_name='person')),
+            ],
+            options={
+                'verbose_name': 'daily transaction total',
+                'verbose_name_plural': 'daily transaction totals',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['day', 'transaction_type'], name='personal_tab_dtt_day_idx'), models.Index(fields=['person', 'day'], name='personal_tab_dtt_person_idx')],
+            },
+        ),
+    ]
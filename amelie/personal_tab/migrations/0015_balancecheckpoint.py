@@ -0,0 +1,44 @@
+# Generated by Django 5.2.12 on 2026-10-17 12:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0022_person_minecraft_username_person_minecraft_uuid'),
+        ('personal_tab', '0014_dailytransactiontotal'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BalanceCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateTimeField(unique=True, verbose_name='date')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='created on')),
+            ],
+            options={
+                'verbose_name': 'balance checkpoint',
+                'verbose_name_plural': 'balance checkpoints',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BalanceCheckpointEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('balance', models.DecimalField(decimal_places=2, default=0.0, max_digits=10, verbose_name='balance')),
+                ('uncollected', models.DecimalField(decimal_places=2, default=0.0, max_digits=10, verbose_name='not yet collected')),
+                ('exam_cookie_credit', models.DecimalField(decimal_places=2, default=0.0, max_digits=10, verbose_name='exam cookie credit')),
+                ('checkpoint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='personal_tab.balancecheckpoint', verbose_name='balance checkpoint')),
+                ('person', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='members.person', verbose_name='person')),
+            ],
+            options={
+                'verbose_name': 'balance checkpoint entry',
+                'verbose_name_plural': 'balance checkpoint entries',
+                'unique_together': {('checkpoint', 'person')},
+            },
+        ),
+    ]
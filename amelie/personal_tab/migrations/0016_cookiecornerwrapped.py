@@ -0,0 +1,31 @@
+# Generated by Django 5.2.12 on 2026-10-17 14:05
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0022_person_minecraft_username_person_minecraft_uuid'),
+        ('personal_tab', '0015_balancecheckpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CookieCornerWrapped',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField(verbose_name='year')),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='data')),
+                ('created_on', models.DateTimeField(auto_now_add=True, verbose_name='created on')),
+                ('person', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='members.person', verbose_name='person')),
+            ],
+            options={
+                'verbose_name': 'Cookie Corner Wrapped profile',
+                'verbose_name_plural': 'Cookie Corner Wrapped profiles',
+                'unique_together': {('year', 'person')},
+            },
+        ),
+    ]
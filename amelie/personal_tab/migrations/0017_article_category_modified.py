@@ -0,0 +1,26 @@
+# Generated by Django 5.2.12 on 2026-10-17 16:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personal_tab', '0016_cookiecornerwrapped'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now, editable=False),
+            preserve_default=False,
+        ),
+    ]
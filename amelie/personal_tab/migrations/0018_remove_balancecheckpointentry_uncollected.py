@@ -0,0 +1,17 @@
+# Generated by Django 5.2.12 on 2026-10-18 09:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('personal_tab', '0017_article_category_modified'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='balancecheckpointentry',
+            name='uncollected',
+        ),
+    ]
@@ -1,6 +1,8 @@
 # -*- coding: UTF-8 -*-
 import datetime
 import logging
+import threading
+from contextlib import contextmanager
 from io import BytesIO
 from typing import Optional
 
@@ -9,12 +11,13 @@ import json
 
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
 from django.urls import reverse
 from django.shortcuts import get_object_or_404
 from django.core.validators import RegexValidator
 from django.db import models, transaction
 from django.db.models import Q
-from django.db.models.signals import pre_save, post_save, post_delete
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
 from django.utils import timezone
 from django.utils.translation import get_language, gettext_lazy as _l, gettext
 from documenso_sdk import EnvelopeDistributeResponse
@@ -22,7 +25,8 @@ from localflavor.generic.models import BICField, IBANField
 
 from amelie.claudia.tools import verify_instance
 from amelie.members.models import Person, Membership, Committee
-from amelie.personal_tab.managers import AuthorizationManager, DebtCollectionInstructionManager
+from amelie.personal_tab.managers import AuthorizationManager, DebtCollectionInstructionManager, \
+    DailyTransactionTotalManager, BalanceCheckpointManager
 
 
 class DiscountPeriod(models.Model):
@@ -286,6 +290,7 @@ class Article(models.Model):
     is_available: Indicates if the article is available at this moment. If it is False, the product cannot be sold.
     image: The image for the Cookie Corner to show in its interface. Optional.
     kcal: The amount of kiloCalories this product has. This is used in statistics. Optional.
+    modified: When the article was last changed. Used to notice changes to the POS catalogue.
     """
 
     name_nl = models.CharField(max_length=50, verbose_name=_l('Name'))
@@ -296,6 +301,7 @@ class Article(models.Model):
     is_available = models.BooleanField(default=False, verbose_name=_l('Available'))
     image = models.ImageField(upload_to='cookie_corner', max_length=255, blank=False, verbose_name=_l('Image'))
     kcal = models.PositiveSmallIntegerField(verbose_name=_l('kCal'), blank=True, null=True)
+    modified = models.DateTimeField(editable=False, auto_now=True)
 
     @property
     def name(self):
@@ -323,6 +329,7 @@ class Category(models.Model):
     is_available: If the category is available. Same as Article.is_available.
     image: Image for the Cookie Corner. Same as Article.image.
     order: Integer indicating the order this category should be shown in. 1 will be shown before 2, etc.
+    modified: When the category was last changed. Used to notice changes to the POS catalogue.
     """
 
     name_nl = models.CharField(max_length=50, verbose_name=_l('Name'))
@@ -332,6 +339,7 @@ class Category(models.Model):
     order = models.PositiveIntegerField(default=0, null=False, verbose_name=_l('Sequence'))
     show_calculator_in_pos = models.BooleanField(default=False, verbose_name=_l('Show the calculator in the Point of Sale instead of the products'),
                                                  help_text=_l('The first active article in the category will be used for calculations.'))
+    modified = models.DateTimeField(editable=False, auto_now=True)
 
     @property
     def name(self):
@@ -949,6 +957,131 @@ class ReversalTransaction(Transaction):
         return reverse('personal_tab:reversal_transaction_detail', args=[self.pk])
 
 
+class DailyTransactionTotal(models.Model):
+    """
+    Daily rollup of all transactions, used by the treasurer reports instead of the transaction table.
+
+    There is one row per day, person, transaction type, article and discount offer. The rows are kept up to date by
+    signals on the transaction models, and can be rebuilt with the rebuild_transaction_totals management command.
+
+    day:                The day (in the current timezone) of the transactions.
+    person:             The person the transactions are for.
+    transaction_type:   The type of the transactions, see managers.TRANSACTION_TYPES.
+    article:            The article of the transactions, only for cookie corner transactions.
+    discount_period:    The discount offer of the discount of the transactions.
+    count:              The number of transactions.
+    amount:             The number of articles, only for cookie corner transactions.
+    price:              The total price of the transactions.
+    discount:           The total discount given on the transactions.
+    """
+
+    day = models.DateField(verbose_name=_l('day'))
+    person = models.ForeignKey(Person, verbose_name=_l('person'), on_delete=models.CASCADE, related_name='+')
+    transaction_type = models.CharField(max_length=30, verbose_name=_l('transaction type'))
+    article = models.ForeignKey(Article, verbose_name=_l('Article'), blank=True, null=True,
+                                on_delete=models.SET_NULL, related_name='+')
+    discount_period = models.ForeignKey(DiscountPeriod, verbose_name=_l('discount offer'), blank=True, null=True,
+                                        on_delete=models.CASCADE, related_name='+')
+    count = models.PositiveIntegerField(default=0, verbose_name=_l('number of transactions'))
+    amount = models.PositiveIntegerField(default=0, verbose_name=_l('Amount'))
+    price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, verbose_name=_l('Price'))
+    discount = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True,
+                                   verbose_name=_l('discount'))
+
+    objects = DailyTransactionTotalManager()
+
+    class Meta:
+        ordering = ['day']
+        indexes = [
+            models.Index(fields=['day', 'transaction_type'], name='personal_tab_dtt_day_idx'),
+            models.Index(fields=['person', 'day'], name='personal_tab_dtt_person_idx'),
+        ]
+        verbose_name = _l('daily transaction total')
+        verbose_name_plural = _l('daily transaction totals')
+
+    def __str__(self):
+        return '{} {} {} ({})'.format(self.day, self.person, self.transaction_type, self.price)
+
+
+class BalanceCheckpoint(models.Model):
+    """
+    Checkpoint of the balances of all persons at a certain moment.
+
+    The balance at any moment is the latest checkpoint before that moment plus the transactions since then.
+    Checkpoints are created periodically by the create_balance_checkpoint task, and are removed when a transaction
+    or credit is added or changed before the checkpoint.
+
+    date:       The moment of the checkpoint, the balances include everything before (but not at) this moment.
+    created_on: The date and time on which this checkpoint was created.
+    """
+
+    date = models.DateTimeField(unique=True, verbose_name=_l('date'))
+    created_on = models.DateTimeField(auto_now_add=True, verbose_name=_l('created on'))
+
+    objects = BalanceCheckpointManager()
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name = _l('balance checkpoint')
+        verbose_name_plural = _l('balance checkpoints')
+
+    def __str__(self):
+        return '{}'.format(self.date)
+
+
+class BalanceCheckpointEntry(models.Model):
+    """
+    Balances of a single person in a BalanceCheckpoint. Persons without any balance do not have an entry.
+
+    checkpoint:         The checkpoint this entry belongs to.
+    person:             The person of this entry.
+    balance:            The sum of all transactions since the start of SEPA debt collection.
+    exam_cookie_credit: The exam cookie credit.
+    """
+
+    checkpoint = models.ForeignKey(BalanceCheckpoint, related_name='entries', on_delete=models.CASCADE,
+                                   verbose_name=_l('balance checkpoint'))
+    person = models.ForeignKey(Person, verbose_name=_l('person'), on_delete=models.CASCADE, related_name='+')
+    balance = models.DecimalField(max_digits=10, decimal_places=2, default=0.00, verbose_name=_l('balance'))
+    exam_cookie_credit = models.DecimalField(max_digits=10, decimal_places=2, default=0.00,
+                                             verbose_name=_l('exam cookie credit'))
+
+    class Meta:
+        unique_together = ('checkpoint', 'person')
+        verbose_name = _l('balance checkpoint entry')
+        verbose_name_plural = _l('balance checkpoint entries')
+
+    def __str__(self):
+        return '{} {}'.format(self.checkpoint, self.person)
+
+
+class CookieCornerWrapped(models.Model):
+    """
+    Precomputed Cookie Corner Wrapped profile of a person, or of the whole association, for a year.
+
+    Profiles are generated for all persons at once by the generate_cookie_corner_wrapped task.
+
+    year:       The year of the profile.
+    person:     The person of the profile, or None for the global profile.
+    data:       The compact profile, articles are stored by their id. See amelie.personal_tab.wrapped.
+    created_on: The date and time on which this profile was generated.
+    """
+
+    year = models.PositiveIntegerField(verbose_name=_l('year'))
+    person = models.ForeignKey(Person, verbose_name=_l('person'), on_delete=models.CASCADE, related_name='+',
+                               null=True, blank=True)
+    data = models.JSONField(encoder=DjangoJSONEncoder, verbose_name=_l('data'))
+    created_on = models.DateTimeField(auto_now_add=True, verbose_name=_l('created on'))
+
+    class Meta:
+        unique_together = ('year', 'person')
+        verbose_name = _l('Cookie Corner Wrapped profile')
+        verbose_name_plural = _l('Cookie Corner Wrapped profiles')
+
+    def __str__(self):
+        return '{} {}'.format(self.year, self.person or _l('Global'))
+
+
 def get_sentinel_person() -> Person:
     return Person.objects.get(pk=settings.ANONIMIZATION_SENTINEL_PERSON_ID)
 
@@ -1097,3 +1230,168 @@ post_save.connect(_complain_with_claudia, sender=Authorization)
 pre_save.connect(_complain_with_claudia_old, sender=RFIDCard)
 post_save.connect(_complain_with_claudia, sender=RFIDCard)
 post_delete.connect(_complain_with_claudia, sender=RFIDCard)
+
+
+# Fields of transactions that influence the daily transaction rollup
+_ROLLUP_FIELDS = ['person_id', 'date', 'price', 'discount_id']
+_COOKIE_CORNER_ROLLUP_FIELDS = _ROLLUP_FIELDS + ['article_id', 'amount']
+
+# Fields of transactions that influence the balance checkpoints
+_BALANCE_FIELDS = ['person_id', 'date', 'price']
+
+
+def _rollup_fields(sender):
+    return _COOKIE_CORNER_ROLLUP_FIELDS if issubclass(sender, CookieCornerTransaction) else _ROLLUP_FIELDS
+
+
+def _tracked_fields(sender):
+    return list(dict.fromkeys(_rollup_fields(sender) + _BALANCE_FIELDS))
+
+
+_deferred_updates = threading.local()
+
+
+def schedule_transaction_updates(slices=(), date=None):
+    """
+    Refresh the daily transaction rollup for the given (person_id, day) slices and remove the balance checkpoints
+    that include the given date. The Cookie Corner Wrapped profiles of the years of the slices are removed as well,
+    they are generated again when they are viewed.
+
+    Within a deferred_transaction_updates block, the updates are collected and applied once when the block ends.
+    """
+    pending = getattr(_deferred_updates, 'pending', None)
+    if pending is not None:
+        pending['slices'].update(slices)
+        if date is not None:
+            pending['date'] = min(pending['date'], date) if pending['date'] else date
+        return
+
+    for person_id, day in slices:
+        DailyTransactionTotal.objects.refresh(person_id, day)
+    years = {day.year for person_id, day in slices}
+    if years:
+        CookieCornerWrapped.objects.filter(year__in=years).delete()
+    if date is not None:
+        BalanceCheckpoint.objects.invalidate(date)
+
+
+@contextmanager
+def deferred_transaction_updates():
+    """
+    Collect the rollup and balance checkpoint updates of all transactions and discount credits that are changed in
+    this block, and apply them once at the end of it instead of after every single save.
+
+    Use this when saving many transactions at once, and call schedule_transaction_updates for rows that are written
+    without signals, like with bulk_create.
+    """
+    if getattr(_deferred_updates, 'pending', None) is not None:
+        # Nested block, the outermost block applies the updates
+        yield
+        return
+
+    _deferred_updates.pending = pending = {'slices': set(), 'date': None}
+    try:
+        yield
+    finally:
+        _deferred_updates.pending = None
+    schedule_transaction_updates(slices=pending['slices'], date=pending['date'])
+
+
+def _remember_old_transaction(sender, **kwargs):
+    """
+    Remember the rollup and balance fields of a transaction before it is changed.
+
+    Call from pre_save signal.
+    """
+    instance = kwargs.get('instance')
+    instance._tracked_old = sender.objects.filter(pk=instance.pk).values(*_tracked_fields(sender)).first() \
+        if instance.pk else None
+
+
+def _transaction_changed(sender, **kwargs):
+    """
+    Update the daily transaction rollup for the day(s) and person(s) of a changed transaction, and remove the
+    balance checkpoints that include it.
+
+    Call from post_save and post_delete signals.
+    """
+    instance = kwargs.get('instance')
+    deleted = kwargs.get('signal') is post_delete
+    new = {field: getattr(instance, field) for field in _tracked_fields(sender)}
+    old = getattr(instance, '_tracked_old', None) if not deleted else None
+
+    def _changed(fields):
+        return deleted or old is None or any(old[field] != new[field] for field in fields)
+
+    # Fields like the description or the debt collection instruction do not influence the totals
+    if _changed(_rollup_fields(sender)):
+        slices = {(new['person_id'], timezone.localdate(new['date']))}
+        if old:
+            slices.add((old['person_id'], timezone.localdate(old['date'])))
+        schedule_transaction_updates(slices=slices)
+
+    if _changed(_BALANCE_FIELDS):
+        schedule_transaction_updates(date=min(new['date'], old['date']) if old else new['date'])
+
+
+def _remember_old_credit(sender, **kwargs):
+    """
+    Remember the date of a discount credit before it is changed.
+
+    Call from pre_save signal.
+    """
+    instance = kwargs.get('instance')
+    instance._old_date = sender.objects.filter(pk=instance.pk).values_list('date', flat=True).first() \
+        if instance.pk else None
+
+
+def _credit_changed(sender, **kwargs):
+    """
+    Remove the balance checkpoints that include a changed discount credit.
+
+    Call from post_save and post_delete signals.
+    """
+    instance = kwargs.get('instance')
+    old_date = getattr(instance, '_old_date', None)
+    schedule_transaction_updates(date=min(instance.date, old_date) if old_date else instance.date)
+
+
+def _remember_discount_transaction(sender, **kwargs):
+    """
+    Remember the (person_id, day) of the transaction of a discount before it is deleted. Deleting a discount sets the
+    discount of its transaction to NULL without sending signals for the transaction.
+
+    Call from pre_delete signal.
+    """
+    instance = kwargs.get('instance')
+    instance._rollup_slices = {(person_id, timezone.localdate(date)) for person_id, date
+                               in Transaction.objects.filter(discount=instance).values_list('person_id', 'date')}
+
+
+def _discount_changed(sender, **kwargs):
+    """
+    Update the daily transaction rollup for the transaction of a changed or deleted discount.
+
+    Call from post_save and post_delete signals.
+    """
+    instance = kwargs.get('instance')
+    slices = getattr(instance, '_rollup_slices', None)
+    if slices is None:
+        slices = {(person_id, timezone.localdate(date)) for person_id, date
+                  in Transaction.objects.filter(discount=instance).values_list('person_id', 'date')}
+    schedule_transaction_updates(slices=slices)
+
+
+for _transaction_model in [Transaction, CookieCornerTransaction, ActivityTransaction, AlexiaTransaction,
+                           ContributionTransaction, CustomTransaction, DebtCollectionTransaction, ReversalTransaction]:
+    pre_save.connect(_remember_old_transaction, sender=_transaction_model)
+    post_save.connect(_transaction_changed, sender=_transaction_model)
+    post_delete.connect(_transaction_changed, sender=_transaction_model)
+
+pre_save.connect(_remember_old_credit, sender=DiscountCredit)
+post_save.connect(_credit_changed, sender=DiscountCredit)
+post_delete.connect(_credit_changed, sender=DiscountCredit)
+
+pre_delete.connect(_remember_discount_transaction, sender=Discount)
+post_save.connect(_discount_changed, sender=Discount)
+post_delete.connect(_discount_changed, sender=Discount)
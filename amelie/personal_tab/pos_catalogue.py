@@ -0,0 +1,100 @@
+import operator
+import threading
+
+from django.db.models import Count, Max
+
+from amelie.personal_tab.models import Article, Category, CookieCornerTransaction
+
+
+# Number of recent purchases of a person that their favourites are based on
+FAVOURITES_TRANSACTION_COUNT = 100
+
+_catalogue = None
+_catalogue_lock = threading.Lock()
+
+
+class Catalogue(object):
+    """
+    Snapshot of the available categories and articles of the cookie corner.
+
+    categories: The available categories, in order, with their available articles in pos_articles.
+    articles:   All available articles by id, with their category loaded.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self.articles = Article.objects.filter(is_available=True).select_related('category').in_bulk()
+
+        self.categories = list(Category.objects.filter(is_available=True).order_by('order'))
+        category_articles = {category.pk: [] for category in self.categories}
+        for article in sorted(self.articles.values(), key=lambda a: a.name_nl):
+            if article.category_id in category_articles:
+                category_articles[article.category_id].append(article)
+        for category in self.categories:
+            category.pos_articles = category_articles[category.pk]
+
+
+def catalogue_version():
+    """
+    Returns the version of the catalogue, which changes when an article or category is added, changed or deleted.
+
+    The version is read from the database, so every process notices changes made by the others.
+    """
+    return tuple(tuple(model.objects.aggregate(Count('pk'), Max('modified')).values()) for model in (Article, Category))
+
+
+def get_catalogue():
+    """
+    Returns the catalogue snapshot of the cookie corner.
+
+    The snapshot is kept in memory of this process, and is rebuilt when the version of the catalogue has changed.
+    """
+    global _catalogue
+
+    version = catalogue_version()
+
+    catalogue = _catalogue
+    if catalogue is None or catalogue.version != version:
+        with _catalogue_lock:
+            if _catalogue is None or _catalogue.version != version:
+                _catalogue = Catalogue(version)
+            catalogue = _catalogue
+
+    return catalogue
+
+
+def _recent_purchases(person):
+    """
+    Returns the last purchases of available articles by a person that count for their favourites, as
+    (article_id, amount) tuples, newest first.
+    """
+    return CookieCornerTransaction.objects.filter(person=person, article__is_available=True).exclude(
+        article__category__show_calculator_in_pos=True
+    ).values_list('article_id', 'amount')[:FAVOURITES_TRANSACTION_COUNT]
+
+
+def favourite_articles(person, count=5):
+    """
+    Returns the articles a person bought most in their recent purchases, as dictionaries for the POS.
+    """
+    articles = get_catalogue().articles
+
+    favourites = {}
+    for article_id, amount in _recent_purchases(person):
+        if article_id in articles:
+            favourites[article_id] = favourites.get(article_id, 0) + amount
+
+    # Sort by the amount bought, the last ones are the favourites
+    favourites = sorted(favourites.items(), key=operator.itemgetter(1))
+
+    result = []
+    for article_id, amount in favourites[:-(count + 1):-1]:
+        article = articles[article_id]
+        result.append({
+            "id": article.id,
+            "name": article.name,
+            "price": str(article.price).replace(".", ","),
+            "article_image": article.image.url if article.image else None,
+            "amount": amount,
+        })
+    return result
@@ -1,7 +1,5 @@
 import json
 import logging
-import operator
-from functools import reduce
 from typing import List
 
 from django.conf import settings
@@ -19,10 +17,10 @@ from django.utils.translation import gettext as _
 from amelie.activities.models import Activity
 from amelie.members.models import Person
 from amelie.personal_tab.forms import CookieCornerPersonSearchForm
-from amelie.personal_tab.models import RFIDCard, Category, CookieCornerTransaction, Article
+from amelie.personal_tab.models import RFIDCard, Article
+from amelie.personal_tab.pos_catalogue import favourite_articles, get_catalogue
 from amelie.personal_tab.pos_models import PendingPosToken
-from amelie.personal_tab.transactions import free_cookie_is_winner, free_cookies_allowed, free_cookies_sale, \
-    cookie_corner_sale
+from amelie.personal_tab.transactions import cookie_corner_checkout
 from amelie.tools.decorators import request_passes_test
 from amelie.tools.http import HttpJSONResponse, get_client_ips
 from amelie.tools.mixins import RequireCookieCornerMixin
@@ -365,7 +363,7 @@ class PosShopView(RequireCookieCornerMixin, CookieCornerBetaModeMixin, TemplateV
 
     def get_context_data(self, **kwargs):
         context = super(PosShopView, self).get_context_data(**kwargs)
-        context['categories'] = Category.objects.filter(is_available=True).order_by('order').prefetch_related('article_set')
+        context['categories'] = get_catalogue().categories
 
         # Get person
         if 'POS_LOGIN_UID' in self.request.session:
@@ -374,32 +372,8 @@ class PosShopView(RequireCookieCornerMixin, CookieCornerBetaModeMixin, TemplateV
             context['pos_person'] = person
             del self.request.session['POS_LOGIN_UID']
 
-            # Get person's top 5 products
-            # We're doing this in python, because we only want to use the last 100 transactions for the top 5.
-            last_transactions = CookieCornerTransaction.objects.filter(person=person, article__is_available=True).exclude(
-                article__category__show_calculator_in_pos=True
-            )[:100]
-
-            favourites = {}
-            for trans in last_transactions:
-                if trans.article_id not in favourites:
-                    favourites[trans.article_id] = 0
-                favourites[trans.article_id] += trans.amount
-
-            # Now we'll just sort it by value.
-            favourites = sorted(favourites.items(), key=operator.itemgetter(1))
-
-            sorted_favourites = []
-            for fav in favourites[:-6:-1]:  # These are the last 5 in reverse order
-                article = Article.objects.get(id=fav[0])
-                sorted_favourites.append({
-                    "id": article.id,
-                    "name": article.name,
-                    "price": str(article.price).replace(".", ","),
-                    "article_image": article.image.url if article.image else None,
-                    "amount": fav[1],
-                })
-            context['top_five_products'] = sorted_favourites
+            # Get person's top 5 products, from the cached last 100 purchases
+            context['top_five_products'] = favourite_articles(person)
 
         return context
 
@@ -421,13 +395,6 @@ class PosShopView(RequireCookieCornerMixin, CookieCornerBetaModeMixin, TemplateV
             return redirect("personal_tab:pos_logout")
 
         cart = json.loads(request.POST['cart'])
-        transactions = []
-        total_price = 0
-        total_kcal = 0
-
-        # Free cookie action
-        is_winner = free_cookie_is_winner(person)
-        action_processed = False
 
         if not cart:
             messages.error(request, _l("No products were selected. Please try again."))
@@ -438,9 +405,11 @@ class PosShopView(RequireCookieCornerMixin, CookieCornerBetaModeMixin, TemplateV
                 messages.error(request, _l("Invalid shopping cart. No products are bought. Please try again. (error 2)"))
                 return redirect("personal_tab:pos_logout")
 
-            try:
-                item = Article.objects.get(id=i['product'])
-            except Article.DoesNotExist:
+        articles = Article.objects.select_related('category').in_bulk([i['product'] for i in cart])
+        lines = []
+        for i in cart:
+            item = articles.get(i['product'])
+            if item is None:
                 messages.error(request, _l("Invalid shopping cart. No products are bought. Please try again. (error 3)"))
                 return redirect("personal_tab:pos_logout")
 
@@ -448,27 +417,26 @@ class PosShopView(RequireCookieCornerMixin, CookieCornerBetaModeMixin, TemplateV
                 messages.error(request, _l("Invalid shopping cart. No products are bought. Please try again. (error 4)"))
                 return redirect("personal_tab:pos_logout")
 
-            amount = i['amount']
+            lines.append((item, i['amount']))
 
-            if is_winner and not action_processed and free_cookies_allowed(item):
-                action_processed = True
-                cc_transaction = free_cookies_sale(article=item, amount=amount, person=person, added_by=person)
-            else:
-                cc_transaction = cookie_corner_sale(article=item, amount=amount, person=person, added_by=person)
+        cc_transactions, free_cookie_winner = cookie_corner_checkout(cart=lines, person=person, added_by=person)
 
+        transactions = []
+        total_price = 0
+        total_kcal = 0
+        for cc_transaction in cc_transactions:
             total_price += cc_transaction.price
             total_kcal += cc_transaction.kcal() or 0
 
             transactions.append({
-                'item': item,
-                'amount': amount,
-                'discount': cc_transaction.discount if hasattr(cc_transaction, 'discount') else None,
+                'item': cc_transaction.article,
+                'amount': cc_transaction.amount,
+                'discount': cc_transaction.discount,
                 'total': cc_transaction.price,
                 'subtotal_kcal': cc_transaction.kcal()
             })
 
-        free_cookie_winner = is_winner and action_processed
-        has_discount = reduce(lambda x, y: x or y, [bool(t['discount']) for t in transactions])
+        has_discount = any(t['discount'] for t in transactions)
 
         return render(request, 'pos/success.html', {
             'success_text': _l('Purchase registered!'),
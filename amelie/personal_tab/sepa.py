@@ -0,0 +1,204 @@
+import io
+from xml.sax.saxutils import XMLGenerator
+
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from amelie.personal_tab.models import DebtCollectionInstruction
+
+# Namespace of the SEPA direct debit initiation messages that are sent to the bank
+PAIN008_NAMESPACE = 'urn:iso:std:iso:20022:tech:xsd:pain.008.001.02'
+
+# Details of Inter-Actief as creditor
+CREDITOR_NAME = 'Inter-Actief'
+CREDITOR_IBAN = 'NL70RABO0103421068'
+CREDITOR_BIC = 'RABONL2U'
+CREDITOR_SCHEME_ID = 'NL81ZZZ400749470000'
+
+# Number of instructions that is read from the database and written to the output at once
+CHUNK_SIZE = 500
+
+
+class _IndentingWriter:
+    """Writes indented XML elements through an XMLGenerator, which escapes the text."""
+
+    def __init__(self, out):
+        self.generator = XMLGenerator(out, encoding='utf-8', short_empty_elements=True)
+        self.depth = 0
+
+    def _indent(self):
+        self.generator.ignorableWhitespace('\n' + '    ' * self.depth)
+
+    def start(self, name, attrs=None):
+        self._indent()
+        self.generator.startElement(name, attrs or {})
+        self.depth += 1
+
+    def end(self, name):
+        self.depth -= 1
+        self._indent()
+        self.generator.endElement(name)
+
+    def element(self, name, text, attrs=None):
+        self._indent()
+        self.generator.startElement(name, attrs or {})
+        self.generator.characters(str(text))
+        self.generator.endElement(name)
+
+    def path(self, names, text):
+        """Write nested elements with the given names, with the text in the innermost element."""
+        for name in names[:-1]:
+            self.start(name)
+        self.element(names[-1], text)
+        for name in reversed(names[:-1]):
+            self.end(name)
+
+
+def _amount(value):
+    """Format an amount with two decimals, sums from SQLite lose the trailing zeros."""
+    return '{:.2f}'.format(value)
+
+
+def _instruction(writer, instruction):
+    authorization = instruction.authorization
+    amendment = instruction.amendment
+
+    writer.start('DrctDbtTxInf')
+    writer.start('PmtId')
+    writer.element('InstrId', instruction.debt_collection_reference())
+    writer.element('EndToEndId', instruction.end_to_end_id)
+    writer.end('PmtId')
+    writer.element('InstdAmt', _amount(instruction.amount), {'Ccy': 'EUR'})
+    writer.start('DrctDbtTx')
+    writer.start('MndtRltdInf')
+    writer.element('MndtId', authorization.authorization_reference())
+    writer.element('DtOfSgntr', authorization.start_date.isoformat())
+    if amendment:
+        writer.element('AmdmntInd', 'true')
+        writer.start('AmdmntInfDtls')
+        # The template never wrote the SMNDA agent for a change of bank, so neither does the writer
+        writer.path(['OrgnlDbtrAcct', 'Id', 'IBAN'], amendment.previous_iban)
+        writer.end('AmdmntInfDtls')
+    writer.end('MndtRltdInf')
+    writer.end('DrctDbtTx')
+    writer.path(['DbtrAgt', 'FinInstnId', 'BIC'], authorization.bic)
+    writer.path(['Dbtr', 'Nm'], authorization.account_holder_name)
+    writer.path(['DbtrAcct', 'Id', 'IBAN'], authorization.iban)
+    writer.path(['RmtInf', 'Ustrd'], instruction.description)
+    writer.end('DrctDbtTxInf')
+
+
+def _batch_start(writer, batch, totals):
+    count, control_sum = totals.get(batch.pk, (0, 0))
+
+    writer.start('PmtInf')
+    writer.element('PmtInfId', batch.reference_number())
+    writer.element('PmtMtd', 'DD')
+    writer.element('BtchBookg', 'true')
+    writer.element('NbOfTxs', count)
+    writer.element('CtrlSum', _amount(control_sum))
+    writer.start('PmtTpInf')
+    writer.path(['SvcLvl', 'Cd'], 'SEPA')
+    writer.path(['LclInstrm', 'Cd'], 'CORE')
+    writer.element('SeqTp', batch.sequence_type)
+    writer.end('PmtTpInf')
+    writer.element('ReqdColltnDt', batch.execution_date.isoformat())
+    writer.path(['Cdtr', 'Nm'], CREDITOR_NAME)
+    writer.path(['CdtrAcct', 'Id', 'IBAN'], CREDITOR_IBAN)
+    writer.path(['CdtrAgt', 'FinInstnId', 'BIC'], CREDITOR_BIC)
+    writer.element('ChrgBr', 'SLEV')
+    writer.start('CdtrSchmeId')
+    writer.start('Id')
+    writer.start('PrvtId')
+    writer.start('Othr')
+    writer.element('Id', CREDITOR_SCHEME_ID)
+    writer.path(['SchmeNm', 'Prtry'], 'SEPA')
+    writer.end('Othr')
+    writer.end('PrvtId')
+    writer.end('Id')
+    writer.end('CdtrSchmeId')
+
+
+def pain008_totals(assignment):
+    """
+    Returns the number of instructions and the control sum per batch of the assignment, from a single grouped query,
+    as a dictionary from batch id to (count, sum).
+    """
+    rows = DebtCollectionInstruction.objects.filter(batch__assignment=assignment).order_by().values(
+        'batch').annotate(Count('pk'), Sum('amount'))
+    return {row['batch']: (row['pk__count'], row['amount__sum']) for row in rows}
+
+
+def write_pain008(assignment):
+    """
+    Generates the SEPA direct debit initiation message (pain.008.001.02) of a debt collection assignment, in chunks
+    of bytes.
+
+    The header totals come from one grouped query, after which all instructions are read with their
+    authorization and amendment in a single query, and written out while they are read.
+
+    :type assignment: amelie.personal_tab.models.DebtCollectionAssignment
+    """
+    out = io.BytesIO()
+    writer = _IndentingWriter(out)
+
+    def flush():
+        data = out.getvalue()
+        out.seek(0)
+        out.truncate()
+        return data
+
+    totals = pain008_totals(assignment)
+    batches = list(assignment.batches.order_by('execution_date', 'pk'))
+
+    out.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>')
+    writer.start('Document', {'xmlns': PAIN008_NAMESPACE})
+    writer.start('CstmrDrctDbtInitn')
+    writer.start('GrpHdr')
+    writer.element('MsgId', assignment.file_identification())
+    writer.element('CreDtTm', timezone.localtime(assignment.created_on).isoformat())
+    writer.element('NbOfTxs', sum(count for count, control_sum in totals.values()))
+    writer.element('CtrlSum', _amount(sum(control_sum for count, control_sum in totals.values())))
+    writer.path(['InitgPty', 'Nm'], CREDITOR_NAME)
+    writer.end('GrpHdr')
+
+    instructions = DebtCollectionInstruction.objects.filter(batch__assignment=assignment).select_related(
+        'authorization', 'amendment'
+    ).order_by('batch__execution_date', 'batch_id', 'authorization', 'pk').iterator(chunk_size=CHUNK_SIZE)
+
+    instruction = next(instructions, None)
+    written = 0
+    for batch in batches:
+        _batch_start(writer, batch, totals)
+        while instruction is not None and instruction.batch_id == batch.pk:
+            _instruction(writer, instruction)
+            instruction = next(instructions, None)
+
+            written += 1
+            if written % CHUNK_SIZE == 0:
+                yield flush()
+        writer.end('PmtInf')
+
+    writer.end('CstmrDrctDbtInitn')
+    writer.end('Document')
+    yield flush()
+
+
+class Pain008ValidationError(Exception):
+    pass
+
+
+def validate_pain008(source, schema_path):
+    """
+    Validate a pain.008 message against its XML schema, which can be downloaded from the ISO 20022 message archive.
+    This requires lxml, which is not needed otherwise. Raises Pain008ValidationError if the message is not valid.
+
+    :param source: Path or file-like object of the message.
+    :param schema_path: Path to pain.008.001.02.xsd.
+    """
+    from lxml import etree
+
+    schema = etree.XMLSchema(etree.parse(schema_path))
+    document = etree.parse(source)
+    if not schema.validate(document):
+        raise Pain008ValidationError('\n'.join(str(error) for error in schema.error_log))
@@ -1,137 +1,145 @@
-from django.db import connection
+from functools import partial
+
 from django.db.models import Count, Sum
 from django.db.models.functions import TruncDay
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _l
 
 from amelie.calendar.models import Event
 from amelie.members.models import MembershipType
 from amelie.personal_tab.models import Discount, DiscountPeriod, CustomTransaction, DiscountCredit, \
     ContributionTransaction, AlexiaTransaction, ActivityTransaction, \
-    CookieCornerTransaction, LedgerAccount, Category, Article
+    LedgerAccount, Article, DailyTransactionTotal
+
+
+class CookieCornerStatistics(object):
+    """
+    Aggregates all cookie corner transactions in a period with a single grouped query.
+
+    The category, article and ledger account breakdowns are all assembled in Python from the per-article rows, so
+    the number of queries does not depend on the size of the catalogue. The rows are read from the daily
+    transaction rollup where possible. An instance can be shared between the
+    statistics functions of a single request, see get_functions().
+    """
+
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+    @cached_property
+    def rows(self):
+        """
+        One row per article sold in the period, in article order. Transactions of which the article has been
+        deleted are grouped into a single row with article None.
+        """
+        aggregation = {
+            key[0]: totals for key, totals in DailyTransactionTotal.objects.totals(
+                self.start, self.end, group_by=('article',), transaction_type='cookiecornertransaction').items()
+        }
+        articles = list(Article.objects.filter(pk__in=[pk for pk in aggregation if pk is not None])
+                        .select_related('category', 'ledger_account'))
+        if None in aggregation:
+            articles.append(None)
 
+        rows = []
+        for article in articles:
+            article_aggregation = aggregation[article.pk if article else None]
+            rows.append({
+                'article': article,
+                'count': article_aggregation['amount'],
+                'discount': article_aggregation['discount'],
+                'sum': article_aggregation['price'],
+            })
+        return rows
+
+    @staticmethod
+    def _group(rows, key, ordering):
+        """Group article rows by key, and return the (key, rows) pairs ordered by ordering with None last."""
+        groups = {}
+        for row in rows:
+            groups.setdefault(key(row['article']), []).append(row)
+        return sorted(groups.items(), key=lambda item: (item[0] is None, ordering(item[0]) if item[0] else ()))
+
+    @staticmethod
+    def _total(rows):
+        discounts = [row['discount'] for row in rows if row['discount'] is not None]
+        discount = sum(discounts) if discounts else None
+        paid = sum(row['sum'] for row in rows)
+        return {
+            'count': sum(row['count'] for row in rows),
+            'discount': discount,
+            'sum': paid,
+            'total': paid + (discount or 0),
+        }
 
-def statistics_totals(start, end, tables):
-    names = {x[1]: x[2] for x in get_functions()}
-    rows = [(names[x], tables[x]['sum'] if x in tables else TOTAL_FUNCTIONS[x](start, end)) for x in TOTAL_FUNCTIONS]
-    return {'rows': rows, 'sum': sum(x[1] for x in rows)}
+    @staticmethod
+    def _article_row(row):
+        return dict(row, total=row['sum'] + (row['discount'] or 0))
 
+    def breakdown(self):
+        categories = self._group(self.rows, lambda article: article.category if article else None,
+                                 lambda category: (category.order, category.name_nl))
 
-def statistics_cookie_corner_ledger_breakdown(ledger):
-    """Create a statistics function for a breakdown of a certain ledger account"""
-    all_articles = {article.pk: article for article in ledger.articles.all()}
+        rows = []
+        for category, category_rows in categories:
+            total = self._total(category_rows)
+            total['discount'] = total['discount'] or 0
+            rows.append(dict(total, category=category, articles=[self._article_row(row) for row in category_rows]))
+        return {'rows': rows}
 
-    def statistics_cookie_corner_breakdown_for_ledger(start, end):
-        cookie_corner_transactions = CookieCornerTransaction.objects.filter(date__gte=start, date__lt=end) \
-            .filter(article__in=all_articles.values())
+    def ledger_totals(self):
+        ledgers = self._group(self.rows, lambda article: article.ledger_account if article else None,
+                              lambda ledger: (ledger.name,))
 
         rows = []
-        articles_aggregator = cookie_corner_transactions\
-            .values('article').order_by('article').annotate(Sum('amount'), Sum('price'), Sum('discount__amount'))
-
-        for article_aggregation in articles_aggregator:
-            if article_aggregation['amount__sum']:
-                article_sum = article_aggregation['price__sum']
-                article_discount_sum = article_aggregation['discount__amount__sum']
-
-                rows.append({
-                    'article': all_articles[article_aggregation['article']],
-                    'count': article_aggregation['amount__sum'],
-                    'discount': article_discount_sum,
-                    'sum': article_sum,
-                    'total': article_sum + (article_discount_sum or 0)
-                })
-
-        # Total row
-        ledger_aggregation = cookie_corner_transactions.aggregate(
-                Sum('amount'), Sum('price'), Sum('discount__amount'))
-
-        ledger_sum = ledger_aggregation['price__sum'] or 0
-        ledger_discount_sum = ledger_aggregation['discount__amount__sum']
-
-        total = {
-            'count': ledger_aggregation['amount__sum'] or 0,
-            'discount': ledger_discount_sum,
-            'sum': ledger_sum,
-            'total': ledger_sum + (ledger_discount_sum or 0)
+        for ledger, ledger_rows in ledgers:
+            total = self._total(ledger_rows)
+            rows.append([ledger, total['count'], total['discount'] or 0, total['sum'], total['total']])
+        return rows
+
+    def ledger_breakdown(self, ledger):
+        ledger_rows = [row for row in self.rows if row['article'] and row['article'].ledger_account_id == ledger.pk]
+        return {
+            'rows': [self._article_row(row) for row in ledger_rows if row['count']],
+            'total': self._total(ledger_rows),
         }
 
-        return {'rows': rows, 'total': total}
+    def total(self):
+        return self._total(self.rows)['total']
 
-    return statistics_cookie_corner_breakdown_for_ledger
 
+def _rollup_total(start, end, transaction_type):
+    """Total price of all transactions of a type in a period, read from the daily transaction rollup."""
+    return DailyTransactionTotal.objects.totals(start, end, transaction_type=transaction_type)[()]['price']
 
-def statistics_cookie_corner_breakdown(start, end):
-    cookie_corner_transactions = CookieCornerTransaction.objects.filter(date__gte=start, date__lt=end)
 
-    categories = cookie_corner_transactions.order_by().distinct().values('article__category')
+def statistics_totals(start, end, tables, cookie_corner=None):
+    names = {x[1]: x[2] for x in get_functions()}
+    total_functions = dict(TOTAL_FUNCTIONS, s=partial(statistics_cookie_corner_total, cookie_corner=cookie_corner))
+    rows = [(names[x], tables[x]['sum'] if x in tables else total_functions[x](start, end)) for x in TOTAL_FUNCTIONS]
+    return {'rows': rows, 'sum': sum(x[1] for x in rows)}
 
-    rows = []
-    for c in categories:
-        category = Category.objects.get(id=c['article__category'])
-        category_transactions = cookie_corner_transactions.filter(article__category_id=category)
-        category_aggregation = category_transactions.aggregate(Sum('amount'), Sum('price'), Sum('discount__amount'))
-        category_count = category_aggregation['amount__sum'] or 0
-        category_sum = category_aggregation['price__sum'] or 0
-        category_discount_sum = category_aggregation['discount__amount__sum'] or 0
-        category_total = category_sum + category_discount_sum
-
-        articles = category_transactions.order_by().distinct().values('article')
-
-        cat_rows = []
-
-        for a in articles:
-            article = Article.objects.get(id=a['article'])
-            article_aggregation = category_transactions.filter(article=article).aggregate(Sum('amount'), Sum('price'),
-                                                                                          Sum('discount__amount'))
-
-            article_count = article_aggregation['amount__sum']
-            article_sum = article_aggregation['price__sum']
-            article_discount_sum = article_aggregation['discount__amount__sum']
-            article_total = article_sum + (article_discount_sum or 0)
-
-            cat_rows.append({
-                'article': article,
-                'count': article_count,
-                'discount': article_discount_sum,
-                'sum': article_sum,
-                'total': article_total
-            })
 
-        rows.append({
-            'category': category,
-            'articles': cat_rows,
-            'count': category_count,
-            'discount': category_discount_sum,
-            'sum': category_sum,
-            'total': category_total
-        })
-    return {'rows': rows}
+def statistics_cookie_corner_ledger_breakdown(ledger, cookie_corner=None):
+    """Create a statistics function for a breakdown of a certain ledger account"""
+    def statistics_cookie_corner_breakdown_for_ledger(start, end):
+        return (cookie_corner or CookieCornerStatistics(start, end)).ledger_breakdown(ledger)
 
+    return statistics_cookie_corner_breakdown_for_ledger
 
-def statistics_cookie_corner_totals(start, end):
-    cookie_corner_transactions = CookieCornerTransaction.objects.filter(date__gte=start, date__lt=end)
-    rows = []
-    for ledger_account in cookie_corner_transactions.order_by().distinct().values('article__ledger_account'):
-        rows.append(_statistics_cookie_corner_totals_category(cookie_corner_transactions,
-                                                              ledger_account['article__ledger_account']))
-    totals = [sum(x[i] for x in rows if x) for i in range(1, 5)]
-    return {'rows': rows, 'sum': totals[-1], 'totals': totals}
+
+def statistics_cookie_corner_breakdown(start, end, cookie_corner=None):
+    return (cookie_corner or CookieCornerStatistics(start, end)).breakdown()
 
 
-def _statistics_cookie_corner_totals_category(cookie_corner_transactions, ledger_account):
-    transactions = cookie_corner_transactions.filter(article__ledger_account_id=ledger_account)
-    totals = transactions.aggregate(Sum('amount'), Sum('price'), Sum('discount__amount'))
-    amount = totals['amount__sum'] or 0
-    paid = totals['price__sum'] or 0
-    discount = totals['discount__amount__sum'] or 0
-    total = paid + discount
-    return [LedgerAccount.objects.get(id=ledger_account), amount, discount, paid, total]
+def statistics_cookie_corner_totals(start, end, cookie_corner=None):
+    rows = (cookie_corner or CookieCornerStatistics(start, end)).ledger_totals()
+    totals = [sum(x[i] for x in rows if x) for i in range(1, 5)]
+    return {'rows': rows, 'sum': totals[-1], 'totals': totals}
 
 
-def statistics_cookie_corner_total(start, end):
-    totals = CookieCornerTransaction.objects.filter(date__gte=start, date__lt=end).aggregate(Sum('price'),
-                                                                                             Sum('discount__amount'))
-    return (totals['price__sum'] or 0) + (totals['discount__amount__sum'] or 0)
+def statistics_cookie_corner_total(start, end, cookie_corner=None):
+    return (cookie_corner or CookieCornerStatistics(start, end)).total()
 
 
 def statistics_activities(start, end):
@@ -165,7 +173,7 @@ def statistics_activities(start, end):
 
 
 def statistics_activities_total(start, end):
-    return ActivityTransaction.objects.filter(date__gte=start, date__lt=end).aggregate(Sum('price'))['price__sum'] or 0
+    return _rollup_total(start, end, 'activitytransaction')
 
 
 def statistics_contribution_transactions(start, end):
@@ -203,8 +211,7 @@ def statistics_contribution_transactions(start, end):
 
 
 def statistics_contribution_transactions_total(start, end):
-    return ContributionTransaction.objects.filter(date__gte=start, date__lt=end).aggregate(
-        Sum('price'))['price__sum'] or 0
+    return _rollup_total(start, end, 'contributiontransaction')
 
 
 def statistics_discount_periods(start, end):
@@ -213,10 +220,12 @@ def statistics_discount_periods(start, end):
     discount_aggregated = discount_transactions.order_by().values('discount_period').annotate(
         Count('amount'), Sum('amount')).order_by('discount_period')
 
+    discount_periods = DiscountPeriod.objects.in_bulk([x['discount_period'] for x in discount_aggregated])
+
     rows = []
 
     for discount in discount_aggregated:
-        discount_period = DiscountPeriod.objects.get(id=discount['discount_period'])
+        discount_period = discount_periods[discount['discount_period']]
 
         discount_count = discount['amount__count']
         discount_sum = discount['amount__sum']
@@ -238,7 +247,7 @@ def statistics_other_transactions(start, end):
 
 
 def statistics_other_transactions_total(start, end):
-    return CustomTransaction.objects.filter(date__gte=start, date__lt=end).aggregate(Sum('price'))['price__sum'] or 0
+    return _rollup_total(start, end, 'customtransaction')
 
 
 def statistics_discount_credits(start, end):
@@ -248,9 +257,11 @@ def statistics_discount_credits(start, end):
     credit_aggregated = transactions.order_by().values('discount_period').annotate(
         Count('price'), Sum('price')).order_by('discount_period')
 
+    discount_periods = DiscountPeriod.objects.in_bulk([x['discount_period'] for x in credit_aggregated])
+
     rows = []
     for credit in credit_aggregated:
-        discount_period = DiscountPeriod.objects.get(id=credit['discount_period'])
+        discount_period = discount_periods[credit['discount_period']]
         row = {'discount_period': discount_period, 'count': credit['price__count'], 'sum': credit['price__sum'], }
         rows.append(row)
     return {'count': credit_count, 'rows': rows, 'sum': credit_sum}
@@ -267,21 +278,27 @@ def statistics_alexia_transactions(start, end):
 
 
 def statistics_alexia_transactions_total(start, end):
-    return AlexiaTransaction.objects.filter(date__gte=start, date__lt=end).aggregate(Sum('price'))['price__sum'] or 0
+    return _rollup_total(start, end, 'alexiatransaction')
 
 
-def statistics_functions_ledgers():
-    return [(statistics_cookie_corner_ledger_breakdown(ledger),
+def statistics_functions_ledgers(cookie_corner=None):
+    return [(statistics_cookie_corner_ledger_breakdown(ledger, cookie_corner),
              'l{}'.format(ledger.pk),
              _l('{} ledger statistics').format(ledger.name.capitalize()),
              ledger.default_statistics)
             for ledger in LedgerAccount.objects.all()]
 
 
-def get_functions():
+def get_functions(cookie_corner=None):
+    """
+    Returns all statistics functions as (function, key, name, selected by default) tuples.
+
+    If a CookieCornerStatistics object is given, all cookie corner functions share its aggregation.
+    """
     return [
-        (statistics_cookie_corner_breakdown, 'u', _l('Personal tab statistics'), False),
-        (statistics_cookie_corner_totals, 's', _l('Personal tab balance'), True),
+        (partial(statistics_cookie_corner_breakdown, cookie_corner=cookie_corner), 'u',
+         _l('Personal tab statistics'), False),
+        (partial(statistics_cookie_corner_totals, cookie_corner=cookie_corner), 's', _l('Personal tab balance'), True),
         (statistics_activities, 'a', _l('Activities'), True),
         (statistics_alexia_transactions, 'x', _l('Alexia transactions'), False),
         (statistics_contribution_transactions, 'c', _l('Contribution transactions'), True),
@@ -289,7 +306,7 @@ def get_functions():
         (statistics_discount_credits, 'g', _l('Discount balances'), True),
         (statistics_other_transactions, 'o', _l('Custom transactions'), True),
         (statistics_totals, 't', _l('Totals'), True),
-    ] + statistics_functions_ledgers()
+    ] + statistics_functions_ledgers(cookie_corner)
 
 
 TOTAL_FUNCTIONS = {'s': statistics_cookie_corner_total,
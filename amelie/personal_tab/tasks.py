@@ -0,0 +1,36 @@
+import datetime
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from amelie.personal_tab.models import BalanceCheckpoint
+from amelie.personal_tab.wrapped import generate_wrapped_profiles
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="default.create_balance_checkpoint")
+def create_balance_checkpoint():
+    """
+    Create a balance checkpoint at the start of today (in the current timezone), if it does not exist yet.
+    """
+    date = timezone.make_aware(datetime.datetime.combine(timezone.localdate(), datetime.time()))
+    checkpoint = BalanceCheckpoint.objects.create_checkpoint(date)
+
+    if checkpoint is None:
+        logger.info(f"Balance checkpoint at {date} already exists.")
+    else:
+        logger.info(f"Balance checkpoint at {date} created with {checkpoint.entries.count()} entries.")
+
+
+@shared_task(name="default.generate_cookie_corner_wrapped")
+def generate_cookie_corner_wrapped(year=None):
+    """
+    Generate the Cookie Corner Wrapped profiles of all persons for a year, by default the configured wrapped year.
+    """
+    year = year or settings.COOKIE_CORNER_WRAPPED_YEAR
+    count = generate_wrapped_profiles(year)
+    logger.info(f"Generated {count} Cookie Corner Wrapped profiles of {year}.")
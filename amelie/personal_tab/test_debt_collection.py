@@ -0,0 +1,78 @@
+import datetime
+from decimal import Decimal
+
+from django.utils import timezone
+
+from amelie.members.models import Person
+from amelie.personal_tab.debt_collection import InstructionsChangedError, generate_cookie_corner_instructions, \
+    save_cookie_corner_instructions
+from amelie.personal_tab.models import Authorization, AuthorizationType, BalanceCheckpoint, CustomTransaction, \
+    DebtCollectionAssignment, DebtCollectionBatch, DebtCollectionInstruction
+from amelie.tools.tests import TestCase
+
+
+class CookieCornerInstructionsTest(TestCase):
+    def setUp(self):
+        super(CookieCornerInstructionsTest, self).setUp()
+        self.authorization_type = AuthorizationType.objects.create(name_nl='Consumpties', text_nl='Consumpties',
+                                                                   active=True, consumptions=True)
+        self.today = timezone.make_aware(datetime.datetime.combine(timezone.localdate(), datetime.time()))
+
+    def _person(self, first_name, *prices, authorized=True):
+        person = Person.objects.create(first_name=first_name, last_name='Person', gender=Person.GenderTypes.UNKNOWN)
+        if authorized:
+            Authorization.objects.create(authorization_type=self.authorization_type, person=person,
+                                         iban='NL91ABNA0417164300', bic='ABNANL2A', account_holder_name=first_name,
+                                         start_date=datetime.date(2020, 1, 1), is_signed=True)
+        for days_ago, price in enumerate(prices, start=2):
+            CustomTransaction.objects.create(person=person, price=Decimal(price),
+                                             date=self.today - datetime.timedelta(days=days_ago))
+        return person
+
+    def test_generate_and_save(self):
+        first = self._person('First', '10.00', '2.50')
+        second = self._person('Second', '4.00')
+        unauthorized = self._person('Third', '3.00', authorized=False)
+        negative = self._person('Fourth', '-1.00')
+
+        results = generate_cookie_corner_instructions(self.today)
+        self.assertEqual([row['person'] for row in results['frst']], [first, second])
+        self.assertEqual([row['person'] for row in results['no_authorization']], [unauthorized])
+        self.assertEqual([row['person'] for row in results['negative']], [negative])
+        self.assertEqual(results['frst'][0]['sum'], Decimal('12.50'))
+
+        BalanceCheckpoint.objects.create_checkpoint(self.today - datetime.timedelta(days=1))
+        assignment = DebtCollectionAssignment.objects.create(description='Test')
+        batch = DebtCollectionBatch.objects.create(assignment=assignment, execution_date=timezone.localdate(),
+                                                   sequence_type=DebtCollectionBatch.SequenceTypes.FRST,
+                                                   status=DebtCollectionBatch.StatusChoices.NEW)
+        save_cookie_corner_instructions(results['frst'], batch)
+
+        instruction = DebtCollectionInstruction.objects.get(authorization__person=first)
+        self.assertEqual(instruction.end_to_end_id, instruction.debt_collection_reference())
+        self.assertEqual(instruction.amount, Decimal('12.50'))
+        self.assertEqual(first.transaction_set.filter(debt_collection=instruction).count(), 3)
+        self.assertFalse(second.transaction_set.filter(debt_collection=None).exists())
+        self.assertTrue(unauthorized.transaction_set.filter(debt_collection=None).exists())
+
+        # Linking the transactions to the instructions does not change the balances
+        self.assertTrue(BalanceCheckpoint.objects.exists())
+
+        # Everything before the collection is collected now, and the next run does not collect it again
+        after = timezone.now() + datetime.timedelta(days=1)
+        results = generate_cookie_corner_instructions(after)
+        self.assertEqual(results['frst'] + results['rcur'] + results['ongoing_frst'], [])
+
+    def test_changed_before_save(self):
+        first = self._person('First', '10.00')
+        results = generate_cookie_corner_instructions(self.today)
+
+        # A transaction that is added after generating the instructions is not collected by them
+        CustomTransaction.objects.create(person=first, price=Decimal('1.00'),
+                                         date=self.today - datetime.timedelta(days=3))
+        assignment = DebtCollectionAssignment.objects.create(description='Test')
+        batch = DebtCollectionBatch.objects.create(assignment=assignment, execution_date=timezone.localdate(),
+                                                   sequence_type=DebtCollectionBatch.SequenceTypes.FRST,
+                                                   status=DebtCollectionBatch.StatusChoices.NEW)
+        with self.assertRaises(InstructionsChangedError):
+            save_cookie_corner_instructions(results['frst'], batch)
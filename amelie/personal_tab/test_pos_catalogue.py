@@ -0,0 +1,66 @@
+from decimal import Decimal
+
+from amelie.members.models import Person
+from amelie.personal_tab.models import Article, Category, CookieCornerTransaction, LedgerAccount
+from amelie.personal_tab import pos_catalogue
+from amelie.personal_tab.pos_catalogue import favourite_articles, get_catalogue
+from amelie.tools.tests import TestCase
+
+
+class PosCatalogueTest(TestCase):
+    def setUp(self):
+        super(PosCatalogueTest, self).setUp()
+        self.person = Person.objects.create(first_name='Test', last_name='Person', gender=Person.GenderTypes.UNKNOWN)
+        self.category = Category.objects.create(name_nl='Snoep', name_en='Candy', is_available=True)
+        ledger_account = LedgerAccount.objects.create(name='food')
+        self.cookie = Article.objects.create(name_nl='Koek', name_en='Cookie', price=Decimal('0.50'),
+                                             image='cookie_corner/test.png', category=self.category,
+                                             ledger_account=ledger_account, is_available=True)
+        self.candy = Article.objects.create(name_nl='Snoep', name_en='Candy', price=Decimal('0.80'),
+                                            image='cookie_corner/test.png', category=self.category,
+                                            ledger_account=ledger_account, is_available=True)
+
+    def _sale(self, article, amount):
+        CookieCornerTransaction.objects.create(person=self.person, article=article, amount=amount,
+                                               price=amount * article.price)
+
+    def test_catalogue(self):
+        category = [c for c in get_catalogue().categories if c.pk == self.category.pk][0]
+        self.assertEqual(category.pos_articles, [self.cookie, self.candy])
+
+        # The snapshot is kept as long as nothing changes
+        self.assertIs(get_catalogue(), get_catalogue())
+
+        # Saving an article replaces the snapshot
+        self.candy.is_available = False
+        self.candy.save()
+        category = [c for c in get_catalogue().categories if c.pk == self.category.pk][0]
+        self.assertEqual(category.pos_articles, [self.cookie])
+
+        # As does deleting one
+        self.cookie.delete()
+        category = [c for c in get_catalogue().categories if c.pk == self.category.pk][0]
+        self.assertEqual(category.pos_articles, [])
+
+    def test_favourites(self):
+        self._sale(self.cookie, 2)
+        self.assertEqual([(f['id'], f['amount']) for f in favourite_articles(self.person)], [(self.cookie.pk, 2)])
+
+        self._sale(self.candy, 3)
+        self._sale(self.cookie, 2)
+        favourites = favourite_articles(self.person)
+        self.assertEqual([(f['id'], f['amount']) for f in favourites], [(self.cookie.pk, 4), (self.candy.pk, 3)])
+
+    def test_favourites_of_available_articles(self):
+        count = pos_catalogue.FAVOURITES_TRANSACTION_COUNT
+        pos_catalogue.FAVOURITES_TRANSACTION_COUNT = 2
+        self.addCleanup(setattr, pos_catalogue, 'FAVOURITES_TRANSACTION_COUNT', count)
+
+        self._sale(self.candy, 3)
+        self._sale(self.cookie, 1)
+        self._sale(self.cookie, 1)
+
+        # Purchases of articles that are not available anymore do not push the others out of the recent purchases
+        self.cookie.is_available = False
+        self.cookie.save()
+        self.assertEqual([(f['id'], f['amount']) for f in favourite_articles(self.person)], [(self.candy.pk, 3)])
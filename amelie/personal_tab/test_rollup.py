@@ -0,0 +1,110 @@
+import datetime
+from decimal import Decimal
+
+from django.utils import timezone
+
+from amelie.members.models import Person
+from amelie.personal_tab.models import Article, Category, CookieCornerTransaction, CustomTransaction, \
+    DailyTransactionTotal, Discount, DiscountPeriod, LedgerAccount, BalanceCheckpoint
+from amelie.tools.tests import TestCase
+
+
+class DailyTransactionTotalTest(TestCase):
+    def setUp(self):
+        super(DailyTransactionTotalTest, self).setUp()
+        self.person = Person.objects.create(first_name='Test', last_name='Person', gender=Person.GenderTypes.UNKNOWN)
+        self.article = Article.objects.create(
+            name_nl='Koek', name_en='Cookie', price=Decimal('0.50'), image='cookie_corner/test.png',
+            category=Category.objects.create(name_nl='Snoep', name_en='Candy'),
+            ledger_account=LedgerAccount.objects.create(name='food'),
+        )
+
+        # Noon, three days ago
+        self.day = timezone.localdate() - datetime.timedelta(days=3)
+        self.date = timezone.make_aware(datetime.datetime.combine(self.day, datetime.time(12)))
+
+    def _sale(self, amount, date=None):
+        return CookieCornerTransaction.objects.create(person=self.person, article=self.article, amount=amount,
+                                                      price=amount * self.article.price, date=date or self.date)
+
+    def test_signals(self):
+        transaction = self._sale(2)
+        self._sale(1)
+        CustomTransaction.objects.create(person=self.person, price=Decimal('10.00'), date=self.date)
+
+        row = DailyTransactionTotal.objects.get(transaction_type='cookiecornertransaction')
+        self.assertEqual((row.day, row.article, row.count, row.amount, row.price), (self.day, self.article, 2, 3,
+                                                                                   Decimal('1.50')))
+        self.assertTrue(DailyTransactionTotal.objects.filter(transaction_type='customtransaction').exists())
+
+        # Moving a transaction to another day updates both days
+        transaction.date = self.date - datetime.timedelta(days=1)
+        transaction.save()
+        self.assertEqual(DailyTransactionTotal.objects.get(
+            transaction_type='cookiecornertransaction', day=self.day).amount, 1)
+        self.assertEqual(DailyTransactionTotal.objects.get(
+            transaction_type='cookiecornertransaction', day=self.day - datetime.timedelta(days=1)).amount, 2)
+
+        transaction.delete()
+        self.assertFalse(DailyTransactionTotal.objects.filter(day=self.day - datetime.timedelta(days=1)).exists())
+
+    def test_discount(self):
+        period = DiscountPeriod.objects.create(begin=self.date - datetime.timedelta(days=1), description_nl='Korting')
+        discount = Discount.objects.create(amount=Decimal('0.20'), discount_period=period)
+        CookieCornerTransaction.objects.create(person=self.person, article=self.article, amount=1,
+                                               price=Decimal('0.30'), date=self.date, discount=discount)
+        self.assertEqual(DailyTransactionTotal.objects.get().discount, Decimal('0.20'))
+
+        # Deleting the discount sets the discount of the transaction to NULL without signals on the transaction
+        discount.delete()
+        row = DailyTransactionTotal.objects.get()
+        self.assertIsNone(row.discount)
+        self.assertIsNone(row.discount_period)
+
+    def test_totals(self):
+        self._sale(2)
+        self._sale(1, date=timezone.now())
+
+        start = self.date - datetime.timedelta(days=1)
+        end = timezone.now() + datetime.timedelta(hours=1)
+        totals = DailyTransactionTotal.objects.totals(start, end, group_by=('article',),
+                                                      transaction_type='cookiecornertransaction')
+        self.assertEqual(totals[(self.article.pk,)]['amount'], 3)
+        self.assertEqual(totals[(self.article.pk,)]['price'], Decimal('1.50'))
+        self.assertIsNone(totals[(self.article.pk,)]['discount'])
+
+        # The closed days are read from the rollup, so changing the raw table without signals is not visible
+        CookieCornerTransaction.objects.filter(date=self.date).update(amount=5)
+        totals = DailyTransactionTotal.objects.totals(start, end, transaction_type='cookiecornertransaction')
+        self.assertEqual(totals[()]['amount'], 3)
+
+        DailyTransactionTotal.objects.rebuild()
+        totals = DailyTransactionTotal.objects.totals(start, end, transaction_type='cookiecornertransaction')
+        self.assertEqual(totals[()]['amount'], 6)
+
+
+class BalanceCheckpointTest(TestCase):
+    def setUp(self):
+        super(BalanceCheckpointTest, self).setUp()
+        self.person = Person.objects.create(first_name='Test', last_name='Person', gender=Person.GenderTypes.UNKNOWN)
+        self.today = timezone.make_aware(datetime.datetime.combine(timezone.localdate(), datetime.time()))
+
+    def _transaction(self, price, days_ago):
+        return CustomTransaction.objects.create(person=self.person, price=Decimal(price),
+                                                date=self.today - datetime.timedelta(days=days_ago))
+
+    def test_balances(self):
+        self._transaction('10.00', 10)
+        self._transaction('2.50', 5)
+        checkpoint = BalanceCheckpoint.objects.create_checkpoint(self.today - datetime.timedelta(days=3))
+        self.assertEqual(checkpoint.entries.get().balance, Decimal('12.50'))
+
+        # Balance is the checkpoint plus the transactions since
+        self._transaction('1.00', 1)
+        now = timezone.now()
+        self.assertEqual(BalanceCheckpoint.objects.balances(now), {self.person.pk: Decimal('13.50')})
+
+        # A back-dated transaction removes the checkpoint
+        self._transaction('5.00', 7)
+        self.assertFalse(BalanceCheckpoint.objects.exists())
+        self.assertEqual(BalanceCheckpoint.objects.balances(now), {self.person.pk: Decimal('18.50')})
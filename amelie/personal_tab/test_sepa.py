@@ -0,0 +1,72 @@
+import datetime
+from decimal import Decimal
+from xml.etree import ElementTree
+
+from amelie.personal_tab.models import Amendment, Authorization, AuthorizationType, DebtCollectionAssignment, \
+    DebtCollectionBatch, DebtCollectionInstruction
+from amelie.personal_tab.sepa import PAIN008_NAMESPACE, write_pain008
+from amelie.tools.tests import TestCase
+
+NS = {'p': PAIN008_NAMESPACE}
+
+
+class Pain008WriterTest(TestCase):
+    def setUp(self):
+        super(Pain008WriterTest, self).setUp()
+        authorization_type = AuthorizationType.objects.create(name_nl='Consumpties', text_nl='Consumpties',
+                                                              consumptions=True)
+        self.authorization = Authorization.objects.create(
+            authorization_type=authorization_type, iban='NL91ABNA0417164300', bic='ABNANL2A',
+            account_holder_name='Test & Person', start_date=datetime.date(2020, 1, 1), is_signed=True
+        )
+        self.assignment = DebtCollectionAssignment.objects.create(description='Test')
+        self.frst = self._batch(DebtCollectionBatch.SequenceTypes.FRST, datetime.date(2026, 1, 10))
+        self.rcur = self._batch(DebtCollectionBatch.SequenceTypes.RCUR, datetime.date(2026, 1, 5))
+
+    def _batch(self, sequence_type, execution_date):
+        return DebtCollectionBatch.objects.create(assignment=self.assignment, execution_date=execution_date,
+                                                  sequence_type=sequence_type,
+                                                  status=DebtCollectionBatch.StatusChoices.NEW)
+
+    def _instructions(self, batch, count, amount):
+        DebtCollectionInstruction.objects.bulk_create([
+            DebtCollectionInstruction(batch=batch, authorization=self.authorization, end_to_end_id='E2E{}'.format(i),
+                                      description='Test', amount=Decimal(amount))
+            for i in range(count)
+        ])
+
+    def _export(self):
+        return ElementTree.fromstring(b''.join(write_pain008(self.assignment)))
+
+    def test_totals(self):
+        self._instructions(self.frst, 3, '2.50')
+        self._instructions(self.rcur, 2, '10.00')
+        document = self._export()
+
+        self.assertEqual(document.find('p:CstmrDrctDbtInitn/p:GrpHdr/p:NbOfTxs', NS).text, '5')
+        self.assertEqual(document.find('p:CstmrDrctDbtInitn/p:GrpHdr/p:CtrlSum', NS).text, '27.50')
+
+        batches = document.findall('p:CstmrDrctDbtInitn/p:PmtInf', NS)
+        self.assertEqual([batch.find('p:PmtTpInf/p:SeqTp', NS).text for batch in batches], ['RCUR', 'FRST'])
+        self.assertEqual([len(batch.findall('p:DrctDbtTxInf', NS)) for batch in batches], [2, 3])
+        self.assertEqual(batches[0].find('p:CtrlSum', NS).text, '20.00')
+        self.assertEqual(batches[1].find('p:DrctDbtTxInf/p:Dbtr/p:Nm', NS).text, 'Test & Person')
+
+    def test_amendment(self):
+        amendment = Amendment.objects.create(authorization=self.authorization, date=datetime.date(2025, 12, 1),
+                                             previous_iban='NL20INGB0001234567', other_bank=True, reason='Test')
+        DebtCollectionInstruction.objects.create(batch=self.frst, authorization=self.authorization,
+                                                 end_to_end_id='E2E', description='Test', amount=Decimal('1.00'),
+                                                 amendment=amendment)
+        details = self._export().find('.//p:AmdmntInfDtls', NS)
+
+        self.assertEqual(details.find('p:OrgnlDbtrAcct/p:Id/p:IBAN', NS).text, 'NL20INGB0001234567')
+        self.assertIsNone(details.find('p:OrgnlDbtrAgt', NS))
+
+    def test_query_count(self):
+        self._instructions(self.frst, 20, '1.00')
+        self._instructions(self.rcur, 20, '1.00')
+
+        # Totals, batches and instructions
+        with self.assertNumQueries(3):
+            self._export()
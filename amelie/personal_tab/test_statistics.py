@@ -0,0 +1,150 @@
+import datetime
+from decimal import Decimal
+
+from django.utils import timezone
+
+from amelie.members.models import Person
+from amelie.personal_tab.models import Article, Category, CookieCornerTransaction, CookieCornerWrapped, Discount, \
+    DiscountPeriod, LedgerAccount
+from amelie.personal_tab.statistics import CookieCornerStatistics, statistics_cookie_corner_breakdown, \
+    statistics_cookie_corner_ledger_breakdown, statistics_cookie_corner_totals, statistics_cookie_corner_total
+from amelie.personal_tab.views import _cookie_corner_wrapped_profile, _cookie_corner_wrapped_years
+from amelie.personal_tab.wrapped import generate_wrapped_profiles, wrapped_context
+from amelie.tools.tests import TestCase
+
+
+class CookieCornerStatisticsTest(TestCase):
+    def setUp(self):
+        super(CookieCornerStatisticsTest, self).setUp()
+        self.now = timezone.now()
+        self.person = Person.objects.create(first_name='Test', last_name='Person', gender=Person.GenderTypes.UNKNOWN)
+
+        self.ledger_food = LedgerAccount.objects.create(name='food')
+        self.ledger_drinks = LedgerAccount.objects.create(name='drinks')
+        self.category_candy = Category.objects.create(name_nl='Snoep', name_en='Candy', order=1)
+        self.category_soda = Category.objects.create(name_nl='Fris', name_en='Soda', order=2)
+
+        self.cookie = self._article('Koek', self.category_candy, self.ledger_food, '0.50')
+        self.bar = self._article('Reep', self.category_candy, self.ledger_food, '0.70')
+        self.cola = self._article('Cola', self.category_soda, self.ledger_drinks, '0.60')
+
+        period = DiscountPeriod.objects.create(begin=self.now - datetime.timedelta(days=1),
+                                               description_nl='Tentamenkoek')
+
+        self._sale(self.cookie, 2, '0.60', Discount.objects.create(amount='0.40', discount_period=period))
+        self._sale(self.cookie, 1, '0.50')
+        self._sale(self.bar, 1, '0.70')
+        self._sale(self.cola, 3, '1.80')
+
+        self.start = self.now - datetime.timedelta(hours=1)
+        self.end = self.now + datetime.timedelta(hours=1)
+
+    def _article(self, name, category, ledger, price):
+        return Article.objects.create(name_nl=name, name_en=name, category=category, ledger_account=ledger,
+                                      price=Decimal(price), image='cookie_corner/test.png')
+
+    def _sale(self, article, amount, price, discount=None):
+        CookieCornerTransaction.objects.create(person=self.person, article=article, amount=amount,
+                                               price=Decimal(price), discount=discount, date=self.now)
+
+    def test_breakdown(self):
+        rows = statistics_cookie_corner_breakdown(self.start, self.end)['rows']
+
+        self.assertEqual([row['category'] for row in rows], [self.category_candy, self.category_soda])
+        self.assertEqual(rows[0]['count'], 4)
+        self.assertEqual(rows[0]['discount'], Decimal('0.40'))
+        self.assertEqual(rows[0]['sum'], Decimal('1.80'))
+        self.assertEqual(rows[0]['total'], Decimal('2.20'))
+        self.assertEqual([row['article'] for row in rows[0]['articles']], [self.cookie, self.bar])
+        self.assertEqual(rows[0]['articles'][0]['total'], Decimal('1.50'))
+        self.assertIsNone(rows[0]['articles'][1]['discount'])
+        self.assertEqual(rows[1]['discount'], 0)
+
+    def test_totals(self):
+        table = statistics_cookie_corner_totals(self.start, self.end)
+
+        self.assertEqual(table['rows'], [
+            [self.ledger_drinks, 3, 0, Decimal('1.80'), Decimal('1.80')],
+            [self.ledger_food, 4, Decimal('0.40'), Decimal('1.80'), Decimal('2.20')],
+        ])
+        self.assertEqual(table['sum'], Decimal('4.00'))
+        self.assertEqual(statistics_cookie_corner_total(self.start, self.end), Decimal('4.00'))
+
+    def test_ledger_breakdown(self):
+        table = statistics_cookie_corner_ledger_breakdown(self.ledger_drinks)(self.start, self.end)
+
+        self.assertEqual([row['article'] for row in table['rows']], [self.cola])
+        self.assertEqual(table['total'], {'count': 3, 'discount': None, 'sum': Decimal('1.80'),
+                                          'total': Decimal('1.80')})
+
+    def test_query_count(self):
+        """The number of queries should not depend on the number of categories, articles or ledgers."""
+        cookie_corner = CookieCornerStatistics(self.start, self.end)
+
+        with self.assertNumQueries(2):
+            statistics_cookie_corner_breakdown(self.start, self.end, cookie_corner=cookie_corner)
+            statistics_cookie_corner_totals(self.start, self.end, cookie_corner=cookie_corner)
+            statistics_cookie_corner_ledger_breakdown(self.ledger_food, cookie_corner)(self.start, self.end)
+            statistics_cookie_corner_total(self.start, self.end, cookie_corner=cookie_corner)
+
+
+    def test_wrapped(self):
+        year = timezone.localtime(self.now).year
+        other = Person.objects.create(first_name='Other', last_name='Person', gender=Person.GenderTypes.UNKNOWN)
+        CookieCornerTransaction.objects.create(person=other, article=self.cola, amount=5, price=Decimal('3.00'),
+                                               date=self.now)
+
+        # A profile for both persons and a global profile
+        self.assertEqual(generate_wrapped_profiles(year), 3)
+
+        context = wrapped_context(CookieCornerWrapped.objects.get(year=year, person=self.person))
+        products = {article: data for article, data in context['top_5_products']}
+        self.assertEqual(products[self.cookie], {'count': 3, 'ranking': None})
+        # The other person bought more cola
+        self.assertEqual(products[self.cola], {'count': 3, 'ranking': 50.0})
+        self.assertEqual(context['most_transactions']['day']['c'], 4)
+        self.assertEqual(context['total']['price'], Decimal('3.60'))
+
+        context = wrapped_context(CookieCornerWrapped.objects.get(year=year, person=None))
+        self.assertEqual(context['top_5_products'][0], (self.cola, {'count': 8, 'ranking': None}))
+        self.assertEqual(context['total']['price'], Decimal('6.60'))
+
+    def test_wrapped_years(self):
+        year = timezone.localtime(self.now).year
+        other = Person.objects.create(first_name='Other', last_name='Person', gender=Person.GenderTypes.UNKNOWN)
+
+        # The years come from the transactions, not from the generated profiles
+        self.assertFalse(CookieCornerWrapped.objects.exists())
+        self.assertEqual(_cookie_corner_wrapped_years(self.person, None), [year])
+        self.assertEqual(_cookie_corner_wrapped_years(self.person, year), [])
+        self.assertEqual(_cookie_corner_wrapped_years(other, None), [])
+        self.assertEqual(_cookie_corner_wrapped_years(None, None), [year])
+
+    def test_wrapped_profile_generated(self):
+        year = timezone.localtime(self.now).year
+        other = Person.objects.create(first_name='Other', last_name='Person', gender=Person.GenderTypes.UNKNOWN)
+        CookieCornerTransaction.objects.create(person=other, article=self.cola, amount=5, price=Decimal('3.00'),
+                                               date=self.now)
+
+        # A missing profile is generated on its own, and is the same as when all profiles are generated at once
+        profile = _cookie_corner_wrapped_profile(year, self.person)
+        self.assertEqual(profile.person, self.person)
+        self.assertEqual(CookieCornerWrapped.objects.count(), 1)
+        self.assertEqual(_cookie_corner_wrapped_profile(year, None).person, None)
+        self.assertEqual(CookieCornerWrapped.objects.count(), 2)
+
+        data = {profile.person_id: profile.data for profile in CookieCornerWrapped.objects.all()}
+        generate_wrapped_profiles(year)
+        self.assertEqual(data, {profile.person_id: profile.data for profile in
+                                CookieCornerWrapped.objects.exclude(person=other)})
+        self.assertIsNone(_cookie_corner_wrapped_profile(year - 1, self.person))
+
+    def test_wrapped_profiles_removed(self):
+        year = timezone.localtime(self.now).year
+        generate_wrapped_profiles(year)
+
+        # A changed transaction of the year changes the profiles, they are generated again when they are viewed
+        self._sale(self.bar, 1, '0.70')
+        self.assertFalse(CookieCornerWrapped.objects.exists())
+        context = wrapped_context(_cookie_corner_wrapped_profile(year, self.person))
+        self.assertEqual(context['total']['price'], Decimal('4.30'))
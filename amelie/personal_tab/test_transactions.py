@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+from django.utils import timezone
+
+from amelie.members.models import Person
+from amelie.personal_tab.models import Article, Category, CookieCornerTransaction, DailyTransactionTotal, \
+    DiscountCredit, DiscountPeriod, LedgerAccount
+from amelie.personal_tab.transactions import cookie_corner_checkout, cookie_corner_sale
+from amelie.tools.tests import TestCase
+
+
+class CookieCornerCheckoutTest(TestCase):
+    def setUp(self):
+        super(CookieCornerCheckoutTest, self).setUp()
+        self.person = Person.objects.create(first_name='Test', last_name='Person', gender=Person.GenderTypes.UNKNOWN)
+        category = Category.objects.create(name_nl='Snoep', name_en='Candy')
+        ledger_account = LedgerAccount.objects.create(name='food')
+        self.cookie = Article.objects.create(name_nl='Koek', name_en='Cookie', price=Decimal('0.50'),
+                                             image='cookie_corner/test.png', category=category,
+                                             ledger_account=ledger_account)
+        self.candy = Article.objects.create(name_nl='Snoep', name_en='Candy', price=Decimal('0.80'),
+                                            image='cookie_corner/test.png', category=category,
+                                            ledger_account=ledger_account)
+
+        self.exam_period = DiscountPeriod.objects.create(begin=timezone.now(), description_nl='Tentamenkoek')
+        self.exam_period.articles.add(self.cookie)
+        self.free_period = DiscountPeriod.objects.create(begin=timezone.now(), description_nl='Gratis koek')
+        self.free_period.articles.add(self.cookie)
+
+    def _sales(self):
+        return list(CookieCornerTransaction.objects.filter(person=self.person).order_by('pk').values_list(
+            'article', 'amount', 'price', 'discount__amount'))
+
+    def test_checkout(self):
+        with self.settings(COOKIE_CORNER_EXAM_COOKIE_DISCOUNT_PERIOD_ID=self.exam_period.pk,
+                           COOKIE_CORNER_FREE_COOKIE_DISCOUNT_PERIOD_ID=self.free_period.pk):
+            cart = [(self.cookie, 3), (self.candy, 1), (self.cookie, 2)]
+
+            # Reference: one sale per line
+            DiscountCredit.objects.create(discount_period=self.exam_period, price=Decimal('2.00'), person=self.person)
+            for article, amount in cart:
+                cookie_corner_sale(article=article, amount=amount, person=self.person, added_by=self.person)
+            expected = self._sales()
+            expected_credit = sorted(DiscountCredit.objects.values_list('price', flat=True))
+            CookieCornerTransaction.objects.all().delete()
+            DiscountCredit.objects.all().delete()
+
+            DiscountCredit.objects.create(discount_period=self.exam_period, price=Decimal('2.00'), person=self.person)
+            transactions, free_cookie_winner = cookie_corner_checkout(cart=cart, person=self.person,
+                                                                      added_by=self.person)
+
+        self.assertFalse(free_cookie_winner)
+        self.assertEqual(len(transactions), 3)
+        self.assertEqual(self._sales(), expected)
+        self.assertEqual(sorted(DiscountCredit.objects.values_list('price', flat=True)), expected_credit)
+
+        # The rollup is updated although the signals were deferred
+        row = DailyTransactionTotal.objects.get(person=self.person, article=self.cookie)
+        self.assertEqual((row.count, row.amount), (2, 5))
+
+    def test_negative_amount(self):
+        with self.assertRaises(ValueError):
+            cookie_corner_checkout(cart=[(self.cookie, -1)], person=self.person, added_by=self.person)
+        self.assertFalse(CookieCornerTransaction.objects.exists())
@@ -2,13 +2,14 @@ import datetime
 import random
 
 from django.conf import settings
-from django.db.models import Sum, Q
+from django.db import connection as db_connection, transaction as db_transaction
+from django.db.models import Count, Sum, Q
 from django.utils import timezone, translation
 from django.utils.translation import gettext as _
 
-from amelie.members.models import Study, Student
+from amelie.members.models import Student
 from amelie.personal_tab.models import ActivityTransaction, DiscountPeriod, DiscountCredit, CookieCornerTransaction, \
-    Discount
+    Discount, deferred_transaction_updates, schedule_transaction_updates
 from amelie.tools.logic import current_academic_year_strict
 
 
@@ -149,37 +150,39 @@ def free_cookie_discount():
     return DiscountPeriod.objects.get(id=settings.COOKIE_CORNER_FREE_COOKIE_DISCOUNT_PERIOD_ID)
 
 
-def free_cookie_is_winner(person):
+def free_cookie_is_winner(person, discount_period=None):
     """Determine if the given person is a winner based on the configured chances."""
     now = timezone.now()
-    discount_period = free_cookie_discount()
+    discount_period = discount_period or free_cookie_discount()
 
     if now < discount_period.begin or (discount_period.end and now > discount_period.end):
         # Discount period is not running at this moment.
         return False
 
-    main_studies = Study.objects.filter(primary_study=True)
-    bsc_main_studies = main_studies.filter(type='BSc')
-    msc_main_studies = main_studies.filter(type='MSc')
-    date = datetime.date(current_academic_year_strict() - 2, 9, 1)
-
-    primary_study_member = Student.objects.filter(person=person, studyperiod__study__in=main_studies).exists()
-
-    if not primary_study_member:
+    # Draw first, someone who would not win with the highest chance does not need their studies looked up.
+    draw = random.random()
+    if draw > max(settings.COOKIE_CORNER_FREE_COOKIE_DISCOUNT_RATE_HIGH,
+                  settings.COOKIE_CORNER_FREE_COOKIE_DISCOUNT_RATE_LOW):
+        # Did not win
         return False
 
-    older_years = Student.objects.filter(
-        Q(studyperiod__study__in=bsc_main_studies, studyperiod__begin__lte=date) | Q(
-            studyperiod__study__in=msc_main_studies
-        ), person=person
-    ).exists()
+    date = datetime.date(current_academic_year_strict() - 2, 9, 1)
+    studies = Student.objects.filter(person=person, studyperiod__study__primary_study=True).aggregate(
+        primary_study_periods=Count('studyperiod'),
+        older_year_periods=Count('studyperiod', filter=Q(
+            studyperiod__study__type='BSc', studyperiod__begin__lte=date
+        ) | Q(studyperiod__study__type='MSc')),
+    )
+
+    if not studies['primary_study_periods']:
+        return False
 
-    if older_years:
+    if studies['older_year_periods']:
         chance = settings.COOKIE_CORNER_FREE_COOKIE_DISCOUNT_RATE_HIGH
     else:
         chance = settings.COOKIE_CORNER_FREE_COOKIE_DISCOUNT_RATE_LOW
 
-    if random.random() > chance:
+    if draw > chance:
         # Did not win
         return False
 
@@ -229,3 +232,93 @@ def free_cookies_sale(article, amount, person, added_by):
                                           discount=discount, article=article, amount=amount, added_by=added_by)
     transaction.save()
     return transaction
+
+
+def cookie_corner_checkout(cart, person, added_by):
+    """
+    Register the sale of a complete shopping cart in the cookie corner.
+
+    The result is the same as calling cookie_corner_sale for every line of the cart, with free_cookies_sale for the
+    first line that qualifies if the person wins a free cookie. The discount periods and the exam cookie credit are
+    however read only once, and the discounts are divided over the lines in memory.
+
+    Returns the list of created transactions, in the order of the cart, and whether a free cookie was won.
+
+    :param cart: List of (article, amount) tuples. The articles should have their category loaded.
+    :type person: Person
+    :type added_by: Person
+    """
+    if any(amount < 0 for article, amount in cart):
+        raise ValueError("Someone is trying to get money by buying a negative number of products!")
+
+    periods = DiscountPeriod.objects.in_bulk([settings.COOKIE_CORNER_EXAM_COOKIE_DISCOUNT_PERIOD_ID,
+                                              settings.COOKIE_CORNER_FREE_COOKIE_DISCOUNT_PERIOD_ID])
+    try:
+        exam_period = periods[settings.COOKIE_CORNER_EXAM_COOKIE_DISCOUNT_PERIOD_ID]
+        free_period = periods[settings.COOKIE_CORNER_FREE_COOKIE_DISCOUNT_PERIOD_ID]
+    except KeyError:
+        raise DiscountPeriod.DoesNotExist("Cookie corner discount period does not exist.")
+
+    period_articles = {exam_period.pk: set(), free_period.pk: set()}
+    for period_id, article_id in DiscountPeriod.articles.through.objects.filter(
+            discountperiod__in=periods.values()).values_list('discountperiod_id', 'article_id'):
+        period_articles[period_id].add(article_id)
+
+    is_winner = free_cookie_is_winner(person, discount_period=free_period)
+    now = timezone.now()
+
+    with db_transaction.atomic(), deferred_transaction_updates():
+        cookie_credit = DiscountCredit.objects.select_for_update().filter(
+            person=person, discount_period=exam_period
+        ).aggregate(Sum('price'))['price__sum'] or 0
+
+        # Divide the discounts over the lines in the order of the cart, like consecutive sales would
+        lines = []
+        free_cookie_processed = False
+        for article, amount in cart:
+            with translation.override(person.preferred_language):
+                description = _(u"Sale {category}::{article}").format(category=article.category.name,
+                                                                      article=article.name)
+            total_price = amount * article.price
+            discount = None
+
+            if is_winner and not free_cookie_processed and article.pk in period_articles[free_period.pk]:
+                free_cookie_processed = True
+                discount = Discount(amount=article.price, date=now, discount_period=free_period)
+            elif cookie_credit > 0 and total_price > 0 and article.pk in period_articles[exam_period.pk]:
+                discount = Discount(amount=min(cookie_credit, total_price), date=now, discount_period=exam_period)
+                cookie_credit -= discount.amount
+
+            if discount:
+                total_price -= discount.amount
+            lines.append((article, amount, description, total_price, discount))
+
+        discounts = [discount for article, amount, description, total_price, discount in lines if discount]
+        if db_connection.features.can_return_rows_from_bulk_insert:
+            Discount.objects.bulk_create(discounts)
+        else:
+            # The discounts need their primary keys to be linked to, which bulk_create can not return on this backend
+            for discount in discounts:
+                discount.save()
+
+        # Register usage of exam cookie credit
+        DiscountCredit.objects.bulk_create([
+            DiscountCredit(discount_period=exam_period, date=now, price=-discount.amount, person=person,
+                           description=description, discount=discount, added_by=added_by)
+            for article, amount, description, total_price, discount in lines
+            if discount and discount.discount_period_id == exam_period.pk
+        ])
+
+        # Cookie corner transactions are saved one by one, because bulk_create does not support multi-table
+        # inheritance. Their rollup and checkpoint updates are applied once at the end of the block.
+        transactions = []
+        for article, amount, description, total_price, discount in lines:
+            transaction = CookieCornerTransaction(date=now, price=total_price, person=person, description=description,
+                                                  discount=discount, article=article, amount=amount, added_by=added_by)
+            transaction.save()
+            transactions.append(transaction)
+
+        # The bulk created credits did not send any signals
+        schedule_transaction_updates(date=now)
+
+    return transactions, is_winner and free_cookie_processed
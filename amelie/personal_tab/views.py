@@ -3,7 +3,6 @@ import datetime
 from datetime import timezone as tz
 import logging
 from decimal import Decimal
-import itertools
 import traceback
 import operator
 from functools import reduce
@@ -11,15 +10,15 @@ from functools import reduce
 import django.conf
 from django.conf import settings
 from django.contrib import messages
+from django.core.cache import cache
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.urls import reverse, reverse_lazy
 from django.utils.translation import get_language, gettext_lazy as _l
 from django.db import transaction
-from django.db.models import Sum, Q, Count, Subquery, OuterRef
-from django.db.models.functions import TruncDay
-from django.http import HttpResponseRedirect, HttpResponse, Http404, HttpResponseForbidden
+from django.db.models import Sum, Q, Subquery, OuterRef
+from django.http import HttpResponseRedirect, HttpResponse, Http404, HttpResponseForbidden, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.utils import formats, timezone
 from django.utils.decorators import method_decorator
@@ -42,15 +41,18 @@ from amelie.personal_tab.forms import CookieCornerTransactionForm, CustomTransac
     StatisticsForm, DeclarationForm, ArticleForm
 from amelie.personal_tab.debt_collection import delete_amendment, delete_reversal, edit_amendment, edit_reversal, generate_contribution_instructions, filter_contribution_instructions, \
     save_contribution_instructions, generate_cookie_corner_instructions, filter_cookie_corner_instructions, save_cookie_corner_instructions, \
-    process_reversal, process_amendment
+    process_reversal, process_amendment, InstructionsChangedError
 from amelie.personal_tab.models import Amendment, Category, Declaration, Transaction, CookieCornerTransaction, \
     ActivityTransaction, \
     CustomTransaction, AlexiaTransaction, RFIDCard, Authorization, DebtCollectionAssignment, DebtCollectionBatch, \
     DiscountCredit, \
-    DebtCollectionInstruction, ReversalTransaction, Article
-from amelie.personal_tab.statistics import get_functions, statistics_totals
+    DebtCollectionInstruction, ReversalTransaction, Article, DailyTransactionTotal, BalanceCheckpoint, \
+    CookieCornerWrapped
+from amelie.personal_tab.sepa import write_pain008
+from amelie.personal_tab.statistics import get_functions, statistics_totals, CookieCornerStatistics
 from amelie.personal_tab.transactions import exam_cookie_discount, \
     exam_cookie_credit as transactions_exam_cookie_credit, add_exam_cookie_credit
+from amelie.personal_tab.wrapped import generate_wrapped_profiles, wrapped_context
 from amelie.tools.decorators import require_lid, require_board, require_ajax
 from amelie.tools.forms import PeriodTimeForm, DateTimeForm, ExportForm
 from amelie.tools.logic import current_association_year
@@ -217,9 +219,20 @@ def generate_overview(request, person, date_from=None, date_to=None):
             # Table with latest 10 transactions
             latest_10_transactions = _trans.order_by('-added_on')[:10]
 
+        # Sum the transactions per day, type and article, read from the daily transaction rollup
+        type_names = [x._meta.model_name for x in transaction_types]
+        daily_totals = {
+            key: value for key, value in DailyTransactionTotal.objects.totals(
+                date_from, date_to, group_by=('day', 'transaction_type', 'article'), person=person).items()
+            if key[1] in type_names
+        }
+        article_kcal = dict(Article.objects.filter(pk__in={key[2] for key in daily_totals}).values_list('pk', 'kcal'))
+
+        def _kcal(key, value):
+            return (article_kcal.get(key[2]) or 0) * value['amount']
+
         # Generate table with data
         if overview_type != 'day':
-            data = set()
             rows = []
 
             if overview_type == 'total':
@@ -249,47 +262,37 @@ def generate_overview(request, person, date_from=None, date_to=None):
             else:
                 raise ValueError
 
-            for trans in itertools.chain.from_iterable(all_transactions):
-                data.add(_datetime_start(trans.date.astimezone(localtz)))
+            data = {}
+            for key, value in daily_totals.items():
+                date_data = data.setdefault(_datetime_start(key[0]), {'amounts': [0] * len(type_names), 'kcal_total': 0})
+                date_data['amounts'][type_names.index(key[1])] += value['price']
+                date_data['kcal_total'] += _kcal(key, value)
 
             for date in sorted(data):
-                amounts = [
-                    x.filter(date__gte=date, date__lt=_datetime_end(date)).aggregate(Sum('price'))['price__sum'] or 0
-                    for x in all_transactions]
+                amounts = data[date]['amounts']
 
                 # Add the total to the end
                 amounts.append(sum(amounts))
 
-                # TODO: BLEGH, custom SQL! - albertskja 2018-04-25
-                kcal_total = all_transactions[0].select_related('article').filter(
-                    date__gte=date,
-                    date__lt=_datetime_end(date)).extra(
-                        select={
-                            'kcal_total': "SUM(`personal_tab_article`.`kcal` * `personal_tab_cookiecornertransaction`.`amount`)"
-                        }).values('kcal_total', 'article__kcal')[0]['kcal_total'] or 0
-
                 start_url_d = max(_urlize(date), start_url) if start_url else _urlize(date)
                 end_url_d = min(_urlize(_datetime_end(date)), end_url) if end_url else _urlize(_datetime_end(date))
 
                 rows.append({
                     'date': date,
                     'amounts': amounts,
-                    'kcal_total': kcal_total,
+                    'kcal_total': data[date]['kcal_total'],
                     'start_url': start_url_d,
                     'end_url': end_url_d
                 })
 
         # Calculate totals
-        totals = [x.aggregate(Sum('price'))['price__sum'] or 0 for x in all_transactions]
+        totals = [sum(value['price'] for key, value in daily_totals.items() if key[1] == type_name)
+                  for type_name in type_names]
 
         # Add totals to the end
         totals.append(sum(totals))
 
-        # TODO: BLEGH, custom SQL! - albertskja 2018-04-25
-        kcal_totals = all_transactions[0].select_related('article').extra(
-            select={
-                'kcal_total': "SUM(`personal_tab_article`.`kcal` * `personal_tab_cookiecornertransaction`.`amount`)"
-            }).values('kcal_total', 'article__kcal')[0]['kcal_total'] or 0
+        kcal_totals = sum(_kcal(key, value) for key, value in daily_totals.items())
 
     # Form shite
     form = PeriodTimeForm(initial={'datetime_from': date_from, 'datetime_to': date_to})
@@ -1115,9 +1118,10 @@ def statistics(request, date_from, date_to, checkboxes):
 
     form = StatisticsForm(initial={'start_date': start, 'end_date': end, 'checkboxes': choices})
 
-    # Get statistics
+    # Get statistics, all cookie corner tables share a single aggregation of the cookie corner transactions
+    cookie_corner = CookieCornerStatistics(start, end)
     tables = {}
-    functions_dict = {x[1]: x[0] for x in functions}
+    functions_dict = {x[1]: x[0] for x in get_functions(cookie_corner)}
     for option in choices:
         if option != 't':
             table = functions_dict[option](start, end)
@@ -1125,7 +1129,7 @@ def statistics(request, date_from, date_to, checkboxes):
             tables[option] = table
 
     if 't' in choices:
-        tables['t'] = statistics_totals(start, end, tables)
+        tables['t'] = statistics_totals(start, end, tables, cookie_corner)
 
     return render(request, 'statistics/statistics.html', {
         'form': form, 'tables': tables, 'start': start, 'end': end,
@@ -1159,20 +1163,14 @@ def balance(request, dt_str=False):
 
     dt_url = _urlize(dt)
 
-    # Date the SEPA debt collection went into effect: 2013-10-31 00:00 CET
-    begin = datetime.datetime(2013, 10, 30, 23, 00, 00, tzinfo=tz.utc)
-
-    all_transactions = Transaction.objects.filter(date__gte=begin, date__lt=dt)
-    all_transactions_aggregated = all_transactions.aggregate(Sum('price'))
-    all_transactions_sum = all_transactions_aggregated['price__sum']
+    # Balances since the date the SEPA debt collection went into effect, from the nearest checkpoint
+    transaction_sum_per_person_dict = BalanceCheckpoint.objects.balances(dt)
+    all_transactions_sum = sum(transaction_sum_per_person_dict.values()) if transaction_sum_per_person_dict else None
 
 
     # --- Personal Tab ---
     # Members and Former members are displayed separately, so the Treasurer can take appropriate action
 
-    transaction_sum_per_person = all_transactions.values('person').order_by().annotate(Sum('price'))
-    transaction_sum_per_person_dict = dict([(s['person'], s['price__sum']) for s in transaction_sum_per_person])
-
     members = Person.objects.members().filter(pk__in=transaction_sum_per_person_dict.keys())
     non_members_pks = set(transaction_sum_per_person_dict.keys()) - set(members.values_list('pk', flat=True))
     former_members = Person.objects.filter(pk__in=non_members_pks)
@@ -1193,12 +1191,8 @@ def balance(request, dt_str=False):
 
     # --- Exam cookie credit ---
     # Give activity statistics over a given period
-    discount_period = exam_cookie_discount()
-    exam_cookie_transactions = DiscountCredit.objects.filter(discount_period=discount_period, date__lt=dt)
-    exam_cookie_sum = exam_cookie_transactions.aggregate(Sum('price'))['price__sum'] or 0
-
-    exam_cookie_credit_per_person = exam_cookie_transactions.values('person').order_by().annotate(Sum('price'))
-    exam_cookie_credit_per_person_dict = dict([(c['person'], c['price__sum']) for c in exam_cookie_credit_per_person])
+    exam_cookie_credit_per_person_dict = BalanceCheckpoint.objects.exam_cookie_credits(dt)
+    exam_cookie_sum = sum(exam_cookie_credit_per_person_dict.values())
 
     exam_cookie_members = Person.objects.members().filter(pk__in=exam_cookie_credit_per_person_dict.keys())
     exam_cookie_non_members_pks = set(exam_cookie_credit_per_person_dict.keys()) - set(exam_cookie_members.values_list('pk', flat=True))
@@ -1559,34 +1553,42 @@ def debt_collection_new(request):
                     cookie_rcur = []
 
                 if contr_frst or contr_rcur or cookie_frst or cookie_rcur:
-                    assignment = DebtCollectionAssignment(description=form.cleaned_data['description'],
-                                                          end=form.cleaned_data['end'])
-                    assignment.save()
-
-                    if contr_frst or cookie_frst:
-                        frst_batch = DebtCollectionBatch(assignment=assignment,
-                                                         execution_date=form.cleaned_data['execution_date'],
-                                                         sequence_type=DebtCollectionBatch.SequenceTypes.FRST,
-                                                         status=DebtCollectionBatch.StatusChoices.NEW)
-                        frst_batch.save()
-
-                        if contr_frst:
-                            save_contribution_instructions(contr_frst, frst_batch)
-                        if cookie_frst:
-                            save_cookie_corner_instructions(cookie_frst, frst_batch)
-
-                    if contr_rcur or cookie_rcur:
-                        rcur_batch = DebtCollectionBatch(assignment=assignment,
-                                                         execution_date=form.cleaned_data['execution_date'],
-                                                         sequence_type=DebtCollectionBatch.SequenceTypes.RCUR,
-                                                         status=DebtCollectionBatch.StatusChoices.NEW)
-                        rcur_batch.save()
-
-                        if contr_rcur:
-                            save_contribution_instructions(contr_rcur, rcur_batch)
-                        if cookie_rcur:
-                            save_cookie_corner_instructions(cookie_rcur, rcur_batch)
-                    return redirect(assignment)
+                    try:
+                        with transaction.atomic():
+                            assignment = DebtCollectionAssignment(description=form.cleaned_data['description'],
+                                                                  end=form.cleaned_data['end'])
+                            assignment.save()
+
+                            if contr_frst or cookie_frst:
+                                frst_batch = DebtCollectionBatch(assignment=assignment,
+                                                                 execution_date=form.cleaned_data['execution_date'],
+                                                                 sequence_type=DebtCollectionBatch.SequenceTypes.FRST,
+                                                                 status=DebtCollectionBatch.StatusChoices.NEW)
+                                frst_batch.save()
+
+                                if contr_frst:
+                                    save_contribution_instructions(contr_frst, frst_batch)
+                                if cookie_frst:
+                                    save_cookie_corner_instructions(cookie_frst, frst_batch)
+
+                            if contr_rcur or cookie_rcur:
+                                rcur_batch = DebtCollectionBatch(assignment=assignment,
+                                                                 execution_date=form.cleaned_data['execution_date'],
+                                                                 sequence_type=DebtCollectionBatch.SequenceTypes.RCUR,
+                                                                 status=DebtCollectionBatch.StatusChoices.NEW)
+                                rcur_batch.save()
+
+                                if contr_rcur:
+                                    save_contribution_instructions(contr_rcur, rcur_batch)
+                                if cookie_rcur:
+                                    save_cookie_corner_instructions(cookie_rcur, rcur_batch)
+                        return redirect(assignment)
+                    except InstructionsChangedError:
+                        # The transactions changed after the instructions were generated, show the current ones
+                        messages.error(request, _("The transactions changed while the debt collection was being "
+                                                  "made. Please check the instructions again."))
+                        cookie_corner_instructions = generate_cookie_corner_instructions(end)
+                        cookie_corner_totals = _instruction_totals(cookie_corner_instructions)
 
     else:
         end_date = timezone.datetime(year=now.year, month=now.month, day=now.day)
@@ -1650,7 +1652,7 @@ def debt_collection_export(request, id):
     """
     assignment = get_object_or_404(DebtCollectionAssignment, id=id)
 
-    response = render(request, 'exports/sepadd.xml', locals(), content_type='application/xml; charset=utf-8')
+    response = StreamingHttpResponse(write_pain008(assignment), content_type='application/xml; charset=utf-8')
     response['Content-Disposition'] = 'attachment; filename=%s.xml' % (assignment.file_identification())
     return response
 
@@ -2032,6 +2034,31 @@ def authorization_view(request, authorization_id):
 Cookie Corner Wrapped
 """
 
+def _cookie_corner_wrapped_profile(year, person):
+    """
+    Returns the Cookie Corner Wrapped profile of a person, or the global profile if person is None, for a year.
+
+    Profiles are generated for everyone at once by the generate_cookie_corner_wrapped task, and are removed when
+    transactions of their year change. A missing profile is generated on its own.
+    """
+    profile = CookieCornerWrapped.objects.filter(year=year, person=person).first()
+    if profile is None and year in _cookie_corner_wrapped_years(person, None):
+        generate_wrapped_profiles(year, persons=[person.pk if person is not None else None])
+        profile = CookieCornerWrapped.objects.filter(year=year, person=person).first()
+    return profile
+
+
+def _cookie_corner_wrapped_years(person, current_year):
+    """
+    Returns the years in which a person, or anyone if person is None, bought something in the cookie corner, except
+    for the current year.
+    """
+    totals = DailyTransactionTotal.objects.filter(transaction_type='cookiecornertransaction')
+    if person is not None:
+        totals = totals.filter(person=person)
+    return [day.year for day in totals.dates('day', 'year') if day.year != current_year]
+
+
 @require_lid
 def cookie_corner_wrapped_main(request, year=None):
     # Only allow specifying a year if the year is in the past
@@ -2045,131 +2072,23 @@ def cookie_corner_wrapped_main(request, year=None):
         COOKIE_CORNER_WRAPPED_YEAR = django.conf.settings.COOKIE_CORNER_WRAPPED_YEAR
 
     person = request.person
-    language = get_language()
-
-    transaction_years = sorted(list(set(
-        CookieCornerTransaction.objects.filter(person=person).values_list('date__year', flat=True).distinct()
-    )))
-    # Remove current year if present
-    if current_year in transaction_years:
-        transaction_years.remove(current_year)
+    profile = _cookie_corner_wrapped_profile(COOKIE_CORNER_WRAPPED_YEAR, person)
+    transaction_years = _cookie_corner_wrapped_years(person, current_year)
 
-    transactions = CookieCornerTransaction.objects.filter(
-        person=person,
-        date__year=COOKIE_CORNER_WRAPPED_YEAR
-    ).all()
-
-    if len(transactions) == 0:
+    if profile is None:
         # No transactions found, display the no transactions page
         return render(request, 'wrapped/wrapped_no_transactions.html', {
             'year': COOKIE_CORNER_WRAPPED_YEAR,
             'transaction_years': transaction_years,
         })
 
-    transaction_count = transactions \
-        .annotate(day=TruncDay('date')) \
-        .values('day') \
-        .annotate(c=Count('id')) \
-        .values('day', 'c')
-
-    first_transaction_of_the_year = transactions.earliest('date')
-    last_transaction_of_the_year = transactions[0]
-
-    most_transactions_day = transaction_count.order_by('c').last()
-    most_transactions_date = most_transactions_day['day']
-    most_transactions_list = transactions.filter(
-        date__month=most_transactions_date.month,
-        date__day=most_transactions_date.day
-    ).all()
-
-    total_price = 0
-    total_kcal = 0
-
-    for transaction in most_transactions_list:
-        total_price += transaction.article.price
-        total_kcal += transaction.article.kcal if transaction.article.kcal is not None else 0
-
-    """
-        Products
-    """
-    products_grouped_by_count = {}
-
-    total = {
-        'kcal': 0,
-        'price': 0
-    }
-
-    for transaction in transactions:
-        article = transaction.article
-        amount = transaction.amount
-
-        kcal = transaction.kcal()
-
-        total['kcal'] += kcal if kcal is not None else 0
-        total['price'] += transaction.price
-
-        if article in products_grouped_by_count:
-            products_grouped_by_count[article]["count"] += amount
-        else:
-            products_grouped_by_count[article] = {"count": amount}
-
-    products_grouped_by_count = sorted(products_grouped_by_count.items(), key=lambda x:x[1]["count"])
-
-    products_grouped_by_count.reverse()
-
-    top_5_products = products_grouped_by_count[:5]
-
-    total['equivalent'] = kcal_equivalent(total['kcal'], language)
-
-    # Calculating the person ranking percentage for each of the top 5 products
-    for i, top_product in enumerate(top_5_products):
-        top_product_transactions = CookieCornerTransaction.objects.filter(article=top_product[0], date__year=COOKIE_CORNER_WRAPPED_YEAR)
-        product_count_grouped_by_person = top_product_transactions.values('person').annotate(count=Sum('amount')).order_by('-count').values_list('person', 'count')
-        total_persons = len(product_count_grouped_by_person)
-        ranking = {}
-        for index, item in enumerate(product_count_grouped_by_person):
-            if item[0] == person.pk:
-                calculation = round((index) / total_persons * 100, 2)
-                ranking[top_product[0].pk] = calculation if calculation > 0 else None
-                break
-
-        if ranking is not None:
-            top_5_products[i][1].update({"ranking": ranking[top_product[0].pk]})
-        else:
-            top_5_products[i][1].update({"ranking": 0})
-
-    """
-        Alexia
-    """
-
-    alexia_transactions = AlexiaTransaction.objects.filter(
-        person=person,
-        date__year=COOKIE_CORNER_WRAPPED_YEAR
-    )
-
-    drink_spend_most = alexia_transactions \
-        .values('description', 'date__day', 'date__month') \
-        .annotate(total_price=Sum('price')) \
-        .order_by('-total_price', '-date__day', '-date__month')
-
-    drinks_total = sum(d['total_price'] for d in drink_spend_most)
-
-    return render(request, 'wrapped/wrapped.html', {
+    context = wrapped_context(profile)
+    context['total']['equivalent'] = kcal_equivalent(context['total']['kcal'], get_language())
+    context.update({
         'year': COOKIE_CORNER_WRAPPED_YEAR,
         'transaction_years': transaction_years,
-        'first_transaction_of_the_year': first_transaction_of_the_year,
-        'last_transaction_of_the_year': last_transaction_of_the_year,
-        'most_transactions': {
-            'day': most_transactions_day,
-            'list': most_transactions_list,
-            'total_price': total_price,
-            'total_kcal': total_kcal,
-        },
-        'top_5_products': top_5_products,
-        'total': total,
-        'drink_spend_most': drink_spend_most,
-        'drinks_total': drinks_total
     })
+    return render(request, 'wrapped/wrapped.html', context)
 
 
 @require_board
@@ -2184,110 +2103,23 @@ def cookie_corner_wrapped_global(request, year=None):
     else:
         COOKIE_CORNER_WRAPPED_YEAR = django.conf.settings.COOKIE_CORNER_WRAPPED_YEAR
 
-    language = get_language()
-
-    transaction_years = sorted(list(set(
-        CookieCornerTransaction.objects.all().values_list('date__year', flat=True).distinct()
-    )))
-    # Remove current year if present
-    if current_year in transaction_years:
-        transaction_years.remove(current_year)
+    profile = _cookie_corner_wrapped_profile(COOKIE_CORNER_WRAPPED_YEAR, None)
+    transaction_years = _cookie_corner_wrapped_years(None, current_year)
 
-    transactions = CookieCornerTransaction.objects.filter(
-        date__year=COOKIE_CORNER_WRAPPED_YEAR
-    ).all()
-
-    if len(transactions) == 0:
+    if profile is None:
         # No transactions found, display the no transactions page
         return render(request, 'wrapped/wrapped_no_transactions.html', {
             'year': COOKIE_CORNER_WRAPPED_YEAR,
             'transaction_years': transaction_years,
         })
 
-    transaction_count = transactions \
-        .annotate(day=TruncDay('date')) \
-        .values('day') \
-        .annotate(c=Count('id')) \
-        .values('day', 'c')
-
-    first_transaction_of_the_year = transactions.earliest('date')
-    last_transaction_of_the_year = transactions[0]
-
-    most_transactions_day = transaction_count.order_by('c').last()
-    most_transactions_date = most_transactions_day['day']
-    most_transactions_list = transactions.filter(
-        date__month=most_transactions_date.month,
-        date__day=most_transactions_date.day
-    ).all()
-
-    total_price = 0
-    total_kcal = 0
-
-    for transaction in most_transactions_list:
-        total_price += transaction.article.price
-        total_kcal += transaction.article.kcal if transaction.article.kcal is not None else 0
-
-    """
-        Products
-    """
-    products_grouped_by_count = {}
-
-    total = {
-        'kcal': 0,
-        'price': 0
-    }
-
-    for transaction in transactions:
-        article = transaction.article
-        amount = transaction.amount
-
-        kcal = transaction.kcal()
-
-        total['kcal'] += kcal if kcal is not None else 0
-        total['price'] += transaction.price
-
-        if article in products_grouped_by_count:
-            products_grouped_by_count[article]["count"] += amount
-        else:
-            products_grouped_by_count[article] = {"count": amount}
-
-    products_grouped_by_count = sorted(products_grouped_by_count.items(), key=lambda x:x[1]['count'])
-
-    products_grouped_by_count.reverse()
-
-    top_5_products = products_grouped_by_count[:10]  # Global stats have 10 products
-
-    """
-        Alexia
-    """
-
-    alexia_transactions = AlexiaTransaction.objects.filter(
-        date__year=COOKIE_CORNER_WRAPPED_YEAR
-    )
-
-    drink_spend_most = alexia_transactions \
-        .values('description', 'date__day', 'date__month') \
-        .annotate(total_price=Sum('price')) \
-        .order_by('-total_price', '-date__day', '-date__month')
-
-    drinks_total = sum(d['total_price'] for d in drink_spend_most)
-
-    return render(request, 'wrapped/wrapped.html', {
+    context = wrapped_context(profile)
+    context.update({
         'global': True,
         'year': COOKIE_CORNER_WRAPPED_YEAR,
         'transaction_years': transaction_years,
-        'first_transaction_of_the_year': first_transaction_of_the_year,
-        'last_transaction_of_the_year': last_transaction_of_the_year,
-        'most_transactions': {
-            'day': most_transactions_day,
-            'total_price': total_price,
-            'total_kcal': total_kcal,
-        },
-        'top_5_products': top_5_products,
-        'total': total,
-        'drink_spend_most': drink_spend_most[:10],
-        'drinks_total': drinks_total
     })
+    return render(request, 'wrapped/wrapped.html', context)
 
 
 class DeclarationView(RequirePersonMixin, FormView):
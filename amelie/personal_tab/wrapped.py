@@ -0,0 +1,242 @@
+import datetime
+import logging
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import RowNumber, TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from amelie.personal_tab.models import AlexiaTransaction, Article, CookieCornerTransaction, CookieCornerWrapped
+
+
+logger = logging.getLogger(__name__)
+
+
+def _year_bounds(year):
+    localtz = timezone.get_current_timezone()
+    return datetime.datetime(year, 1, 1, tzinfo=localtz), datetime.datetime(year + 1, 1, 1, tzinfo=localtz)
+
+
+def _transaction_record(row):
+    return {'article': row['article'], 'date': row['date'].isoformat()}
+
+
+def _busiest_day(day_articles, articles, with_articles=True):
+    """
+    Returns the day with the most transactions, given a dictionary from (day, article) to a number of transactions.
+
+    The articles of the transactions on that day are only included if with_articles is True.
+    """
+    per_day = {}
+    for (day, article), count in day_articles.items():
+        per_day[day] = per_day.get(day, 0) + count
+    day = max(sorted(per_day), key=lambda d: per_day[d])
+
+    day_article_ids = []
+    for (d, article), count in sorted(day_articles.items(), key=lambda x: (x[0][0], x[0][1] or 0)):
+        if d == day:
+            day_article_ids += [article] * count
+
+    price = sum(articles[a]['price'] for a in day_article_ids if a in articles)
+    kcal = sum(articles[a]['kcal'] or 0 for a in day_article_ids if a in articles)
+    return {'day': day.isoformat(), 'count': per_day[day], 'articles': day_article_ids if with_articles else [],
+            'price': str(price), 'kcal': kcal}
+
+
+def _products(article_totals, rankings=None):
+    """
+    Returns the products sorted by the number bought, as [article, count, ranking] lists.
+    """
+    products = sorted(article_totals.items(), key=lambda x: x[1], reverse=True)
+    return [[article, count, rankings.get(article) if rankings else None] for article, count in products]
+
+
+def _rankings(person_articles):
+    """
+    Returns the position of every person in the ranking of each article they bought, by (person, article), as the
+    percentage of persons that bought more of it. The first position is None.
+    """
+    per_article = {}
+    for row in person_articles:
+        per_article.setdefault(row['article'], []).append(row)
+
+    rankings = {}
+    for article, rows in per_article.items():
+        rows.sort(key=lambda r: (-(r['amount_sum'] or 0), r['person']))
+        for position, row in enumerate(rows):
+            ranking = round(position / len(rows) * 100, 2)
+            rankings[(row['person'], article)] = ranking if ranking > 0 else None
+    return rankings
+
+
+def generate_wrapped_profiles(year, persons=None):
+    """
+    Compute the Cookie Corner Wrapped profiles of a year, and replace the stored profiles with them.
+
+    Everything is computed with a handful of grouped queries over the whole association, instead of several queries
+    per person and product.
+
+    :param persons: The ids of the persons to compute the profiles of, None for the global profile. Defaults to the
+                    profiles of all persons and the global profile.
+    """
+    start, end = _year_bounds(year)
+    transactions = CookieCornerTransaction.objects.filter(date__gte=start, date__lt=end).order_by()
+    articles = {a['pk']: a for a in Article.objects.values('pk', 'price', 'kcal')}
+    everyone = persons is None
+    with_global = everyone or None in persons
+    person_ids = None if everyone else {person for person in persons if person is not None}
+
+    def _of_persons(queryset):
+        return queryset if everyone else queryset.filter(person__in=person_ids)
+
+    # Per person and article totals of everyone, the rankings compare a person with everyone who bought the article
+    person_articles = list(transactions.values('person', 'article').annotate(amount_sum=Sum('amount'),
+                                                                              price_sum=Sum('price')))
+    rankings = _rankings(person_articles)
+
+    # Number of transactions per person, day and article
+    person_days = _of_persons(transactions).annotate(day=TruncDate('date')).values('person', 'day', 'article')\
+        .annotate(transaction_count=Count('id'))
+
+    # First and last transaction of every person
+    first_last = _of_persons(transactions).annotate(
+        first=Window(RowNumber(), partition_by=[F('person')], order_by=[F('date').asc(), F('added_on').asc()]),
+        last=Window(RowNumber(), partition_by=[F('person')], order_by=[F('date').desc(), F('added_on').desc()]),
+    ).filter(Q(first=1) | Q(last=1)).values('person', 'article', 'date', 'first', 'last')
+
+    # Money spent on drinks per person, description and day
+    drinks = AlexiaTransaction.objects.filter(date__gte=start, date__lt=end).values(
+        'person', 'description', 'date__day', 'date__month'
+    ).annotate(total_price=Sum('price')).order_by('-total_price', '-date__day', '-date__month')
+    if not with_global:
+        drinks = _of_persons(drinks)
+
+    profiles = {}
+    global_articles = {}
+    global_day_articles = {}
+    global_total = {'price': Decimal(0), 'kcal': 0}
+
+    def _profile(person):
+        if person not in profiles:
+            profiles[person] = {'articles': {}, 'rankings': {}, 'day_articles': {}, 'drinks': [],
+                                'total': {'price': Decimal(0), 'kcal': 0}}
+        return profiles[person]
+
+    for row in person_articles:
+        article, amount = row['article'], row['amount_sum'] or 0
+        kcal = (articles[article]['kcal'] or 0) * amount if article in articles else 0
+
+        if everyone or row['person'] in person_ids:
+            profile = _profile(row['person'])
+            profile['articles'][article] = amount
+            profile['total']['price'] += row['price_sum'] or 0
+            profile['total']['kcal'] += kcal
+            profile['rankings'][article] = rankings[(row['person'], article)]
+
+        global_articles[article] = global_articles.get(article, 0) + amount
+        global_total['price'] += row['price_sum'] or 0
+        global_total['kcal'] += kcal
+
+    for row in person_days:
+        key = (row['day'], row['article'])
+        day_articles = _profile(row['person'])['day_articles']
+        day_articles[key] = day_articles.get(key, 0) + row['transaction_count']
+        global_day_articles[key] = global_day_articles.get(key, 0) + row['transaction_count']
+
+    if with_global and not everyone:
+        # The busiest day of the association, without the days of every single person
+        for row in transactions.annotate(day=TruncDate('date')).values('day', 'article').annotate(
+                transaction_count=Count('id')):
+            global_day_articles[(row['day'], row['article'])] = row['transaction_count']
+
+    for row in first_last:
+        profile = _profile(row['person'])
+        if row['first'] == 1:
+            profile['first'] = _transaction_record(row)
+        if row['last'] == 1:
+            profile['last'] = _transaction_record(row)
+
+    global_drinks = {}
+    for row in drinks:
+        key = (row['description'], row['date__day'], row['date__month'])
+        global_drinks[key] = global_drinks.get(key, 0) + row['total_price']
+        if row['person'] in profiles:
+            profiles[row['person']]['drinks'].append(list(key) + [str(row['total_price'])])
+    global_drinks = [list(key) + [str(price)] for key, price in sorted(
+        global_drinks.items(), key=lambda x: (x[1], x[0][1], x[0][2]), reverse=True)]
+
+    wrapped = []
+    for person, profile in profiles.items():
+        drinks_total = sum(Decimal(d[3]) for d in profile['drinks'])
+        wrapped.append(CookieCornerWrapped(year=year, person_id=person, data={
+            'first': profile['first'],
+            'last': profile['last'],
+            'busiest_day': _busiest_day(profile['day_articles'], articles),
+            'products': _products(profile['articles'], profile['rankings'])[:5],
+            'total': {'price': str(profile['total']['price']), 'kcal': profile['total']['kcal']},
+            'drinks': profile['drinks'],
+            'drinks_total': str(drinks_total),
+        }))
+
+    if with_global and person_articles:
+        first = transactions.order_by('date', 'added_on').values('article', 'date')[0]
+        last = transactions.order_by('-date', '-added_on').values('article', 'date')[0]
+        wrapped.append(CookieCornerWrapped(year=year, person=None, data={
+            'first': _transaction_record(first),
+            'last': _transaction_record(last),
+            'busiest_day': _busiest_day(global_day_articles, articles, with_articles=False),
+            'products': _products(global_articles)[:10],
+            'total': {'price': str(global_total['price']), 'kcal': global_total['kcal']},
+            'drinks': global_drinks[:10],
+            'drinks_total': str(sum(Decimal(d[3]) for d in global_drinks)),
+        }))
+
+    with transaction.atomic():
+        replaced = CookieCornerWrapped.objects.filter(year=year)
+        if not everyone:
+            replaced_persons = Q(person__in=person_ids)
+            if with_global:
+                replaced_persons |= Q(person=None)
+            replaced = replaced.filter(replaced_persons)
+        replaced.delete()
+        # A profile that is generated on demand by two requests at once is only stored once
+        CookieCornerWrapped.objects.bulk_create(wrapped, batch_size=500, ignore_conflicts=True)
+
+    logger.info(f"Generated {len(wrapped)} Cookie Corner Wrapped profiles for {year}.")
+    return len(wrapped)
+
+
+def wrapped_context(profile):
+    """
+    Turn a stored Cookie Corner Wrapped profile into the context of the wrapped template.
+
+    :type profile: CookieCornerWrapped
+    """
+    data = profile.data
+    busiest_day = data['busiest_day']
+
+    article_ids = {data['first']['article'], data['last']['article']} | set(busiest_day['articles']) | \
+        {p[0] for p in data['products']}
+    articles = Article.objects.in_bulk([pk for pk in article_ids if pk is not None])
+
+    def _transaction(record):
+        return {'article': articles.get(record['article']), 'date': parse_datetime(record['date'])}
+
+    return {
+        'first_transaction_of_the_year': _transaction(data['first']),
+        'last_transaction_of_the_year': _transaction(data['last']),
+        'most_transactions': {
+            'day': {'day': parse_date(busiest_day['day']), 'c': busiest_day['count']},
+            'list': [{'article': articles.get(pk)} for pk in busiest_day['articles']],
+            'total_price': Decimal(busiest_day['price']),
+            'total_kcal': busiest_day['kcal'],
+        },
+        'top_5_products': [(articles.get(pk), {'count': count, 'ranking': ranking})
+                           for pk, count, ranking in data['products']],
+        'total': {'price': Decimal(data['total']['price']), 'kcal': data['total']['kcal']},
+        'drink_spend_most': [{'description': description, 'date__day': day, 'date__month': month,
+                              'total_price': Decimal(price)} for description, day, month, price in data['drinks']],
+        'drinks_total': Decimal(data['drinks_total']),
+    }
@@ -40,6 +40,19 @@ THUMBNAIL_SIZES = {
     'large': (1600, 1200),
 }
 
+# Encoder settings for thumbnails
+THUMBNAIL_QUALITY = 85
+THUMBNAIL_PROGRESSIVE = True
+THUMBNAIL_OPTIMIZE = True
+# Extra formats in which thumbnails are saved next to the JPEG thumbnail, for example ['webp', 'avif']
+THUMBNAIL_EXTRA_FORMATS = []
+# Limits on the number of frames and the duration (in milliseconds) of thumbnails of animated images
+THUMBNAIL_GIF_MAX_FRAMES = 200
+THUMBNAIL_GIF_MAX_DURATION = 30000
+
+# Number of photos that is processed by a single task when uploading photos
+PHOTO_UPLOAD_CHUNK_SIZE = 25
+
 # Known mimetypes
 MIMETYPES = {
     "image/jpeg": "image",
@@ -108,6 +121,9 @@ EMAIL_RETURN_PATH = '<bounces@inter-actief.net>'  # Where to send 'undeliverable
 EMAIL_REPORT_TO = 'WWW-commissie <www@inter-actief.net>'  # Where to send e-mail reports
 EMAIL_INTERCEPT_ADDRESS = None
 EMAIL_DELAY = 5  # Delay in seconds between sending consecutive e-mails
+EMAIL_BURST = 10  # Number of e-mails that may be sent at once before EMAIL_DELAY applies
+EMAIL_BATCH_SIZE = 50  # Number of e-mails sent by a single task over one connection, None for a task per e-mail
+EMAIL_BATCH_TIME_LIMIT = 240  # Soft time limit of a batch of e-mails in seconds, below the --time-limit of Celery
 
 # Language code for this installation. All choices can be found here:
 # https://www.w3.org/TR/REC-html40/struct/dirlang.html#langcodes
@@ -158,6 +174,9 @@ STATICFILES_FINDERS = (
 # The location where data exports are saved until they expire
 DATA_EXPORT_ROOT = "/data/application_data/amelie/data_exports"
 
+# Number of exporters of a data export that run at the same time
+DATA_EXPORT_WORKERS = 3
+
 # Settings for the template renderer
 TEMPLATES = [
     {
@@ -406,6 +425,19 @@ GRAPHENE = {
 }
 GRAPHENE_DEFAULT_LIMIT = 10
 
+# JSON file with the persisted GraphQL queries of the frontend by their id, see amelie.graphql.documents
+GRAPHQL_PERSISTED_QUERIES_FILE = None
+# Only allow persisted queries for anonymous users
+GRAPHQL_PERSISTED_QUERIES_ONLY = False
+# Number of parsed and validated GraphQL queries to keep per process
+GRAPHQL_DOCUMENT_CACHE_SIZE = 256
+# The cache in CACHES for responses to GraphQL queries of anonymous users
+GRAPHQL_RESPONSE_CACHE = 'default'
+# Seconds to cache responses to GraphQL queries of anonymous users, 0 to disable. A process only sees the changes that
+# other processes make if the cache is shared between them, otherwise it serves stale responses for up to this long.
+# The default cache is a LocMemCache per process, so this timeout is the only bound on stale responses.
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = 10
+
 GRAPHQL_JWT = {
     'JWT_ALLOW_ANY_HANDLER': allow_none,
     'JWT_ALGORITHM': "RS256",
@@ -734,6 +766,14 @@ CLAUDIA_SHELL_DEFAULT = 'bash'
 # If False, any member objects will be added to the queue, even though verification of their parent failed.
 CLAUDIA_STOP_ON_ERROR = False
 
+# Number of mappings that the integrity check verifies per task
+CLAUDIA_VERIFY_CHUNK_SIZE = 50
+
+# Number of days after which the integrity check verifies a mapping again, even if its desired state did not change.
+# This repairs changes that were made directly in the systems that Claudia manages. The plugins do not report those
+# changes through changed_mappings yet, so every mapping is verified again daily, like the nightly full verification.
+CLAUDIA_VERIFY_MAX_AGE_DAYS = 1
+
 # Claudia's connection details to Active Directory
 CLAUDIA_AD = {
     'LDAP': 'ldaps',
@@ -1021,10 +1061,16 @@ HEALTH_CHECK_ENABLED_CHECKS = [  # Celery and RabbitMQ checks are added if it is
     "health_check.contrib.psutil.Memory",
 ]
 
+# The HTTP client of async code, see amelie.tools.asyncio.get_http_session
+ASYNC_HTTP_TIMEOUT = 10  # Seconds before a request to an upstream service is aborted
+ASYNC_HTTP_CONNECTIONS = 100  # Maximum number of open connections per event loop
+
 # The Spotify app details for the room narrowcasting page.
 SPOTIFY_CLIENT_ID = "19f600baa77b4223b639088daa62f2f2"
 SPOTIFY_CLIENT_SECRET = ""
 SPOTIFY_SCOPES = "user-read-currently-playing"
+SPOTIFY_API_URL = "https://api.spotify.com/v1"  # No trailing slash!
+SPOTIFY_ACCOUNTS_URL = "https://accounts.spotify.com"  # No trailing slash!
 
 # The Matrix chat settings for the room narrowcasting page.
 MATRIX_SETTINGS = {
@@ -1036,6 +1082,21 @@ MATRIX_SETTINGS = {
     "MAX_MSG_LENGTH": 150,  # Characters of a message to show before it is cut off.
 }
 
+# Seconds between refreshes of the parts of the room narrowcasting screen by the narrowcasting_poller command
+NARROWCASTING_ROOM_REFRESH = {
+    "spotify": 5,
+    "chat": 15,
+    "room_duty": 5 * 60,
+    "pictures": 10 * 60,
+}
+# Seconds between checks for changes of the room state, per connected screen
+NARROWCASTING_STREAM_INTERVAL = 1
+# Seconds after which a keepalive is sent to a connected screen if nothing changed
+NARROWCASTING_STREAM_KEEPALIVE = 15
+# Seconds after which the stream of a connected screen ends, the browser then connects again. Under WSGI each connected
+# screen holds a worker thread until then.
+NARROWCASTING_STREAM_LIFETIME = 5 * 60
+
 # Date on which old RFID cards are registered. Old RFID cards were registered before we kept track of registration date.
 DATE_OLD_RFID_CARDS = date(2019, 9, 1)
 
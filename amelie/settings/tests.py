@@ -27,3 +27,6 @@ AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend'] + AUTHEN
 
 # Disable secure redirects to allow testing without SSL
 SECURE_SSL_REDIRECT = False
+
+# Cached GraphQL responses would outlive the rollback of the test database, tests that need it enable it
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = 0
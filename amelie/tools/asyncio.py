@@ -1,4 +1,10 @@
 import asyncio
+import weakref
+
+import aiohttp
+from django.conf import settings
+
+_http_sessions = weakref.WeakKeyDictionary()
 
 
 def get_event_loop():
@@ -8,3 +14,25 @@ def get_event_loop():
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         return loop
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Returns the HTTP session of the running event loop, which keeps a pool of connections to upstream services.
+
+    Sessions cannot be shared between event loops, so there is one per loop. Under ASGI all async views share the loop
+    of the server; code that runs a loop of its own for a single task should use new_http_session instead.
+    """
+    loop = asyncio.get_running_loop()
+    session = _http_sessions.get(loop)
+    if session is None or session.closed:
+        session = new_http_session()
+        _http_sessions[loop] = session
+    return session
+
+
+def new_http_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=settings.ASYNC_HTTP_TIMEOUT),
+        connector=aiohttp.TCPConnector(limit=settings.ASYNC_HTTP_CONNECTIONS),
+    )
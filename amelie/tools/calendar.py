@@ -3,13 +3,23 @@ from datetime import timedelta, datetime
 
 import hashlib
 import icalendar
+import time
 from copy import deepcopy
+from functools import lru_cache
 from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
 from django.utils.encoding import force_str
+from django.utils.http import http_date
 from django.utils.translation import gettext as _, get_language
 from pytz import timezone
 
 
+# Serialized events are keyed by their update count and organizer, so they only have to expire to free up space
+ICAL_FEED_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+
+
 def ical_event(event):
     evt = icalendar.Event()
 
@@ -46,21 +56,15 @@ def ical_event(event):
     return evt
 
 
-def ical_calendar(calendar, events=None, max_duration_before_split=timedelta(days=3)):
-    if events is None:
-        events = []
-
-    cal = icalendar.Calendar()
-
-    cal.add('version', '2.0')
-    cal.add('prodid', '-//inter-actief//amélie//NL')
-    cal.add('x-wr-calname', force_str(calendar))
-    # lines.append(Line('CALSCALE', 'GREGORIAN'))
-
+@lru_cache
+def ical_timezone(year):
+    """
+    Returns the VTIMEZONE component of the local timezone, based on the transitions of the given year.
+    """
     local_tz = timezone(settings.TIME_ZONE)
 
     # get two
-    daylight, standard = [(dt, local_tz._transition_info[num]) for num, dt in enumerate(local_tz._utc_transition_times) if dt.year == datetime.today().year]
+    daylight, standard = [(dt, local_tz._transition_info[num]) for num, dt in enumerate(local_tz._utc_transition_times) if dt.year == year]
 
     timezone_daylight = icalendar.TimezoneDaylight()
     timezone_daylight.add('TZOFFSETFROM', standard[1][0])
@@ -81,64 +85,153 @@ def ical_calendar(calendar, events=None, max_duration_before_split=timedelta(day
     cal_tz.add('X-LIC-LOCATION', local_tz)
     cal_tz.add_component(timezone_daylight)
     cal_tz.add_component(timezone_standard)
-    cal.add_component(cal_tz)
-
-    for event in events:
-        # Make a dictionary of the event so that we don't accidentally alter the model instance that might get saved
-        event_dict = event.__dict__
-        event_dict['__module__'] = event.__module__
-        event_dict['__class__'] = event.__class__
-        if hasattr(event, "organizer") and event.organizer is not None:
-            event_dict['organizer_name'] = event.organizer.name
-            event_dict['organizer_email'] = event.organizer.email
-        if event.summary:
-            event_dict['summary'] = event.summary
-        if event.description:
-            event_dict['description'] = event.description
-
-        # Fix description and summary fields in the dict if they don't exist
-        language = get_language()
-        keys = event_dict.keys()
-        if 'description' not in keys:
-            if 'description_en' not in keys and 'description_nl' not in keys:
-                event_dict['description'] = ""
-            else:
-                if language == "en" and event_dict['description_en']:
-                    event_dict['description'] = event_dict['description_en']
-                else:
-                    event_dict['description'] = event_dict['description_nl']
-
-        if 'summary' not in keys:
-            if 'summary_en' not in keys and 'summary_nl' not in keys:
-                event_dict['summary'] = ""
+    return cal_tz
+
+
+def ical_event_components(event, max_duration_before_split=timedelta(days=3)):
+    """
+    Returns the VEVENT components of an event, which are two components if the event is split in a start and end event.
+    """
+    # Make a dictionary of the event so that we don't accidentally alter the model instance that might get saved
+    event_dict = event.__dict__
+    event_dict['__module__'] = event.__module__
+    event_dict['__class__'] = event.__class__
+    if hasattr(event, "organizer") and event.organizer is not None:
+        event_dict['organizer_name'] = event.organizer.name
+        event_dict['organizer_email'] = event.organizer.email
+    if event.summary:
+        event_dict['summary'] = event.summary
+    if event.description:
+        event_dict['description'] = event.description
+
+    # Fix description and summary fields in the dict if they don't exist
+    language = get_language()
+    keys = event_dict.keys()
+    if 'description' not in keys:
+        if 'description_en' not in keys and 'description_nl' not in keys:
+            event_dict['description'] = ""
+        else:
+            if language == "en" and event_dict['description_en']:
+                event_dict['description'] = event_dict['description_en']
             else:
-                if language == "en" and event_dict['summary_en']:
-                    event_dict['summary'] = event_dict['summary_en']
-                else:
-                    event_dict['summary'] = event_dict['summary_nl']
-
-        # Check duration of an event, if its longer then max_duration_before_split, split it into a start and end event.
-        if event.end - event.begin >= max_duration_before_split:
-            start_event = deepcopy(event_dict)
-            # Remove the end date of this object to signal that this event is one day long ("all day event")
-            del start_event['end']
-            if 'summary' in start_event.keys():
-                start_event['summary_override'] = _("[START] {}").format(start_event['summary'])
-
-            cal.add_component(ical_event(start_event))
-
-            end_event = deepcopy(event_dict)
-            # The end event starts on the end of the total event
-            end_event['begin'] = end_event['end']
-            del end_event['end']
-            if 'summary' in end_event.keys():
-                end_event['summary_override'] = _("[END] {}").format(end_event['summary'])
-            # The primary key of this event should be different from the start event, therefore we negate it to produce
-            # a new digest
-            end_event['id'] = -end_event['id']
-
-            cal.add_component(ical_event(end_event))
+                event_dict['description'] = event_dict['description_nl']
+
+    if 'summary' not in keys:
+        if 'summary_en' not in keys and 'summary_nl' not in keys:
+            event_dict['summary'] = ""
         else:
-            cal.add_component(ical_event(event_dict))
+            if language == "en" and event_dict['summary_en']:
+                event_dict['summary'] = event_dict['summary_en']
+            else:
+                event_dict['summary'] = event_dict['summary_nl']
+
+    # Check duration of an event, if its longer then max_duration_before_split, split it into a start and end event.
+    if event.end - event.begin >= max_duration_before_split:
+        start_event = deepcopy(event_dict)
+        # Remove the end date of this object to signal that this event is one day long ("all day event")
+        del start_event['end']
+        if 'summary' in start_event.keys():
+            start_event['summary_override'] = _("[START] {}").format(start_event['summary'])
+
+        components = [ical_event(start_event)]
+
+        end_event = deepcopy(event_dict)
+        # The end event starts on the end of the total event
+        end_event['begin'] = end_event['end']
+        del end_event['end']
+        if 'summary' in end_event.keys():
+            end_event['summary_override'] = _("[END] {}").format(end_event['summary'])
+        # The primary key of this event should be different from the start event, therefore we negate it to produce
+        # a new digest
+        end_event['id'] = -end_event['id']
+
+        components.append(ical_event(end_event))
+    else:
+        components = [ical_event(event_dict)]
+
+    return components
+
+
+def _ical_calendar_component(calendar):
+    cal = icalendar.Calendar()
+
+    cal.add('version', '2.0')
+    cal.add('prodid', '-//inter-actief//amélie//NL')
+    cal.add('x-wr-calname', force_str(calendar))
+    # lines.append(Line('CALSCALE', 'GREGORIAN'))
+
+    cal.add_component(ical_timezone(datetime.today().year))
+    return cal
+
+
+def ical_calendar(calendar, events=None, max_duration_before_split=timedelta(days=3)):
+    if events is None:
+        events = []
+
+    cal = _ical_calendar_component(calendar)
+
+    for event in events:
+        for component in ical_event_components(event, max_duration_before_split):
+            cal.add_component(component)
 
     return cal.to_ical()
+
+
+def _event_cache_key(model, pk, version, language, max_duration_before_split):
+    version_hash = hashlib.sha256(repr(version).encode()).hexdigest()[:16]
+    return 'ical_event_{}_{}_{}_{}_{}_{}'.format(model._meta.label_lower, pk, version_hash, language,
+                                                 int(max_duration_before_split.total_seconds()), datetime.today().year)
+
+
+def ical_feed_response(request, calendar, events, max_duration_before_split=timedelta(days=3)):
+    """
+    Returns an HttpResponse with the iCalendar feed of the given queryset of events, which supports conditional GET.
+
+    The serialized VEVENT blocks of the events are cached per language and are only regenerated if the update_count
+    or the name or e-mail address of the organizer of an event changes, since renaming a committee does not change
+    the update_count of its events. The ETag of the feed is derived from the same versions of the events, so an
+    unchanged feed is answered with a 304 Not Modified response.
+
+    :type events: django.db.models.QuerySet
+    """
+    language = get_language()
+    versions = [(pk, version) for pk, *version in
+                events.values_list('pk', 'update_count', 'organizer__name', 'organizer__email')]
+
+    feed_hash = hashlib.sha256('{}|{}|{}|{}|{}'.format(
+        force_str(calendar), language, max_duration_before_split, datetime.today().year, versions
+    ).encode()).hexdigest()
+    etag = '"{}"'.format(feed_hash)
+
+    last_modified = cache.get('ical_feed_modified_{}'.format(feed_hash))
+    if last_modified is None:
+        last_modified = int(time.time())
+        cache.set('ical_feed_modified_{}'.format(feed_hash), last_modified, ICAL_FEED_CACHE_TIMEOUT)
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        keys = {pk: _event_cache_key(events.model, pk, version, language, max_duration_before_split)
+                for pk, version in versions}
+        blocks = cache.get_many(keys.values())
+
+        missing = [pk for pk, key in keys.items() if key not in blocks]
+        if missing:
+            new_blocks = {}
+            for event in events.model.objects.filter(pk__in=missing).select_related('organizer'):
+                new_blocks[keys[event.pk]] = b''.join(
+                    component.to_ical() for component in ical_event_components(event, max_duration_before_split)
+                )
+            cache.set_many(new_blocks, ICAL_FEED_CACHE_TIMEOUT)
+            blocks.update(new_blocks)
+
+        # Assemble the feed by placing the cached event blocks in an empty calendar
+        empty_calendar = _ical_calendar_component(calendar).to_ical()
+        end = empty_calendar.rindex(b'END:VCALENDAR')
+        contents = empty_calendar[:end] + b''.join(blocks[keys[pk]] for pk, version in versions) + \
+            empty_calendar[end:]
+
+        response = HttpResponse(contents, content_type='text/calendar; charset=UTF-8')
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
@@ -1,10 +1,11 @@
+import asyncio
 import copy
 import logging
 import re
 from enum import StrEnum
 from typing import List, Dict, Any, Optional, NamedTuple, Union, Tuple
 
-import requests
+from asgiref.sync import async_to_sync
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.db import transaction
@@ -18,6 +19,8 @@ from documenso_sdk import Documenso, \
     EnvelopeCreateEmailSettingsTypedDict, EnvelopeCreateLanguage, EnvelopeCreateRole, EnvelopeDistributeResponse, \
     EnvelopeCreateType, EnvelopeGetStatus, EnvelopeGetResponse
 
+from amelie.tools.asyncio import new_http_session
+
 FIELD_TEMPLATES = {
     "MEMBERSHIP": [
         {"type": "SIGNATURE", "positionX": 3.75, "positionY": 83.75, "width": 43, "height": 13.5}
@@ -177,19 +180,25 @@ def retrieve_documents(envelope_id) -> Tuple[List[RetrievedFile], EnvelopeGetRes
         if envelope_info.status != EnvelopeGetStatus.COMPLETED:
             raise ValueError(gettext("Requested documents are not completed yet. (EID: {envelope_id})").format(envelope_id=envelope_id))
 
-        documents = []
-        for item in envelope_info.envelope_items:
-            # The SDK method `doc.envelopes.items.download` doesn't like to download files (it's autogenerated and expects JSON),
-            # so we have to manually build the request for this one.
-            api_base = settings.DOCUMENSO_SETTINGS.get("API_BASE")
-            document = requests.get(
-                url=f"{api_base}/envelope/item/{item.id}/download?version=signed",
-                headers={"Authorization": settings.DOCUMENSO_SETTINGS.get("API_KEY", "")},
-            )
-            documents.append(RetrievedFile(filename=item.title, data=document.content))
+        documents = async_to_sync(_download_envelope_items)(envelope_info.envelope_items)
     return documents, envelope_info
 
 
+async def _download_envelope_items(items) -> List[RetrievedFile]:
+    # The SDK method `doc.envelopes.items.download` doesn't like to download files (it's autogenerated and expects JSON),
+    # so we have to manually build the requests for these. The items are downloaded at the same time.
+    api_base = settings.DOCUMENSO_SETTINGS.get("API_BASE")
+    headers = {"Authorization": settings.DOCUMENSO_SETTINGS.get("API_KEY", "")}
+
+    async with new_http_session() as session:
+        async def download(item):
+            async with session.get(f"{api_base}/envelope/item/{item.id}/download?version=signed",
+                                   headers=headers) as response:
+                return RetrievedFile(filename=item.title, data=await response.read())
+
+        return list(await asyncio.gather(*[download(item) for item in items]))
+
+
 def create_enrollment_documents(person, membership) -> EnvelopeCreateResponse:
     from amelie.members.models import Person, UnverifiedEnrollment, Membership, MembershipType
     from amelie.personal_tab.models import Authorization
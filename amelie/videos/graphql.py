@@ -6,6 +6,7 @@ from django.utils.translation import gettext_lazy as _
 from graphene_django import DjangoObjectType
 
 from amelie.graphql.decorators import check_authorization
+from amelie.graphql.loaders import load_related
 from amelie.graphql.pagination.connection_field import DjangoPaginationConnectionField
 from amelie.videos.models import BaseVideo
 
@@ -74,7 +75,7 @@ class VideoType(DjangoObjectType):
     embed_url = graphene.String(description=_("Embed URL"))
 
     def resolve_publisher(obj: BaseVideo, info):
-        return obj.publisher.name
+        return load_related(info, obj, 'publisher').name
 
     def resolve_video_type(obj: BaseVideo, info):
         return obj.get_video_type()
@@ -200,7 +200,8 @@ def send_weekmail(request, pk):
                     report_to=weekmail.writer.email_address,
                     report_language=weekmail.writer.preferred_language,
                     report_always=True,
-                    priority=TaskPriority.LOW)
+                    priority=TaskPriority.LOW,
+                    prerender=True)
 
     # If debug is enabled, add a single recipient, the person themselves
     if settings.DEBUG:
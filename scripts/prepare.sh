@@ -9,6 +9,11 @@ python3 manage.py collectstatic --noinput
 echo "Migrating database..."
 python3 manage.py migrate
 
+# Fill the derived tables that new migrations added, these are kept up to date automatically afterwards
+echo "Filling derived tables..."
+python3 manage.py rebuild_transaction_totals --if-empty
+python3 manage.py rebuild_event_index --if-empty
+
 # Check if Django can run
 echo "Checking if Django can run..."
 python3 manage.py check
@@ -90,9 +90,21 @@ if ! python manage.py migrate --check; then
     exit 1
 fi
 
-echo "### Restarting webserver and celery..."
+echo "### Filling derived tables added by new migrations"
+python manage.py rebuild_transaction_totals --if-empty
+python manage.py rebuild_event_index --if-empty
+echo "### Derived tables filled"
+
+echo "### Restarting webserver, celery and the narrowcasting poller..."
 sudo systemctl restart apache2
 sudo systemctl restart celery-amelie
+# The poller is optional, without it the room screens call the upstream services themselves.
+# See scripts/start_narrowcasting_poller.sh for how to install its service.
+if systemctl cat narrowcasting-poller-amelie.service > /dev/null 2>&1; then
+    sudo systemctl restart narrowcasting-poller-amelie
+else
+    echo "### narrowcasting-poller-amelie is not installed, not restarting it"
+fi
 sleep 3
 sudo systemctl restart flower-amelie
 
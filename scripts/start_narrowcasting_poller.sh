@@ -0,0 +1,30 @@
+#!/bin/bash
+
+# The room narrowcasting screens get their Spotify players, chat messages, room duty and pictures from the state that
+# this poller stores in the database. Without it, every screen calls the upstream services itself.
+#
+# In production it runs as the narrowcasting-poller-amelie service, which is installed by hand like celery-amelie, with
+# the same user, in /etc/systemd/system/narrowcasting-poller-amelie.service:
+#
+#   [Unit]
+#   Description=Amelie narrowcasting poller
+#   After=network.target mysql.service
+#
+#   [Service]
+#   User=amelie
+#   WorkingDirectory=/data/applications/amelie
+#   Environment=PATH=/data/environment/amelie/bin:/usr/bin:/bin
+#   ExecStart=/data/applications/amelie/scripts/start_narrowcasting_poller.sh
+#   Restart=always
+#
+#   [Install]
+#   WantedBy=multi-user.target
+#
+# Then run: sudo systemctl daemon-reload && sudo systemctl enable --now narrowcasting-poller-amelie
+
+# Check if Django can run
+echo "Checking if Django can run..."
+python3 manage.py check
+
+echo "Starting narrowcasting poller..."
+python3 manage.py narrowcasting_poller
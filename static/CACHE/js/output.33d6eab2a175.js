@@ -0,0 +1,2 @@
+Scanner={init:function(){var scanner=this;var socket;socket=new WebSocket('ws://localhost:3000','nfc');socket.onmessage=function(event){var rfid=JSON.parse(event.data);scanner.action(rfid);}},action:function(rfid){var typeIdentifier='xx';if(rfid['atqa']=='00:04'&&rfid['sak']=='08'){typeIdentifier='02';}else if(rfid['atqa']=='00:02'&&rfid['sak']=='18'){typeIdentifier='03';}else if(rfid['atqa']=='03:44'&&rfid['sak']=='20'){typeIdentifier='04';}else if(rfid['atqa']=='00:44'&&rfid['sak']=='00'){typeIdentifier='05';}else{alert('RFID niet herkend');return;}
+$('#id_code').val(typeIdentifier+','+rfid['uid']);$('#enrollment_control_form').submit();}};$(function(){Scanner.init();$('#id_student_number').focus();});;
\ No newline at end of file